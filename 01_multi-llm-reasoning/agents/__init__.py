@@ -8,10 +8,19 @@ from agents.coordinator import create_coordinator_agent
 from agents.researcher import create_researcher_agent
 from agents.analyzer import create_analyzer_agent
 from agents.summarizer import create_summarizer_agent
+from agents.clients import get_chat_client, warm_up_clients, close_clients
+from agents.fake_client import FakeChatClient, LatencyModel, ScriptRule, get_fake_chat_client
 
 __all__ = [
     "create_coordinator_agent",
     "create_researcher_agent",
     "create_analyzer_agent",
     "create_summarizer_agent",
+    "get_chat_client",
+    "warm_up_clients",
+    "close_clients",
+    "FakeChatClient",
+    "LatencyModel",
+    "ScriptRule",
+    "get_fake_chat_client",
 ]
@@ -74,12 +74,15 @@ Researcherが収集した情報を分析し、深い洞察を導き出します
 """
 
 
-async def create_analyzer_agent():
+async def create_analyzer_agent(model_type: str = "gpt5"):
     """
     Analysis Agentを作成
 
     HostedCodeInterpreterToolとカスタムツールを組み込み
 
+    Args:
+        model_type: 使用するモデルタイプ（gpt5 または gpt5-mini、既定: gpt5）
+
     Returns:
         ChatAgent: 設定済みAnalysis Agent（ツール付き）
     """
@@ -93,41 +96,10 @@ async def create_analyzer_agent():
         categorize_data
     ]
 
-    from agent_framework import ChatAgent
-    from agent_framework.azure import AzureOpenAIChatClient
-    from azure.identity.aio import AzureCliCredential
-    import os
-
-    # 環境変数から取得
-    endpoint = os.getenv("AZURE_OPENAI_ENDPOINT")
-    api_key = os.getenv("AZURE_OPENAI_API_KEY")
-
-    if not endpoint:
-        raise ValueError("AZURE_OPENAI_ENDPOINTが設定されていません")
-
-    deployment_name = settings.get_deployment_name("gpt5")
-
-    # クライアント作成
-    if api_key:
-        client = AzureOpenAIChatClient(
-            endpoint=endpoint,
-            deployment_name=deployment_name,
-            api_key=api_key
-        )
-    else:
-        credential = AzureCliCredential()
-        client = AzureOpenAIChatClient(
-            endpoint=endpoint,
-            deployment_name=deployment_name,
-            credential=credential
-        )
-
     # ツール付きエージェント作成
-    agent = ChatAgent(
-        chat_client=client,
+    return await create_azure_agent(
         name="Analyzer",
         instructions=ANALYZER_INSTRUCTIONS,
+        deployment_name=settings.get_deployment_name(model_type),
         tools=tools
     )
-
-    return agent
@@ -5,10 +5,13 @@ Azure OpenAI エージェントを作成するための共通機能を提供し
 """
 
 import os
-from typing import Optional
+from typing import Any, List, Optional
 from agent_framework import ChatAgent
-from agent_framework.azure import AzureOpenAIChatClient
-from azure.identity.aio import AzureCliCredential
+
+from agents.clients import get_chat_client
+from agents.fake_client import get_fake_chat_client
+from config.settings import settings
+from orchestration.tracing import traced_tool
 
 
 async def create_azure_agent(
@@ -16,7 +19,8 @@ async def create_azure_agent(
     instructions: str,
     deployment_name: str,
     endpoint: Optional[str] = None,
-    api_key: Optional[str] = None
+    api_key: Optional[str] = None,
+    tools: Optional[List[Any]] = None
 ) -> ChatAgent:
     """
     Azure OpenAI エージェントを作成
@@ -27,39 +31,38 @@ async def create_azure_agent(
         deployment_name: Azure OpenAIのデプロイメント名（gpt-5, gpt-5-miniなど）
         endpoint: Azure OpenAIエンドポイント（環境変数から取得可能）
         api_key: APIキー（省略時はAzure CLI認証を使用）
+        tools: エージェントに組み込むツールのリスト（関数ツールは呼び出しをトレースに記録）
 
     Returns:
         ChatAgent: 設定済みエージェント
+
+    Note:
+        Settings.LLM_BACKEND が fake の場合はAzureに接続せず、フェイククライアントを使います。
     """
-    # 環境変数から取得
-    endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
-    api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
+    if settings.LLM_BACKEND == "fake":
+        client = get_fake_chat_client(deployment_name)
+    else:
+        # 環境変数から取得
+        endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
+        api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
 
-    if not endpoint:
-        raise ValueError("AZURE_OPENAI_ENDPOINTが設定されていません")
+        if not endpoint:
+            raise ValueError("AZURE_OPENAI_ENDPOINTが設定されていません")
 
-    # クライアント作成
-    if api_key:
-        # APIキー認証
-        client = AzureOpenAIChatClient(
-            endpoint=endpoint,
-            deployment_name=deployment_name,
-            api_key=api_key
-        )
-    else:
-        # Azure CLI認証（推奨）
-        credential = AzureCliCredential()
-        client = AzureOpenAIChatClient(
-            endpoint=endpoint,
-            deployment_name=deployment_name,
-            credential=credential
-        )
+        # 共有レジストリからクライアントを取得
+        # （APIキー未設定時はAzure CLI認証。接続プールとトークンは全エージェントで共有）
+        client = get_chat_client(endpoint, deployment_name, api_key)
+
+    # 関数ツールはトレース用のラッパーで包む（ホスト型ツールはそのまま）
+    if tools:
+        tools = [traced_tool(tool) if callable(tool) else tool for tool in tools]
 
     # エージェント作成
     agent = ChatAgent(
         chat_client=client,
         name=name,
-        instructions=instructions
+        instructions=instructions,
+        tools=tools
     )
 
     return agent
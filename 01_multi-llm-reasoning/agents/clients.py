@@ -0,0 +1,336 @@
+"""
+Azure OpenAI クライアントの共有レジストリ
+
+全エージェントでHTTP接続プールと認証情報を共有し、
+エージェントごとの接続確立・トークン取得を省きます。
+
+openai・Azure SDK は読み込みに時間がかかるため、クライアントを作成する時点で読み込みます
+（フェイクバックエンドやAPIキー認証では使わないモジュールを読み込まない）。
+"""
+
+import asyncio
+import hashlib
+import logging
+import time
+from typing import TYPE_CHECKING, Any, Callable, Dict, Optional, Set, Tuple
+
+from config.settings import settings
+
+if TYPE_CHECKING:
+    from agent_framework.azure import AzureOpenAIChatClient
+
+logger = logging.getLogger(__name__)
+
+# Azure OpenAI のトークンスコープ
+COGNITIVE_SERVICES_SCOPE = "https://cognitiveservices.azure.com/.default"
+
+
+class CachedTokenProvider:
+    """
+    AADトークンを有効期限の少し前までキャッシュするトークンプロバイダー
+
+    AsyncAzureOpenAI の azure_ad_token_provider として渡すと、
+    リクエストごとに呼ばれてもトークン取得は期限切れ直前の1回だけになります。
+    """
+
+    def __init__(
+        self,
+        credential: Any,
+        scope: str = COGNITIVE_SERVICES_SCOPE,
+        refresh_margin: float = 300,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        プロバイダー初期化
+
+        Args:
+            credential: 非同期のAzure認証情報（get_tokenを持つもの）
+            scope: 取得するトークンのスコープ
+            refresh_margin: 有効期限の何秒前に再取得するか
+            clock: 現在時刻（UNIX秒）を返す関数
+        """
+        self.credential = credential
+        self.scope = scope
+        self.refresh_margin = refresh_margin
+        self.clock = clock
+        self.acquisitions = 0
+        self._token: Optional[str] = None
+        self._expires_on: float = 0
+        self._lock: Optional[asyncio.Lock] = None
+
+    def _is_valid(self) -> bool:
+        """キャッシュ済みトークンがまだ使えるか"""
+        return self._token is not None and self.clock() < self._expires_on - self.refresh_margin
+
+    async def __call__(self) -> str:
+        """
+        トークン文字列を取得
+
+        Returns:
+            AADアクセストークン
+        """
+        if self._is_valid():
+            return self._token
+
+        # 同時に期限切れを検知した呼び出しでも取得は1回にまとめる
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+        async with self._lock:
+            if not self._is_valid():
+                access_token = await self.credential.get_token(self.scope)
+                self._token = access_token.token
+                self._expires_on = access_token.expires_on
+                self.acquisitions += 1
+                logger.debug("AADトークンを取得しました")
+
+        return self._token
+
+    async def close(self) -> None:
+        """認証情報を閉じる"""
+        await self.credential.close()
+
+
+class ClientRegistry:
+    """
+    プロセス共有のAzure OpenAIクライアントレジストリ
+
+    チャットクライアントは (エンドポイント, デプロイメント, 認証情報) ごとに1つ作成し、
+    HTTP接続プールとAADトークンプロバイダーは全クライアントで共有します。
+    """
+
+    def __init__(self):
+        """レジストリ初期化"""
+        self._clients: Dict[Tuple[str, str, str], "AzureOpenAIChatClient"] = {}
+        self._http_client: Optional[Any] = None
+        self._token_provider: Optional[CachedTokenProvider] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        # 破棄した古い接続・認証情報を閉じるタスク（完了まで参照を保持）
+        self._closing: Set["asyncio.Task[None]"] = set()
+
+    def _check_loop(self) -> None:
+        """
+        イベントループが変わっていれば古いクライアントを閉じて破棄
+
+        HTTP接続は作成時のイベントループに紐づくため、asyncio.runを
+        複数回呼ぶ場合はループごとに作り直します。古い接続プールと認証情報は
+        新しいループ上で閉じます（実行中のループがない場合はその場で閉じる）。
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+
+        if loop is self._loop:
+            return
+
+        stale_http_client, stale_token_provider = self._http_client, self._token_provider
+        self._clients.clear()
+        self._http_client = None
+        self._token_provider = None
+        self._loop = loop
+
+        if stale_http_client is None and stale_token_provider is None:
+            return
+        closing = self._close_resources(stale_http_client, stale_token_provider)
+        if loop is None:
+            asyncio.run(closing)
+        else:
+            task = loop.create_task(closing)
+            self._closing.add(task)
+            task.add_done_callback(self._closing.discard)
+
+    @staticmethod
+    async def _close_resources(
+        http_client: Optional[Any],
+        token_provider: Optional[CachedTokenProvider]
+    ) -> None:
+        """
+        HTTP接続プールと認証情報を閉じる
+
+        以前のイベントループに紐づく接続は既に閉じられないことがあるため、
+        失敗してもログに残すだけにします。
+        """
+        if http_client is not None:
+            try:
+                await http_client.aclose()
+            except Exception as e:
+                logger.debug(f"古いHTTP接続を閉じられませんでした: {e}")
+        if token_provider is not None:
+            try:
+                await token_provider.close()
+            except Exception as e:
+                logger.debug(f"古い認証情報を閉じられませんでした: {e}")
+
+    def get_http_client(self) -> Any:
+        """共有HTTPクライアント（接続プール）を取得"""
+        self._check_loop()
+        if self._http_client is None:
+            from openai import DefaultAsyncHttpxClient
+
+            self._http_client = DefaultAsyncHttpxClient()
+        return self._http_client
+
+    def get_token_provider(self) -> CachedTokenProvider:
+        """共有AADトークンプロバイダーを取得（Azure CLI認証）"""
+        self._check_loop()
+        if self._token_provider is None:
+            from azure.identity.aio import AzureCliCredential
+
+            self._token_provider = CachedTokenProvider(AzureCliCredential())
+        return self._token_provider
+
+    def get_chat_client(
+        self,
+        endpoint: str,
+        deployment_name: str,
+        api_key: Optional[str] = None
+    ) -> "AzureOpenAIChatClient":
+        """
+        チャットクライアントを取得（未作成なら作成）
+
+        Args:
+            endpoint: Azure OpenAIエンドポイント
+            deployment_name: デプロイメント名
+            api_key: APIキー（省略時はAzure CLI認証）
+
+        Returns:
+            AzureOpenAIChatClient: 共有チャットクライアント
+        """
+        self._check_loop()
+        auth_mode = "api_key" if api_key else "azure_cli"
+        # APIキーごとに別のクライアントにする（キーそのものは保持しない）
+        credential_id = hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16] if api_key else auth_mode
+        key = (endpoint, deployment_name, credential_id)
+
+        client = self._clients.get(key)
+        if client is not None:
+            return client
+
+        from agent_framework.azure import AzureOpenAIChatClient
+        from openai import AsyncAzureOpenAI
+
+        auth_args: Dict[str, Any] = {"api_key": api_key} if api_key else {
+            "azure_ad_token_provider": self.get_token_provider()
+        }
+        async_client = AsyncAzureOpenAI(
+            azure_endpoint=endpoint,
+            azure_deployment=deployment_name,
+            api_version=settings.AZURE_OPENAI_API_VERSION,
+            http_client=self.get_http_client(),
+            # 再試行はワークフローのリトライポリシーで行うため、SDK側では行わない
+            max_retries=0,
+            **auth_args
+        )
+        client = AzureOpenAIChatClient(
+            endpoint=endpoint,
+            deployment_name=deployment_name,
+            async_client=async_client
+        )
+
+        self._clients[key] = client
+        logger.debug(f"チャットクライアントを作成: {deployment_name} ({auth_mode})")
+        return client
+
+    async def warm_up(
+        self,
+        endpoint: str,
+        api_key: Optional[str] = None,
+        timeout: float = 5.0
+    ) -> Dict[str, Any]:
+        """
+        認証情報の取得とエンドポイントへの接続を事前に行う
+
+        APIキー未設定時はAADトークンを1回取得し（全クライアントで共有）、
+        並行してエンドポイントへ軽量なHEADリクエストを送り、共有接続プールに
+        TLS接続を確立しておきます。最初のクエリがこれらの待ち時間を負担しないためのものです。
+        失敗してもクエリ実行時に改めて行われるため、例外は送出せず結果に記録します。
+
+        Args:
+            endpoint: Azure OpenAIエンドポイント
+            api_key: APIキー（省略時はAzure CLI認証のトークンを取得）
+            timeout: それぞれの処理の最大待機秒数
+
+        Returns:
+            所要時間（credential_seconds, connection_seconds）とエラーの辞書
+        """
+        report: Dict[str, Any] = {"credential_seconds": None, "connection_seconds": None, "errors": []}
+
+        async def resolve_credential() -> None:
+            start = time.perf_counter()
+            await asyncio.wait_for(self.get_token_provider()(), timeout)
+            report["credential_seconds"] = time.perf_counter() - start
+
+        async def open_connection() -> None:
+            start = time.perf_counter()
+            # 応答のステータスは問わない（接続が確立できればよい）
+            await self.get_http_client().head(endpoint, timeout=timeout)
+            report["connection_seconds"] = time.perf_counter() - start
+
+        tasks = [open_connection()] if api_key else [resolve_credential(), open_connection()]
+        for result in await asyncio.gather(*tasks, return_exceptions=True):
+            if isinstance(result, BaseException):
+                report["errors"].append(f"{type(result).__name__}: {result}")
+
+        if report["errors"]:
+            logger.warning(f"⚠️  接続の事前準備に失敗しました（初回のクエリで再試行します）: {'; '.join(report['errors'])}")
+        return report
+
+    async def close(self) -> None:
+        """共有HTTP接続と認証情報を閉じる"""
+        if self._http_client is not None:
+            await self._http_client.aclose()
+        if self._token_provider is not None:
+            await self._token_provider.close()
+        if self._closing:
+            await asyncio.gather(*self._closing, return_exceptions=True)
+
+        self._clients.clear()
+        self._http_client = None
+        self._token_provider = None
+
+
+# プロセス共有レジストリ
+client_registry = ClientRegistry()
+
+
+def get_chat_client(
+    endpoint: str,
+    deployment_name: str,
+    api_key: Optional[str] = None
+) -> "AzureOpenAIChatClient":
+    """
+    共有レジストリからチャットクライアントを取得する
+
+    Args:
+        endpoint: Azure OpenAIエンドポイント
+        deployment_name: デプロイメント名
+        api_key: APIキー（省略時はAzure CLI認証）
+
+    Returns:
+        AzureOpenAIChatClient: 共有チャットクライアント
+    """
+    return client_registry.get_chat_client(endpoint, deployment_name, api_key)
+
+
+async def warm_up_clients(
+    endpoint: str,
+    api_key: Optional[str] = None,
+    timeout: float = 5.0
+) -> Dict[str, Any]:
+    """
+    共有レジストリの認証情報と接続を事前に準備する
+
+    Args:
+        endpoint: Azure OpenAIエンドポイント
+        api_key: APIキー（省略時はAzure CLI認証のトークンを取得）
+        timeout: それぞれの処理の最大待機秒数
+
+    Returns:
+        所要時間とエラーの辞書
+    """
+    return await client_registry.warm_up(endpoint, api_key, timeout)
+
+
+async def close_clients() -> None:
+    """共有クライアントを全て閉じる（シャットダウン時に呼び出す）"""
+    await client_registry.close()
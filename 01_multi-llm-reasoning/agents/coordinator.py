@@ -42,15 +42,18 @@ Researcherに対する具体的な調査依頼を記述してください。
 """
 
 
-async def create_coordinator_agent():
+async def create_coordinator_agent(model_type: str = "gpt5"):
     """
     Coordinator Agentを作成
 
+    Args:
+        model_type: 使用するモデルタイプ（gpt5 または gpt5-mini、既定: gpt5）
+
     Returns:
         ChatAgent: 設定済みCoordinator Agent
     """
     return await create_azure_agent(
         name="Coordinator",
         instructions=COORDINATOR_INSTRUCTIONS,
-        deployment_name=settings.get_deployment_name("gpt5")
+        deployment_name=settings.get_deployment_name(model_type)
     )
@@ -0,0 +1,9 @@
+"""
+Benchmarks Package - ベンチマーク集
+
+フェイクLLMバックエンドでワークフローの性能を計測します。
+"""
+
+__all__ = [
+    "workflow_benchmark"
+]
@@ -0,0 +1,443 @@
+"""
+Workflow Benchmark - ワークフローのスループット・レイテンシ計測
+
+フェイクLLMバックエンド（LLM_BACKEND=fake）で MultiAgentWorkflow を実行し、
+以下を計測してJSONに書き出します。
+
+- latency: 逐次実行したときのエンドツーエンドのp50/p95/p99
+- throughput: 同時実行数ごとの秒間クエリ数とレイテンシ
+- phase_overhead: フェーズごとの、LLM呼び出し以外に掛かった時間（オーケストレーションのオーバーヘッド）
+- memory: 多数回実行したときのメモリ増加量（tracemalloc）
+
+--baseline に以前の結果を渡すと、オーバーヘッドとメモリ増加の悪化を検出して終了コード1を返します。
+
+使用例:
+    python benchmarks/workflow_benchmark.py --runs 200 --concurrency 1,4,16 --latency 0.05
+    python benchmarks/workflow_benchmark.py --baseline benchmarks/results/baseline.json
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+# Azureに接続しないよう、設定の読み込み前にフェイクバックエンドを選択
+os.environ.setdefault("LLM_BACKEND", "fake")
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from agents import fake_client
+from config.settings import settings
+from workflow import MultiAgentWorkflow
+
+# ベンチマークで使う質問
+BENCHMARK_QUERY = "量子コンピューターの現状と将来性について教えてください"
+
+# 悪化として検出する指標（値が大きいほど悪い）
+REGRESSION_METRICS = [
+    ("latency", "overhead_p50_seconds"),
+    ("latency", "overhead_p95_seconds"),
+    ("memory", "growth_bytes_per_run"),
+]
+
+
+def percentile(values: Sequence[float], p: float) -> float:
+    """
+    パーセンタイルを求める（最近傍順位法）
+
+    Args:
+        values: 値のリスト
+        p: パーセンタイル（0〜100）
+
+    Returns:
+        パーセンタイル値（値がない場合は0）
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+    return ordered[index]
+
+
+def summarize_latencies(values: Sequence[float]) -> Dict[str, float]:
+    """レイテンシの要約（mean, p50, p95, p99, max）"""
+    return {
+        "mean_seconds": sum(values) / len(values) if values else 0.0,
+        "p50_seconds": percentile(values, 50),
+        "p95_seconds": percentile(values, 95),
+        "p99_seconds": percentile(values, 99),
+        "max_seconds": max(values) if values else 0.0,
+    }
+
+
+def configure_fake_backend(latency: float, stddev: float, distribution: str, tokens_per_second: float) -> None:
+    """
+    フェイクLLMバックエンドの設定を反映する
+
+    Args:
+        latency: 最初のトークンまでの平均応答時間（秒）
+        stddev: 応答時間の標準偏差（秒）
+        distribution: 応答時間の分布
+        tokens_per_second: 出力トークンの生成速度（0以下は待機なし）
+    """
+    settings.LLM_BACKEND = "fake"
+    settings.FAKE_LLM_LATENCY_MEAN = latency
+    settings.FAKE_LLM_LATENCY_STDDEV = stddev
+    settings.FAKE_LLM_LATENCY_DISTRIBUTION = distribution
+    settings.FAKE_LLM_TOKENS_PER_SECOND = tokens_per_second
+    settings.FAKE_LLM_FAILURE_RATE = 0.0
+    fake_client.reset_fake_clients()
+
+
+def create_workflow() -> MultiAgentWorkflow:
+    """計測用のワークフロー（キャッシュ・チェックポイントなし）"""
+    return MultiAgentWorkflow(use_cache=False, use_checkpoints=False)
+
+
+def phase_overhead(spans: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    1回の実行のフェーズごとのオーバーヘッドを求める
+
+    フェーズスパンの所要時間から、その中のLLM呼び出し（agentスパン）の時間を引いた値です。
+    "workflow" にはフェーズの外側（初期化・グラフ実行など）に掛かった時間を入れます。
+
+    Args:
+        spans: 実行結果の trace["spans"]
+
+    Returns:
+        フェーズ名をキーとするオーバーヘッド（秒）
+    """
+    by_id = {s["span_id"]: s for s in spans}
+
+    def phase_span_of(s: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        while s is not None:
+            if s["kind"] == "phase":
+                return s
+            s = by_id.get(s["parent_id"])
+        return None
+
+    overhead: Dict[str, float] = {}
+    phase_seconds = 0.0
+    for s in spans:
+        if s["kind"] == "phase":
+            phase = s["attributes"].get("phase")
+            overhead[phase] = overhead.get(phase, 0.0) + s["duration_seconds"]
+            phase_seconds += s["duration_seconds"]
+
+    for s in spans:
+        if s["kind"] == "agent":
+            parent = phase_span_of(s)
+            if parent is not None:
+                phase = parent["attributes"].get("phase")
+                overhead[phase] -= s["duration_seconds"]
+
+    root = next((s for s in spans if s["kind"] == "workflow"), None)
+    if root is not None:
+        overhead["workflow"] = root["duration_seconds"] - phase_seconds
+    return overhead
+
+
+def llm_seconds(spans: List[Dict[str, Any]]) -> float:
+    """1回の実行でLLM呼び出しに掛かった時間の合計（秒）"""
+    return sum(s["duration_seconds"] for s in spans if s["kind"] == "agent")
+
+
+async def bench_latency(runs: int) -> Dict[str, Any]:
+    """
+    逐次実行のエンドツーエンドのレイテンシを計測
+
+    Args:
+        runs: 実行回数
+
+    Returns:
+        レイテンシとオーバーヘッド（エンドツーエンド - LLM呼び出し）の要約、フェーズ別オーバーヘッド
+    """
+    workflow = create_workflow()
+    await workflow.ensure_initialized()
+
+    latencies: List[float] = []
+    overheads: List[float] = []
+    per_phase: Dict[str, List[float]] = {}
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = await workflow.run(BENCHMARK_QUERY)
+        elapsed = time.perf_counter() - start
+        spans = result["trace"]["spans"]
+
+        latencies.append(elapsed)
+        overheads.append(elapsed - llm_seconds(spans))
+        for phase, seconds in phase_overhead(spans).items():
+            per_phase.setdefault(phase, []).append(seconds)
+
+    summary = summarize_latencies(latencies)
+    summary.update({
+        "runs": runs,
+        "overhead_p50_seconds": percentile(overheads, 50),
+        "overhead_p95_seconds": percentile(overheads, 95),
+    })
+    phases = {
+        phase: {"mean_seconds": sum(values) / len(values), "p95_seconds": percentile(values, 95)}
+        for phase, values in per_phase.items()
+    }
+    return {"latency": summary, "phase_overhead": phases}
+
+
+async def bench_throughput(concurrency: int, runs: int) -> Dict[str, Any]:
+    """
+    共有ワークフローを同時実行したときのスループットを計測
+
+    Args:
+        concurrency: 同時実行数
+        runs: 実行回数
+
+    Returns:
+        秒間クエリ数とレイテンシの要約
+    """
+    workflow = create_workflow()
+    await workflow.ensure_initialized()
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+
+    async def one() -> None:
+        async with semaphore:
+            start = time.perf_counter()
+            await workflow.run(BENCHMARK_QUERY)
+            latencies.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(runs)))
+    wall = time.perf_counter() - start
+
+    return {
+        "concurrency": concurrency,
+        "runs": runs,
+        "wall_seconds": wall,
+        "qps": runs / wall if wall > 0 else 0.0,
+        **summarize_latencies(latencies),
+    }
+
+
+async def bench_memory(runs: int, samples: int = 10) -> Dict[str, Any]:
+    """
+    同じワークフローを多数回実行したときのメモリ増加を計測
+
+    最初の1回（初期化を含む）の後を基準に、tracemalloc で確保中のメモリを
+    samples 回に分けて記録します。
+
+    Args:
+        runs: 実行回数
+        samples: 記録する回数
+
+    Returns:
+        基準・最終の確保量、1回あたりの増加量、途中の記録
+    """
+    workflow = create_workflow()
+    await workflow.run(BENCHMARK_QUERY)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline, _ = tracemalloc.get_traced_memory()
+        every = max(1, runs // samples)
+        timeline = []
+        for i in range(1, runs + 1):
+            await workflow.run(BENCHMARK_QUERY)
+            if i % every == 0 or i == runs:
+                gc.collect()
+                current, _ = tracemalloc.get_traced_memory()
+                timeline.append({"runs": i, "bytes": current - baseline})
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    growth = timeline[-1]["bytes"] if timeline else 0
+    return {
+        "runs": runs,
+        "baseline_bytes": baseline,
+        "growth_bytes": growth,
+        "growth_bytes_per_run": growth / runs if runs else 0.0,
+        "peak_bytes": peak,
+        "timeline": timeline,
+    }
+
+
+async def run_suite(
+    runs: int = 100,
+    concurrency_levels: Sequence[int] = (1, 4, 16),
+    throughput_runs: Optional[int] = None,
+    memory_runs: int = 1000,
+    latency: float = 0.05,
+    stddev: float = 0.0,
+    distribution: str = "fixed",
+    tokens_per_second: float = 0.0
+) -> Dict[str, Any]:
+    """
+    ベンチマーク一式を実行
+
+    Args:
+        runs: レイテンシ計測の実行回数
+        concurrency_levels: スループットを計測する同時実行数
+        throughput_runs: 同時実行数ごとの実行回数（省略時は runs）
+        memory_runs: メモリ計測の実行回数（0で省略、LLMの応答時間は0で実行）
+        latency: フェイクLLMの平均応答時間（秒）
+        stddev: フェイクLLMの応答時間の標準偏差（秒）
+        distribution: フェイクLLMの応答時間の分布
+        tokens_per_second: フェイクLLMの出力トークン生成速度
+
+    Returns:
+        計測結果（JSONに書き出せる辞書）
+    """
+    config = {
+        "runs": runs,
+        "concurrency_levels": list(concurrency_levels),
+        "throughput_runs": throughput_runs or runs,
+        "memory_runs": memory_runs,
+        "fake_llm": {
+            "latency_mean_seconds": latency,
+            "latency_stddev_seconds": stddev,
+            "latency_distribution": distribution,
+            "tokens_per_second": tokens_per_second,
+        },
+    }
+
+    configure_fake_backend(latency, stddev, distribution, tokens_per_second)
+    latency_result = await bench_latency(runs)
+    throughput = [
+        await bench_throughput(level, throughput_runs or runs) for level in concurrency_levels
+    ]
+
+    memory = None
+    if memory_runs > 0:
+        # メモリ計測はオーケストレーション側だけを見るため応答時間を0にする
+        configure_fake_backend(0.0, 0.0, "fixed", 0.0)
+        memory = await bench_memory(memory_runs)
+
+    return {
+        "benchmark": "workflow",
+        "timestamp": datetime.now().isoformat(),
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": config,
+        **latency_result,
+        "throughput": throughput,
+        "memory": memory,
+    }
+
+
+def compare_results(
+    current: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float = 0.2
+) -> List[str]:
+    """
+    以前の結果と比べて悪化した指標を列挙する
+
+    実行回数やフェイクLLMの設定が同じ結果同士を比較してください。
+
+    Args:
+        current: 今回の結果
+        baseline: 比較対象の結果
+        tolerance: 許容する増加率（0.2 は20%まで）
+
+    Returns:
+        悪化した指標の説明のリスト
+    """
+    regressions = []
+    for section, key in REGRESSION_METRICS:
+        before = (baseline.get(section) or {}).get(key)
+        after = (current.get(section) or {}).get(key)
+        if before is None or after is None or before <= 0:
+            continue
+        if after > before * (1 + tolerance):
+            regressions.append(f"{section}.{key}: {before:.6g} → {after:.6g} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def print_report(result: Dict[str, Any]) -> None:
+    """計測結果を表示"""
+    latency = result["latency"]
+    print(f"⏱️  レイテンシ（{latency['runs']}回、逐次）: "
+          f"p50={latency['p50_seconds'] * 1000:.1f}ms p95={latency['p95_seconds'] * 1000:.1f}ms "
+          f"p99={latency['p99_seconds'] * 1000:.1f}ms")
+    print(f"⚙️  オーバーヘッド（LLM呼び出し以外）: "
+          f"p50={latency['overhead_p50_seconds'] * 1000:.2f}ms p95={latency['overhead_p95_seconds'] * 1000:.2f}ms")
+    for phase, entry in result["phase_overhead"].items():
+        print(f"    {phase:<12} mean={entry['mean_seconds'] * 1000:.2f}ms p95={entry['p95_seconds'] * 1000:.2f}ms")
+    for entry in result["throughput"]:
+        print(f"🚀 同時実行数 {entry['concurrency']:>3}: {entry['qps']:.1f} qps "
+              f"(p50={entry['p50_seconds'] * 1000:.1f}ms p95={entry['p95_seconds'] * 1000:.1f}ms)")
+    if result["memory"]:
+        memory = result["memory"]
+        print(f"🧠 メモリ増加（{memory['runs']}回）: {memory['growth_bytes'] / 1024:.1f}KB "
+              f"({memory['growth_bytes_per_run']:.0f}バイト/回)")
+
+
+def main() -> int:
+    """メイン関数"""
+    parser = argparse.ArgumentParser(description="Multi-Agent Reasoning System - ワークフローのベンチマーク")
+    parser.add_argument("--runs", type=int, default=100, help="レイテンシ計測の実行回数（デフォルト: 100）")
+    parser.add_argument("--concurrency", type=str, default="1,4,16",
+                        help="スループットを計測する同時実行数（カンマ区切り、デフォルト: 1,4,16）")
+    parser.add_argument("--throughput-runs", type=int, help="同時実行数ごとの実行回数（デフォルト: --runs）")
+    parser.add_argument("--memory-runs", type=int, default=1000, help="メモリ計測の実行回数（0で省略、デフォルト: 1000）")
+    parser.add_argument("--latency", type=float, default=0.05, help="フェイクLLMの平均応答時間（秒、デフォルト: 0.05）")
+    parser.add_argument("--latency-stddev", type=float, default=0.0, help="フェイクLLMの応答時間の標準偏差（秒）")
+    parser.add_argument("--latency-distribution", type=str, default="fixed",
+                        help="フェイクLLMの応答時間の分布（fixed / uniform / normal / lognormal / exponential）")
+    parser.add_argument("--tokens-per-second", type=float, default=0.0, help="フェイクLLMの出力トークン生成速度")
+    parser.add_argument("--output", type=str, help="結果のJSONファイル（デフォルト: benchmarks/results/workflow_<日時>.json）")
+    parser.add_argument("--baseline", type=str, help="比較する以前の結果のJSONファイル")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="悪化とみなす増加率（デフォルト: 0.2）")
+    args = parser.parse_args()
+
+    # フェーズごとのログは計測の邪魔になるため抑制
+    logging.disable(logging.INFO)
+
+    result = asyncio.run(run_suite(
+        runs=args.runs,
+        concurrency_levels=[int(c) for c in args.concurrency.split(",") if c.strip()],
+        throughput_runs=args.throughput_runs,
+        memory_runs=args.memory_runs,
+        latency=args.latency,
+        stddev=args.latency_stddev,
+        distribution=args.latency_distribution,
+        tokens_per_second=args.tokens_per_second
+    ))
+    print_report(result)
+
+    output = Path(args.output) if args.output else (
+        Path(__file__).parent / "results" / f"workflow_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(result, f, ensure_ascii=False, indent=2)
+    print(f"\n💾 結果を保存しました: {output}")
+
+    if args.baseline:
+        with open(args.baseline, "r", encoding="utf-8") as f:
+            regressions = compare_results(result, json.load(f), args.tolerance)
+        if regressions:
+            print("\n❌ 以前の結果より悪化した指標があります:")
+            for line in regressions:
+                print(f"  - {line}")
+            return 1
+        print("\n✅ 以前の結果からの悪化はありません")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -6,6 +6,7 @@
 
 import os
 from pathlib import Path
+from typing import Tuple
 from dotenv import load_dotenv
 
 # プロジェクトルートの.envファイルを読み込み
@@ -27,11 +28,102 @@ class Settings:
     AZURE_OPENAI_DEPLOYMENT_GPT5: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_GPT5", "gpt-5")
     AZURE_OPENAI_DEPLOYMENT_GPT5_MINI: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_GPT5_MINI", "gpt-5-mini")
 
+    # LLMバックエンド（azure: Azure OpenAI / fake: オフライン計測用のフェイククライアント）
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "azure").lower()
+
+    # フェイククライアント設定（LLM_BACKEND=fake の場合に使用）
+    FAKE_LLM_LATENCY_DISTRIBUTION: str = os.getenv("FAKE_LLM_LATENCY_DISTRIBUTION", "fixed")  # fixed / uniform / normal / lognormal / exponential
+    FAKE_LLM_LATENCY_MEAN: float = float(os.getenv("FAKE_LLM_LATENCY_MEAN", "0.5"))  # 秒
+    FAKE_LLM_LATENCY_STDDEV: float = float(os.getenv("FAKE_LLM_LATENCY_STDDEV", "0"))  # 秒
+    FAKE_LLM_TOKENS_PER_SECOND: float = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0"))  # 0の場合は待機なし
+    FAKE_LLM_FAILURE_RATE: float = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0"))
+    FAKE_LLM_FAILURE_KINDS: str = os.getenv("FAKE_LLM_FAILURE_KINDS", "429")  # カンマ区切りで 429 / 500 / timeout
+    FAKE_LLM_RETRY_AFTER: float = float(os.getenv("FAKE_LLM_RETRY_AFTER", "0"))  # 秒（0の場合はヘッダーなし）
+    FAKE_LLM_TIMEOUT_AFTER: float = float(os.getenv("FAKE_LLM_TIMEOUT_AFTER", "30"))  # 秒
+    FAKE_LLM_RESPONSE_CHARS: int = int(os.getenv("FAKE_LLM_RESPONSE_CHARS", "400"))
+    FAKE_LLM_SCRIPT: str = os.getenv("FAKE_LLM_SCRIPT", "")  # 応答ルールのJSONファイル
+    FAKE_LLM_SEED: int | None = int(os.getenv("FAKE_LLM_SEED")) if os.getenv("FAKE_LLM_SEED") else None
+
     # Agent 設定
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
     TIMEOUT_SECONDS: int = int(os.getenv("TIMEOUT_SECONDS", "60"))
+    # ResearcherはWeb検索ツールを使い60秒を超えることがあるため、既定で長めにする
+    TIMEOUT_SECONDS_RESEARCHER: int = int(os.getenv("TIMEOUT_SECONDS_RESEARCHER", "300"))
     ENABLE_STREAMING: bool = os.getenv("ENABLE_STREAMING", "true").lower() == "true"
 
+    # リトライ・ヘッジ設定（MAX_RETRIES / TIMEOUT_SECONDS と合わせてエージェント呼び出しに適用）
+    RETRY_BASE_DELAY: float = float(os.getenv("RETRY_BASE_DELAY", "1.0"))  # 秒
+    RETRY_MAX_DELAY: float = float(os.getenv("RETRY_MAX_DELAY", "30"))  # 秒
+    HEDGE_ENABLED: bool = os.getenv("HEDGE_ENABLED", "false").lower() == "true"
+    HEDGE_PERCENTILE: float = float(os.getenv("HEDGE_PERCENTILE", "95"))
+    HEDGE_MIN_SAMPLES: int = int(os.getenv("HEDGE_MIN_SAMPLES", "5"))
+    HEDGE_AFTER_SECONDS: float = float(os.getenv("HEDGE_AFTER_SECONDS", "0"))  # 0の場合は記録が揃うまで送らない
+
+    # レート制限設定（デプロイメントごと・テナントごとの1分あたりのリクエスト数・トークン数、0の場合は無制限）
+    # デプロイメント別に RATE_LIMIT_RPM_<DEPLOYMENT>（例: RATE_LIMIT_RPM_GPT_5）で上書き可能
+    RATE_LIMIT_ENABLED: bool = os.getenv("RATE_LIMIT_ENABLED", "false").lower() == "true"
+    RATE_LIMIT_RPM: int = int(os.getenv("RATE_LIMIT_RPM", "0"))
+    RATE_LIMIT_TPM: int = int(os.getenv("RATE_LIMIT_TPM", "0"))
+    RATE_LIMIT_TENANT_RPM: int = int(os.getenv("RATE_LIMIT_TENANT_RPM", "0"))
+    RATE_LIMIT_TENANT_TPM: int = int(os.getenv("RATE_LIMIT_TENANT_TPM", "0"))
+    RATE_LIMIT_OUTPUT_TOKENS: int = int(os.getenv("RATE_LIMIT_OUTPUT_TOKENS", "1000"))  # TPMの予約に含める出力の見込み
+
+    # エージェント初期化時の事前準備（認証情報の取得とエンドポイントへの接続）
+    WARMUP_ENABLED: bool = os.getenv("WARMUP_ENABLED", "true").lower() == "true"
+    WARMUP_TIMEOUT_SECONDS: float = float(os.getenv("WARMUP_TIMEOUT_SECONDS", "5"))
+
+    # Researcher ファンアウト設定（調査項目ごとに並行調査）
+    RESEARCHER_FANOUT: bool = os.getenv("RESEARCHER_FANOUT", "false").lower() == "true"
+    RESEARCHER_MAX_CONCURRENCY: int = int(os.getenv("RESEARCHER_MAX_CONCURRENCY", "4"))
+    RESEARCHER_FANOUT_MIN_ITEMS: int = int(os.getenv("RESEARCHER_FANOUT_MIN_ITEMS", "2"))
+
+    # Researcher 先行実行設定（Coordinatorの計画と並行して元の質問から調査を開始）
+    SPECULATIVE_RESEARCH: bool = os.getenv("SPECULATIVE_RESEARCH", "false").lower() == "true"
+    SPECULATIVE_COVERAGE_THRESHOLD: float = float(os.getenv("SPECULATIVE_COVERAGE_THRESHOLD", "0.5"))
+
+    # 応答キャッシュ設定
+    RESPONSE_CACHE_ENABLED: bool = os.getenv("RESPONSE_CACHE_ENABLED", "false").lower() == "true"
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "256"))
+    RESPONSE_CACHE_TTL_SECONDS: int = int(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "3600"))
+    RESPONSE_CACHE_DB: str = os.getenv("RESPONSE_CACHE_DB", "")  # 空の場合はメモリのみ
+
+    # モデルルーティング設定（単純な質問のフェーズを GPT-5-mini で処理）
+    ROUTING_ENABLED: bool = os.getenv("ROUTING_ENABLED", "false").lower() == "true"
+    ROUTING_SHORT_QUERY_CHARS: int = int(os.getenv("ROUTING_SHORT_QUERY_CHARS", "80"))
+    ROUTING_SIMPLE_PLAN_ITEMS: int = int(os.getenv("ROUTING_SIMPLE_PLAN_ITEMS", "2"))
+    ROUTING_ESCALATE: bool = os.getenv("ROUTING_ESCALATE", "true").lower() == "true"
+    ROUTING_MIN_OUTPUT_CHARS: int = int(os.getenv("ROUTING_MIN_OUTPUT_CHARS", "200"))
+    ROUTING_RULES: str = os.getenv("ROUTING_RULES", "")  # JSON配列（空の場合は既定のルール）
+
+    # トリアージ設定（質問を simple / lookup / deep に分類し、短いフェーズグラフで処理）
+    TRIAGE_ENABLED: bool = os.getenv("TRIAGE_ENABLED", "false").lower() == "true"
+    TRIAGE_SIMPLE_MAX_CHARS: int = int(os.getenv("TRIAGE_SIMPLE_MAX_CHARS", "40"))
+    TRIAGE_LOOKUP_MAX_CHARS: int = int(os.getenv("TRIAGE_LOOKUP_MAX_CHARS", "80"))
+
+    # プロンプト圧縮設定（前段の出力を後段に渡す際に適用）
+    # カンマ区切りで sections, extractive, budget を指定（none で無効、既定は無効）
+    PROMPT_COMPACTION: str = os.getenv("PROMPT_COMPACTION", "none")
+    PROMPT_EXTRACTIVE_MAX_CHARS: int = int(os.getenv("PROMPT_EXTRACTIVE_MAX_CHARS", "1500"))
+    PROMPT_TOKEN_BUDGET: int = int(os.getenv("PROMPT_TOKEN_BUDGET", "0"))  # 0の場合は無制限
+
+    # チェックポイント設定（フェーズ失敗後の再開用）
+    CHECKPOINT_ENABLED: bool = os.getenv("CHECKPOINT_ENABLED", "true").lower() == "true"
+    CHECKPOINT_DIR: str = os.getenv("CHECKPOINT_DIR", ".checkpoints")
+
+    # 実行履歴の保持設定（直近N件・合計バイト数の上限、超過分はJSONLに書き出して破棄）
+    HISTORY_MAX_RUNS: int = int(os.getenv("HISTORY_MAX_RUNS", "20"))  # 0の場合は無制限
+    HISTORY_MAX_BYTES: int = int(os.getenv("HISTORY_MAX_BYTES", "8000000"))  # 0の場合は無制限
+    HISTORY_SPILL_PATH: str = os.getenv("HISTORY_SPILL_PATH", "")  # 空の場合は書き出さない
+    HISTORY_PREVIEW_CHARS: int = int(os.getenv("HISTORY_PREVIEW_CHARS", "200"))
+
+    # トレース出力設定（空の場合はファイルに出力しない）
+    TRACE_EXPORT_DIR: str = os.getenv("TRACE_EXPORT_DIR", "")
+    TRACE_EXPORT_FORMAT: str = os.getenv("TRACE_EXPORT_FORMAT", "jsonl")  # jsonl / otlp / both
+
+    # 常駐サービス設定（service.py）
+    SERVICE_MAX_CONCURRENCY: int = int(os.getenv("SERVICE_MAX_CONCURRENCY", "4"))
+    SERVICE_DRAIN_TIMEOUT: int = int(os.getenv("SERVICE_DRAIN_TIMEOUT", "300"))  # 秒
+
     # GPT-5 特有の設定
     GPT5_MAX_TOKENS: int = int(os.getenv("GPT5_MAX_TOKENS", "4096"))
     GPT5_TEMPERATURE: float = float(os.getenv("GPT5_TEMPERATURE", "0.7"))
@@ -44,6 +136,10 @@ class Settings:
         Raises:
             ValueError: 必須設定が不足している場合
         """
+        if cls.LLM_BACKEND == "fake":
+            # フェイククライアントはAzureに接続しない
+            return
+
         if not cls.AZURE_OPENAI_ENDPOINT:
             raise ValueError(
                 "AZURE_OPENAI_ENDPOINTが設定されていません。"
@@ -74,9 +170,97 @@ class Settings:
         else:
             raise ValueError(f"未対応のモデルタイプ: {model_type}")
 
+    @classmethod
+    def get_rate_limits(cls, deployment_name: str) -> Tuple[int, int]:
+        """
+        デプロイメントごとのレート制限を取得
+
+        RATE_LIMIT_RPM_<DEPLOYMENT> / RATE_LIMIT_TPM_<DEPLOYMENT>
+        （デプロイメント名の英数字以外は_、例: RATE_LIMIT_RPM_GPT_5_MINI）が
+        設定されていればその値、なければ RATE_LIMIT_RPM / RATE_LIMIT_TPM を返します。
+
+        Args:
+            deployment_name: デプロイメント名
+
+        Returns:
+            (rpm, tpm)（0の場合は無制限）
+        """
+        suffix = "".join(c if c.isalnum() else "_" for c in deployment_name).upper()
+        rpm = os.getenv(f"RATE_LIMIT_RPM_{suffix}")
+        tpm = os.getenv(f"RATE_LIMIT_TPM_{suffix}")
+        return (
+            int(rpm) if rpm else cls.RATE_LIMIT_RPM,
+            int(tpm) if tpm else cls.RATE_LIMIT_TPM,
+        )
+
+    @classmethod
+    def get_cache_ttl(cls, phase: str) -> int:
+        """
+        フェーズごとの応答キャッシュ有効期間を取得
+
+        RESPONSE_CACHE_TTL_<PHASE>（例: RESPONSE_CACHE_TTL_RESEARCHER）が
+        設定されていればそれを優先します。
+
+        Args:
+            phase: フェーズ名（coordinator, researcher, analyzer, summarizer）
+
+        Returns:
+            有効期間（秒、0以下はキャッシュしない）
+        """
+        value = os.getenv(f"RESPONSE_CACHE_TTL_{phase.upper()}")
+        return int(value) if value else cls.RESPONSE_CACHE_TTL_SECONDS
+
+    @classmethod
+    def get_phase_timeout(cls, phase: str) -> int:
+        """
+        フェーズごとのエージェント呼び出しタイムアウトを取得
+
+        TIMEOUT_SECONDS_<PHASE>（例: TIMEOUT_SECONDS_ANALYZER）が
+        設定されていればそれを優先します。Researcher は TIMEOUT_SECONDS_RESEARCHER（既定300秒）を使います。
+
+        Args:
+            phase: フェーズ名（coordinator, researcher, analyzer, summarizer）
+
+        Returns:
+            1回の呼び出しのタイムアウト（秒、0以下は無制限）
+        """
+        value = os.getenv(f"TIMEOUT_SECONDS_{phase.upper()}")
+        if value:
+            return int(value)
+        return getattr(cls, f"TIMEOUT_SECONDS_{phase.upper()}", cls.TIMEOUT_SECONDS)
+
+    @classmethod
+    def get_compaction_strategies(cls) -> list:
+        """
+        有効なプロンプト圧縮戦略を取得
+
+        Returns:
+            戦略名のリスト（無効の場合は空）
+        """
+        value = cls.PROMPT_COMPACTION.strip().lower()
+        if value in ("", "none", "off", "false"):
+            return []
+        return [s.strip() for s in value.split(",") if s.strip()]
+
+    @classmethod
+    def get_prompt_budget(cls, phase: str) -> int:
+        """
+        フェーズごとのプロンプト圧縮のトークン上限を取得
+
+        PROMPT_TOKEN_BUDGET_<PHASE>（例: PROMPT_TOKEN_BUDGET_SUMMARIZER）が
+        設定されていればそれを優先します。
+
+        Args:
+            phase: フェーズ名（analyzer, summarizer）
+
+        Returns:
+            トークン上限（0以下は無制限）
+        """
+        value = os.getenv(f"PROMPT_TOKEN_BUDGET_{phase.upper()}")
+        return int(value) if value else cls.PROMPT_TOKEN_BUDGET
+
 
 # 設定インスタンス
 settings = Settings()
 
-# 起動時に設定を検証
-settings.validate()
+# 起動時の自動検証は行わない（--help などを軽くするため、main.py の check_environment と service.py の起動時に settings.validate() で検証）
@@ -6,19 +6,43 @@ Multi-Agent Reasoning System - メインエントリーポイント
 
 import asyncio
 import argparse
+import importlib
+import json
 import sys
-import os
 from pathlib import Path
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 # プロジェクトルートをパスに追加
 project_root = Path(__file__).parent
 sys.path.insert(0, str(project_root))
 
-from workflow import run_multi_agent_workflow
 from config.settings import settings
 
+# 初回利用時に読み込む属性（モジュール名）
+# agent_framework・Azure SDK・ツール群の読み込みを --help やバナー表示では行わないため
+_LAZY_ATTRIBUTES = {
+    "run_multi_agent_workflow": "workflow",
+    "MultiAgentWorkflow": "workflow",
+    "WorkflowService": "service",
+    "close_clients": "agents",
+}
+
+
+def __getattr__(name: str) -> Any:
+    """遅延読み込みする属性をモジュール属性として取得（PEP 562）"""
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
+
+
+def _load(name: str) -> Any:
+    """遅延読み込みする属性を取得（読み込み済み・差し替え済みの値を優先）"""
+    return globals()[name] if name in globals() else __getattr__(name)
+
 
 def print_banner():
     """バナーを表示"""
@@ -52,6 +76,25 @@ def print_agent_output(agent_name: str, output: str, verbose: bool = False):
     print()
 
 
+def print_profile(profile: Dict[str, Dict[str, Any]]):
+    """
+    フェーズごとの内訳を表形式で表示
+
+    Args:
+        profile: フェーズ名をキーとする集計値（workflow結果の profile）
+    """
+    print_section_header("📊 フェーズごとの内訳", "-")
+    print(f"{'フェーズ':<12}{'回数':>6}{'秒':>9}{'入力文字':>10}{'出力文字':>10}"
+          f"{'入力tok':>9}{'出力tok':>9}{'再試行':>7}{'キャッシュ':>8}{'ツール':>7}")
+    for phase, entry in profile.items():
+        print(
+            f"{phase:<12}{entry['calls']:>6}{entry['seconds']:>9.2f}"
+            f"{entry['prompt_chars']:>10}{entry['completion_chars']:>10}"
+            f"{entry['input_tokens']:>9}{entry['output_tokens']:>9}"
+            f"{entry['retries']:>7}{entry['cache_hits']:>8}{entry['tool_calls']:>7}"
+        )
+
+
 def save_results_to_file(result: dict, output_dir: Path):
     """
     実行結果をファイルに保存
@@ -98,6 +141,142 @@ def save_results_to_file(result: dict, output_dir: Path):
     print(f"\n💾 結果をファイルに保存しました: {output_file}")
 
 
+def load_batch_queries(batch_file: Path) -> List[Tuple[str, str]]:
+    """
+    バッチファイルからクエリを読み込む
+
+    1行1件で、テキスト行（質問そのもの）またはJSON行（{"id": ..., "query": ...}）を
+    受け付けます。idを省略した場合は行番号をidとします。
+
+    Args:
+        batch_file: バッチファイルのパス（.txt または .jsonl）
+
+    Returns:
+        (id, 質問) のリスト
+    """
+    queries = []
+    with open(batch_file, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            line = line.strip()
+            if not line:
+                continue
+            if line.startswith("{"):
+                item = json.loads(line)
+                queries.append((str(item.get("id", line_no)), item["query"]))
+            else:
+                queries.append((str(line_no), line))
+    return queries
+
+
+def load_completed_ids(output_file: Path) -> Set[str]:
+    """
+    既存の結果ファイルから完了済みのidを読み込む（中断したバッチの再開用）
+
+    Args:
+        output_file: バッチ結果のJSONLファイル
+
+    Returns:
+        正常に完了したクエリのid集合
+    """
+    completed: Set[str] = set()
+    if not output_file.exists():
+        return completed
+
+    with open(output_file, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError:
+                # 中断時に書きかけになった行は無視
+                continue
+            if record.get("status") == "ok":
+                completed.add(str(record["id"]))
+    return completed
+
+
+async def run_batch(
+    batch_file: Path,
+    output_file: Path,
+    concurrency: int,
+    workflow_kwargs: Dict[str, Any]
+) -> Dict[str, int]:
+    """
+    バッチモードで複数のクエリを処理
+
+    共有ワークフローで同時実行数の上限付きで処理し、完了したものから
+    1行1件のJSONLで結果ファイルに追記します。完了済みのidはスキップします。
+
+    Args:
+        batch_file: バッチファイルのパス
+        output_file: 結果を追記するJSONLファイル
+        concurrency: 同時実行数
+        workflow_kwargs: MultiAgentWorkflowに渡す引数
+
+    Returns:
+        件数の集計（total, skipped, ok, error）
+    """
+    queries = load_batch_queries(batch_file)
+    completed = load_completed_ids(output_file)
+    pending = [(qid, q) for qid, q in queries if qid not in completed]
+    counts = {"total": len(queries), "skipped": len(queries) - len(pending), "ok": 0, "error": 0}
+
+    print(f"📦 バッチ: {len(queries)}件（完了済み{counts['skipped']}件をスキップ、同時実行数: {concurrency}）")
+    print(f"💾 結果の出力先: {output_file}\n")
+
+    output_file.parent.mkdir(parents=True, exist_ok=True)
+    service = _load("WorkflowService")(_load("MultiAgentWorkflow")(**workflow_kwargs), max_concurrency=concurrency)
+
+    with open(output_file, "a", encoding="utf-8") as out:
+        async def process(query_id: str, query: str):
+            record: Dict[str, Any] = {"id": query_id, "query": query}
+            try:
+                result = await service.submit(query)
+                record.update({
+                    "status": "ok",
+                    "final_answer": result["final_answer"],
+                    "execution_time": result["execution_time"],
+                    "usage": result.get("usage"),
+                })
+                counts["ok"] += 1
+                print(f"✅ [{query_id}] {result['execution_time']:.2f}秒")
+            except Exception as e:
+                record.update({"status": "error", "error": str(e)})
+                counts["error"] += 1
+                print(f"❌ [{query_id}] {e}")
+
+            # 完了したものから1行ずつ書き出す
+            out.write(json.dumps(record, ensure_ascii=False) + "\n")
+            out.flush()
+
+        if pending:
+            await service.start()
+            await asyncio.gather(*(process(qid, q) for qid, q in pending))
+        await service.drain()
+
+    print(f"\n📊 バッチ完了: 成功 {counts['ok']}件 / エラー {counts['error']}件 / スキップ {counts['skipped']}件")
+    return counts
+
+
+def check_environment() -> bool:
+    """
+    必須の設定を確認（settings.validate()）
+
+    Returns:
+        全て設定されている場合True
+    """
+    if settings.LLM_BACKEND == "fake":
+        print("🧪 フェイクLLMバックエンドで実行します（Azureには接続しません）")
+        return True
+
+    try:
+        settings.validate()
+    except ValueError as e:
+        print(f"❌ エラー: {e}")
+        return False
+
+    return True
+
+
 async def main():
     """メイン関数"""
     # コマンドライン引数のパース
@@ -114,6 +293,18 @@ async def main():
 
   # 結果をファイルに保存
   python main.py "量子コンピューターについて教えてください" --save-output
+
+  # 最終回答を生成されたそばから表示
+  python main.py "量子コンピューターについて教えてください" --stream
+
+  # 失敗した実行を完了済みのフェーズの続きから再開
+  python main.py --resume 20250101_120000_ab12cd34
+
+  # フェーズごとの所要時間・トークン数の内訳を表示
+  python main.py "量子コンピューターについて教えてください" --profile
+
+  # ファイルの質問をまとめて処理（4件ずつ並行、中断しても再実行で続きから）
+  python main.py --batch questions.txt --concurrency 4
         """
     )
 
@@ -143,6 +334,52 @@ async def main():
         help="出力ディレクトリ（デフォルト: output/）"
     )
 
+    parser.add_argument(
+        "--stream",
+        action="store_true",
+        help="Summarizerの最終回答をストリーミング表示（ENABLE_STREAMING=falseの場合は完了後に表示）"
+    )
+
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="応答キャッシュを使わずに全フェーズを実行"
+    )
+
+    parser.add_argument(
+        "--resume",
+        type=str,
+        metavar="RUN_ID",
+        help="失敗した実行をチェックポイントから再開（完了済みのフェーズは再実行しない）"
+    )
+
+    parser.add_argument(
+        "--batch",
+        type=str,
+        metavar="FILE",
+        help="質問ファイル（1行1件のテキストまたはJSONL）をまとめて処理"
+    )
+
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=settings.SERVICE_MAX_CONCURRENCY,
+        help=f"バッチの同時実行数（デフォルト: {settings.SERVICE_MAX_CONCURRENCY}）"
+    )
+
+    parser.add_argument(
+        "--batch-output",
+        type=str,
+        metavar="FILE",
+        help="バッチ結果のJSONLファイル（デフォルト: <output-dir>/<FILE名>_results.jsonl）"
+    )
+
+    parser.add_argument(
+        "--profile",
+        action="store_true",
+        help="フェーズごとの所要時間・文字数・トークン数・再試行・キャッシュヒット・ツール呼び出しを表示"
+    )
+
     parser.add_argument(
         "--no-banner",
         action="store_true",
@@ -155,9 +392,25 @@ async def main():
     if not args.no_banner:
         print_banner()
 
-    # 質問の取得
-    query = args.query
-    if not query:
+    # バッチモード
+    if args.batch:
+        if not check_environment():
+            return
+
+        batch_file = Path(args.batch)
+        output_file = Path(args.batch_output) if args.batch_output else (
+            Path(args.output_dir) / f"{batch_file.stem}_results.jsonl"
+        )
+        workflow_kwargs = {"use_cache": False} if args.no_cache else {}
+        try:
+            await run_batch(batch_file, output_file, args.concurrency, workflow_kwargs)
+        finally:
+            await _load("close_clients")()
+        return
+
+    # 質問の取得（再開時はチェックポイントの質問を使用）
+    query = args.query or ""
+    if not query and not args.resume:
         # インタラクティブモード
         print("質問を入力してください（終了するにはCtrl+Cを押してください）:")
         try:
@@ -166,30 +419,44 @@ async def main():
             print("\n\n👋 終了します")
             return
 
-    if not query:
+    if not query and not args.resume:
         print("❌ 質問が空です")
         return
 
     # 環境変数チェック
-    required_env_vars = ["AZURE_OPENAI_ENDPOINT"]
-    missing_vars = [var for var in required_env_vars if not os.getenv(var)]
-
-    if missing_vars:
-        print(f"❌ エラー: 以下の環境変数が設定されていません:")
-        for var in missing_vars:
-            print(f"  - {var}")
-        print("\n.envファイルを確認してください")
+    if not check_environment():
         return
 
     # 質問表示
-    print_section_header("📝 質問")
-    print(query)
+    if query:
+        print_section_header("📝 質問")
+        print(query)
 
     try:
         # ワークフロー実行
         print("\n🚀 マルチエージェントワークフローを開始します...\n")
 
-        result = await run_multi_agent_workflow(query)
+        workflow_kwargs = {}
+        if args.no_cache:
+            workflow_kwargs["use_cache"] = False
+        if args.resume:
+            workflow_kwargs["resume"] = args.resume
+
+        streamed = {"started": False}
+
+        if args.stream:
+            def on_delta(phase: str, delta: str):
+                """Summarizerの差分を到着順に表示"""
+                if phase != "summarizer":
+                    return
+                if not streamed["started"]:
+                    print_section_header("✨ 最終回答")
+                    streamed["started"] = True
+                print(delta, end="", flush=True)
+
+            workflow_kwargs["on_delta"] = on_delta
+
+        result = await _load("run_multi_agent_workflow")(query, **workflow_kwargs)
 
         # 各エージェントの出力表示（verbose モード）
         if args.verbose:
@@ -202,12 +469,21 @@ async def main():
             print_agent_output("Analyzer", result['agent_outputs']['analyzer'], True)
             print_agent_output("Summarizer", result['agent_outputs']['summarizer'], True)
 
-        # 最終回答表示
-        print_section_header("✨ 最終回答")
-        print(result['final_answer'])
+        # 最終回答表示（ストリーミング表示済みの場合は改行のみ）
+        if streamed["started"]:
+            print()
+        else:
+            print_section_header("✨ 最終回答")
+            print(result['final_answer'])
 
         # 実行時間表示
         print(f"\n⏱️  実行時間: {result['execution_time']:.2f}秒")
+        if result.get("path") in ("simple", "lookup"):
+            print(f"🧭 実行パス: {result['path']}（{result['triage']['reason']}）")
+
+        # フェーズごとの内訳表示
+        if args.profile and result.get("profile"):
+            print_profile(result["profile"])
 
         # ファイル保存
         if args.save_output:
@@ -228,6 +504,11 @@ async def main():
             traceback.print_exc()
         sys.exit(1)
 
+    finally:
+        # 共有クライアント（HTTP接続・認証情報）を閉じる（未読み込みなら接続もない）
+        if "agents" in sys.modules:
+            await _load("close_clients")()
+
 
 if __name__ == "__main__":
     # 非同期実行
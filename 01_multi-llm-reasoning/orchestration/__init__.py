@@ -0,0 +1,164 @@
+"""
+Orchestration package exports
+
+ワークフローの実行制御（フェーズグラフ、エグゼキューター、計画解析、応答キャッシュ、プロンプト圧縮、チェックポイント、実行履歴、リトライ、レート制限、モデルルーティング、質問のトリアージ、Researcherの先行実行、トレーシング）をエクスポートします。
+"""
+
+# フェーズグラフ
+from orchestration.graph import (
+    PhaseNode,
+    FanOutNode,
+    NodeTiming,
+    PhaseGraph,
+    GraphExecutor
+)
+
+# 調査計画の解析
+from orchestration.plan import (
+    split_sections,
+    extract_section,
+    parse_research_items
+)
+
+# 応答キャッシュ
+from orchestration.cache import (
+    make_cache_key,
+    ResponseCache
+)
+
+# プロンプト圧縮
+from orchestration.compaction import (
+    estimate_tokens,
+    select_sections,
+    truncate_to_budget,
+    CompactionStats,
+    PromptCompactor
+)
+
+# チェックポイント
+from orchestration.checkpoint import CheckpointStore
+
+# 実行履歴
+from orchestration.history import (
+    RunHistory,
+    HistoryStore
+)
+
+# リトライ・タイムアウト・ヘッジ
+from orchestration.retry import (
+    is_retryable,
+    get_retry_after,
+    LatencyTracker,
+    RetryPolicy
+)
+
+# レート制限
+from orchestration.rate_limit import (
+    TokenBucket,
+    RateLimitTicket,
+    RateLimiter
+)
+
+# モデルルーティング
+from orchestration.routing import (
+    QueryFeatures,
+    extract_features,
+    RoutingRule,
+    default_rules,
+    check_quality,
+    RoutingDecision,
+    ModelRouter
+)
+
+# 質問のトリアージ
+from orchestration.triage import (
+    TriageDecision,
+    classify_query,
+    QueryTriage
+)
+
+# Researcherの先行実行
+from orchestration.speculation import (
+    extract_terms,
+    item_coverage,
+    Reconciliation,
+    reconcile_findings,
+    SpeculationReport,
+    estimate_saving
+)
+
+# トレーシング
+from orchestration.tracing import (
+    Span,
+    Tracer,
+    span,
+    current_span,
+    traced_tool,
+    summarize_spans,
+    JsonlSpanExporter,
+    OtlpJsonFileExporter
+)
+
+__all__ = [
+    # Graph
+    "PhaseNode",
+    "FanOutNode",
+    "NodeTiming",
+    "PhaseGraph",
+    "GraphExecutor",
+    # Plan
+    "split_sections",
+    "extract_section",
+    "parse_research_items",
+    # Cache
+    "make_cache_key",
+    "ResponseCache",
+    # Compaction
+    "estimate_tokens",
+    "select_sections",
+    "truncate_to_budget",
+    "CompactionStats",
+    "PromptCompactor",
+    # Checkpoint
+    "CheckpointStore",
+    # History
+    "RunHistory",
+    "HistoryStore",
+    # Retry
+    "is_retryable",
+    "get_retry_after",
+    "LatencyTracker",
+    "RetryPolicy",
+    # Rate limit
+    "TokenBucket",
+    "RateLimitTicket",
+    "RateLimiter",
+    # Routing
+    "QueryFeatures",
+    "extract_features",
+    "RoutingRule",
+    "default_rules",
+    "check_quality",
+    "RoutingDecision",
+    "ModelRouter",
+    # Triage
+    "TriageDecision",
+    "classify_query",
+    "QueryTriage",
+    # Speculation
+    "extract_terms",
+    "item_coverage",
+    "Reconciliation",
+    "reconcile_findings",
+    "SpeculationReport",
+    "estimate_saving",
+    # Tracing
+    "Span",
+    "Tracer",
+    "span",
+    "current_span",
+    "traced_tool",
+    "summarize_spans",
+    "JsonlSpanExporter",
+    "OtlpJsonFileExporter",
+]
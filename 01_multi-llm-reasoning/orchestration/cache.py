@@ -0,0 +1,179 @@
+"""
+エージェント応答のコンテンツアドレス型キャッシュ
+
+エージェント名・デプロイメント名・システムプロンプト・入力プロンプトの
+ハッシュをキーに応答テキストを保存します。メモリ上のLRUと、
+任意でSQLiteによるディスク層の2段構成です。
+"""
+
+import hashlib
+import json
+import logging
+import sqlite3
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+
+def make_cache_key(agent_name: str, deployment_name: str, instructions: str, prompt: str) -> str:
+    """
+    キャッシュキーを生成する
+
+    Args:
+        agent_name: エージェント名
+        deployment_name: デプロイメント名
+        instructions: エージェントのシステムプロンプト
+        prompt: 入力プロンプト
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    payload = json.dumps(
+        [agent_name, deployment_name, instructions, prompt],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """
+    TTL付き2層キャッシュ（メモリLRU + 任意のSQLite）
+
+    TTLはフェーズごとに指定でき、0以下のフェーズはキャッシュしません。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 3600,
+        phase_ttls: Optional[Dict[str, float]] = None,
+        db_path: Optional[Union[str, Path]] = None,
+        clock: Callable[[], float] = time.time
+    ):
+        """
+        キャッシュ初期化
+
+        Args:
+            max_entries: メモリ層に保持する最大件数（超過分はLRUで破棄）
+            default_ttl: 既定の有効期間（秒）
+            phase_ttls: フェーズ名ごとの有効期間（秒）
+            db_path: SQLiteファイルのパス（省略時はメモリ層のみ）
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.phase_ttls = phase_ttls or {}
+        self.clock = clock
+        self._memory: "OrderedDict[str, Tuple[str, float]]" = OrderedDict()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stores": 0, "evictions": 0}
+
+        self._db: Optional[sqlite3.Connection] = None
+        if db_path:
+            Path(db_path).parent.mkdir(parents=True, exist_ok=True)
+            self._db = sqlite3.connect(str(db_path), check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS responses ("
+                "key TEXT PRIMARY KEY, phase TEXT, value TEXT, expires_at REAL)"
+            )
+            self._db.commit()
+
+    def ttl_for(self, phase: str) -> float:
+        """フェーズの有効期間（秒）を取得"""
+        return self.phase_ttls.get(phase, self.default_ttl)
+
+    def get(self, key: str, phase: str = "") -> Optional[str]:
+        """
+        キャッシュから応答を取得
+
+        Args:
+            key: キャッシュキー
+            phase: フェーズ名（統計用）
+
+        Returns:
+            キャッシュされた応答（未登録・期限切れの場合はNone）
+        """
+        now = self.clock()
+
+        entry = self._memory.get(key)
+        if entry is not None:
+            value, expires_at = entry
+            if expires_at > now:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return value
+            del self._memory[key]
+
+        if self._db is not None:
+            row = self._db.execute(
+                "SELECT value, expires_at FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is not None:
+                value, expires_at = row
+                if expires_at > now:
+                    self._put_memory(key, value, expires_at)
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                    return value
+                self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._db.commit()
+
+        self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, value: str, phase: str = "") -> None:
+        """
+        応答をキャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            value: 応答テキスト
+            phase: フェーズ名（TTLの決定に使用）
+        """
+        ttl = self.ttl_for(phase)
+        if ttl <= 0:
+            return
+
+        expires_at = self.clock() + ttl
+        self._put_memory(key, value, expires_at)
+        self._stats["stores"] += 1
+
+        if self._db is not None:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (key, phase, value, expires_at) VALUES (?, ?, ?, ?)",
+                (key, phase, value, expires_at)
+            )
+            self._db.commit()
+
+    def _put_memory(self, key: str, value: str, expires_at: float) -> None:
+        """メモリ層に保存し、上限を超えた古いエントリを破棄"""
+        self._memory[key] = (value, expires_at)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        ヒット・ミスの統計を取得
+
+        Returns:
+            統計値の辞書（hits, misses, memory_hits, disk_hits, stores, evictions, size）
+        """
+        return {**self._stats, "size": len(self._memory)}
+
+    def clear(self) -> None:
+        """全エントリを削除"""
+        self._memory.clear()
+        if self._db is not None:
+            self._db.execute("DELETE FROM responses")
+            self._db.commit()
+
+    def close(self) -> None:
+        """ディスク層の接続を閉じる"""
+        if self._db is not None:
+            self._db.close()
+            self._db = None
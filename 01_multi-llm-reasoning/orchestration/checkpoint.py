@@ -0,0 +1,145 @@
+"""
+ワークフロー実行のチェックポイント
+
+各フェーズの出力を完了した時点で実行IDごとのJSONファイルに保存し、
+途中のフェーズで失敗した実行を最初の未完了フェーズから再開できるようにします。
+最後まで完了した実行のチェックポイントはワークフローが削除するため、残るのは失敗した実行だけです。
+"""
+
+import json
+import logging
+import os
+import threading
+import uuid
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+class CheckpointStore:
+    """
+    実行IDごとのJSONファイルによるチェックポイントストア
+
+    ファイルの内容:
+        run_id, query, status（running / completed / failed）, error,
+        outputs（フェーズ名 → 出力）, created_at, updated_at
+    """
+
+    def __init__(self, directory: Union[str, Path]):
+        """
+        ストア初期化
+
+        Args:
+            directory: チェックポイントファイルの保存先ディレクトリ
+        """
+        self.directory = Path(directory)
+        # 実行中のチェックポイント（保存のたびにファイルを読み直さない）
+        self._checkpoints: Dict[str, Dict[str, Any]] = {}
+        # 並行ノードの保存を別スレッドから呼んでも書き込みが重ならないようにする
+        self._lock = threading.Lock()
+
+    def _path(self, run_id: str) -> Path:
+        """実行IDに対応するファイルパス"""
+        return self.directory / f"{run_id}.json"
+
+    def _write(self, checkpoint: Dict[str, Any]) -> None:
+        """チェックポイントを書き込む（書きかけのファイルが残らないよう置き換えで保存）"""
+        self.directory.mkdir(parents=True, exist_ok=True)
+        checkpoint["updated_at"] = datetime.now().isoformat()
+        path = self._path(checkpoint["run_id"])
+        tmp_path = path.with_suffix(".json.tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+    def create(self, query: str, run_id: Optional[str] = None) -> str:
+        """
+        新しい実行のチェックポイントを作成
+
+        Args:
+            query: ユーザーからの質問
+            run_id: 実行ID（省略時は自動生成）
+
+        Returns:
+            実行ID
+        """
+        run_id = run_id or datetime.now().strftime("%Y%m%d_%H%M%S_") + uuid.uuid4().hex[:8]
+        checkpoint = {
+            "run_id": run_id,
+            "query": query,
+            "status": "running",
+            "error": None,
+            "outputs": {},
+            "created_at": datetime.now().isoformat(),
+        }
+        with self._lock:
+            self._checkpoints[run_id] = checkpoint
+            self._write(checkpoint)
+        return run_id
+
+    def exists(self, run_id: str) -> bool:
+        """チェックポイントが存在するか"""
+        return self._path(run_id).exists()
+
+    def load(self, run_id: str) -> Dict[str, Any]:
+        """
+        チェックポイントを読み込む
+
+        Args:
+            run_id: 実行ID
+
+        Returns:
+            チェックポイントの辞書
+
+        Raises:
+            KeyError: チェックポイントが存在しない場合
+        """
+        path = self._path(run_id)
+        if not path.exists():
+            raise KeyError(f"チェックポイントが見つかりません: {run_id}")
+        with open(path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def save_output(self, run_id: str, phase: str, output: Any) -> None:
+        """
+        フェーズの出力を保存
+
+        Args:
+            run_id: 実行ID
+            phase: フェーズ名
+            output: フェーズの出力
+        """
+        with self._lock:
+            checkpoint = self._checkpoints.get(run_id) or self.load(run_id)
+            self._checkpoints[run_id] = checkpoint
+            checkpoint["outputs"][phase] = output
+            self._write(checkpoint)
+        logger.debug(f"💾 チェックポイント保存: {run_id} / {phase}")
+
+    def mark(self, run_id: str, status: str, error: Optional[str] = None) -> None:
+        """
+        実行の状態を更新
+
+        Args:
+            run_id: 実行ID
+            status: 状態（running / completed / failed）
+            error: 失敗時のエラーメッセージ
+        """
+        with self._lock:
+            checkpoint = self._checkpoints.get(run_id) or self.load(run_id)
+            checkpoint["status"] = status
+            checkpoint["error"] = error
+            self._write(checkpoint)
+            # 実行中でなくなったものは保持しない（再開時は読み直す）
+            if status == "running":
+                self._checkpoints[run_id] = checkpoint
+            else:
+                self._checkpoints.pop(run_id, None)
+
+    def delete(self, run_id: str) -> None:
+        """チェックポイントを削除"""
+        with self._lock:
+            self._checkpoints.pop(run_id, None)
+            self._path(run_id).unlink(missing_ok=True)
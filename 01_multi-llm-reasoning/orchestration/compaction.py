@@ -0,0 +1,203 @@
+"""
+フェーズ間のプロンプト圧縮
+
+後段のエージェントに前段の出力を全文で渡すとフェーズ数に応じてプロンプトが
+膨らむため、各フェーズが必要とする部分だけを残して渡します。
+
+戦略（適用順）:
+  - sections: 後段が必要とする【...】セクションだけを選択
+  - extractive: 長い出力を文単位で抜粋（summarize_search_results）
+  - budget: フェーズごとのトークン上限で切り詰め
+"""
+
+import logging
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from orchestration.plan import split_sections
+from tools.web_tools import summarize_search_results
+
+logger = logging.getLogger(__name__)
+
+# 利用可能な戦略（適用順）
+COMPACTION_STRATEGIES = ("sections", "extractive", "budget")
+
+# 各フェーズが前段の出力から必要とするセクション {フェーズ: {出力元: [見出し]}}
+# 出力元がない・見出しが見つからない場合は全文を渡す
+PHASE_SECTIONS: Dict[str, Dict[str, List[str]]] = {
+    "analyzer": {
+        "coordinator": ["質問の理解", "分析の方向性", "次のステップへの指示"],
+        "researcher": ["収集した情報", "追加の発見"],
+    },
+    "summarizer": {
+        "coordinator": ["質問の理解"],
+        "researcher": ["収集した情報"],
+        "analyzer": ["主要な発見", "パターンと傾向", "リスクと機会", "推論と洞察"],
+    },
+}
+
+# 切り詰めた場合の末尾の表記
+TRUNCATION_MARKER = "\n…（以下省略）"
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    トークン数を概算する
+
+    ASCII文字は約4文字で1トークン、それ以外（日本語など）は1文字1トークンとして数えます。
+
+    Args:
+        text: 対象テキスト
+
+    Returns:
+        概算トークン数
+    """
+    ascii_chars = sum(1 for ch in text if ord(ch) < 128)
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def select_sections(text: str, headers: Sequence[str]) -> str:
+    """
+    指定した【見出し】のセクションだけを残す
+
+    Args:
+        text: 【...】形式の見出しを含むテキスト
+        headers: 残す見出し名
+
+    Returns:
+        選択したセクションを連結したテキスト（該当なしの場合は元のテキスト）
+    """
+    sections = split_sections(text)
+    selected = [f"【{header}】\n{sections[header]}" for header in headers if header in sections]
+    if not selected:
+        return text
+    return "\n\n".join(selected)
+
+
+def truncate_to_budget(text: str, max_tokens: int) -> str:
+    """
+    概算トークン数が上限に収まるよう末尾を切り詰める
+
+    Args:
+        text: 対象テキスト
+        max_tokens: トークン上限（0以下は無制限）
+
+    Returns:
+        切り詰めたテキスト
+    """
+    if max_tokens <= 0 or estimate_tokens(text) <= max_tokens:
+        return text
+
+    # 二分探索で上限に収まる最長の先頭部分を求める
+    budget = max_tokens - estimate_tokens(TRUNCATION_MARKER)
+    low, high = 0, len(text)
+    while low < high:
+        mid = (low + high + 1) // 2
+        if estimate_tokens(text[:mid]) <= budget:
+            low = mid
+        else:
+            high = mid - 1
+    return text[:low].rstrip() + TRUNCATION_MARKER
+
+
+@dataclass
+class CompactionStats:
+    """1フェーズ分の圧縮結果（バイト数はUTF-8）"""
+
+    original_bytes: int = 0
+    compacted_bytes: int = 0
+    sources: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+    def add(self, source: str, original: str, compacted: str) -> None:
+        """出力元1件分のバイト数を加算"""
+        before = len(original.encode("utf-8"))
+        after = len(compacted.encode("utf-8"))
+        self.original_bytes += before
+        self.compacted_bytes += after
+        self.sources[source] = {"original_bytes": before, "compacted_bytes": after}
+
+    def to_dict(self) -> Dict[str, object]:
+        """辞書形式に変換"""
+        return {
+            "original_bytes": self.original_bytes,
+            "compacted_bytes": self.compacted_bytes,
+            "saved_bytes": self.original_bytes - self.compacted_bytes,
+            "sources": dict(self.sources),
+        }
+
+
+class PromptCompactor:
+    """
+    前段の出力を後段のフェーズ向けに圧縮する
+
+    戦略は sections → extractive → budget の順に適用します。
+    budget のトークン上限はフェーズ単位で、出力元ごとに均等に割り当てます。
+    """
+
+    def __init__(
+        self,
+        strategies: Sequence[str] = ("sections",),
+        extractive_max_chars: int = 1500,
+        phase_budgets: Optional[Dict[str, int]] = None,
+        phase_sections: Optional[Dict[str, Dict[str, List[str]]]] = None
+    ):
+        """
+        圧縮器初期化
+
+        Args:
+            strategies: 適用する戦略（"sections", "extractive", "budget"）
+            extractive_max_chars: extractive で残す出力元1件あたりの最大文字数
+            phase_budgets: フェーズ名ごとのトークン上限（0以下・未指定は無制限）
+            phase_sections: フェーズごとに残す見出し（省略時はPHASE_SECTIONS）
+
+        Raises:
+            ValueError: 未対応の戦略が指定された場合
+        """
+        unknown = [s for s in strategies if s not in COMPACTION_STRATEGIES]
+        if unknown:
+            raise ValueError(f"未対応の圧縮戦略: {', '.join(unknown)}")
+
+        self.strategies = [s for s in COMPACTION_STRATEGIES if s in strategies]
+        self.extractive_max_chars = extractive_max_chars
+        self.phase_budgets = phase_budgets or {}
+        self.phase_sections = PHASE_SECTIONS if phase_sections is None else phase_sections
+
+    @property
+    def enabled(self) -> bool:
+        """いずれかの戦略が有効か"""
+        return bool(self.strategies)
+
+    def compact(self, phase: str, outputs: Dict[str, str]) -> Tuple[Dict[str, str], CompactionStats]:
+        """
+        後段フェーズに渡す前段の出力を圧縮する
+
+        Args:
+            phase: 出力を受け取るフェーズ名
+            outputs: 出力元のフェーズ名をキー、出力を値とする辞書
+
+        Returns:
+            (圧縮後の出力の辞書, 圧縮結果)
+        """
+        stats = CompactionStats()
+        sections = self.phase_sections.get(phase, {})
+        budget = self.phase_budgets.get(phase, 0)
+        per_source_budget = budget // len(outputs) if budget > 0 and outputs else 0
+
+        compacted: Dict[str, str] = {}
+        for source, text in outputs.items():
+            result = text
+            if "sections" in self.strategies and source in sections:
+                result = select_sections(result, sections[source])
+            if "extractive" in self.strategies and len(result) > self.extractive_max_chars:
+                result = summarize_search_results(result, max_length=self.extractive_max_chars)
+            if "budget" in self.strategies:
+                result = truncate_to_budget(result, per_source_budget)
+
+            compacted[source] = result
+            stats.add(source, text, result)
+
+        if stats.original_bytes:
+            logger.debug(
+                f"🗜️  {phase}: {stats.original_bytes} → {stats.compacted_bytes} バイト"
+            )
+        return compacted, stats
@@ -0,0 +1,262 @@
+"""
+フェーズグラフとasyncioエグゼキューター
+
+ワークフローの各フェーズを名前付きノードと依存関係で宣言し、
+依存が解決したノードから並行に実行します。
+"""
+
+import asyncio
+import inspect
+import logging
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+from orchestration.tracing import span
+
+logger = logging.getLogger(__name__)
+
+# ノード関数の型: コンテキスト（クエリと完了済みノードの出力）を受け取り出力を返す
+NodeFunc = Callable[[Dict[str, Any]], Awaitable[Any]]
+
+
+@dataclass
+class PhaseNode:
+    """
+    単一フェーズのノード
+
+    Attributes:
+        name: ノード名（コンテキスト上の出力キーにもなる）
+        func: 実行する非同期関数
+        depends_on: 依存するノード名のリスト
+    """
+
+    name: str
+    func: NodeFunc
+    depends_on: List[str] = field(default_factory=list)
+
+    async def execute(self, context: Dict[str, Any]) -> Any:
+        """ノードを実行"""
+        return await self.func(context)
+
+
+@dataclass
+class FanOutNode:
+    """
+    ファンアウトノード
+
+    コンテキストから作業項目を分割し、各項目をworkerで並行処理した後、
+    mergeで1つの出力に統合します。
+
+    Attributes:
+        name: ノード名
+        split: コンテキストから作業項目のリストを作る関数
+        worker: 1項目を処理する非同期関数（項目, コンテキスト）
+        merge: 全項目の結果を統合する関数（結果リスト, コンテキスト）
+        depends_on: 依存するノード名のリスト
+        max_concurrency: 同時に処理する項目数の上限
+    """
+
+    name: str
+    split: Callable[[Dict[str, Any]], List[Any]]
+    worker: Callable[[Any, Dict[str, Any]], Awaitable[Any]]
+    merge: Callable[[List[Any], Dict[str, Any]], Any]
+    depends_on: List[str] = field(default_factory=list)
+    max_concurrency: int = 4
+
+    async def execute(self, context: Dict[str, Any]) -> Any:
+        """全項目を並行処理して統合結果を返す"""
+        items = self.split(context)
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrency))
+
+        async def run_item(item: Any) -> Any:
+            async with semaphore:
+                return await self.worker(item, context)
+
+        results = await asyncio.gather(*(run_item(item) for item in items))
+        return self.merge(list(results), context)
+
+
+Node = Union[PhaseNode, FanOutNode]
+
+
+@dataclass
+class NodeTiming:
+    """ノード1件分の実行記録"""
+
+    node: str
+    started_at: str
+    duration_seconds: float
+    status: str
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return {
+            "node": self.node,
+            "started_at": self.started_at,
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+        }
+
+
+class PhaseGraph:
+    """
+    フェーズの依存関係グラフ
+
+    ノードの追加と、未定義の依存・循環依存の検証を行います。
+    """
+
+    def __init__(self, nodes: Optional[List[Node]] = None):
+        """
+        グラフ初期化
+
+        Args:
+            nodes: 初期ノードのリスト
+        """
+        self.nodes: Dict[str, Node] = {}
+        for node in nodes or []:
+            self.add(node)
+
+    def add(self, node: Node) -> "PhaseGraph":
+        """
+        ノードを追加
+
+        Args:
+            node: 追加するノード
+
+        Returns:
+            自身（メソッドチェーン用）
+
+        Raises:
+            ValueError: 同名のノードが既に存在する場合
+        """
+        if node.name in self.nodes:
+            raise ValueError(f"ノード名が重複しています: {node.name}")
+        self.nodes[node.name] = node
+        return self
+
+    def validate(self) -> List[str]:
+        """
+        グラフを検証し、トポロジカル順のノード名を返す
+
+        Returns:
+            依存順に並べたノード名のリスト
+
+        Raises:
+            ValueError: 未定義の依存先や循環依存がある場合
+        """
+        for node in self.nodes.values():
+            for dep in node.depends_on:
+                if dep not in self.nodes:
+                    raise ValueError(f"ノード '{node.name}' の依存先 '{dep}' が未定義です")
+
+        order: List[str] = []
+        remaining = {name: set(node.depends_on) for name, node in self.nodes.items()}
+        while remaining:
+            ready = [name for name, deps in remaining.items() if not deps]
+            if not ready:
+                raise ValueError(f"循環依存を検出しました: {sorted(remaining)}")
+            for name in ready:
+                order.append(name)
+                del remaining[name]
+            for deps in remaining.values():
+                deps.difference_update(ready)
+
+        return order
+
+
+class GraphExecutor:
+    """
+    フェーズグラフの非同期エグゼキューター
+
+    依存が全て完了したノードを即座に起動し、独立したノードは並行に実行します。
+    いずれかのノードが失敗した場合は残りのノードをキャンセルして例外を再送出します。
+    """
+
+    def __init__(
+        self,
+        graph: PhaseGraph,
+        on_node_complete: Optional[Callable[[NodeTiming], None]] = None,
+        on_node_output: Optional[Callable[[str, Any], Any]] = None
+    ):
+        """
+        エグゼキューター初期化
+
+        Args:
+            graph: 実行するフェーズグラフ
+            on_node_complete: ノード終了時（成功・失敗とも）に呼ばれるコールバック
+            on_node_output: ノード成功時に (ノード名, 出力) で呼ばれるコールバック（コルーチン関数も可）
+        """
+        self.graph = graph
+        self.on_node_complete = on_node_complete
+        self.on_node_output = on_node_output
+        self.timings: List[NodeTiming] = []
+
+    def _record(self, timing: NodeTiming) -> None:
+        """実行記録を保存してコールバックに通知"""
+        self.timings.append(timing)
+        if self.on_node_complete:
+            self.on_node_complete(timing)
+
+    async def _run_node(self, node: Node, context: Dict[str, Any]) -> Any:
+        """1ノードを実行し、所要時間を記録"""
+        started_at = datetime.now().isoformat()
+        start = time.perf_counter()
+        try:
+            with span(f"node.{node.name}", "node"):
+                output = await node.execute(context)
+        except asyncio.CancelledError:
+            self._record(NodeTiming(node.name, started_at, time.perf_counter() - start, "cancelled"))
+            raise
+        except Exception:
+            self._record(NodeTiming(node.name, started_at, time.perf_counter() - start, "failed"))
+            raise
+
+        self._record(NodeTiming(node.name, started_at, time.perf_counter() - start, "completed"))
+        return output
+
+    async def run(self, context: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        グラフを実行
+
+        Args:
+            context: 初期コンテキスト（例: {"query": ...}）。
+                     ノード名と同じキーが既に存在するノードは完了済みとして扱います。
+
+        Returns:
+            全ノードの出力を追加したコンテキスト
+        """
+        self.graph.validate()
+
+        done = {name for name in self.graph.nodes if name in context}
+        running: Dict[asyncio.Task, str] = {}
+
+        try:
+            while len(done) < len(self.graph.nodes):
+                # 依存が解決したノードを起動
+                for name, node in self.graph.nodes.items():
+                    if name in done or name in running.values():
+                        continue
+                    if all(dep in done for dep in node.depends_on):
+                        logger.debug(f"ノード起動: {name}")
+                        task = asyncio.create_task(self._run_node(node, context))
+                        running[task] = name
+
+                finished, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+                for task in finished:
+                    name = running.pop(task)
+                    context[name] = task.result()
+                    done.add(name)
+                    if self.on_node_output:
+                        notified = self.on_node_output(name, context[name])
+                        if inspect.isawaitable(notified):
+                            await notified
+
+        finally:
+            for task in running:
+                task.cancel()
+            if running:
+                await asyncio.gather(*running, return_exceptions=True)
+
+        return context
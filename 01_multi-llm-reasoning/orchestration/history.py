@@ -0,0 +1,280 @@
+"""
+実行履歴ストア
+
+run()ごとの実行履歴を保持期間の上限（直近N件・合計バイト数）付きで保持します。
+長いプロンプトや出力はハッシュをキーに1回だけ保持し、履歴には参照を記録するため、
+同じ文字列が複数の履歴から参照されても重複して保持しません。
+上限を超えた古い履歴は追記専用のJSONLファイルに書き出して（任意）メモリから解放します。
+書き出しはファイル操作を伴うため、イベントループからは add_async（スレッドで実行）を使用します。
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# 参照として保持する履歴のフィールド
+TEXT_FIELDS = ("input", "output")
+
+
+@dataclass
+class RunHistory:
+    """
+    1回のrun()の実行履歴
+
+    entries の input / output は、preview_chars を超える場合は
+    先頭部分（プレビュー）に置き換え、全文は <field>_ref の参照で保持します。
+    """
+
+    history_id: str
+    query: str
+    status: str
+    recorded_at: str
+    entries: List[Dict[str, Any]] = field(default_factory=list)
+    refs: List[str] = field(default_factory=list)
+    size_bytes: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換（参照は解決しない）"""
+        return {
+            "history_id": self.history_id,
+            "query": self.query,
+            "status": self.status,
+            "recorded_at": self.recorded_at,
+            "entries": [dict(entry) for entry in self.entries],
+        }
+
+
+class HistoryStore:
+    """
+    保持期間の上限付きの実行履歴ストア
+
+    max_runs・max_bytes のどちらかを超えると古い履歴から順に破棄します
+    （spill_path を指定した場合は全文を解決してJSONLに追記してから破棄）。
+    """
+
+    def __init__(
+        self,
+        max_runs: int = 20,
+        max_bytes: int = 0,
+        spill_path: Optional[Union[str, Path]] = None,
+        preview_chars: int = 200
+    ):
+        """
+        ストア初期化
+
+        Args:
+            max_runs: メモリに保持する履歴の件数（0以下は無制限）
+            max_bytes: メモリに保持する履歴の合計バイト数（0以下は無制限）
+            spill_path: 破棄する履歴を追記するJSONLファイル（省略時は書き出さない）
+            preview_chars: 履歴に直接残す文字数（これより長い文字列は参照で保持）
+        """
+        self.max_runs = max_runs
+        self.max_bytes = max_bytes
+        self.spill_path = Path(spill_path) if spill_path else None
+        self.preview_chars = preview_chars
+        self._runs: "OrderedDict[str, RunHistory]" = OrderedDict()
+        # 参照先の文字列と参照数 {ref: [text, count]}
+        self._texts: Dict[str, List[Any]] = {}
+        self.total_bytes = 0
+        self.spilled_runs = 0
+        self._sequence = 0
+        # add_async（スレッド）と他の呼び出しが同時に履歴を更新しないためのロック
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._runs)
+
+    def _intern(self, text: str) -> str:
+        """文字列を参照として保持し、参照IDを返す"""
+        ref = hashlib.sha256(text.encode("utf-8")).hexdigest()[:16]
+        holder = self._texts.get(ref)
+        if holder is None:
+            self._texts[ref] = [text, 1]
+            self.total_bytes += len(text.encode("utf-8"))
+        else:
+            holder[1] += 1
+        return ref
+
+    def _release(self, ref: str) -> None:
+        """参照を1つ解放し、参照がなくなった文字列を破棄"""
+        holder = self._texts.get(ref)
+        if holder is None:
+            return
+        holder[1] -= 1
+        if holder[1] <= 0:
+            del self._texts[ref]
+            self.total_bytes -= len(holder[0].encode("utf-8"))
+
+    def resolve(self, ref: str) -> Optional[str]:
+        """
+        参照IDから全文を取得
+
+        Args:
+            ref: 参照ID
+
+        Returns:
+            全文（破棄済みの場合はNone）
+        """
+        holder = self._texts.get(ref)
+        return holder[0] if holder is not None else None
+
+    def add(
+        self,
+        entries: List[Dict[str, Any]],
+        query: str = "",
+        status: str = "completed",
+        history_id: Optional[str] = None
+    ) -> RunHistory:
+        """
+        1回分の実行履歴を追加
+
+        Args:
+            entries: 実行履歴のエントリ（input / output の長い文字列は参照に置き換える）
+            query: ユーザーからの質問
+            status: 実行の状態（completed / failed）
+            history_id: 履歴ID（省略時は連番）
+
+        Returns:
+            RunHistory: 追加した履歴
+        """
+        with self._lock:
+            return self._add(entries, query, status, history_id)
+
+    async def add_async(
+        self,
+        entries: List[Dict[str, Any]],
+        query: str = "",
+        status: str = "completed",
+        history_id: Optional[str] = None
+    ) -> RunHistory:
+        """
+        1回分の実行履歴を追加（上限を超えた履歴の書き出しでイベントループを止めないようスレッドで実行）
+
+        Args:
+            entries: 実行履歴のエントリ
+            query: ユーザーからの質問
+            status: 実行の状態（completed / failed）
+            history_id: 履歴ID（省略時は連番）
+
+        Returns:
+            RunHistory: 追加した履歴
+        """
+        return await asyncio.to_thread(self.add, entries, query, status, history_id)
+
+    def _add(
+        self,
+        entries: List[Dict[str, Any]],
+        query: str,
+        status: str,
+        history_id: Optional[str]
+    ) -> RunHistory:
+        """履歴を追加する（ロックを取得した状態で呼び出す）"""
+        self._sequence += 1
+        history = RunHistory(
+            history_id=history_id or f"run-{self._sequence}",
+            query=query,
+            status=status,
+            recorded_at=datetime.now().isoformat()
+        )
+
+        for entry in entries:
+            stored = dict(entry)
+            for name in TEXT_FIELDS:
+                text = stored.get(name)
+                if isinstance(text, str) and len(text) > self.preview_chars:
+                    ref = self._intern(text)
+                    history.refs.append(ref)
+                    stored[name] = text[:self.preview_chars] + "…"
+                    stored[f"{name}_ref"] = ref
+                    stored[f"{name}_chars"] = len(text)
+            history.entries.append(stored)
+
+        # 参照先の文字列以外（プレビュー・属性）の大きさ
+        history.size_bytes = len(json.dumps(history.entries, ensure_ascii=False, default=str).encode("utf-8"))
+        self.total_bytes += history.size_bytes
+
+        # 同じIDの履歴は置き換える（参照は新しい履歴の分を確保してから解放する）
+        replaced = self._runs.pop(history.history_id, None)
+        if replaced is not None:
+            self._discard(replaced)
+        self._runs[history.history_id] = history
+        self._enforce()
+        return history
+
+    def _enforce(self) -> None:
+        """保持期間の上限を超えた古い履歴を破棄（最新の1件は残す）"""
+        while len(self._runs) > 1 and (
+            (self.max_runs > 0 and len(self._runs) > self.max_runs)
+            or (self.max_bytes > 0 and self.total_bytes > self.max_bytes)
+        ):
+            _, oldest = self._runs.popitem(last=False)
+            if self.spill_path is not None:
+                self._spill(oldest)
+            self._discard(oldest)
+
+    def _discard(self, history: RunHistory) -> None:
+        """ストアから外した履歴の参照と大きさを解放"""
+        for ref in history.refs:
+            self._release(ref)
+        self.total_bytes -= history.size_bytes
+
+    def _spill(self, history: RunHistory) -> None:
+        """履歴を全文に戻してJSONLファイルに追記（ブロッキング、イベントループからは add_async 経由で呼ぶ）"""
+        try:
+            self.spill_path.parent.mkdir(parents=True, exist_ok=True)
+            with open(self.spill_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(self.expand(history), ensure_ascii=False, default=str) + "\n")
+            self.spilled_runs += 1
+        except OSError as e:
+            logger.warning(f"⚠️  実行履歴をファイルに書き出せませんでした: {e}")
+
+    def expand(self, history: RunHistory) -> Dict[str, Any]:
+        """
+        参照を全文に戻した履歴を取得
+
+        Args:
+            history: 実行履歴
+
+        Returns:
+            input / output を全文に戻した辞書
+        """
+        data = history.to_dict()
+        for entry in data["entries"]:
+            for name in TEXT_FIELDS:
+                ref = entry.pop(f"{name}_ref", None)
+                if ref is not None:
+                    entry.pop(f"{name}_chars", None)
+                    entry[name] = self.resolve(ref)
+        return data
+
+    def get(self, history_id: str) -> Optional[RunHistory]:
+        """履歴IDから履歴を取得（破棄済みの場合はNone）"""
+        return self._runs.get(history_id)
+
+    def latest(self) -> Optional[RunHistory]:
+        """直近の履歴"""
+        with self._lock:
+            return next(reversed(self._runs.values()), None)
+
+    def runs(self) -> List[RunHistory]:
+        """保持中の履歴（古い順）"""
+        with self._lock:
+            return list(self._runs.values())
+
+    def stats(self) -> Dict[str, Any]:
+        """保持件数・合計バイト数・参照中の文字列数・書き出し件数"""
+        return {
+            "runs": len(self._runs),
+            "total_bytes": self.total_bytes,
+            "texts": len(self._texts),
+            "spilled_runs": self.spilled_runs,
+        }
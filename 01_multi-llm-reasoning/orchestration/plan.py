@@ -0,0 +1,83 @@
+"""
+Coordinator出力（調査計画）の解析
+
+【...】形式のセクションを抽出し、調査項目を個別のリストに分解します。
+"""
+
+import re
+from typing import Dict, List
+
+# 【見出し】の行を検出するパターン
+SECTION_PATTERN = re.compile(r'^\s*【([^】]+)】\s*$', re.MULTILINE)
+
+# 箇条書き記号（-, *, ・, •, 1. , 1) など）
+BULLET_PATTERN = re.compile(r'^(?:[-*・•]|\d+[.)．])\s*')
+
+
+def split_sections(text: str) -> Dict[str, str]:
+    """
+    テキストを【見出し】ごとのセクションに分割する
+
+    Args:
+        text: 【...】形式の見出しを含むテキスト
+
+    Returns:
+        見出しをキー、本文を値とする辞書（出現順）
+    """
+    sections: Dict[str, str] = {}
+    matches = list(SECTION_PATTERN.finditer(text))
+
+    for i, match in enumerate(matches):
+        start = match.end()
+        end = matches[i + 1].start() if i + 1 < len(matches) else len(text)
+        sections[match.group(1).strip()] = text[start:end].strip()
+
+    return sections
+
+
+def extract_section(text: str, header: str) -> str:
+    """
+    指定した見出しのセクション本文を取得する
+
+    Args:
+        text: 【...】形式の見出しを含むテキスト
+        header: 見出し名（【】を除いたもの）
+
+    Returns:
+        セクション本文（見つからない場合は空文字列）
+    """
+    return split_sections(text).get(header, "")
+
+
+def parse_research_items(coordinator_output: str, header: str = "必要な情報") -> List[str]:
+    """
+    Coordinatorの調査計画から個別の調査項目を抽出する
+
+    インデントのない箇条書きを1項目とし、インデントされた行
+    （重要度などの補足）は直前の項目に連結します。
+
+    Args:
+        coordinator_output: Coordinatorの出力
+        header: 調査項目が列挙されているセクション名
+
+    Returns:
+        調査項目のリスト
+    """
+    items: List[str] = []
+
+    for line in extract_section(coordinator_output, header).splitlines():
+        if not line.strip():
+            continue
+
+        stripped = line.strip()
+        is_top_level = not line[:1].isspace()
+
+        if is_top_level and BULLET_PATTERN.match(stripped):
+            items.append(BULLET_PATTERN.sub("", stripped, count=1).strip())
+        elif items:
+            # 補足行は直前の項目に連結
+            items[-1] += " / " + BULLET_PATTERN.sub("", stripped, count=1).strip()
+        else:
+            items.append(stripped)
+
+    return [item for item in items if item]
@@ -0,0 +1,418 @@
+"""
+デプロイメント・テナント単位のレート制限
+
+Azure OpenAI のデプロイメントごとの RPM（1分あたりのリクエスト数）と TPM（1分あたりのトークン数）を
+トークンバケットで管理し、上限を超える呼び出しを待たせて 429 を防ぎます。
+テナントごとのクォータ（RPM・TPM）も設定でき、待機中のリクエストはテナント間で
+ラウンドロビンに処理するため、1つのテナントの大量のクエリが他のテナントを待たせ続けることはありません。
+
+時計（clock）と待機（sleep）は差し替えられるため、シミュレーションした時刻でテストできます。
+"""
+
+import asyncio
+import logging
+import math
+import time
+from collections import OrderedDict, deque
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# 待機状況を受け取るコールバックの型
+WaitCallback = Callable[[Dict[str, Any]], None]
+
+
+class TokenBucket:
+    """
+    トークンバケット
+
+    capacity まで貯まり、毎秒 refill_per_second ずつ補充されます。
+    消費は残量を超えてもよく（実際の使用量が予約を上回った場合）、その分は後の補充で返済します。
+    """
+
+    def __init__(self, capacity: float, refill_per_second: float, clock: Callable[[], float] = time.monotonic):
+        """
+        バケット初期化
+
+        Args:
+            capacity: 貯められる最大量
+            refill_per_second: 1秒あたりの補充量
+            clock: 現在時刻（秒）を返す関数
+        """
+        self.capacity = capacity
+        self.refill_per_second = refill_per_second
+        self.clock = clock
+        self._tokens = capacity
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        """経過時間分を補充"""
+        now = self.clock()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_second)
+        self._updated = now
+
+    @property
+    def available(self) -> float:
+        """現在の残量"""
+        self._refill()
+        return self._tokens
+
+    def time_until(self, amount: float) -> float:
+        """
+        残量が amount に達するまでの秒数（capacity を超える量は貯まるまでの理論値）
+
+        Args:
+            amount: 必要な量
+
+        Returns:
+            待機秒数（すでに足りている場合は0）
+        """
+        shortage = amount - self.available
+        if shortage <= 0:
+            return 0.0
+        if self.refill_per_second <= 0:
+            return math.inf
+        return shortage / self.refill_per_second
+
+    def wait_time(self, amount: float) -> float:
+        """
+        amount を消費できるまでの秒数
+
+        capacity を超える要求は満杯になった時点で消費できるものとします。
+        """
+        return self.time_until(min(amount, self.capacity))
+
+    def consume(self, amount: float) -> None:
+        """amount を消費（残量が負になってもよい）"""
+        self._refill()
+        self._tokens -= amount
+
+    def refund(self, amount: float) -> None:
+        """amount を戻す（capacity まで）"""
+        self._refill()
+        self._tokens = min(self.capacity, self._tokens + amount)
+
+
+@dataclass
+class RateLimitTicket:
+    """
+    レート制限を通過した呼び出しの記録
+
+    queue_position は待機を始めた時点で前にいたリクエスト数、
+    estimated_wait_seconds はその時点の待機時間の見積もり、waited_seconds は実際の待機時間です。
+    """
+
+    deployment: str
+    tenant: str
+    tokens: int
+    queue_position: int = 0
+    estimated_wait_seconds: float = 0.0
+    waited_seconds: float = 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return asdict(self)
+
+
+@dataclass
+class _Waiter:
+    """待機中のリクエスト"""
+
+    tenant: str
+    tokens: int
+    future: asyncio.Future
+
+
+class RateLimiter:
+    """
+    デプロイメント・テナント単位のレート制限
+
+    デプロイメントごとの RPM・TPM と、テナントごとのクォータ（tenant_rpm / tenant_tpm）を
+    トークンバケットで管理します（0以下は無制限）。
+    すぐに通せないリクエストはデプロイメントごとの待ち行列に入り、テナント間を
+    ラウンドロビンで処理します。テナントが自身のクォータを使い切っている間は
+    他のテナントを先に通し、デプロイメント全体の上限で待つ間は順番を維持します。
+    """
+
+    def __init__(
+        self,
+        rpm: int = 0,
+        tpm: int = 0,
+        tenant_rpm: int = 0,
+        tenant_tpm: int = 0,
+        deployment_limits: Optional[Dict[str, Tuple[int, int]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        """
+        レート制限の初期化
+
+        Args:
+            rpm: デプロイメントごとの1分あたりのリクエスト数（0以下は無制限）
+            tpm: デプロイメントごとの1分あたりのトークン数（0以下は無制限）
+            tenant_rpm: テナントごとの1分あたりのリクエスト数（0以下は無制限）
+            tenant_tpm: テナントごとの1分あたりのトークン数（0以下は無制限）
+            deployment_limits: デプロイメント名ごとの (rpm, tpm) の上書き
+            clock: 現在時刻（秒）を返す関数
+            sleep: 指定秒数待機するコルーチン関数
+        """
+        self.rpm = rpm
+        self.tpm = tpm
+        self.tenant_rpm = tenant_rpm
+        self.tenant_tpm = tenant_tpm
+        self.deployment_limits = dict(deployment_limits or {})
+        self.clock = clock
+        self.sleep = sleep
+        # (デプロイメント, テナント or None) ごとの (RPMバケット, TPMバケット)
+        self._buckets: Dict[Tuple[str, Optional[str]], Tuple[Optional[TokenBucket], Optional[TokenBucket]]] = {}
+        # デプロイメントごとのテナント別待ち行列（先頭のテナントが次の順番）
+        self._queues: Dict[str, "OrderedDict[str, Deque[_Waiter]]"] = {}
+        self._pumps: Dict[str, asyncio.Task] = {}
+        self._wakeups: Dict[str, asyncio.Event] = {}
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def limits_for(self, deployment: str) -> Tuple[int, int]:
+        """デプロイメントの (rpm, tpm)"""
+        return self.deployment_limits.get(deployment, (self.rpm, self.tpm))
+
+    def _bucket_pair(self, deployment: str, tenant: Optional[str]) -> Tuple[Optional[TokenBucket], Optional[TokenBucket]]:
+        """デプロイメント全体（tenant=None）またはテナントのバケットを取得（未作成なら作成）"""
+        key = (deployment, tenant)
+        pair = self._buckets.get(key)
+        if pair is None:
+            rpm, tpm = self.limits_for(deployment) if tenant is None else (self.tenant_rpm, self.tenant_tpm)
+            pair = (
+                TokenBucket(rpm, rpm / 60, self.clock) if rpm > 0 else None,
+                TokenBucket(tpm, tpm / 60, self.clock) if tpm > 0 else None,
+            )
+            self._buckets[key] = pair
+        return pair
+
+    @staticmethod
+    def _pair_wait(
+        pair: Tuple[Optional[TokenBucket], Optional[TokenBucket]],
+        requests: int,
+        tokens: int,
+        cumulative: bool = False
+    ) -> float:
+        """
+        バケットの組で requests 件・tokens トークンを消費できるまでの秒数
+
+        cumulative=True の場合は、capacity を超える量を続けて消費し終えるまでの見積もりです。
+        """
+        wait = 0.0
+        for bucket, amount in zip(pair, (requests, tokens)):
+            if bucket is not None and amount > 0:
+                wait = max(wait, bucket.time_until(amount) if cumulative else bucket.wait_time(amount))
+        return wait
+
+    def _waits(self, deployment: str, tenant: str, tokens: int) -> Tuple[float, float]:
+        """(デプロイメント全体の待機秒数, テナントのクォータの待機秒数)"""
+        return (
+            self._pair_wait(self._bucket_pair(deployment, None), 1, tokens),
+            self._pair_wait(self._bucket_pair(deployment, tenant), 1, tokens),
+        )
+
+    def _consume(self, deployment: str, tenant: str, requests: int, tokens: int) -> None:
+        """デプロイメント全体とテナントのバケットから消費"""
+        for key in (None, tenant):
+            rpm_bucket, tpm_bucket = self._bucket_pair(deployment, key)
+            if rpm_bucket is not None and requests:
+                rpm_bucket.consume(requests)
+            if tpm_bucket is not None and tokens:
+                tpm_bucket.consume(tokens)
+
+    def _check_loop(self) -> None:
+        """イベントループが変わっていれば待ち行列を破棄（Futureはループに紐づくため）"""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            loop = None
+        if loop is not self._loop:
+            self._queues.clear()
+            self._pumps.clear()
+            self._wakeups.clear()
+            self._loop = loop
+
+    def _estimate(self, deployment: str, tenant: str, index: int, tokens: int) -> Tuple[int, float]:
+        """
+        テナントの待ち行列の index 番目のリクエストの順番と待機時間を見積もる
+
+        ラウンドロビンでは他のテナントは最大 index + 1 件ずつ先に処理されるものとします。
+
+        Returns:
+            (前にいるリクエスト数, 待機秒数の見積もり)
+        """
+        queue = self._queues.get(deployment, OrderedDict())
+        ahead: List[_Waiter] = []
+        for name, waiters in queue.items():
+            live = [w for w in waiters if not w.future.done()]
+            ahead.extend(live[:index] if name == tenant else live[:index + 1])
+
+        own_tokens = sum(w.tokens for w in list(queue.get(tenant, ()))[:index]) + tokens
+        estimate = max(
+            self._pair_wait(self._bucket_pair(deployment, None), len(ahead) + 1,
+                            sum(w.tokens for w in ahead) + tokens, cumulative=True),
+            self._pair_wait(self._bucket_pair(deployment, tenant), index + 1, own_tokens, cumulative=True),
+        )
+        return len(ahead), estimate
+
+    async def acquire(
+        self,
+        deployment: str,
+        tenant: str = "default",
+        tokens: int = 0,
+        on_wait: Optional[WaitCallback] = None
+    ) -> RateLimitTicket:
+        """
+        リクエスト1件と tokens トークン分の枠を確保する（確保できるまで待機）
+
+        Args:
+            deployment: デプロイメント名
+            tenant: テナント名
+            tokens: 予約するトークン数（入力の見積もり + 出力の見込み）
+            on_wait: 待機する場合に順番と待機時間の見積もりを受け取るコールバック
+
+        Returns:
+            RateLimitTicket: 確保した枠（settle() で実際の使用量を反映）
+        """
+        self._check_loop()
+        start = self.clock()
+        queue = self._queues.setdefault(deployment, OrderedDict())
+
+        # 待ち行列が空で枠があればすぐに通す
+        if not any(queue.values()) and max(self._waits(deployment, tenant, tokens)) <= 0:
+            self._consume(deployment, tenant, 1, tokens)
+            return RateLimitTicket(deployment, tenant, tokens)
+
+        waiter = _Waiter(tenant, tokens, asyncio.get_running_loop().create_future())
+        waiters = queue.setdefault(tenant, deque())
+        waiters.append(waiter)
+        position, estimate = self._estimate(deployment, tenant, len(waiters) - 1, tokens)
+        ticket = RateLimitTicket(deployment, tenant, tokens, position, estimate)
+        logger.info(f"🚦 {deployment}（{tenant}）: レート制限で待機（{position}件待ち、約{estimate:.1f}秒）")
+        if on_wait is not None:
+            on_wait({"deployment": deployment, "tenant": tenant,
+                     "queue_position": position, "estimated_wait_seconds": estimate})
+
+        self._wake(deployment)
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter in waiters:
+                waiters.remove(waiter)
+            self._wake(deployment)
+            raise
+
+        ticket.waited_seconds = self.clock() - start
+        return ticket
+
+    def _wake(self, deployment: str) -> None:
+        """待ち行列の処理タスクを起こす（未起動なら起動）"""
+        event = self._wakeups.setdefault(deployment, asyncio.Event())
+        event.set()
+        pump = self._pumps.get(deployment)
+        if pump is None or pump.done():
+            self._pumps[deployment] = asyncio.get_running_loop().create_task(self._pump(deployment))
+
+    async def _pump(self, deployment: str) -> None:
+        """待ち行列をテナント間のラウンドロビンで処理"""
+        queue = self._queues[deployment]
+        wakeup = self._wakeups[deployment]
+
+        while any(queue.values()):
+            wakeup.clear()
+            waits: List[float] = []
+            granted = False
+            for tenant in list(queue):
+                waiters = queue[tenant]
+                while waiters and waiters[0].future.done():
+                    waiters.popleft()
+                if not waiters:
+                    del queue[tenant]
+                    continue
+
+                head = waiters[0]
+                global_wait, tenant_wait = self._waits(deployment, tenant, head.tokens)
+                if tenant_wait > 0:
+                    # 自身のクォータを使い切ったテナントは飛ばして他のテナントを先に通す
+                    waits.append(max(global_wait, tenant_wait))
+                    continue
+                if global_wait > 0:
+                    # デプロイメント全体の上限待ちは順番を維持する
+                    waits.append(global_wait)
+                    break
+
+                self._consume(deployment, tenant, 1, head.tokens)
+                waiters.popleft()
+                head.future.set_result(None)
+                if waiters:
+                    queue.move_to_end(tenant)
+                else:
+                    del queue[tenant]
+                granted = True
+                break
+
+            if granted or not any(queue.values()):
+                continue
+
+            # 枠が空くまで、または新しいリクエストが来るまで待つ
+            sleeper = asyncio.ensure_future(self.sleep(min(waits)))
+            woken = asyncio.ensure_future(wakeup.wait())
+            try:
+                await asyncio.wait({sleeper, woken}, return_when=asyncio.FIRST_COMPLETED)
+            finally:
+                sleeper.cancel()
+                woken.cancel()
+
+    def settle(self, ticket: Optional[RateLimitTicket], actual_tokens: Optional[int] = None, extra_requests: int = 0) -> None:
+        """
+        呼び出し後に実際の使用量を反映する
+
+        予約より少なければ差分をTPMの枠に戻し、多ければ追加で消費します。
+        再試行・ヘッジで送った分は extra_requests としてRPMの枠から消費します。
+
+        Args:
+            ticket: acquire() の結果（Noneの場合は何もしない）
+            actual_tokens: 実際の使用トークン数（不明な場合はNoneで予約のまま）
+            extra_requests: 追加で送ったリクエスト数
+        """
+        if ticket is None:
+            return
+        difference = 0 if actual_tokens is None else actual_tokens - ticket.tokens
+        for key in (None, ticket.tenant):
+            rpm_bucket, tpm_bucket = self._bucket_pair(ticket.deployment, key)
+            if rpm_bucket is not None and extra_requests > 0:
+                rpm_bucket.consume(extra_requests)
+            if tpm_bucket is not None and difference > 0:
+                tpm_bucket.consume(difference)
+            elif tpm_bucket is not None and difference < 0:
+                tpm_bucket.refund(-difference)
+        if difference < 0 and ticket.deployment in self._wakeups:
+            self._wakeups[ticket.deployment].set()
+
+    def status(self, deployment: str, tenant: str = "default", tokens: int = 0) -> Dict[str, Any]:
+        """
+        テナントが今リクエストを送った場合の待機状況
+
+        Args:
+            deployment: デプロイメント名
+            tenant: テナント名
+            tokens: 予約するトークン数
+
+        Returns:
+            queued（テナントの待機中の件数）, queue_length（全体の待機中の件数）,
+            queue_position, estimated_wait_seconds の辞書
+        """
+        queue = self._queues.get(deployment, OrderedDict())
+        queued = sum(1 for w in queue.get(tenant, ()) if not w.future.done())
+        position, estimate = self._estimate(deployment, tenant, queued, tokens)
+        if not any(queue.values()):
+            estimate = max(self._waits(deployment, tenant, tokens))
+        return {
+            "queued": queued,
+            "queue_length": sum(1 for ws in queue.values() for w in ws if not w.future.done()),
+            "queue_position": position,
+            "estimated_wait_seconds": estimate,
+        }
@@ -0,0 +1,310 @@
+"""
+エージェント呼び出しのリトライ・タイムアウト・ヘッジポリシー
+
+1回の呼び出しにフェーズごとのタイムアウトを設け、一時的なエラー
+（タイムアウト、429、5xx、接続エラー）はジッター付き指数バックオフで再試行します。
+429 の Retry-After が返された場合はその秒数を待機します。
+
+ヘッジを有効にすると、過去の応答時間のパーセンタイル（p95など）を過ぎても
+応答がない場合に同じリクエストをもう1本送り、先に返った方を採用します。
+
+エラーの判定（_error_chain・get_retry_after・is_retryable）は 02_azure-voice-chatbot の
+agents/retry.py に複製しています。再試行の対象を変更する場合は両方を更新してください。
+"""
+
+import asyncio
+import logging
+import random
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 再試行するHTTPステータスコード
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 再試行する例外クラス名（openai の接続・タイムアウトエラー）
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+def _error_chain(error: BaseException) -> List[BaseException]:
+    """例外と、その原因となった例外の連鎖（agent_frameworkは元の例外を__cause__に保持）"""
+    chain = []
+    while error is not None and error not in chain:
+        chain.append(error)
+        error = error.__cause__ or getattr(error, "inner_exception", None)
+    return chain
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """
+    例外の連鎖からHTTPステータスコードを取得する
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        ステータスコード（含まれない場合はNone）
+    """
+    for item in _error_chain(error):
+        status_code = getattr(item, "status_code", None)
+        if isinstance(status_code, int):
+            return status_code
+    return None
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    例外の連鎖からRetry-After（秒）を取得する
+
+    retry-after-ms と retry-after（秒）のヘッダーに対応します。
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        待機秒数（ヘッダーがない場合はNone）
+    """
+    for item in _error_chain(error):
+        headers = getattr(getattr(item, "response", None), "headers", None)
+        if not headers:
+            continue
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except (TypeError, ValueError):
+            # HTTP日付形式などは無視して通常のバックオフに任せる
+            continue
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    再試行で回復する可能性のある一時的なエラーか
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        タイムアウト・429・5xx・接続エラーの場合True
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    if get_status_code(error) in RETRYABLE_STATUS_CODES:
+        return True
+    return any(type(item).__name__ in RETRYABLE_ERROR_NAMES for item in _error_chain(error))
+
+
+class LatencyTracker:
+    """直近の成功した呼び出しの応答時間を保持し、パーセンタイルを求める"""
+
+    def __init__(self, window: int = 50):
+        """
+        トラッカー初期化
+
+        Args:
+            window: 保持する直近の件数
+        """
+        self._samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def record(self, seconds: float) -> None:
+        """応答時間を記録"""
+        self._samples.append(seconds)
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        応答時間のパーセンタイルを取得
+
+        Args:
+            p: パーセンタイル（0〜100）
+
+        Returns:
+            応答時間（秒、記録がない場合はNone）
+        """
+        if not self._samples:
+            return None
+        ordered = sorted(self._samples)
+        index = min(len(ordered) - 1, max(0, int(round(p / 100 * len(ordered))) - 1))
+        return ordered[index]
+
+
+class RetryPolicy:
+    """
+    1フェーズ分のリトライ・タイムアウト・ヘッジポリシー
+
+    call() に渡した呼び出しを、ポリシーに従って実行します。
+    各試行の結果は attempts のリストとして返し、実行履歴に記録できるようにします。
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        timeout: Optional[float] = 60,
+        base_delay: float = 1.0,
+        max_delay: float = 30.0,
+        hedge: bool = False,
+        hedge_percentile: float = 95,
+        hedge_min_samples: int = 5,
+        hedge_after: Optional[float] = None,
+        rng: Optional[random.Random] = None,
+        sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+    ):
+        """
+        ポリシー初期化
+
+        Args:
+            max_retries: 最初の試行に加えて再試行する最大回数
+            timeout: 1試行あたりのタイムアウト（秒、0以下・Noneは無制限）
+            base_delay: バックオフの基準待機秒数（試行ごとに倍増）
+            max_delay: バックオフの最大待機秒数
+            hedge: ヘッジリクエストを送るか
+            hedge_percentile: ヘッジを送る応答時間のパーセンタイル
+            hedge_min_samples: パーセンタイルを使うのに必要な応答時間の記録数
+            hedge_after: 記録が足りない間に使う固定のヘッジ送信秒数（Noneは記録が揃うまで送らない）
+            rng: ジッター用の乱数生成器
+            sleep: 待機関数（テスト用に差し替え可能）
+        """
+        self.max_retries = max_retries
+        self.timeout = timeout if timeout and timeout > 0 else None
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.hedge = hedge
+        self.hedge_percentile = hedge_percentile
+        self.hedge_min_samples = hedge_min_samples
+        self.hedge_after = hedge_after
+        self.rng = rng or random.Random()
+        self.sleep = sleep
+        self.latency = LatencyTracker()
+
+    def backoff_delay(self, retry: int, error: Optional[BaseException] = None) -> float:
+        """
+        再試行前の待機秒数を計算
+
+        Retry-After があればそれに従い、なければ full jitter の指数バックオフ
+        （0〜base_delay * 2^retry の一様乱数、max_delayで頭打ち）を使います。
+
+        Args:
+            retry: 何回目の再試行か（0始まり）
+            error: 直前の試行で発生した例外
+
+        Returns:
+            待機秒数
+        """
+        retry_after = get_retry_after(error) if error is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_delay)
+        return self.rng.uniform(0, min(self.max_delay, self.base_delay * (2 ** retry)))
+
+    def hedge_deadline(self) -> Optional[float]:
+        """ヘッジリクエストを送るまでの秒数（送らない場合はNone）"""
+        if not self.hedge:
+            return None
+        if len(self.latency) >= self.hedge_min_samples:
+            return self.latency.percentile(self.hedge_percentile)
+        return self.hedge_after
+
+    async def _attempt(self, func: Callable[[], Awaitable[T]], hedge: bool) -> Tuple[T, bool]:
+        """
+        1試行を実行（必要ならヘッジリクエストも送る）
+
+        Returns:
+            (結果, ヘッジ側の結果を採用したか)
+        """
+        deadline = self.hedge_deadline() if hedge else None
+        if deadline is None:
+            return await func(), False
+
+        primary = asyncio.ensure_future(func())
+        tasks = {primary}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=deadline)
+            if done:
+                return primary.result(), False
+
+            logger.info(f"🪁 応答が{deadline:.1f}秒を超えたためヘッジリクエストを送信")
+            secondary = asyncio.ensure_future(func())
+            tasks.add(secondary)
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        return task.result(), task is secondary
+            # 両方失敗した場合は元のリクエストの例外を送出
+            return primary.result(), False
+
+        finally:
+            # 採用しなかったリクエスト（タイムアウト時は全て）を取り消す
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def call(
+        self,
+        func: Callable[[], Awaitable[T]],
+        attempts: Optional[List[Dict[str, Any]]] = None,
+        hedge: bool = True,
+        can_retry: Callable[[], bool] = lambda: True
+    ) -> T:
+        """
+        ポリシーに従って呼び出しを実行
+
+        Args:
+            func: 呼び出しを実行するコルーチン関数（試行ごとに呼ばれる）
+            attempts: 各試行の結果を追記するリスト
+                      （attempt, status, duration_seconds, error, delay_seconds, hedged）
+            hedge: この呼び出しでヘッジを許可するか（ストリーミングなど重複実行できない場合はFalse）
+            can_retry: 失敗時に再試行してよいかを返す関数（部分的な出力を通知済みの場合など）
+
+        Returns:
+            呼び出しの結果
+
+        Raises:
+            Exception: 再試行できないエラー、または再試行回数を使い切った場合の最後のエラー
+        """
+        attempts = attempts if attempts is not None else []
+        retry = 0
+
+        while True:
+            record: Dict[str, Any] = {"attempt": retry + 1}
+            attempts.append(record)
+            start = time.perf_counter()
+            try:
+                if self.timeout is None:
+                    result, hedged = await self._attempt(func, hedge)
+                else:
+                    result, hedged = await asyncio.wait_for(self._attempt(func, hedge), timeout=self.timeout)
+            except Exception as e:
+                record["duration_seconds"] = time.perf_counter() - start
+                if isinstance(e, asyncio.TimeoutError):
+                    message = f"{self.timeout}秒以内に応答がありません" if self.timeout else "タイムアウト"
+                    record.update(status="timeout", error=str(e) or message)
+                else:
+                    record.update(status="error", error=str(e), status_code=get_status_code(e))
+
+                if retry >= self.max_retries or not is_retryable(e) or not can_retry():
+                    raise
+
+                delay = self.backoff_delay(retry, e)
+                record["delay_seconds"] = delay
+                logger.warning(
+                    f"🔁 一時的なエラーのため{delay:.1f}秒後に再試行します"
+                    f"（{retry + 1}/{self.max_retries}）: {record['error']}"
+                )
+                await self.sleep(delay)
+                retry += 1
+                continue
+
+            duration = time.perf_counter() - start
+            record.update(status="ok", duration_seconds=duration, hedged=hedged)
+            if not hedged:
+                self.latency.record(duration)
+            return result
@@ -0,0 +1,246 @@
+"""
+フェーズごとのモデルルーティング
+
+質問の長さ・Coordinatorの調査項目数・数値を含むかといった軽量な特徴量と
+設定可能なルールから、各フェーズで GPT-5 と GPT-5-mini のどちらを使うかを決めます。
+mini に切り替えた出力が品質チェックに通らない場合は GPT-5 で再実行（エスカレーション）します。
+"""
+
+import logging
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from orchestration.plan import parse_research_items, split_sections
+from orchestration.retry import LatencyTracker
+
+logger = logging.getLogger(__name__)
+
+# フェーズごとの既定モデル（ルーティング無効時の割り当て）
+DEFAULT_PHASE_MODELS: Dict[str, str] = {
+    "coordinator": "gpt5",
+    "researcher": "gpt5-mini",
+    "analyzer": "gpt5",
+    "summarizer": "gpt5",
+}
+
+# 品質チェックで出力に含まれているべきセクション
+EXPECTED_SECTIONS: Dict[str, List[str]] = {
+    "coordinator": ["必要な情報"],
+    "analyzer": ["主要な発見"],
+}
+
+# 数値・計算を含む質問の検出（数字、パーセント、単位付きの量、比較・計算の語）
+NUMERIC_PATTERN = re.compile(r'\d|[０-９]|％|%|何(倍|割|円|人|年)|計算|比較|統計|推移|割合')
+
+
+@dataclass
+class QueryFeatures:
+    """ルーティングに使う軽量な特徴量"""
+
+    query_length: int
+    plan_items: int
+    has_numeric: bool
+
+
+def extract_features(query: str, coordinator_output: Optional[str] = None) -> QueryFeatures:
+    """
+    質問と調査計画から特徴量を抽出する
+
+    Args:
+        query: ユーザーからの質問
+        coordinator_output: Coordinatorの出力（Coordinatorフェーズでは省略）
+
+    Returns:
+        QueryFeatures: 特徴量
+    """
+    return QueryFeatures(
+        query_length=len(query.strip()),
+        plan_items=len(parse_research_items(coordinator_output)) if coordinator_output else 0,
+        has_numeric=bool(NUMERIC_PATTERN.search(query))
+    )
+
+
+@dataclass
+class RoutingRule:
+    """
+    ルーティングルール
+
+    条件（None は条件なし）を全て満たした場合に、そのフェーズで model を使います。
+    """
+
+    phase: str
+    model: str
+    max_query_length: Optional[int] = None
+    max_plan_items: Optional[int] = None
+    numeric: Optional[bool] = None
+
+    def matches(self, phase: str, features: QueryFeatures) -> bool:
+        """フェーズと特徴量がこのルールに当てはまるか"""
+        if phase != self.phase and self.phase != "*":
+            return False
+        if self.max_query_length is not None and features.query_length > self.max_query_length:
+            return False
+        if self.max_plan_items is not None and features.plan_items > self.max_plan_items:
+            return False
+        if self.numeric is not None and features.has_numeric != self.numeric:
+            return False
+        return True
+
+    def describe(self) -> str:
+        """判定理由として記録する説明"""
+        conditions = [
+            f"{name}={value}" for name, value in asdict(self).items()
+            if name not in ("phase", "model") and value is not None
+        ]
+        return f"rule({', '.join(conditions) or 'always'})"
+
+
+def default_rules(short_query_chars: int = 80, simple_plan_items: int = 2) -> List[RoutingRule]:
+    """
+    既定のルール（短く数値を含まない単純な質問は mini で処理）
+
+    Args:
+        short_query_chars: 単純な質問とみなす最大文字数
+        simple_plan_items: 単純な質問とみなす調査項目数の上限
+
+    Returns:
+        ルールのリスト
+    """
+    return [
+        RoutingRule("coordinator", "gpt5-mini", max_query_length=short_query_chars, numeric=False),
+        RoutingRule("analyzer", "gpt5-mini", max_query_length=short_query_chars,
+                    max_plan_items=simple_plan_items, numeric=False),
+        RoutingRule("summarizer", "gpt5-mini", max_query_length=short_query_chars,
+                    max_plan_items=simple_plan_items, numeric=False),
+    ]
+
+
+def check_quality(phase: str, output: str, min_chars: int = 200) -> Optional[str]:
+    """
+    出力の簡易品質チェック
+
+    Args:
+        phase: フェーズ名
+        output: エージェントの出力
+        min_chars: 最低限必要な文字数
+
+    Returns:
+        不合格の理由（合格の場合はNone）
+    """
+    if len(output.strip()) < min_chars:
+        return f"出力が短すぎます（{len(output.strip())}文字 < {min_chars}文字）"
+
+    sections = split_sections(output)
+    missing = [header for header in EXPECTED_SECTIONS.get(phase, []) if header not in sections]
+    if missing:
+        return f"必要なセクションがありません: {', '.join(missing)}"
+    return None
+
+
+@dataclass
+class RoutingDecision:
+    """1フェーズ分のルーティング結果"""
+
+    phase: str
+    model: str
+    reason: str
+    escalated: bool = False
+    escalation_reason: Optional[str] = None
+    escalation_model: Optional[str] = None
+    duration_seconds: Optional[float] = None
+    estimated_saving_seconds: Optional[float] = None
+    features: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return asdict(self)
+
+
+class ModelRouter:
+    """
+    フェーズごとにモデルを選択するルーター
+
+    ルールは先頭から順に評価し、最初に当てはまったルールのモデルを使います。
+    当てはまるルールがなければフェーズの既定モデルを使います。
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        rules: Optional[Sequence[RoutingRule]] = None,
+        default_models: Optional[Dict[str, str]] = None,
+        escalate: bool = True,
+        min_output_chars: int = 200
+    ):
+        """
+        ルーター初期化
+
+        Args:
+            enabled: ルーティングを行うか（Falseの場合は常に既定モデル）
+            rules: ルーティングルール（省略時はdefault_rules()）
+            default_models: フェーズごとの既定モデル（省略時はDEFAULT_PHASE_MODELS）
+            escalate: mini の出力が品質チェックに通らない場合に GPT-5 で再実行するか
+            min_output_chars: 品質チェックで必要な最低文字数
+        """
+        self.enabled = enabled
+        self.rules = list(default_rules() if rules is None else rules)
+        self.default_models = dict(default_models or DEFAULT_PHASE_MODELS)
+        self.escalate = escalate
+        self.min_output_chars = min_output_chars
+        # (フェーズ, モデル) ごとの応答時間（削減時間の見積もりに使用）
+        self._latency: Dict[Tuple[str, str], LatencyTracker] = {}
+
+    def default_model(self, phase: str) -> str:
+        """フェーズの既定モデル"""
+        return self.default_models.get(phase, "gpt5")
+
+    def route(self, phase: str, features: QueryFeatures) -> RoutingDecision:
+        """
+        フェーズで使うモデルを決める
+
+        Args:
+            phase: フェーズ名
+            features: 質問の特徴量
+
+        Returns:
+            RoutingDecision: 選択したモデルと理由
+        """
+        feature_dict = asdict(features)
+        if self.enabled:
+            for rule in self.rules:
+                if rule.matches(phase, features):
+                    return RoutingDecision(phase, rule.model, rule.describe(), features=feature_dict)
+        return RoutingDecision(phase, self.default_model(phase), "default", features=feature_dict)
+
+    def should_escalate(self, decision: RoutingDecision, output: str) -> Optional[str]:
+        """
+        既定より軽いモデルに切り替えた出力を GPT-5 で再実行すべきか
+
+        Args:
+            decision: ルーティング結果
+            output: 選択したモデルの出力
+
+        Returns:
+            再実行する理由（不要な場合はNone）
+        """
+        if not self.escalate or decision.model == self.default_model(decision.phase):
+            return None
+        return check_quality(decision.phase, output, self.min_output_chars)
+
+    def record_latency(self, phase: str, model: str, seconds: float) -> None:
+        """フェーズとモデルの応答時間を記録"""
+        self._latency.setdefault((phase, model), LatencyTracker()).record(seconds)
+
+    def estimate_saving(self, decision: RoutingDecision) -> Optional[float]:
+        """
+        既定モデルを使った場合と比べた削減時間を見積もる
+
+        既定モデルの過去の応答時間（中央値）から実際の所要時間を引いた値です。
+        既定モデルの記録がない場合は見積もれないためNoneを返します。
+        """
+        default = self.default_model(decision.phase)
+        tracker = self._latency.get((decision.phase, default))
+        if decision.model == default or decision.duration_seconds is None or not tracker:
+            return None
+        return tracker.percentile(50) - decision.duration_seconds
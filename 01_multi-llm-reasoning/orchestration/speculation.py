@@ -0,0 +1,173 @@
+"""
+Researcherの先行実行（スペキュレーション）
+
+Coordinatorが計画を立てている間に、元の質問だけを使ってResearcherを先行して実行し、
+計画が届いた時点で照合します。計画の調査項目と重なる調査結果は残し、
+カバーされていない項目だけを追加で調査します。
+
+照合は調査項目のキーワード（カタカナ・漢字・英数字の連続）が調査結果に
+含まれる割合で判定する軽量なものです。
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict, List, Optional, Set
+
+# キーワードとして抽出する文字列（2文字以上のカタカナ・漢字・英数字の連続）
+TERM_PATTERN = re.compile(r'[ァ-ヴー]{2,}|[一-龥々]{2,}|[A-Za-z0-9]{2,}')
+
+# 調査項目によく現れるがカバー判定には使わない語
+STOP_TERMS = {"情報", "調査", "必要", "重要度", "重要", "内容", "関連", "最新", "現状", "概要", "詳細", "具体的"}
+
+
+def extract_terms(text: str) -> Set[str]:
+    """
+    テキストからキーワードを抽出する
+
+    Args:
+        text: 対象のテキスト
+
+    Returns:
+        キーワードの集合（英字は小文字に統一、除外語は取り除く）
+    """
+    terms = set()
+    for term in TERM_PATTERN.findall(text):
+        # 「最新情報」のような複合語からも除外語を取り除く
+        for stop in STOP_TERMS:
+            term = term.replace(stop, "")
+        if len(term) >= 2:
+            terms.add(term.lower())
+    return terms
+
+
+def item_coverage(item: str, findings: str) -> float:
+    """
+    調査項目のキーワードのうち調査結果に含まれる割合
+
+    Args:
+        item: 調査項目
+        findings: 調査結果
+
+    Returns:
+        0〜1の割合（キーワードがない項目は0）
+    """
+    terms = extract_terms(item)
+    if not terms:
+        return 0.0
+    text = findings.lower()
+    return sum(1 for term in terms if term in text) / len(terms)
+
+
+@dataclass
+class Reconciliation:
+    """先行調査の結果と調査計画の照合結果"""
+
+    covered_items: List[str] = field(default_factory=list)
+    uncovered_items: List[str] = field(default_factory=list)
+    kept_text: str = ""
+    kept_chars: int = 0
+    discarded_chars: int = 0
+
+    @property
+    def discarded_ratio(self) -> float:
+        """先行調査の結果のうち破棄した割合"""
+        total = self.kept_chars + self.discarded_chars
+        return self.discarded_chars / total if total else 0.0
+
+
+def reconcile_findings(items: List[str], findings: str, threshold: float = 0.5) -> Reconciliation:
+    """
+    先行調査の結果を調査計画と照合する
+
+    キーワードの threshold 以上が調査結果に含まれる項目をカバー済みとし、
+    調査結果は計画のいずれかの項目のキーワードを含む段落だけを残します。
+
+    Args:
+        items: 調査計画の調査項目
+        findings: 先行調査の結果
+        threshold: カバー済みとみなすキーワードの割合
+
+    Returns:
+        Reconciliation: 照合結果
+    """
+    result = Reconciliation()
+    for item in items:
+        if item_coverage(item, findings) >= threshold:
+            result.covered_items.append(item)
+        else:
+            result.uncovered_items.append(item)
+
+    plan_terms: Set[str] = set()
+    for item in items:
+        plan_terms |= extract_terms(item)
+
+    kept: List[str] = []
+    for paragraph in re.split(r'\n\s*\n', findings.strip()):
+        if not paragraph.strip():
+            continue
+        lowered = paragraph.lower()
+        if any(term in lowered for term in plan_terms):
+            kept.append(paragraph.strip())
+            result.kept_chars += len(paragraph)
+        else:
+            result.discarded_chars += len(paragraph)
+
+    result.kept_text = "\n\n".join(kept)
+    return result
+
+
+@dataclass
+class SpeculationReport:
+    """
+    先行実行の効果の記録
+
+    estimated_saving_seconds は、先行調査の所要時間を通常のResearcherの所要時間とみなして
+    「Coordinator完了後にResearcherを実行した場合」の完了時刻と比べた短縮時間です。
+    wasted_tokens は先行調査のトークンのうち、破棄した結果の割合に相当する分です
+    （先行調査が失敗した場合や計画と照合できずに通常の調査をやり直した場合は全量）。
+    error は先行調査が失敗した場合のエラーです。
+    """
+
+    enabled: bool = True
+    covered_items: List[str] = field(default_factory=list)
+    followup_items: List[str] = field(default_factory=list)
+    fallback: bool = False
+    speculative_seconds: Optional[float] = None
+    followup_seconds: float = 0.0
+    kept_chars: int = 0
+    discarded_chars: int = 0
+    speculative_tokens: int = 0
+    wasted_tokens: int = 0
+    estimated_saving_seconds: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return asdict(self)
+
+
+def estimate_saving(
+    coordinator_end: float,
+    speculative_start: float,
+    speculative_end: float,
+    followup_seconds: float
+) -> float:
+    """
+    先行実行による短縮時間を見積もる
+
+    通常はCoordinator完了後に1回分のResearcher（先行調査と同程度の時間）を実行するため、
+    coordinator_end + 先行調査の所要時間 に完了します。先行実行では
+    Coordinatorと先行調査の遅い方の完了後に追加調査を行うため、その差を短縮時間とします。
+
+    Args:
+        coordinator_end: Coordinatorの完了時刻（time.perf_counter）
+        speculative_start: 先行調査の開始時刻
+        speculative_end: 先行調査の完了時刻
+        followup_seconds: 追加調査の所要時間
+
+    Returns:
+        短縮時間（秒、負の場合は遅くなった）
+    """
+    baseline_end = coordinator_end + (speculative_end - speculative_start)
+    actual_end = max(coordinator_end, speculative_end) + followup_seconds
+    return baseline_end - actual_end
@@ -0,0 +1,331 @@
+"""
+ワークフローのトレーシング
+
+フェーズ・エージェント呼び出し・ツール呼び出し・エージェント初期化をスパンとして記録します。
+スパンの開始・終了はモノトニック時計（time.perf_counter_ns）で測り、
+JSONLまたはOpenTelemetry互換（OTLP/JSON）形式でファイルに出力できます。
+
+トレーサーは ContextVar で引き継ぐため、run() の中で呼ばれたツールやノードは
+自動的に同じトレースに記録されます。トレーサーがない場合のスパンは何も記録しません。
+"""
+
+import functools
+import json
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Union
+
+# 実行中のトレーサーと、現在のスパン（子スパンの親になる）
+_current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("current_tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+@dataclass
+class Span:
+    """
+    1区間の計測結果
+
+    start_ns / end_ns はモノトニック時計の値で、start_unix_ns はエクスポート用の壁時計時刻です。
+    """
+
+    name: str
+    kind: str
+    trace_id: str
+    span_id: str
+    parent_id: Optional[str]
+    start_ns: int
+    start_unix_ns: int
+    end_ns: Optional[int] = None
+    status: str = "ok"
+    error: Optional[str] = None
+    attributes: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def duration_seconds(self) -> float:
+        """所要時間（秒、終了前は0）"""
+        return (self.end_ns - self.start_ns) / 1e9 if self.end_ns is not None else 0.0
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """属性を設定"""
+        self.attributes[key] = value
+
+    def add(self, key: str, amount: Union[int, float]) -> None:
+        """数値の属性に加算"""
+        self.attributes[key] = self.attributes.get(key, 0) + amount
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSONL出力用の辞書"""
+        return {
+            "name": self.name,
+            "kind": self.kind,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_ns": self.start_ns,
+            "end_ns": self.end_ns,
+            "start_unix_ns": self.start_unix_ns,
+            "duration_seconds": self.duration_seconds,
+            "status": self.status,
+            "error": self.error,
+            "attributes": dict(self.attributes),
+        }
+
+
+class _NoopSpan:
+    """トレーサーがない場合のスパン（記録しない）"""
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def add(self, key: str, amount: Union[int, float]) -> None:
+        pass
+
+
+_NOOP_SPAN = _NoopSpan()
+
+
+class Tracer:
+    """1回の実行分のスパンを集めるトレーサー"""
+
+    def __init__(self, trace_id: Optional[str] = None):
+        """
+        トレーサー初期化
+
+        Args:
+            trace_id: トレースID（省略時は自動生成、32桁の16進数）
+        """
+        self.trace_id = trace_id or uuid.uuid4().hex
+        self.spans: List[Span] = []
+
+    @contextmanager
+    def activate(self) -> Iterator["Tracer"]:
+        """このトレーサーを現在のコンテキストで有効にする"""
+        token = _current_tracer.set(self)
+        try:
+            yield self
+        finally:
+            _current_tracer.reset(token)
+
+    @contextmanager
+    def start_span(self, name: str, kind: str = "internal", **attributes: Any) -> Iterator[Span]:
+        """
+        スパンを開始し、ブロックの終了時に閉じる
+
+        ブロック内で例外が発生した場合は status=error として記録し、例外を再送出します。
+
+        Args:
+            name: スパン名
+            kind: 種別（workflow, node, phase, agent, tool, init など）
+            **attributes: 初期属性
+        """
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            kind=kind,
+            trace_id=self.trace_id,
+            span_id=uuid.uuid4().hex[:16],
+            parent_id=parent.span_id if parent is not None else None,
+            start_ns=time.perf_counter_ns(),
+            start_unix_ns=time.time_ns(),
+            attributes=dict(attributes)
+        )
+        self.spans.append(span)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.error = str(e) or type(e).__name__
+            raise
+        finally:
+            span.end_ns = time.perf_counter_ns()
+            _current_span.reset(token)
+
+
+def get_tracer() -> Optional[Tracer]:
+    """現在のコンテキストのトレーサー（ない場合はNone）"""
+    return _current_tracer.get()
+
+
+def current_span() -> Union[Span, _NoopSpan]:
+    """現在のスパン（ない場合は何も記録しないスパン）"""
+    return _current_span.get() or _NOOP_SPAN
+
+
+@contextmanager
+def span(name: str, kind: str = "internal", **attributes: Any) -> Iterator[Union[Span, _NoopSpan]]:
+    """
+    現在のトレーサーでスパンを記録する（トレーサーがなければ何もしない）
+
+    Args:
+        name: スパン名
+        kind: 種別
+        **attributes: 初期属性
+    """
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield _NOOP_SPAN
+        return
+    with tracer.start_span(name, kind, **attributes) as s:
+        yield s
+
+
+def traced_tool(func: Callable) -> Callable:
+    """
+    ツール関数の呼び出しをスパンとして記録するデコレーター
+
+    functools.wraps でシグネチャと説明を保つため、エージェントに渡すツールの
+    スキーマは元の関数と同じになります。
+
+    Args:
+        func: ツール関数
+
+    Returns:
+        スパンを記録するラッパー関数
+    """
+    @functools.wraps(func)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        with span(f"tool.{func.__name__}", "tool") as s:
+            s.set_attribute("input_chars", sum(len(str(v)) for v in (*args, *kwargs.values())))
+            result = func(*args, **kwargs)
+            s.set_attribute("output_chars", len(str(result)))
+            return result
+
+    return wrapper
+
+
+def summarize_spans(spans: List[Span]) -> Dict[str, Dict[str, Any]]:
+    """
+    フェーズごとの内訳を集計する
+
+    phase スパンを phase 属性ごとに合計し、その子孫のツール呼び出し数も数えます。
+    エージェント初期化（init スパン）は "init" としてまとめます。
+
+    Args:
+        spans: スパンのリスト
+
+    Returns:
+        フェーズ名をキーとする集計値（calls, seconds, prompt_chars, completion_chars,
+        input_tokens, output_tokens, retries, cache_hits, tool_calls）
+    """
+    by_id = {s.span_id: s for s in spans}
+
+    def phase_of(s: Span) -> Optional[str]:
+        while s is not None:
+            if s.kind == "phase":
+                return s.attributes.get("phase")
+            s = by_id.get(s.parent_id)
+        return None
+
+    keys = ("prompt_chars", "completion_chars", "input_tokens", "output_tokens", "retries")
+    summary: Dict[str, Dict[str, Any]] = {}
+    for s in spans:
+        phase = "init" if s.kind == "init" else phase_of(s)
+        if phase is None:
+            continue
+        entry = summary.setdefault(phase, {
+            "calls": 0, "seconds": 0.0, **{k: 0 for k in keys}, "cache_hits": 0, "tool_calls": 0
+        })
+        if s.kind in ("phase", "init"):
+            entry["calls"] += 1
+            entry["seconds"] += s.duration_seconds
+            entry["cache_hits"] += 1 if s.attributes.get("cache_hit") else 0
+        elif s.kind == "agent":
+            for key in keys:
+                entry[key] += s.attributes.get(key, 0)
+        elif s.kind == "tool":
+            entry["tool_calls"] += 1
+    return summary
+
+
+class JsonlSpanExporter:
+    """スパンを1行1件のJSONとしてファイルに追記するエクスポーター"""
+
+    def __init__(self, path: Union[str, Path]):
+        """
+        エクスポーター初期化
+
+        Args:
+            path: 出力先ファイル
+        """
+        self.path = Path(path)
+
+    def export(self, spans: List[Span]) -> None:
+        """スパンを書き出す"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            for s in spans:
+                f.write(json.dumps(s.to_dict(), ensure_ascii=False) + "\n")
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    """属性値をOTLPのAnyValue形式に変換"""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class OtlpJsonFileExporter:
+    """
+    OpenTelemetry互換（OTLP/JSON）のファイルエクスポーター
+
+    OpenTelemetry Collector のファイルエクスポーターと同じく、
+    1行に1つの ExportTraceServiceRequest（resourceSpans）を書き出します。
+    """
+
+    def __init__(self, path: Union[str, Path], service_name: str = "multi-llm-reasoning"):
+        """
+        エクスポーター初期化
+
+        Args:
+            path: 出力先ファイル
+            service_name: resource の service.name 属性
+        """
+        self.path = Path(path)
+        self.service_name = service_name
+
+    def to_request(self, spans: List[Span]) -> Dict[str, Any]:
+        """スパンをOTLPのリクエスト形式に変換"""
+        otlp_spans = []
+        for s in spans:
+            end_unix_ns = s.start_unix_ns + ((s.end_ns or s.start_ns) - s.start_ns)
+            otlp_span = {
+                "traceId": s.trace_id,
+                "spanId": s.span_id,
+                "name": s.name,
+                "kind": 1,  # SPAN_KIND_INTERNAL
+                "startTimeUnixNano": str(s.start_unix_ns),
+                "endTimeUnixNano": str(end_unix_ns),
+                "attributes": [
+                    {"key": key, "value": _otlp_value(value)}
+                    for key, value in {"span.kind": s.kind, **s.attributes}.items()
+                    if value is not None
+                ],
+                "status": {"code": 2, "message": s.error} if s.status == "error" else {"code": 1},
+            }
+            if s.parent_id:
+                otlp_span["parentSpanId"] = s.parent_id
+            otlp_spans.append(otlp_span)
+
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [
+                    {"key": "service.name", "value": {"stringValue": self.service_name}}
+                ]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": otlp_spans}],
+            }]
+        }
+
+    def export(self, spans: List[Span]) -> None:
+        """スパンを書き出す"""
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(self.to_request(spans), ensure_ascii=False) + "\n")
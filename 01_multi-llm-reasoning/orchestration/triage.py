@@ -0,0 +1,140 @@
+"""
+質問のトリアージ
+
+LLMを呼ばない軽量なルールで質問を simple / lookup / deep の3種類に分類し、
+種類ごとに短いフェーズグラフを選べるようにします。
+
+- simple: 計算式やあいさつ、短い定義の質問など。Summarizerが1回で直接回答する
+- lookup: 事実を調べれば答えられる質問。Coordinator → Researcher → Summarizer（Analyzerを省略）
+- deep: 比較・分析・予測などを求める質問。標準の4フェーズグラフ
+"""
+
+import re
+from dataclasses import asdict, dataclass, field
+from typing import Any, Dict
+
+# パスの種類
+PATHS = ("simple", "lookup", "deep")
+
+# 分析・考察を求める語（含まれる場合は deep）
+# 英語は "constant" や "consensus" に一致しないよう単語境界で区切る
+DEEP_PATTERN = re.compile(
+    r'比較|分析|考察|評価|予測|将来|展望|影響|要因|理由|なぜ|戦略|課題|メリット|デメリット|'
+    r'違い|推移|動向|傾向|現状と|長所|短所|どう(すべき|すれば|なる)|'
+    r'\b(compar(e|es|ed|ing|ison)|analy[sz]\w*|impacts?|why|trends?|pros|cons)\b',
+    re.IGNORECASE
+)
+
+# 調べれば答えられる事実や、時点によって答えが変わる情報を尋ねる語（含まれる場合は lookup）
+LOOKUP_PATTERN = re.compile(
+    r'いつ|どこ|誰|だれ|何年|何人|いくら|いくつ|どれくらい|最新|現在の|今日|今年|発表|価格|株価|人口|首都|天気|'
+    r'\b(when|where|who|how (many|much)|latest|current(ly)?|today|now|price|prices|stock|weather|news|population)\b',
+    re.IGNORECASE
+)
+
+# 計算式だけの質問（数字・演算子・括弧と末尾の「は？」など）
+ARITHMETIC_PATTERN = re.compile(r'^[\d\s０-９.,+\-*/×÷＋－()（）=＝^%％]+(は|って)?[?？。]*$')
+
+# 定義やあいさつなど、調査を必要としない短い質問
+SIMPLE_PATTERN = re.compile(
+    r'とは[?？。]*$|って何|の意味|こんにちは|ありがとう|^(what is|define|hello|hi)\b',
+    re.IGNORECASE
+)
+
+
+@dataclass
+class TriageDecision:
+    """トリアージの結果"""
+
+    path: str
+    reason: str
+    features: Dict[str, Any] = field(default_factory=dict)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return asdict(self)
+
+
+def classify_query(
+    query: str,
+    simple_max_chars: int = 40,
+    lookup_max_chars: int = 80
+) -> TriageDecision:
+    """
+    質問を simple / lookup / deep に分類する
+
+    分析を求める語を含む質問と lookup_max_chars を超える質問は deep、
+    計算式だけの質問は simple、事実や最新の情報を尋ねる語を含む lookup_max_chars 以下の質問は lookup、
+    それ以外の simple_max_chars 以下の定義・あいさつは simple とし、
+    どれにも当てはまらない場合は deep（従来どおりの4フェーズ）にします。
+    「what is the current price ...」のように定義の形でも最新の情報を尋ねる質問は調査が必要なため、
+    lookup の判定を simple より先に行います。
+
+    Args:
+        query: ユーザーからの質問
+        simple_max_chars: simple とみなす最大文字数
+        lookup_max_chars: lookup とみなす最大文字数
+
+    Returns:
+        TriageDecision: 分類結果と理由
+    """
+    text = query.strip()
+    deep_match = DEEP_PATTERN.search(text)
+    features = {
+        "query_length": len(text),
+        "deep_keyword": deep_match.group(0) if deep_match else None,
+    }
+
+    if ARITHMETIC_PATTERN.match(text):
+        return TriageDecision("simple", "arithmetic", features)
+    if deep_match:
+        return TriageDecision("deep", f"keyword({deep_match.group(0)})", features)
+    if len(text) > lookup_max_chars:
+        return TriageDecision("deep", f"long_query(>{lookup_max_chars})", features)
+
+    lookup_match = LOOKUP_PATTERN.search(text)
+    if lookup_match:
+        return TriageDecision("lookup", f"keyword({lookup_match.group(0)})", features)
+    if len(text) <= simple_max_chars and SIMPLE_PATTERN.search(text):
+        return TriageDecision("simple", "definition_or_greeting", features)
+    return TriageDecision("deep", "default", features)
+
+
+class QueryTriage:
+    """
+    設定に従って質問を分類するトリアージ
+
+    無効な場合は常に deep（標準の4フェーズグラフ）を返します。
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        simple_max_chars: int = 40,
+        lookup_max_chars: int = 80
+    ):
+        """
+        トリアージ初期化
+
+        Args:
+            enabled: 分類を行うか（Falseの場合は常にdeep）
+            simple_max_chars: simple とみなす最大文字数
+            lookup_max_chars: lookup とみなす最大文字数
+        """
+        self.enabled = enabled
+        self.simple_max_chars = simple_max_chars
+        self.lookup_max_chars = lookup_max_chars
+
+    def classify(self, query: str) -> TriageDecision:
+        """
+        質問の実行パスを決める
+
+        Args:
+            query: ユーザーからの質問
+
+        Returns:
+            TriageDecision: 選択したパスと理由
+        """
+        if not self.enabled:
+            return TriageDecision("deep", "disabled")
+        return classify_query(query, self.simple_max_chars, self.lookup_max_chars)
@@ -0,0 +1,281 @@
+"""
+Workflow Service - 常駐型ワークフローサービス
+
+エージェントを一度だけ初期化し、複数のクエリを同時実行数の上限付きで処理します。
+標準入力からJSONL形式でクエリを受け取り、結果を1行ずつJSONLで返すフロントエンドを備えます。
+
+使用例:
+  echo '{"id": "q1", "query": "量子コンピューターについて教えてください"}' | python service.py
+"""
+
+import asyncio
+import argparse
+import json
+import logging
+import signal
+import sys
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, TextIO
+
+# プロジェクトルートをパスに追加
+project_root = Path(__file__).parent
+sys.path.insert(0, str(project_root))
+
+from workflow import MultiAgentWorkflow
+from agents import close_clients
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class ServiceClosedError(RuntimeError):
+    """ドレイン開始後に新しいクエリが投入された場合の例外"""
+
+
+class WorkflowService:
+    """
+    常駐型のワークフローサービス
+
+    1つのMultiAgentWorkflow（初期化済みエージェント）を全リクエストで共有し、
+    リクエストごとの状態（実行履歴・ストリーミング通知先）は分離して扱います。
+    """
+
+    def __init__(
+        self,
+        workflow: Optional[MultiAgentWorkflow] = None,
+        max_concurrency: Optional[int] = None
+    ):
+        """
+        サービス初期化
+
+        Args:
+            workflow: 共有するワークフロー（省略時は新規作成）
+            max_concurrency: 同時に処理するクエリ数の上限（省略時はSettings.SERVICE_MAX_CONCURRENCY）
+        """
+        self.workflow = workflow or MultiAgentWorkflow()
+        self.max_concurrency = max_concurrency or settings.SERVICE_MAX_CONCURRENCY
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._accepting = True
+        self._in_flight = 0
+        self._idle: Optional[asyncio.Event] = None
+        self.stats = {"completed": 0, "failed": 0}
+
+    @property
+    def in_flight(self) -> int:
+        """処理中（待機中を含む）のクエリ数"""
+        return self._in_flight
+
+    async def start(self):
+        """エージェントを初期化（以降のクエリで再利用）"""
+        self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._idle = asyncio.Event()
+        self._idle.set()
+        await self.workflow.ensure_initialized()
+        logger.info(f"✅ ワークフローサービス起動（同時実行数: {self.max_concurrency}）")
+
+    async def submit(self, query: str, **run_kwargs: Any) -> Dict[str, Any]:
+        """
+        クエリを処理
+
+        同時実行数の上限に達している場合は空きが出るまで待機します。
+
+        Args:
+            query: ユーザーからの質問
+            **run_kwargs: MultiAgentWorkflow.run に渡す追加引数（on_delta など）
+
+        Returns:
+            ワークフローの実行結果
+
+        Raises:
+            ServiceClosedError: ドレイン開始後に呼ばれた場合
+        """
+        if not self._accepting:
+            raise ServiceClosedError("サービスは停止処理中のため新しいクエリを受け付けません")
+        if self._semaphore is None:
+            await self.start()
+
+        self._in_flight += 1
+        self._idle.clear()
+        try:
+            async with self._semaphore:
+                result = await self.workflow.run(query, **run_kwargs)
+            self.stats["completed"] += 1
+            return result
+
+        except Exception:
+            self.stats["failed"] += 1
+            raise
+
+        finally:
+            self._in_flight -= 1
+            if self._in_flight == 0:
+                self._idle.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """
+        新規受付を停止し、処理中のクエリの完了を待つ
+
+        Args:
+            timeout: 最大待機秒数（省略時はSettings.SERVICE_DRAIN_TIMEOUT）
+
+        Returns:
+            時間内に全クエリが完了した場合True
+        """
+        self._accepting = False
+        if self._idle is None:
+            return True
+
+        timeout = settings.SERVICE_DRAIN_TIMEOUT if timeout is None else timeout
+        logger.info(f"⏳ 処理中のクエリ{self._in_flight}件の完了を待機中...")
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            logger.warning(f"⚠️  ドレインがタイムアウトしました（残り{self._in_flight}件）")
+            return False
+
+    async def close(self, timeout: Optional[float] = None) -> bool:
+        """
+        ドレインして共有クライアントを閉じる
+
+        Args:
+            timeout: ドレインの最大待機秒数
+
+        Returns:
+            時間内に全クエリが完了した場合True
+        """
+        drained = await self.drain(timeout)
+        await close_clients()
+        return drained
+
+
+def _format_response(request_id: Any, result: Optional[Dict[str, Any]], error: Optional[str]) -> str:
+    """1件分の応答をJSONL行に整形"""
+    response: Dict[str, Any] = {"id": request_id}
+    if error is None:
+        response.update({
+            "final_answer": result["final_answer"],
+            "execution_time": result["execution_time"],
+        })
+    else:
+        response["error"] = error
+    return json.dumps(response, ensure_ascii=False)
+
+
+def _start_line_reader(
+    input_stream: TextIO,
+    loop: asyncio.AbstractEventLoop,
+    queue: "asyncio.Queue[Optional[str]]"
+) -> threading.Thread:
+    """
+    入力を別スレッドで1行ずつ読み取り、キューに渡す
+
+    ブロッキング読み込みでイベントループを止めないためのスレッドです。
+    デーモンスレッドなので、読み込み待ちのままでもプロセス終了を妨げません。
+    入力の終端ではNoneを渡します。
+    """
+    def reader():
+        for line in input_stream:
+            loop.call_soon_threadsafe(queue.put_nowait, line)
+        loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    thread = threading.Thread(target=reader, name="jsonl-reader", daemon=True)
+    thread.start()
+    return thread
+
+
+async def serve_jsonl(
+    service: WorkflowService,
+    input_stream: TextIO = sys.stdin,
+    output_stream: TextIO = sys.stdout
+):
+    """
+    JSONLフロントエンド
+
+    1行1リクエスト（{"id": ..., "query": ...}）を読み取り、完了した順に
+    1行1レスポンスを書き出します。入力の終端またはSIGTERMで新規受付を止め、
+    処理中のクエリの完了を待ってから戻ります。
+
+    Args:
+        service: 起動済みのワークフローサービス
+        input_stream: リクエストの入力元
+        output_stream: レスポンスの出力先
+    """
+    loop = asyncio.get_running_loop()
+    lines: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    stop = asyncio.Event()
+    tasks = set()
+
+    # SIGTERMでグレースフルに停止（未対応のプラットフォームでは入力終端のみ）
+    try:
+        loop.add_signal_handler(signal.SIGTERM, stop.set)
+    except (NotImplementedError, RuntimeError):
+        pass
+
+    async def handle(line_no: int, line: str):
+        request_id: Any = line_no
+        try:
+            request = json.loads(line)
+            request_id = request.get("id", line_no)
+            # テナントを指定したリクエストはテナントごとのレート制限の対象にする
+            run_kwargs = {"tenant": request["tenant"]} if "tenant" in request else {}
+            result = await service.submit(request["query"], **run_kwargs)
+            output = _format_response(request_id, result, None)
+        except Exception as e:
+            output = _format_response(request_id, None, str(e))
+        output_stream.write(output + "\n")
+        output_stream.flush()
+
+    _start_line_reader(input_stream, loop, lines)
+
+    line_no = 0
+    while not stop.is_set():
+        getter = asyncio.ensure_future(lines.get())
+        stopper = asyncio.ensure_future(stop.wait())
+        await asyncio.wait({getter, stopper}, return_when=asyncio.FIRST_COMPLETED)
+        stopper.cancel()
+        if not getter.done():
+            getter.cancel()
+            break
+
+        line = getter.result()
+        if line is None:
+            break
+        line_no += 1
+        if not line.strip():
+            continue
+        task = asyncio.create_task(handle(line_no, line))
+        tasks.add(task)
+        task.add_done_callback(tasks.discard)
+
+    # 受付済みのリクエストを処理し終えてから停止
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
+    await service.drain()
+
+
+async def main():
+    """メイン関数"""
+    parser = argparse.ArgumentParser(
+        description="Workflow Service - 常駐型マルチエージェントワークフロー（標準入力JSONL）"
+    )
+    parser.add_argument(
+        "-c", "--max-concurrency",
+        type=int,
+        default=None,
+        help=f"同時に処理するクエリ数（デフォルト: {settings.SERVICE_MAX_CONCURRENCY}）"
+    )
+    args = parser.parse_args()
+    settings.validate()
+
+    service = WorkflowService(max_concurrency=args.max_concurrency)
+    await service.start()
+    try:
+        await serve_jsonl(service)
+    finally:
+        await service.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,162 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from agents.clients import CachedTokenProvider, ClientRegistry
+
+
+@pytest.fixture(autouse=True)
+def _azure_endpoint(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+
+
+class _AccessToken:
+    def __init__(self, token: str, expires_on: float):
+        self.token = token
+        self.expires_on = expires_on
+
+
+class _FakeCredential:
+    def __init__(self, clock):
+        self.clock = clock
+        self.calls = 0
+        self.closed = False
+
+    async def get_token(self, *scopes):
+        self.calls += 1
+        await asyncio.sleep(0)
+        return _AccessToken(f"token-{self.calls}", self.clock() + 3600)
+
+    async def close(self):
+        self.closed = True
+
+
+def test_token_provider_caches_until_refresh_margin():
+    now = {"t": 0.0}
+    clock = lambda: now["t"]
+    credential = _FakeCredential(clock)
+    provider = CachedTokenProvider(credential, refresh_margin=300, clock=clock)
+
+    async def scenario():
+        first = await asyncio.gather(*(provider() for _ in range(5)))
+        now["t"] = 3000
+        cached = await provider()
+        now["t"] = 3301
+        refreshed = await provider()
+        return first, cached, refreshed
+
+    first, cached, refreshed = asyncio.run(scenario())
+    assert set(first) == {"token-1"}
+    assert cached == "token-1"
+    assert refreshed == "token-2"
+    assert credential.calls == 2
+
+
+def test_registry_reuses_clients_and_shares_http_pool():
+    registry = ClientRegistry()
+
+    async def scenario():
+        a = registry.get_chat_client("https://example.openai.azure.com", "gpt-5", "key")
+        b = registry.get_chat_client("https://example.openai.azure.com", "gpt-5", "key")
+        c = registry.get_chat_client("https://example.openai.azure.com", "gpt-5-mini", "key")
+        http = registry.get_http_client()
+        await registry.close()
+        return a, b, c, http
+
+    a, b, c, http = asyncio.run(scenario())
+    assert a is b
+    assert a is not c
+    assert a.deployment_name == "gpt-5" and c.deployment_name == "gpt-5-mini"
+    assert a.client._client is http and c.client._client is http
+    assert http.is_closed
+
+
+def test_warm_up_fetches_token_and_opens_connection_once():
+    import httpx
+
+    requests = []
+
+    def handler(request):
+        requests.append(request.method)
+        return httpx.Response(404)
+
+    registry = ClientRegistry()
+    credential = _FakeCredential(lambda: 0.0)
+
+    async def scenario():
+        registry.get_http_client()
+        registry._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        registry._token_provider = CachedTokenProvider(credential, clock=lambda: 0.0)
+        report = await registry.warm_up("https://example.openai.azure.com")
+        token = await registry.get_token_provider()()
+        await registry.close()
+        return report, token
+
+    report, token = asyncio.run(scenario())
+    assert requests == ["HEAD"]
+    assert report["errors"] == []
+    assert report["credential_seconds"] is not None and report["connection_seconds"] is not None
+    # 事前に取得したトークンが最初のリクエストで使われる
+    assert token == "token-1" and credential.calls == 1
+
+
+def test_warm_up_reports_failures_without_raising():
+    import httpx
+
+    def handler(request):
+        raise httpx.ConnectError("unreachable", request=request)
+
+    registry = ClientRegistry()
+
+    async def scenario():
+        registry.get_http_client()
+        registry._http_client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+        report = await registry.warm_up("https://example.openai.azure.com", api_key="key")
+        await registry.close()
+        return report
+
+    report = asyncio.run(scenario())
+    assert report["credential_seconds"] is None
+    assert report["connection_seconds"] is None
+    assert report["errors"] and "ConnectError" in report["errors"][0]
+
+
+def test_registry_keys_api_key_clients_by_key():
+    registry = ClientRegistry()
+
+    async def scenario():
+        a = registry.get_chat_client("https://example.openai.azure.com", "gpt-5", "key-a")
+        b = registry.get_chat_client("https://example.openai.azure.com", "gpt-5", "key-b")
+        await registry.close()
+        return a, b
+
+    a, b = asyncio.run(scenario())
+    assert a is not b
+
+
+def test_loop_change_closes_previous_pool_and_credential():
+    registry = ClientRegistry()
+    credential = _FakeCredential(lambda: 0.0)
+
+    async def first_run():
+        registry.get_chat_client("https://example.openai.azure.com", "gpt-5", "key")
+        registry._token_provider = CachedTokenProvider(credential, clock=lambda: 0.0)
+        return registry.get_http_client()
+
+    async def second_run():
+        http = registry.get_http_client()
+        await registry.close()
+        return http
+
+    old_http = asyncio.run(first_run())
+    new_http = asyncio.run(second_run())
+    assert new_http is not old_http
+    assert old_http.is_closed
+    assert credential.closed
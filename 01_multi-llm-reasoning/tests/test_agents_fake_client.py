@@ -0,0 +1,114 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from agent_framework import ChatAgent
+
+from agents.fake_client import FakeChatClient, LatencyModel, ScriptRule, split_tokens
+from orchestration.retry import RetryPolicy, get_retry_after, get_status_code, is_retryable
+
+
+@pytest.fixture(autouse=True)
+def _azure_endpoint(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+
+
+def test_scripted_response_with_usage_and_streaming():
+    client = FakeChatClient(script=[
+        ScriptRule(match="量子", response="量子の回答です。"),
+        ScriptRule(response="既定の回答"),
+    ])
+    agent = ChatAgent(chat_client=client, name="A", instructions="指示")
+
+    async def run():
+        response = await agent.run("量子コンピューターとは？")
+        chunks = [update.text async for update in agent.run_stream("天気は？")]
+        return response, chunks
+
+    response, chunks = asyncio.run(run())
+
+    assert response.text == "量子の回答です。"
+    assert response.usage_details.output_token_count == len(split_tokens("量子の回答です。"))
+    assert response.usage_details.input_token_count > 0
+    assert "".join(chunks) == "既定の回答"
+    assert len([c for c in chunks if c]) == len(split_tokens("既定の回答"))
+    assert client.calls == 2
+
+
+def test_default_response_is_deterministic():
+    client = FakeChatClient(model_id="gpt-5", response_chars=50)
+    agent = ChatAgent(chat_client=client, name="A", instructions="指示")
+
+    first = asyncio.run(agent.run("質問"))
+    second = asyncio.run(agent.run("質問"))
+
+    assert first.text == second.text
+    assert len(first.text) == 50
+    assert "gpt-5" in first.text
+
+
+def test_injected_429_is_retryable_with_retry_after():
+    client = FakeChatClient(failure_rate=1.0, failure_kinds=["429"], retry_after=2)
+    agent = ChatAgent(chat_client=client, name="A", instructions="指示")
+
+    with pytest.raises(Exception) as exc_info:
+        asyncio.run(agent.run("質問"))
+
+    assert get_status_code(exc_info.value) == 429
+    assert get_retry_after(exc_info.value) == 2
+    assert is_retryable(exc_info.value)
+    assert client.failures == {"429": 1}
+
+
+def test_injected_timeout_triggers_retry_policy_timeout():
+    client = FakeChatClient(script=[ScriptRule(fail="timeout")], timeout_after=5)
+    agent = ChatAgent(chat_client=client, name="A", instructions="指示")
+
+    async def no_sleep(seconds):
+        pass
+
+    policy = RetryPolicy(max_retries=1, timeout=0.05, sleep=no_sleep)
+    attempts = []
+    with pytest.raises(asyncio.TimeoutError):
+        asyncio.run(policy.call(lambda: agent.run("質問"), attempts))
+
+    assert [a["status"] for a in attempts] == ["timeout", "timeout"]
+
+
+def test_latency_model_distributions_are_non_negative_and_seeded():
+    for distribution in ("fixed", "uniform", "normal", "lognormal", "exponential"):
+        model = LatencyModel(distribution, mean=0.2, stddev=0.1)
+        samples = [model.sample(random.Random(1)) for _ in range(3)]
+        assert all(s >= 0 for s in samples)
+        assert len(set(samples)) == 1
+
+    with pytest.raises(ValueError):
+        LatencyModel("bimodal", mean=1).sample(random.Random())
+
+
+def test_workflow_runs_against_fake_backend(monkeypatch):
+    import importlib
+
+    from agents import fake_client
+
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(wf.settings, "FAKE_LLM_LATENCY_MEAN", 0.0)
+    fake_client.reset_fake_clients()
+
+    try:
+        workflow = wf.MultiAgentWorkflow(use_cache=False, use_checkpoints=False)
+        result = asyncio.run(workflow.run("量子コンピューターとは？"))
+    finally:
+        fake_client.reset_fake_clients()
+
+    assert "フェイク応答" in result["final_answer"]
+    assert result["usage"]["output_tokens"] > 0
@@ -0,0 +1,57 @@
+import asyncio
+import importlib
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+
+@pytest.fixture(autouse=True)
+def _azure_endpoint(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+
+
+def _import_benchmark(monkeypatch):
+    monkeypatch.setenv("LLM_BACKEND", "fake")
+    bench = importlib.import_module("benchmarks.workflow_benchmark")
+    # configure_fake_backend が書き換える設定をテスト後に戻す
+    for name in ("LLM_BACKEND", "FAKE_LLM_LATENCY_MEAN", "FAKE_LLM_LATENCY_STDDEV",
+                 "FAKE_LLM_LATENCY_DISTRIBUTION", "FAKE_LLM_TOKENS_PER_SECOND", "FAKE_LLM_FAILURE_RATE"):
+        monkeypatch.setattr(bench.settings, name, getattr(bench.settings, name))
+    return bench
+
+
+def test_run_suite_reports_latency_throughput_and_memory(monkeypatch):
+    bench = _import_benchmark(monkeypatch)
+
+    try:
+        result = asyncio.run(bench.run_suite(runs=3, concurrency_levels=[1, 2], memory_runs=4, latency=0.0))
+    finally:
+        bench.fake_client.reset_fake_clients()
+
+    assert result["latency"]["runs"] == 3
+    assert result["latency"]["p50_seconds"] <= result["latency"]["p99_seconds"]
+    assert [t["concurrency"] for t in result["throughput"]] == [1, 2]
+    assert all(t["qps"] > 0 for t in result["throughput"])
+    assert set(result["phase_overhead"]) >= {"coordinator", "researcher", "analyzer", "summarizer", "workflow"}
+    assert result["memory"]["runs"] == 4 and result["memory"]["timeline"]
+
+
+def test_percentile_and_compare_results(monkeypatch):
+    bench = _import_benchmark(monkeypatch)
+
+    assert bench.percentile([3, 1, 2, 4], 50) == 2
+    assert bench.percentile([3, 1, 2, 4], 99) == 4
+    assert bench.percentile([], 95) == 0.0
+
+    baseline = {"latency": {"overhead_p50_seconds": 0.001, "overhead_p95_seconds": 0.002},
+                "memory": {"growth_bytes_per_run": 100}}
+    current = {"latency": {"overhead_p50_seconds": 0.0011, "overhead_p95_seconds": 0.004},
+               "memory": None}
+    regressions = bench.compare_results(current, baseline, tolerance=0.2)
+    assert len(regressions) == 1 and regressions[0].startswith("latency.overhead_p95_seconds")
@@ -3,14 +3,27 @@ import sys
 from pathlib import Path
 
 import builtins
+import importlib
 import types
 
+import pytest
+
 # Ensure project dir on path
 PROJECT_DIR = Path(__file__).resolve().parents[1]
 if str(PROJECT_DIR) not in sys.path:
     sys.path.insert(0, str(PROJECT_DIR))
 
 
+ENDPOINT = "https://example.openai.azure.com"
+
+
+@pytest.fixture(autouse=True)
+def _azure_endpoint(monkeypatch):
+    # main.py は起動時に settings.validate() で検証するため、読み込み済みの設定にも反映する
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", ENDPOINT)
+    monkeypatch.setattr(type(importlib.import_module("main").settings), "AZURE_OPENAI_ENDPOINT", ENDPOINT)
+
+
 async def _fake_workflow(query: str):
     # Minimal shape expected by main.py
     return {
@@ -27,8 +40,6 @@ async def _fake_workflow(query: str):
 
 def test_main_cli_runs_with_stubbed_workflow(monkeypatch):
     # Prepare environment
-    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
-
     import importlib
     main = importlib.import_module("main")
 
@@ -43,3 +54,138 @@ def test_main_cli_runs_with_stubbed_workflow(monkeypatch):
     # Run the async main
     asyncio.run(main.main())
 
+
+
+def test_main_cli_stream_prints_summarizer_deltas(monkeypatch, capsys):
+    import importlib
+    main = importlib.import_module("main")
+
+    async def fake_streaming_workflow(query: str, on_delta=None):
+        on_delta("coordinator", "計画")
+        on_delta("summarizer", "ストリーム")
+        on_delta("summarizer", "回答")
+        return await _fake_workflow(query)
+
+    monkeypatch.setattr(main, "run_multi_agent_workflow", fake_streaming_workflow)
+    monkeypatch.setattr(sys, "argv", ["prog", "テスト質問", "--no-banner", "--stream"])
+
+    asyncio.run(main.main())
+
+    out = capsys.readouterr().out
+    assert "ストリーム回答" in out
+    assert "計画" not in out
+    assert "回答: テスト質問" not in out
+
+
+class _FakeBatchWorkflow:
+    """MultiAgentWorkflow の代わりに使うバッチ用スタブ"""
+
+    calls = []
+
+    def __init__(self, **kwargs):
+        pass
+
+    async def ensure_initialized(self):
+        pass
+
+    async def run(self, query: str):
+        _FakeBatchWorkflow.calls.append(query)
+        if query == "失敗":
+            raise RuntimeError("boom")
+        return {
+            "final_answer": f"回答: {query}",
+            "execution_time": 0.1,
+            "usage": {"total": {"input_tokens": 3, "output_tokens": 5}},
+        }
+
+
+def test_main_cli_batch_writes_jsonl_and_resumes(monkeypatch, tmp_path):
+    import json
+    import importlib
+
+    main = importlib.import_module("main")
+    monkeypatch.setattr(main, "MultiAgentWorkflow", _FakeBatchWorkflow)
+    _FakeBatchWorkflow.calls = []
+
+    batch_file = tmp_path / "questions.txt"
+    batch_file.write_text("質問A\n\n失敗\n質問B\n", encoding="utf-8")
+    output_file = tmp_path / "out.jsonl"
+    argv = ["prog", "--no-banner", "--batch", str(batch_file),
+            "--batch-output", str(output_file), "--concurrency", "2"]
+
+    monkeypatch.setattr(sys, "argv", argv)
+    asyncio.run(main.main())
+
+    records = {r["id"]: r for r in map(json.loads, output_file.read_text(encoding="utf-8").splitlines())}
+    assert set(records) == {"1", "3", "4"}
+    assert records["1"]["status"] == "ok"
+    assert records["1"]["final_answer"] == "回答: 質問A"
+    assert records["1"]["usage"]["total"]["output_tokens"] == 5
+    assert records["3"]["status"] == "error"
+
+    # 再実行では失敗した質問だけを処理する
+    _FakeBatchWorkflow.calls = []
+    asyncio.run(main.main())
+    assert _FakeBatchWorkflow.calls == ["失敗"]
+
+
+def test_load_batch_queries_accepts_jsonl(monkeypatch, tmp_path):
+    import importlib
+
+    main = importlib.import_module("main")
+
+    batch_file = tmp_path / "questions.jsonl"
+    batch_file.write_text('{"id": "q1", "query": "A"}\n{"query": "B"}\n', encoding="utf-8")
+
+    assert main.load_batch_queries(batch_file) == [("q1", "A"), ("2", "B")]
+
+
+def test_main_cli_resume_passes_run_id_without_query(monkeypatch):
+    import importlib
+
+    main = importlib.import_module("main")
+    received = {}
+
+    async def fake_workflow(query: str, resume=None):
+        received.update(query=query, resume=resume)
+        return await _fake_workflow("保存された質問")
+
+    monkeypatch.setattr(main, "run_multi_agent_workflow", fake_workflow)
+    monkeypatch.setattr(sys, "argv", ["prog", "--no-banner", "--resume", "run-1"])
+
+    asyncio.run(main.main())
+
+    assert received == {"query": "", "resume": "run-1"}
+
+
+def test_main_cli_profile_prints_phase_table(monkeypatch, capsys):
+    import importlib
+    main = importlib.import_module("main")
+
+    async def fake_profiled_workflow(query: str):
+        result = await _fake_workflow(query)
+        result["profile"] = {
+            "analyzer": {
+                "calls": 1, "seconds": 1.5, "prompt_chars": 120, "completion_chars": 80,
+                "input_tokens": 40, "output_tokens": 20, "retries": 1, "cache_hits": 0, "tool_calls": 2,
+            }
+        }
+        return result
+
+    monkeypatch.setattr(main, "run_multi_agent_workflow", fake_profiled_workflow)
+    monkeypatch.setattr(sys, "argv", ["prog", "質問", "--no-banner", "--profile"])
+
+    asyncio.run(main.main())
+
+    out = capsys.readouterr().out
+    assert "フェーズごとの内訳" in out
+    assert "analyzer" in out and "1.50" in out
+
+
+def test_check_environment_uses_settings_validate(monkeypatch, capsys):
+    main = importlib.import_module("main")
+    monkeypatch.setattr(type(main.settings), "LLM_BACKEND", "azure")
+    monkeypatch.setattr(type(main.settings), "AZURE_OPENAI_ENDPOINT", "")
+
+    assert main.check_environment() is False
+    assert "AZURE_OPENAI_ENDPOINT" in capsys.readouterr().out
@@ -0,0 +1,77 @@
+"""
+起動時間の回帰テスト
+
+python -X importtime の出力から読み込んだモジュールと合計読み込み時間を集計し、
+--help と最初のクエリ（フェイクバックエンド）の起動コストが予算内かを確認します。
+"""
+
+import os
+import re
+import subprocess
+import sys
+from pathlib import Path
+from typing import Dict, Tuple
+
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+
+# 起動時の読み込み時間の予算（マイクロ秒）。計測値（--help 約0.12秒、最初のクエリ 約0.87秒）に余裕を持たせた値
+HELP_IMPORT_BUDGET_US = 300_000
+FIRST_QUERY_IMPORT_BUDGET_US = 2_500_000
+
+# --help では読み込まないモジュール
+HEAVY_MODULES = ("workflow", "agents", "agent_framework", "openai", "azure.identity")
+
+_IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+
+def _run_with_importtime(*args: str, **env: str) -> Tuple[subprocess.CompletedProcess, Dict[str, int], int]:
+    """main.py を -X importtime 付きで実行し、(結果, モジュールごとの累積時間, 合計時間) を返す"""
+    run_env = {**os.environ, "CHECKPOINT_ENABLED": "false", "TRACE_EXPORT_DIR": "", **env}
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "main.py", *args],
+        cwd=PROJECT_DIR,
+        env=run_env,
+        capture_output=True,
+        text=True,
+        encoding="utf-8",
+        timeout=120,
+    )
+    modules: Dict[str, int] = {}
+    total = 0
+    for line in proc.stderr.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        cumulative, indent, name = int(match.group(2)), match.group(3), match.group(4)
+        modules[name] = cumulative
+        if len(indent) == 1:
+            # トップレベルの読み込みだけを合計（入れ子は累積時間に含まれる）
+            total += cumulative
+    return proc, modules, total
+
+
+def test_help_does_not_import_heavy_modules():
+    proc, modules, total = _run_with_importtime("--help", AZURE_OPENAI_ENDPOINT="")
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert "使用例" in proc.stdout
+    loaded = [name for name in HEAVY_MODULES if name in modules]
+    assert loaded == []
+    assert total < HELP_IMPORT_BUDGET_US, f"--help の読み込み時間 {total / 1e6:.2f}秒"
+
+
+def test_first_query_cold_start_within_budget():
+    proc, modules, total = _run_with_importtime(
+        "2+2は？", "--no-banner",
+        LLM_BACKEND="fake",
+        FAKE_LLM_LATENCY_MEAN="0",
+        FAKE_LLM_FAILURE_RATE="0",
+        AZURE_OPENAI_API_KEY="",
+    )
+
+    assert proc.returncode == 0, proc.stderr[-2000:]
+    assert "最終回答" in proc.stdout
+    # フェイクバックエンドでは openai・Azure SDK を読み込まない
+    assert "openai" not in modules
+    assert "azure.identity" not in modules
+    assert total < FIRST_QUERY_IMPORT_BUDGET_US, f"最初のクエリの読み込み時間 {total / 1e6:.2f}秒"
@@ -0,0 +1,67 @@
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.cache import make_cache_key, ResponseCache
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_cache_key_depends_on_every_component():
+    base = make_cache_key("Coordinator", "gpt-5", "inst", "prompt")
+    assert base == make_cache_key("Coordinator", "gpt-5", "inst", "prompt")
+    assert base != make_cache_key("Coordinator", "gpt-5-mini", "inst", "prompt")
+    assert base != make_cache_key("Coordinator", "gpt-5", "inst2", "prompt")
+    assert base != make_cache_key("Analyzer", "gpt-5", "inst", "prompt")
+
+
+def test_lru_eviction_and_counters():
+    cache = ResponseCache(max_entries=2)
+    cache.set("a", "A")
+    cache.set("b", "B")
+    assert cache.get("a") == "A"  # a becomes most recent
+    cache.set("c", "C")           # evicts b
+
+    assert cache.get("b") is None
+    assert cache.get("c") == "C"
+    stats = cache.stats()
+    assert stats["hits"] == 2 and stats["misses"] == 1
+    assert stats["evictions"] == 1 and stats["size"] == 2
+
+
+def test_per_phase_ttl_expiry_and_disable():
+    clock = _Clock()
+    cache = ResponseCache(default_ttl=100, phase_ttls={"researcher": 10, "summarizer": 0}, clock=clock)
+    cache.set("r", "R", phase="researcher")
+    cache.set("c", "C", phase="coordinator")
+    cache.set("s", "S", phase="summarizer")
+
+    clock.now += 11
+    assert cache.get("r") is None
+    assert cache.get("c") == "C"
+    assert cache.get("s") is None
+
+
+def test_disk_tier_survives_new_instance(tmp_path):
+    db = tmp_path / "cache" / "responses.sqlite3"
+    first = ResponseCache(db_path=db)
+    first.set("k", "value", phase="analyzer")
+    first.close()
+
+    second = ResponseCache(db_path=db)
+    assert second.get("k") == "value"
+    assert second.stats()["disk_hits"] == 1
+    # promoted to memory tier
+    assert second.get("k") == "value"
+    assert second.stats()["memory_hits"] == 1
+    second.close()
@@ -0,0 +1,52 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.checkpoint import CheckpointStore
+
+
+def test_checkpoint_round_trip(tmp_path):
+    store = CheckpointStore(tmp_path)
+    run_id = store.create("質問")
+
+    store.save_output(run_id, "coordinator", "計画")
+    store.mark(run_id, "failed", "timeout")
+
+    checkpoint = store.load(run_id)
+    assert checkpoint["query"] == "質問"
+    assert checkpoint["outputs"] == {"coordinator": "計画"}
+    assert checkpoint["status"] == "failed"
+    assert checkpoint["error"] == "timeout"
+    assert not list(tmp_path.glob("*.tmp"))
+
+
+def test_load_missing_checkpoint_raises(tmp_path):
+    store = CheckpointStore(tmp_path)
+    with pytest.raises(KeyError):
+        store.load("missing")
+
+    run_id = store.create("質問", run_id="fixed")
+    assert run_id == "fixed" and store.exists("fixed")
+    store.delete("fixed")
+    assert not store.exists("fixed")
+
+
+def test_save_output_does_not_reread_running_checkpoint(tmp_path, monkeypatch):
+    store = CheckpointStore(tmp_path)
+    run_id = store.create("質問")
+
+    def fail_load(run_id):
+        raise AssertionError("保存のたびにファイルを読み直している")
+
+    monkeypatch.setattr(store, "load", fail_load)
+    store.save_output(run_id, "coordinator", "計画")
+    store.save_output(run_id, "researcher", "調査")
+    monkeypatch.undo()
+
+    assert store.load(run_id)["outputs"] == {"coordinator": "計画", "researcher": "調査"}
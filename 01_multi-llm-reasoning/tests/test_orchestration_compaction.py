@@ -0,0 +1,109 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.compaction import (
+    PHASE_SECTIONS,
+    estimate_tokens,
+    select_sections,
+    truncate_to_budget,
+    PromptCompactor,
+)
+
+
+COORDINATOR_OUTPUT = """【質問の理解】
+量子コンピューターの基礎を知りたい
+
+【必要な情報】
+- 量子ビット
+- 量子ゲート
+
+【分析の方向性】
+古典計算との違いに注目
+
+【次のステップへの指示】
+基礎から順に調査
+"""
+
+
+def test_select_sections_keeps_requested_headers_in_order():
+    result = select_sections(COORDINATOR_OUTPUT, ["分析の方向性", "質問の理解"])
+    assert result == "【分析の方向性】\n古典計算との違いに注目\n\n【質問の理解】\n量子コンピューターの基礎を知りたい"
+
+
+def test_select_sections_falls_back_to_full_text():
+    assert select_sections("見出しのない出力", ["質問の理解"]) == "見出しのない出力"
+
+
+def test_truncate_to_budget_respects_token_estimate():
+    text = "あ" * 200
+    truncated = truncate_to_budget(text, 50)
+    assert estimate_tokens(truncated) <= 50
+    assert truncated.endswith("（以下省略）")
+    assert truncate_to_budget(text, 0) == text
+    assert estimate_tokens("abcd" * 10) == 10
+
+
+def test_compactor_applies_strategies_and_records_savings():
+    compactor = PromptCompactor(
+        strategies=["budget", "sections"],
+        phase_budgets={"summarizer": 60}
+    )
+    outputs = {"coordinator": COORDINATOR_OUTPUT, "analyzer": "分析" * 100}
+
+    compacted, stats = compactor.compact("summarizer", outputs)
+
+    assert compacted["coordinator"].startswith("【質問の理解】")
+    assert "量子ゲート" not in compacted["coordinator"]
+    assert estimate_tokens(compacted["analyzer"]) <= 30
+    summary = stats.to_dict()
+    assert summary["saved_bytes"] == summary["original_bytes"] - summary["compacted_bytes"] > 0
+    assert set(summary["sources"]) == {"coordinator", "analyzer"}
+
+
+def test_compactor_rejects_unknown_strategy():
+    with pytest.raises(ValueError):
+        PromptCompactor(strategies=["llm"])
+
+
+def test_phase_sections_are_pinned():
+    # 変更すると後段のプロンプトに含まれる内容が変わるため、意図した変更の場合のみ更新する
+    assert PHASE_SECTIONS == {
+        "analyzer": {
+            "coordinator": ["質問の理解", "分析の方向性", "次のステップへの指示"],
+            "researcher": ["収集した情報", "追加の発見"],
+        },
+        "summarizer": {
+            "coordinator": ["質問の理解"],
+            "researcher": ["収集した情報"],
+            "analyzer": ["主要な発見", "パターンと傾向", "リスクと機会", "推論と洞察"],
+        },
+    }
+
+
+def test_sections_strategy_drops_unlisted_sections_per_phase():
+    compactor = PromptCompactor(strategies=["sections"])
+    researcher_output = "【調査項目】\n項目\n\n【収集した情報】\n情報\n\n【追加の発見】\n発見"
+    analyzer_output = "【分析の観点】\n観点\n\n【主要な発見】\n主要"
+
+    analyzer_inputs, _ = compactor.compact("analyzer", {
+        "coordinator": COORDINATOR_OUTPUT,
+        "researcher": researcher_output,
+    })
+    summarizer_inputs, _ = compactor.compact("summarizer", {
+        "coordinator": COORDINATOR_OUTPUT,
+        "researcher": researcher_output,
+        "analyzer": analyzer_output,
+    })
+
+    assert "【必要な情報】" not in analyzer_inputs["coordinator"]
+    assert "【追加の発見】" in analyzer_inputs["researcher"]
+    assert "【追加の発見】" not in summarizer_inputs["researcher"]
+    assert "【分析の観点】" not in summarizer_inputs["analyzer"]
+    assert "【主要な発見】" in summarizer_inputs["analyzer"]
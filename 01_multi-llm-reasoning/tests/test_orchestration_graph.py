@@ -0,0 +1,139 @@
+import asyncio
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.graph import PhaseNode, FanOutNode, PhaseGraph, GraphExecutor
+
+
+def _sleeper(name: str, delay: float, log: list):
+    async def func(ctx):
+        log.append(("start", name))
+        await asyncio.sleep(delay)
+        log.append(("end", name))
+        return f"{name}-out"
+
+    return func
+
+
+def test_validate_returns_topological_order():
+    graph = PhaseGraph([
+        PhaseNode("c", _sleeper("c", 0, []), depends_on=["a", "b"]),
+        PhaseNode("a", _sleeper("a", 0, [])),
+        PhaseNode("b", _sleeper("b", 0, []), depends_on=["a"]),
+    ])
+    assert graph.validate() == ["a", "b", "c"]
+
+
+def test_validate_rejects_cycles_and_unknown_deps():
+    cyclic = PhaseGraph([
+        PhaseNode("a", _sleeper("a", 0, []), depends_on=["b"]),
+        PhaseNode("b", _sleeper("b", 0, []), depends_on=["a"]),
+    ])
+    with pytest.raises(ValueError):
+        cyclic.validate()
+
+    unknown = PhaseGraph([PhaseNode("a", _sleeper("a", 0, []), depends_on=["missing"])])
+    with pytest.raises(ValueError):
+        unknown.validate()
+
+
+def test_independent_nodes_run_concurrently():
+    log = []
+    graph = PhaseGraph([
+        PhaseNode("root", _sleeper("root", 0, log)),
+        PhaseNode("left", _sleeper("left", 0.05, log), depends_on=["root"]),
+        PhaseNode("right", _sleeper("right", 0.05, log), depends_on=["root"]),
+        PhaseNode("join", _sleeper("join", 0, log), depends_on=["left", "right"]),
+    ])
+    executor = GraphExecutor(graph)
+    outputs = asyncio.run(executor.run({"query": "q"}))
+
+    assert outputs["join"] == "join-out"
+    # left and right both start before either finishes
+    starts = [i for i, e in enumerate(log) if e in (("start", "left"), ("start", "right"))]
+    ends = [i for i, e in enumerate(log) if e in (("end", "left"), ("end", "right"))]
+    assert max(starts) < min(ends)
+    assert [t.node for t in executor.timings][-1] == "join"
+    assert all(t.status == "completed" for t in executor.timings)
+
+
+def test_fanout_node_bounds_concurrency_and_merges():
+    active = {"now": 0, "peak": 0}
+
+    async def worker(item, ctx):
+        active["now"] += 1
+        active["peak"] = max(active["peak"], active["now"])
+        await asyncio.sleep(0.01)
+        active["now"] -= 1
+        return item * 2
+
+    graph = PhaseGraph([
+        FanOutNode(
+            "fan",
+            split=lambda ctx: list(range(6)),
+            worker=worker,
+            merge=lambda results, ctx: sum(results),
+            max_concurrency=2,
+        )
+    ])
+    outputs = asyncio.run(GraphExecutor(graph).run({}))
+    assert outputs["fan"] == 30
+    assert active["peak"] == 2
+
+
+def test_failure_cancels_and_records_status():
+    async def boom(ctx):
+        raise RuntimeError("boom")
+
+    graph = PhaseGraph([
+        PhaseNode("slow", _sleeper("slow", 1, [])),
+        PhaseNode("bad", boom),
+    ])
+    timings = []
+    with pytest.raises(RuntimeError):
+        asyncio.run(GraphExecutor(graph, on_node_complete=timings.append).run({}))
+    statuses = {t.node: t.status for t in timings}
+    assert statuses == {"bad": "failed", "slow": "cancelled"}
+
+
+def test_precomputed_nodes_are_skipped():
+    calls = []
+
+    async def second(ctx):
+        calls.append("second")
+        return ctx["first"] + "!"
+
+    async def first(ctx):
+        calls.append("first")
+        return "fresh"
+
+    graph = PhaseGraph([
+        PhaseNode("first", first),
+        PhaseNode("second", second, depends_on=["first"]),
+    ])
+    outputs = asyncio.run(GraphExecutor(graph).run({"first": "cached"}))
+    assert outputs["second"] == "cached!"
+    assert calls == ["second"]
+
+
+def test_async_node_output_callback_is_awaited():
+    saved = []
+
+    async def save(name, output):
+        await asyncio.sleep(0)
+        saved.append((name, output))
+
+    graph = PhaseGraph([
+        PhaseNode("a", _sleeper("a", 0, [])),
+        PhaseNode("b", _sleeper("b", 0, []), depends_on=["a"]),
+    ])
+    asyncio.run(GraphExecutor(graph, on_node_output=save).run({"query": "q"}))
+
+    assert saved == [("a", "a-out"), ("b", "b-out")]
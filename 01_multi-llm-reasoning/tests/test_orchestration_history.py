@@ -0,0 +1,99 @@
+import json
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.history import HistoryStore
+
+
+def _entries(prompt: str, output: str = "短い出力"):
+    return [{"agent": "Summarizer", "input": prompt, "output": output}, {"node": "summarizer"}]
+
+
+def test_long_texts_are_stored_by_reference_and_shared():
+    store = HistoryStore(max_runs=0, preview_chars=10)
+    prompt = "長いプロンプト" * 20
+
+    first = store.add(_entries(prompt), "Q1")
+    second = store.add(_entries(prompt), "Q2")
+
+    entry = first.entries[0]
+    assert entry["input"] == prompt[:10] + "…"
+    assert entry["input_chars"] == len(prompt)
+    assert store.resolve(entry["input_ref"]) == prompt
+    assert entry["output"] == "短い出力" and "output_ref" not in entry
+    # 同じ文字列は1回だけ保持する
+    assert second.entries[0]["input_ref"] == entry["input_ref"]
+    assert store.stats()["texts"] == 1
+    assert store.expand(second)["entries"][0]["input"] == prompt
+
+
+def test_max_runs_evicts_oldest_and_spills_full_text(tmp_path):
+    spill = tmp_path / "history.jsonl"
+    store = HistoryStore(max_runs=2, spill_path=spill, preview_chars=5)
+
+    for i in range(4):
+        store.add(_entries(f"プロンプト{i}" * 5), f"Q{i}", history_id=f"h{i}")
+
+    assert [h.history_id for h in store.runs()] == ["h2", "h3"]
+    assert store.get("h0") is None
+    spilled = [json.loads(line) for line in spill.read_text(encoding="utf-8").splitlines()]
+    assert [r["history_id"] for r in spilled] == ["h0", "h1"]
+    assert spilled[0]["entries"][0]["input"] == "プロンプト0" * 5
+    assert "input_ref" not in spilled[0]["entries"][0]
+    # 破棄した履歴だけが参照していた文字列は解放される
+    assert store.stats() == {"runs": 2, "total_bytes": store.total_bytes, "texts": 2, "spilled_runs": 2}
+
+
+def test_max_bytes_keeps_total_under_cap_but_keeps_latest():
+    store = HistoryStore(max_runs=0, max_bytes=2000, preview_chars=10)
+
+    for i in range(10):
+        store.add(_entries(f"{i}" * 600), f"Q{i}")
+        assert store.total_bytes <= 2000 or len(store) == 1
+
+    assert 1 <= len(store) < 10
+    assert store.latest().query == "Q9"
+
+    store.add(_entries("x" * 5000), "big")
+    assert len(store) == 1 and store.latest().query == "big"
+
+
+def test_replacing_history_id_releases_previous_texts():
+    store = HistoryStore(max_runs=0, preview_chars=5)
+
+    store.add(_entries("古いプロンプト" * 5), "Q", history_id="h")
+    store.add(_entries("新しいプロンプト" * 5), "Q", history_id="h")
+
+    assert len(store) == 1
+    assert store.stats()["texts"] == 1
+    assert store.resolve(store.get("h").entries[0]["input_ref"]) == "新しいプロンプト" * 5
+    assert store.total_bytes == store.get("h").size_bytes + len(("新しいプロンプト" * 5).encode("utf-8"))
+
+
+def test_add_async_spills_off_the_event_loop(tmp_path):
+    import asyncio
+    import threading
+
+    spill = tmp_path / "history.jsonl"
+    store = HistoryStore(max_runs=1, spill_path=spill, preview_chars=5)
+    writers = []
+    spill_once = store._spill
+
+    def spill_and_record(history):
+        writers.append(threading.current_thread() is threading.main_thread())
+        spill_once(history)
+
+    store._spill = spill_and_record
+
+    async def scenario():
+        await store.add_async(_entries("プロンプト0" * 5), "Q0", history_id="h0")
+        await store.add_async(_entries("プロンプト1" * 5), "Q1", history_id="h1")
+
+    asyncio.run(scenario())
+    assert writers == [False]
+    assert [json.loads(line)["history_id"] for line in spill.read_text(encoding="utf-8").splitlines()] == ["h0"]
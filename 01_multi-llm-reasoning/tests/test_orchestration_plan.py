@@ -0,0 +1,49 @@
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.plan import split_sections, extract_section, parse_research_items
+
+
+PLAN = """
+【質問の理解】
+- 量子コンピューターの現状を知りたい
+
+【必要な情報】
+- 主要企業の最新ハードウェア動向
+  - 重要度: 高
+- 量子誤り訂正の研究状況
+・ 市場規模の推移
+1. 実用化事例
+
+【分析の方向性】
+- 技術と市場の両面
+"""
+
+
+def test_split_sections_keeps_order_and_bodies():
+    sections = split_sections(PLAN)
+    assert list(sections) == ["質問の理解", "必要な情報", "分析の方向性"]
+    assert sections["分析の方向性"] == "- 技術と市場の両面"
+
+
+def test_extract_section_missing_returns_empty():
+    assert extract_section(PLAN, "存在しない") == ""
+
+
+def test_parse_research_items_top_level_bullets():
+    items = parse_research_items(PLAN)
+    assert items == [
+        "主要企業の最新ハードウェア動向 / 重要度: 高",
+        "量子誤り訂正の研究状況",
+        "市場規模の推移",
+        "実用化事例",
+    ]
+
+
+def test_parse_research_items_without_section():
+    assert parse_research_items("計画なし") == []
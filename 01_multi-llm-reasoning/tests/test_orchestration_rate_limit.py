@@ -0,0 +1,145 @@
+import asyncio
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import pytest
+
+from orchestration.rate_limit import RateLimiter, TokenBucket
+
+
+class FakeClock:
+    """sleep すると時刻だけを進めるシミュレーション用の時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    async def sleep(self, seconds: float) -> None:
+        self.now += seconds
+        await asyncio.sleep(0)
+
+
+def _limiter(clock: FakeClock, **kwargs) -> RateLimiter:
+    return RateLimiter(clock=clock, sleep=clock.sleep, **kwargs)
+
+
+def test_token_bucket_refills_over_time():
+    clock = FakeClock()
+    bucket = TokenBucket(60, 1, clock)
+    bucket.consume(60)
+    assert bucket.wait_time(10) == 10
+    clock.now = 5
+    assert bucket.available == 5
+    # capacity を超える要求は満杯になれば通す
+    assert bucket.wait_time(100) == 55
+    bucket.refund(100)
+    assert bucket.available == 60
+
+
+def test_rpm_limit_spaces_requests_and_reports_waits():
+    clock = FakeClock()
+    limiter = _limiter(clock, rpm=2)
+
+    async def scenario():
+        return await asyncio.gather(*(limiter.acquire("gpt-5") for _ in range(4)))
+
+    tickets = asyncio.run(scenario())
+    assert [t.waited_seconds for t in tickets] == [0, 0, 30, 60]
+    assert [t.queue_position for t in tickets] == [0, 0, 0, 1]
+    assert tickets[3].estimated_wait_seconds == pytest.approx(60)
+
+
+def test_waiting_tenants_are_served_round_robin():
+    clock = FakeClock()
+    limiter = _limiter(clock, rpm=1)
+    order = []
+
+    async def request(tenant: str, label: str):
+        await limiter.acquire("gpt-5", tenant)
+        order.append(label)
+
+    async def scenario():
+        tasks = [asyncio.create_task(request("a", f"a{i}")) for i in range(4)]
+        await asyncio.sleep(0)
+        tasks.append(asyncio.create_task(request("b", "b0")))
+        await asyncio.gather(*tasks)
+
+    asyncio.run(scenario())
+    assert order == ["a0", "a1", "b0", "a2", "a3"]
+
+
+def test_tenant_quota_does_not_block_other_tenants():
+    clock = FakeClock()
+    limiter = _limiter(clock, rpm=100, tenant_rpm=1)
+    done = {}
+
+    async def request(tenant: str, label: str):
+        await limiter.acquire("gpt-5", tenant)
+        done[label] = clock.now
+
+    async def scenario():
+        await asyncio.gather(request("a", "a0"), request("a", "a1"), request("b", "b0"))
+
+    asyncio.run(scenario())
+    assert done["a0"] == 0 and done["b0"] == 0
+    assert done["a1"] == pytest.approx(60)
+
+
+def test_tpm_reservation_is_settled_with_actual_usage():
+    clock = FakeClock()
+    limiter = _limiter(clock, tpm=1000)
+
+    async def scenario():
+        first = await limiter.acquire("gpt-5", tokens=800)
+        # 実際には200トークンしか使わなかったので600トークンを戻す
+        limiter.settle(first, actual_tokens=200)
+        second = await limiter.acquire("gpt-5", tokens=800)
+        return second
+
+    second = asyncio.run(scenario())
+    assert second.waited_seconds == 0
+
+
+def test_backpressure_callback_and_status_report_queue_position():
+    clock = FakeClock()
+    limiter = _limiter(clock, rpm=1, deployment_limits={"gpt-5-mini": (0, 0)})
+    events = []
+
+    async def scenario():
+        await limiter.acquire("gpt-5", "a")
+        waiting = asyncio.create_task(limiter.acquire("gpt-5", "a", on_wait=events.append))
+        await asyncio.sleep(0)
+        status = limiter.status("gpt-5", "b")
+        unlimited = await limiter.acquire("gpt-5-mini", "b")
+        await waiting
+        return status, unlimited
+
+    status, unlimited = asyncio.run(scenario())
+    assert events == [{"deployment": "gpt-5", "tenant": "a", "queue_position": 0, "estimated_wait_seconds": 60.0}]
+    assert status["queue_length"] == 1
+    assert status["queue_position"] == 1
+    assert status["estimated_wait_seconds"] == pytest.approx(120)
+    assert unlimited.waited_seconds == 0
+
+
+def test_cancelled_waiter_leaves_the_queue():
+    clock = FakeClock()
+    limiter = _limiter(clock, rpm=1)
+
+    async def scenario():
+        await limiter.acquire("gpt-5", "a")
+        cancelled = asyncio.create_task(limiter.acquire("gpt-5", "a"))
+        await asyncio.sleep(0)
+        cancelled.cancel()
+        await asyncio.gather(cancelled, return_exceptions=True)
+        return limiter.status("gpt-5", "a")
+
+    status = asyncio.run(scenario())
+    assert status["queue_length"] == 0
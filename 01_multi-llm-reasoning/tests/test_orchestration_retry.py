@@ -0,0 +1,137 @@
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.retry import RetryPolicy, LatencyTracker, get_retry_after, is_retryable
+
+
+class _Response:
+    def __init__(self, headers):
+        self.headers = headers
+
+
+class _StatusError(Exception):
+    def __init__(self, status_code, headers=None):
+        super().__init__(f"status {status_code}")
+        self.status_code = status_code
+        self.response = _Response(headers or {})
+
+
+def _wrapped(inner):
+    # agent_framework は元の例外を __cause__ に保持する
+    try:
+        raise inner
+    except Exception as e:
+        try:
+            raise RuntimeError("service failed") from e
+        except RuntimeError as outer:
+            return outer
+
+
+def _policy(**kwargs):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    kwargs.setdefault("rng", random.Random(0))
+    return RetryPolicy(sleep=fake_sleep, **kwargs), sleeps
+
+
+def test_classifies_errors_through_cause_chain():
+    assert is_retryable(_wrapped(_StatusError(429)))
+    assert is_retryable(asyncio.TimeoutError())
+    assert not is_retryable(_wrapped(_StatusError(400)))
+    assert get_retry_after(_wrapped(_StatusError(429, {"retry-after": "7"}))) == 7.0
+    assert get_retry_after(_StatusError(429, {"retry-after-ms": "1500"})) == 1.5
+
+
+def test_retries_429_honouring_retry_after():
+    policy, sleeps = _policy(max_retries=3, timeout=None)
+    outcomes = [_wrapped(_StatusError(429, {"retry-after": "2"})), "ok"]
+
+    async def call():
+        outcome = outcomes.pop(0)
+        if isinstance(outcome, Exception):
+            raise outcome
+        return outcome
+
+    attempts = []
+    assert asyncio.run(policy.call(call, attempts=attempts)) == "ok"
+    assert sleeps == [2.0]
+    assert [a["status"] for a in attempts] == ["error", "ok"]
+    assert attempts[0]["status_code"] == 429
+
+
+def test_gives_up_on_non_retryable_and_after_max_retries():
+    policy, sleeps = _policy(max_retries=2, timeout=None, base_delay=1.0)
+
+    async def bad_request():
+        raise _StatusError(400)
+
+    with pytest.raises(_StatusError):
+        asyncio.run(policy.call(bad_request))
+    assert sleeps == []
+
+    async def unavailable():
+        raise _StatusError(503)
+
+    attempts = []
+    with pytest.raises(_StatusError):
+        asyncio.run(policy.call(unavailable, attempts=attempts))
+    assert len(attempts) == 3
+    # full jitter: 0〜base_delay * 2^retry
+    assert 0 <= sleeps[0] <= 1.0 and 0 <= sleeps[1] <= 2.0
+
+
+def test_timeout_per_attempt_then_retry():
+    policy, _ = _policy(max_retries=1, timeout=0.05)
+    calls = []
+
+    async def slow_then_fast():
+        calls.append(1)
+        if len(calls) == 1:
+            await asyncio.sleep(1)
+        return "fast"
+
+    attempts = []
+    assert asyncio.run(policy.call(slow_then_fast, attempts=attempts)) == "fast"
+    assert [a["status"] for a in attempts] == ["timeout", "ok"]
+
+
+def test_hedged_request_wins_when_primary_is_slow():
+    policy, _ = _policy(timeout=None, hedge=True, hedge_after=0.02)
+    started = []
+
+    async def call():
+        started.append(1)
+        if len(started) == 1:
+            await asyncio.sleep(1)
+            return "primary"
+        return "hedge"
+
+    attempts = []
+    assert asyncio.run(policy.call(call, attempts=attempts)) == "hedge"
+    assert attempts[0]["hedged"] is True
+    assert len(started) == 2
+
+
+def test_hedge_deadline_uses_latency_percentile():
+    tracker = LatencyTracker()
+    for seconds in range(1, 21):
+        tracker.record(float(seconds))
+    assert tracker.percentile(95) == 19.0
+
+    policy, _ = _policy(hedge=True, hedge_min_samples=3)
+    assert policy.hedge_deadline() is None
+    for seconds in (1.0, 2.0, 3.0):
+        policy.latency.record(seconds)
+    assert policy.hedge_deadline() == 3.0
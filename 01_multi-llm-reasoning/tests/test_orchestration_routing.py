@@ -0,0 +1,70 @@
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.routing import (
+    ModelRouter,
+    RoutingRule,
+    check_quality,
+    extract_features,
+)
+
+
+PLAN = "【必要な情報】\n- 項目1\n- 項目2\n- 項目3\n"
+
+
+def test_extract_features():
+    features = extract_features("2023年の売上を比較して", PLAN)
+    assert features.plan_items == 3
+    assert features.has_numeric is True
+    assert extract_features("量子とは？").has_numeric is False
+
+
+def test_default_rules_route_simple_queries_to_mini():
+    router = ModelRouter()
+    simple = extract_features("量子とは？", "【必要な情報】\n- 定義\n")
+    assert router.route("coordinator", simple).model == "gpt5-mini"
+    assert router.route("summarizer", simple).model == "gpt5-mini"
+    assert router.route("researcher", simple).model == "gpt5-mini"
+
+    numeric = extract_features("量子ビットは何個必要？ 2030年予測", PLAN)
+    decision = router.route("analyzer", numeric)
+    assert decision.model == "gpt5"
+    assert decision.reason == "default"
+
+
+def test_disabled_router_and_custom_rules():
+    features = extract_features("量子とは？")
+    assert ModelRouter(enabled=False).route("coordinator", features).model == "gpt5"
+
+    router = ModelRouter(rules=[RoutingRule("*", "gpt5-mini", max_query_length=3)])
+    assert router.route("analyzer", features).model == "gpt5"
+    assert router.route("analyzer", extract_features("短い")).model == "gpt5-mini"
+
+
+def test_quality_check_and_escalation():
+    assert check_quality("summarizer", "短い", min_chars=10) is not None
+    assert "必要な情報" in check_quality("coordinator", "あ" * 50, min_chars=10)
+    assert check_quality("coordinator", "【必要な情報】\n- 項目\n" + "あ" * 20, min_chars=10) is None
+
+    router = ModelRouter(min_output_chars=10)
+    mini = router.route("summarizer", extract_features("量子とは？"))
+    assert router.should_escalate(mini, "短い") is not None
+    assert router.should_escalate(mini, "十分な長さのある回答です。") is None
+    default = router.route("researcher", extract_features("量子とは？"))
+    assert router.should_escalate(default, "") is None
+
+
+def test_estimate_saving_uses_default_model_latency():
+    router = ModelRouter()
+    decision = router.route("summarizer", extract_features("量子とは？"))
+    decision.duration_seconds = 2.0
+    assert router.estimate_saving(decision) is None
+
+    for seconds in (9.0, 10.0, 11.0):
+        router.record_latency("summarizer", "gpt5", seconds)
+    assert router.estimate_saving(decision) == 8.0
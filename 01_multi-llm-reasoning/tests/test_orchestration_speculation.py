@@ -0,0 +1,37 @@
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.speculation import estimate_saving, extract_terms, item_coverage, reconcile_findings
+
+
+def test_extract_terms_skips_stop_terms():
+    assert extract_terms("量子ビットの最新情報（重要度: 高）") == {"量子", "ビット"}
+    assert extract_terms("半導体市場の調査") == {"半導体市場"}
+    assert extract_terms("GPU Market") == {"gpu", "market"}
+
+
+def test_reconcile_keeps_overlapping_paragraphs_and_lists_uncovered_items():
+    items = ["量子ビットの技術動向", "主要企業の投資額"]
+    findings = "量子ビットの技術動向として超伝導方式が主流です。\n\n天気は晴れです。"
+
+    result = reconcile_findings(items, findings, threshold=0.5)
+
+    assert result.covered_items == ["量子ビットの技術動向"]
+    assert result.uncovered_items == ["主要企業の投資額"]
+    assert result.kept_text == "量子ビットの技術動向として超伝導方式が主流です。"
+    assert result.discarded_chars == len("天気は晴れです。")
+    assert 0 < result.discarded_ratio < 1
+    assert item_coverage("主要企業の投資額", findings) == 0.0
+
+
+def test_estimate_saving_compares_with_sequential_researcher():
+    # Coordinator 2秒、先行調査 0〜3秒、追加調査 0.5秒
+    # 通常: 2 + 3 = 5秒、先行実行: max(2, 3) + 0.5 = 3.5秒
+    assert estimate_saving(2.0, 0.0, 3.0, 0.5) == 1.5
+    # 先行調査が不要になるほど遅い場合はマイナス
+    assert estimate_saving(1.0, 0.0, 1.0, 2.0) < 0
@@ -0,0 +1,106 @@
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.tracing import (
+    JsonlSpanExporter,
+    OtlpJsonFileExporter,
+    Tracer,
+    current_span,
+    span,
+    summarize_spans,
+    traced_tool,
+)
+
+
+def test_spans_nest_and_record_errors():
+    tracer = Tracer()
+    with tracer.activate():
+        with span("phase.analyzer", "phase", phase="analyzer") as outer:
+            with span("agent.analyzer", "agent") as inner:
+                inner.set_attribute("prompt_chars", 10)
+            with pytest.raises(ValueError):
+                with span("tool.broken", "tool"):
+                    raise ValueError("壊れた")
+
+    phase, agent, tool = tracer.spans
+    assert agent.parent_id == phase.span_id and tool.parent_id == phase.span_id
+    assert phase.parent_id is None
+    assert phase.end_ns >= agent.end_ns >= agent.start_ns >= phase.start_ns
+    assert tool.status == "error" and tool.error == "壊れた"
+    assert outer is phase
+
+
+def test_span_without_tracer_is_noop():
+    @traced_tool
+    def lookup(keyword: str) -> str:
+        """キーワードを調べる"""
+        return keyword * 2
+
+    with span("phase.x", "phase") as s:
+        s.set_attribute("ignored", True)
+        assert current_span() is s
+        assert lookup("ab") == "abab"
+
+    assert lookup.__doc__ == "キーワードを調べる"
+    assert lookup.__name__ == "lookup"
+
+
+def test_summarize_spans_groups_by_phase():
+    @traced_tool
+    def lookup(keyword: str) -> str:
+        return keyword
+
+    tracer = Tracer()
+    with tracer.activate():
+        with span("init.researcher", "init", phase="researcher"):
+            pass
+        with span("phase.researcher", "phase", phase="researcher") as p:
+            p.set_attribute("cache_hit", False)
+            with span("agent.researcher", "agent", prompt_chars=5) as a:
+                a.add("input_tokens", 3)
+                a.add("output_tokens", 7)
+                a.set_attribute("retries", 1)
+                lookup("量子")
+                lookup("AI")
+
+    summary = summarize_spans(tracer.spans)
+    assert summary["init"]["calls"] == 1
+    researcher = summary["researcher"]
+    assert researcher["calls"] == 1
+    assert researcher["prompt_chars"] == 5
+    assert researcher["input_tokens"] == 3 and researcher["output_tokens"] == 7
+    assert researcher["retries"] == 1
+    assert researcher["tool_calls"] == 2
+    assert researcher["cache_hits"] == 0
+
+
+def test_exporters_write_jsonl_and_otlp(tmp_path):
+    tracer = Tracer()
+    with tracer.activate():
+        with span("workflow.run", "workflow"):
+            with span("phase.coordinator", "phase", phase="coordinator", cache_hit=True):
+                pass
+
+    JsonlSpanExporter(tmp_path / "spans.jsonl").export(tracer.spans)
+    lines = (tmp_path / "spans.jsonl").read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["name"] for line in lines] == ["workflow.run", "phase.coordinator"]
+
+    OtlpJsonFileExporter(tmp_path / "traces.otlp.jsonl").export(tracer.spans)
+    request = json.loads((tmp_path / "traces.otlp.jsonl").read_text(encoding="utf-8"))
+    spans = request["resourceSpans"][0]["scopeSpans"][0]["spans"]
+    root, child = spans
+    assert child["parentSpanId"] == root["spanId"]
+    assert "parentSpanId" not in root
+    assert all(len(s["traceId"]) == 32 and len(s["spanId"]) == 16 for s in spans)
+    assert int(child["endTimeUnixNano"]) >= int(child["startTimeUnixNano"])
+    attributes = {a["key"]: a["value"] for a in child["attributes"]}
+    assert attributes["cache_hit"] == {"boolValue": True}
+    assert attributes["span.kind"] == {"stringValue": "phase"}
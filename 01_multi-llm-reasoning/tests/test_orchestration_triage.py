@@ -0,0 +1,55 @@
+import sys
+from pathlib import Path
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from orchestration.triage import QueryTriage, classify_query
+
+
+def test_arithmetic_and_definitions_are_simple():
+    assert classify_query("2+2は？").path == "simple"
+    assert classify_query("what is 2+2").path == "simple"
+    assert classify_query("APIとは？").path == "simple"
+
+
+def test_factual_questions_are_lookup():
+    decision = classify_query("日本の首都はどこ？")
+    assert decision.path == "lookup"
+    assert decision.reason.startswith("keyword(")
+    assert classify_query("Pythonの最新バージョンは？").path == "lookup"
+
+
+def test_analysis_keywords_and_long_queries_are_deep():
+    decision = classify_query("量子コンピューターの現状と将来性について教えてください")
+    assert decision.path == "deep"
+    assert decision.features["deep_keyword"] is not None
+    # 分析の語は事実を尋ねる語より優先
+    assert classify_query("最新のGPUを比較して").path == "deep"
+    assert classify_query("いつ" + "あ" * 100, lookup_max_chars=80).path == "deep"
+    # どれにも当てはまらない場合は従来どおり
+    assert classify_query("猫").path == "deep"
+
+
+def test_english_definitions_are_not_mistaken_for_analysis():
+    # "cons" / "why" などは単語として現れた場合だけ deep
+    assert classify_query("What is a constant?").path == "simple"
+    assert classify_query("Define consensus").path == "simple"
+    assert classify_query("pros and cons of Rust").path == "deep"
+    assert classify_query("Why is the sky blue?").path == "deep"
+
+
+def test_time_sensitive_questions_are_lookup_even_in_definition_form():
+    decision = classify_query("what is the current price of bitcoin")
+    assert decision.path == "lookup"
+    assert decision.reason == "keyword(current)"
+    assert classify_query("今日の天気とは？").path == "lookup"
+
+
+def test_disabled_triage_always_returns_deep():
+    triage = QueryTriage(enabled=False)
+    decision = triage.classify("2+2は？")
+    assert decision.path == "deep"
+    assert decision.reason == "disabled"
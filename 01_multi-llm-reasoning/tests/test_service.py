@@ -0,0 +1,122 @@
+import asyncio
+import io
+import json
+import sys
+from pathlib import Path
+
+import pytest
+
+# Ensure project dir on path
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+import service
+import workflow as wf
+
+
+@pytest.fixture(autouse=True)
+def _azure_endpoint(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+
+
+class _TextResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _EchoAgent:
+    def __init__(self, name: str, state: dict):
+        self.name = name
+        self.state = state
+
+    async def run(self, prompt: str):
+        self.state["active"] += 1
+        self.state["peak"] = max(self.state["peak"], self.state["active"])
+        await asyncio.sleep(0.01)
+        self.state["active"] -= 1
+        # Summarizer echoes the original question so results can be matched
+        query = prompt.split("【元の質問】\n")[1].split("\n")[0] if "【元の質問】" in prompt else prompt
+        return _TextResponse(f"{self.name}:{query}")
+
+
+def _service(max_concurrency: int):
+    state = {"active": 0, "peak": 0, "inits": 0}
+    workflow = wf.MultiAgentWorkflow(use_cache=False, use_checkpoints=False)
+
+    async def fake_init():
+        state["inits"] += 1
+        workflow.coordinator = _EchoAgent("C", state)
+        workflow.researcher = _EchoAgent("R", state)
+        workflow.analyzer = _EchoAgent("A", state)
+        workflow.summarizer = _EchoAgent("S", state)
+
+    workflow.initialize_agents = fake_init
+    return service.WorkflowService(workflow, max_concurrency=max_concurrency), state
+
+
+def test_concurrent_queries_have_isolated_history_and_cap():
+    svc, state = _service(max_concurrency=2)
+
+    async def scenario():
+        await svc.start()
+        return await asyncio.gather(*(svc.submit(f"Q{i}") for i in range(5)))
+
+    results = asyncio.run(scenario())
+
+    assert state["inits"] == 1
+    assert state["peak"] <= 2
+    for i, result in enumerate(results):
+        assert result["final_answer"] == f"S:Q{i}"
+        inputs = [e["input"] for e in result["execution_history"] if "input" in e]
+        assert all(f"Q{i}" in text for text in inputs)
+    assert svc.stats == {"completed": 5, "failed": 0}
+
+
+def test_drain_rejects_new_queries_after_in_flight_complete():
+    svc, _ = _service(max_concurrency=1)
+
+    async def scenario():
+        await svc.start()
+        pending = asyncio.create_task(svc.submit("Q"))
+        await asyncio.sleep(0)
+        drained = await svc.drain(timeout=5)
+        with pytest.raises(service.ServiceClosedError):
+            await svc.submit("late")
+        return drained, await pending
+
+    drained, result = asyncio.run(scenario())
+    assert drained is True
+    assert result["final_answer"] == "S:Q"
+
+
+def test_serve_jsonl_answers_each_line():
+    svc, _ = _service(max_concurrency=2)
+    requests = io.StringIO(
+        json.dumps({"id": "a", "query": "Q1"}) + "\n\n"
+        + "not json\n"
+        + json.dumps({"id": "b", "query": "Q2"}) + "\n"
+    )
+    output = io.StringIO()
+
+    async def scenario():
+        await svc.start()
+        await service.serve_jsonl(svc, requests, output)
+
+    asyncio.run(scenario())
+
+    responses = {r["id"]: r for r in map(json.loads, output.getvalue().splitlines())}
+    assert responses["a"]["final_answer"] == "S:Q1"
+    assert responses["b"]["final_answer"] == "S:Q2"
+    assert "error" in responses[3]
+
+
+def test_phase_call_outside_run_records_instance_history():
+    state = {"active": 0, "peak": 0}
+    workflow = wf.MultiAgentWorkflow(use_cache=False, use_checkpoints=False)
+    workflow.coordinator = _EchoAgent("C", state)
+
+    output = asyncio.run(workflow.run_coordinator("Q"))
+
+    assert output.startswith("C:")
+    assert [entry["agent"] for entry in workflow.execution_history] == ["Coordinator"]
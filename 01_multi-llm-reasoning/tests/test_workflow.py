@@ -7,9 +7,14 @@ PROJECT_DIR = Path(__file__).resolve().parents[1]
 if str(PROJECT_DIR) not in sys.path:
     sys.path.insert(0, str(PROJECT_DIR))
 
-
 import types
 import asyncio
+import importlib
+
+
+@pytest.fixture(autouse=True)
+def _azure_endpoint(monkeypatch):
+    monkeypatch.setenv("AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
 
 
 class _FakeResponse:
@@ -50,3 +55,565 @@ def test_workflow_runs_with_fake_agents(monkeypatch):
 
     result = asyncio.run(wf.run_multi_agent_workflow("Q"))
     assert "final_answer" in result and "agent_outputs" in result
+
+
+class _TextResponse:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _text_agent(name: str, calls: list):
+    class Agent:
+        async def run(self, prompt: str):
+            calls.append(name)
+            return _TextResponse(f"{name}-output")
+
+    return Agent()
+
+
+def _workflow_with_fake_agents(calls: list, **kwargs):
+    wf = importlib.import_module("workflow")
+    kwargs.setdefault("use_cache", False)
+    kwargs.setdefault("use_checkpoints", False)
+    workflow = wf.MultiAgentWorkflow(**kwargs)
+    workflow.coordinator = _text_agent("C", calls)
+    workflow.researcher = _text_agent("R", calls)
+    workflow.analyzer = _text_agent("A", calls)
+    workflow.summarizer = _text_agent("S", calls)
+    return workflow
+
+
+def test_default_graph_runs_phases_in_order_and_records_timings():
+    calls = []
+    workflow = _workflow_with_fake_agents(calls)
+
+    result = asyncio.run(workflow.run("Q"))
+
+    assert calls == ["C", "R", "A", "S"]
+    assert result["final_answer"] == "S-output"
+    assert result["agent_outputs"]["analyzer"] == "A-output"
+    timed_nodes = [e["node"] for e in result["execution_history"] if "node" in e]
+    assert timed_nodes == ["coordinator", "researcher", "analyzer", "summarizer"]
+    assert all(e["duration_seconds"] >= 0 for e in result["node_timings"])
+
+
+def test_researcher_fanout_runs_items_concurrently_and_merges():
+    calls = []
+    workflow = _workflow_with_fake_agents(calls)
+    workflow.research_fanout = True
+
+    class Coordinator:
+        async def run(self, prompt: str):
+            return _TextResponse("【必要な情報】\n- 項目A\n- 項目B\n- 項目C\n\n【分析の方向性】\n- x")
+
+    state = {"active": 0, "peak": 0}
+
+    class Researcher:
+        async def run(self, prompt: str):
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.01)
+            state["active"] -= 1
+            item = prompt.split("【担当する調査項目】\n")[1].split("\n")[0]
+            return _TextResponse(f"{item}の調査結果")
+
+    workflow.coordinator = Coordinator()
+    workflow.researcher = Researcher()
+
+    result = asyncio.run(workflow.run("Q"))
+
+    merged = result["agent_outputs"]["researcher"]
+    assert state["peak"] > 1
+    assert merged.index("項目Aの調査結果") < merged.index("項目Bの調査結果") < merged.index("項目Cの調査結果")
+    assert merged.startswith("【調査項目】")
+    items = [e["item"] for e in result["execution_history"] if e.get("item")]
+    assert sorted(items) == ["項目A", "項目B", "項目C"]
+
+
+class _Update:
+    def __init__(self, text: str):
+        self.text = text
+
+
+def _streaming_agent(name: str):
+    class Agent:
+        async def run(self, prompt: str):
+            return _TextResponse(f"{name}-full")
+
+        async def run_stream(self, prompt: str):
+            for token in (name, "-", "stream"):
+                yield _Update(token)
+
+    return Agent()
+
+
+def test_run_stream_yields_phase_deltas_in_order():
+    workflow = _workflow_with_fake_agents([])
+    workflow.coordinator = _streaming_agent("C")
+    workflow.researcher = _streaming_agent("R")
+    workflow.analyzer = _streaming_agent("A")
+    workflow.summarizer = _streaming_agent("S")
+
+    async def collect():
+        return [event async for event in workflow.run_stream("Q")]
+
+    events = asyncio.run(collect())
+    phases = [phase for phase, _ in events]
+    assert phases == ["coordinator"] * 3 + ["researcher"] * 3 + ["analyzer"] * 3 + ["summarizer"] * 3
+    assert "".join(delta for phase, delta in events if phase == "summarizer") == "S-stream"
+
+
+def test_fanout_streams_each_item_contiguously():
+    workflow = _workflow_with_fake_agents([])
+    workflow.research_fanout = True
+    workflow.analyzer = _streaming_agent("A")
+    workflow.summarizer = _streaming_agent("S")
+
+    class Coordinator:
+        async def run_stream(self, prompt: str):
+            yield _Update("【必要な情報】\n- 項目A\n- 項目B\n- 項目C\n")
+
+    class Researcher:
+        async def run(self, prompt: str):
+            return _TextResponse("".join([u.text async for u in self.run_stream(prompt)]))
+
+        async def run_stream(self, prompt: str):
+            item = prompt.split("【担当する調査項目】\n")[1].split("\n")[0]
+            for token in (item, "の", "調査", "結果"):
+                # 他の項目のトークンと交互に届くよう制御を譲る
+                await asyncio.sleep(0)
+                yield _Update(token)
+
+    workflow.coordinator = Coordinator()
+    workflow.researcher = Researcher()
+
+    async def collect():
+        return [event async for event in workflow.run_stream("Q")]
+
+    events = asyncio.run(collect())
+    researcher_deltas = [delta for phase, delta in events if phase == "researcher"]
+    assert sorted(researcher_deltas) == ["項目Aの調査結果", "項目Bの調査結果", "項目Cの調査結果"]
+
+
+def test_on_delta_falls_back_to_full_text_when_streaming_disabled(monkeypatch):
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "ENABLE_STREAMING", False)
+    workflow = _workflow_with_fake_agents([])
+    workflow.summarizer = _streaming_agent("S")
+
+    events = []
+    result = asyncio.run(workflow.run("Q", on_delta=lambda phase, delta: events.append((phase, delta))))
+
+    assert ("summarizer", "S-full") in events
+    assert result["final_answer"] == "S-full"
+
+
+def test_response_cache_skips_agents_on_repeated_query():
+    from orchestration.cache import ResponseCache
+
+    calls = []
+    workflow = _workflow_with_fake_agents(calls)
+    workflow.use_cache = True
+    workflow.cache = ResponseCache(max_entries=16, default_ttl=60)
+
+    first = asyncio.run(workflow.run("Q"))
+    second = asyncio.run(workflow.run("Q"))
+
+    assert calls == ["C", "R", "A", "S"]
+    assert second["final_answer"] == first["final_answer"]
+    assert first["cache_stats"]["hits"] == 0
+    assert first["cache_stats"]["misses"] == 4
+    assert second["cache_stats"]["hits"] == 4
+    assert second["cache_stats"]["misses"] == 0
+    assert second["cache_stats"]["cumulative"]["hits"] == 4
+    assert second["cache_stats"]["cumulative"]["misses"] == 4
+
+
+def test_compaction_trims_downstream_prompts_and_reports_savings():
+    from orchestration import PromptCompactor
+
+    calls = []
+    prompts = {}
+    workflow = _workflow_with_fake_agents(calls)
+    workflow.compactor = PromptCompactor(strategies=["sections"])
+
+    class Coordinator:
+        async def run(self, prompt: str):
+            return _TextResponse("【質問の理解】\n理解\n\n【必要な情報】\n- 詳細な項目リスト\n\n【分析の方向性】\n方向")
+
+    class Recorder:
+        def __init__(self, phase):
+            self.phase = phase
+
+        async def run(self, prompt: str):
+            prompts[self.phase] = prompt
+            return _TextResponse(f"{self.phase}-output")
+
+    workflow.coordinator = Coordinator()
+    workflow.analyzer = Recorder("analyzer")
+    workflow.summarizer = Recorder("summarizer")
+
+    result = asyncio.run(workflow.run("Q"))
+
+    assert "詳細な項目リスト" not in prompts["analyzer"]
+    assert "方向" in prompts["analyzer"]
+    assert "方向" not in prompts["summarizer"]
+    assert result["compaction"]["analyzer"]["saved_bytes"] > 0
+    assert result["compaction"]["summarizer"]["sources"]["coordinator"]["compacted_bytes"] > 0
+
+
+def test_resume_continues_from_first_incomplete_phase(tmp_path):
+    from orchestration import CheckpointStore
+
+    calls = []
+    store = CheckpointStore(tmp_path)
+    workflow = _workflow_with_fake_agents(calls, checkpoint_store=store, use_checkpoints=True)
+
+    class FailingSummarizer:
+        async def run(self, prompt: str):
+            calls.append("S")
+            raise RuntimeError("timeout")
+
+    workflow.summarizer = FailingSummarizer()
+    with pytest.raises(RuntimeError):
+        asyncio.run(workflow.run("Q"))
+
+    (checkpoint_file,) = tmp_path.glob("*.json")
+    run_id = checkpoint_file.stem
+    checkpoint = store.load(run_id)
+    assert checkpoint["status"] == "failed"
+    assert set(checkpoint["outputs"]) == {"coordinator", "researcher", "analyzer"}
+
+    calls.clear()
+    workflow.summarizer = _text_agent("S", calls)
+    result = asyncio.run(workflow.run("", resume=run_id))
+
+    assert calls == ["S"]
+    assert result["run_id"] == run_id
+    assert result["resumed_phases"] == ["coordinator", "researcher", "analyzer"]
+    assert result["final_answer"] == "S-output"
+    assert result["agent_outputs"]["analyzer"] == "A-output"
+    # 完了した実行のチェックポイントは削除される
+    assert not store.exists(run_id)
+    assert not list(tmp_path.glob("*.json"))
+
+
+def test_agent_calls_are_retried_and_reported_in_history():
+    from orchestration import RetryPolicy
+
+    calls = []
+
+    async def no_sleep(seconds):
+        pass
+
+    policy = RetryPolicy(max_retries=2, timeout=None, sleep=no_sleep)
+    workflow = _workflow_with_fake_agents(calls, retry_policies={"analyzer": policy})
+
+    class FlakyAnalyzer:
+        def __init__(self):
+            self.calls = 0
+
+        async def run(self, prompt: str):
+            self.calls += 1
+            if self.calls == 1:
+                raise asyncio.TimeoutError()
+            return _TextResponse("A-output")
+
+    workflow.analyzer = FlakyAnalyzer()
+    result = asyncio.run(workflow.run("Q"))
+
+    assert result["agent_outputs"]["analyzer"] == "A-output"
+    entry = next(e for e in result["execution_history"] if e.get("phase") == "analyzer")
+    assert [a["status"] for a in entry["attempts"]] == ["timeout", "ok"]
+
+
+def test_routing_uses_mini_and_escalates_on_failed_quality_check(monkeypatch):
+    from orchestration import ModelRouter, RoutingRule
+
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "ENABLE_STREAMING", False)
+    calls = []
+    router = ModelRouter(rules=[RoutingRule("summarizer", "gpt5-mini")], min_output_chars=5)
+    workflow = _workflow_with_fake_agents(calls, router=router)
+    workflow.routed_agents[("summarizer", "gpt5-mini")] = _text_agent("m", calls)
+
+    deltas = []
+    result = asyncio.run(workflow.run("Q", on_delta=lambda phase, d: deltas.append((phase, d))))
+
+    # "m-output" は5文字以上なので品質チェックに合格
+    assert calls == ["C", "R", "A", "m"]
+    assert result["final_answer"] == "m-output"
+    assert ("summarizer", "m-output") in deltas
+    summarizer = [d for d in result["routing"]["decisions"] if d["phase"] == "summarizer"]
+    assert summarizer[0]["model"] == "gpt5-mini" and not summarizer[0]["escalated"]
+
+    calls.clear()
+    deltas.clear()
+    router.min_output_chars = 100
+    result = asyncio.run(workflow.run("Q", on_delta=lambda phase, d: deltas.append((phase, d))))
+
+    assert calls == ["C", "R", "A", "m", "S"]
+    assert result["final_answer"] == "S-output"
+    # エスカレーションされた mini の出力は通知しない
+    assert ("summarizer", "m-output") not in deltas
+    assert result["routing"]["escalations"] == 1
+
+
+def test_routed_agent_is_created_with_phase_factory(monkeypatch):
+    wf = importlib.import_module("workflow")
+    created = []
+
+    async def fake_factory(model_type: str):
+        created.append(model_type)
+        return _text_agent("m", [])
+
+    assert wf.PHASE_AGENT_FACTORIES["summarizer"] is wf.create_summarizer_agent
+    monkeypatch.setitem(wf.PHASE_AGENT_FACTORIES, "summarizer", fake_factory)
+    workflow = _workflow_with_fake_agents([])
+
+    first = asyncio.run(workflow._get_phase_agent("summarizer", "gpt5-mini"))
+    second = asyncio.run(workflow._get_phase_agent("summarizer", "gpt5-mini"))
+
+    assert first is second
+    assert created == ["gpt5-mini"]
+
+
+def test_run_returns_trace_and_per_phase_profile():
+    calls = []
+    workflow = _workflow_with_fake_agents(calls)
+
+    result = asyncio.run(workflow.run("Q"))
+
+    kinds = {s["kind"] for s in result["trace"]["spans"]}
+    assert {"workflow", "node", "phase", "agent"} <= kinds
+    assert all(s["trace_id"] == result["trace"]["trace_id"] for s in result["trace"]["spans"])
+    profile = result["profile"]
+    assert set(profile) >= {"coordinator", "researcher", "analyzer", "summarizer"}
+    assert profile["analyzer"]["calls"] == 1
+    assert profile["analyzer"]["completion_chars"] == len("A-output")
+    assert profile["analyzer"]["prompt_chars"] > 0
+
+
+def test_history_is_bounded_and_returns_lightweight_view():
+    from orchestration import HistoryStore
+
+    calls = []
+    store = HistoryStore(max_runs=2, preview_chars=20)
+    workflow = _workflow_with_fake_agents(calls, history_store=store)
+
+    results = [asyncio.run(workflow.run(f"Q{i}")) for i in range(3)]
+
+    assert len(store) == 2
+    assert store.get(results[0]["trace"]["trace_id"]) is None
+    latest = results[-1]
+    summarizer = next(e for e in latest["execution_history"] if e.get("agent") == "Summarizer")
+    assert len(summarizer["input"]) == 21
+    assert summarizer["input_chars"] > 20
+    assert "Q2" in store.resolve(summarizer["input_ref"])
+    assert workflow.execution_history == latest["execution_history"]
+
+
+def test_speculative_researcher_runs_alongside_coordinator_and_follows_up(monkeypatch):
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "ENABLE_STREAMING", False)
+    calls = []
+    workflow = _workflow_with_fake_agents(calls, speculative_research=True)
+    started = asyncio.Event()
+
+    class Coordinator:
+        async def run(self, prompt: str):
+            # 先行調査が始まるまで計画を返さない（並行実行の確認）
+            await asyncio.wait_for(started.wait(), timeout=1)
+            calls.append("C")
+            return _TextResponse("【必要な情報】\n- 量子ビットの技術動向\n- 主要企業の投資額\n")
+
+    class Researcher:
+        async def run(self, prompt: str):
+            if "調査計画はまだありません" in prompt:
+                calls.append("R-spec")
+                started.set()
+                return _TextResponse("量子ビットの技術動向は超伝導方式が主流です。\n\n無関係な段落です。")
+            calls.append("R-followup")
+            assert "【追加で調査する項目】\n- 主要企業の投資額\n\n" in prompt
+            return _TextResponse("投資額は増加しています。")
+
+    workflow.coordinator = Coordinator()
+    workflow.researcher = Researcher()
+    result = asyncio.run(workflow.run("量子コンピューターの動向は？"))
+
+    assert calls[:2] == ["R-spec", "C"]
+    assert calls[2:] == ["R-followup", "A", "S"]
+    researcher_output = result["agent_outputs"]["researcher"]
+    assert "超伝導方式" in researcher_output and "投資額は増加" in researcher_output
+    assert "無関係な段落" not in researcher_output
+    speculation = result["speculation"]
+    assert speculation["covered_items"] == ["量子ビットの技術動向"]
+    assert speculation["followup_items"] == ["主要企業の投資額"]
+    assert speculation["estimated_saving_seconds"] is not None
+    assert speculation["discarded_chars"] == len("無関係な段落です。")
+
+
+def test_speculative_research_streams_only_reconciled_output(monkeypatch):
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "ENABLE_STREAMING", False)
+    workflow = _workflow_with_fake_agents([], speculative_research=True)
+
+    class Coordinator:
+        async def run(self, prompt: str):
+            return _TextResponse("【必要な情報】\n- 量子ビットの技術動向\n- 主要企業の投資額\n")
+
+    class Researcher:
+        async def run(self, prompt: str):
+            if "調査計画はまだありません" in prompt:
+                return _TextResponse("量子ビットの技術動向は超伝導方式が主流です。\n\n無関係な段落です。")
+            return _TextResponse("投資額は増加しています。")
+
+    workflow.coordinator = Coordinator()
+    workflow.researcher = Researcher()
+    events = []
+    result = asyncio.run(workflow.run("量子コンピューターの動向は？", on_delta=lambda p, d: events.append((p, d))))
+
+    researcher_deltas = [delta for phase, delta in events if phase == "researcher"]
+    assert researcher_deltas == [result["agent_outputs"]["researcher"]]
+    assert not any("無関係な段落" in delta for delta in researcher_deltas)
+
+
+def test_failed_speculative_researcher_falls_back_to_planned_research(monkeypatch):
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "ENABLE_STREAMING", False)
+    monkeypatch.setattr(wf.settings, "MAX_RETRIES", 0)
+    calls = []
+    workflow = _workflow_with_fake_agents(calls, speculative_research=True)
+
+    class Coordinator:
+        async def run(self, prompt: str):
+            calls.append("C")
+            return _TextResponse("【必要な情報】\n- 量子ビットの技術動向\n")
+
+    class Researcher:
+        async def run(self, prompt: str):
+            if "調査計画はまだありません" in prompt:
+                calls.append("R-spec")
+                raise RuntimeError("speculation failed")
+            calls.append("R")
+            return _TextResponse("計画に基づく調査結果")
+
+    workflow.coordinator = Coordinator()
+    workflow.researcher = Researcher()
+    result = asyncio.run(workflow.run("量子コンピューターの動向は？"))
+
+    assert sorted(calls[:2]) == ["C", "R-spec"]
+    assert calls[2:] == ["R", "A", "S"]
+    assert result["agent_outputs"]["researcher"] == "計画に基づく調査結果"
+    assert result["speculation"]["fallback"] is True
+    assert "speculation failed" in result["speculation"]["error"]
+
+
+def test_triage_runs_shorter_graphs_and_reports_path():
+    from orchestration import QueryTriage
+
+    calls = []
+    prompts = {}
+    workflow = _workflow_with_fake_agents(calls, triage=QueryTriage())
+
+    class Summarizer:
+        async def run(self, prompt: str):
+            calls.append("S")
+            prompts.setdefault("S", []).append(prompt)
+            return _TextResponse("S-output")
+
+    workflow.summarizer = Summarizer()
+
+    simple = asyncio.run(workflow.run("2+2は？"))
+    assert calls == ["S"]
+    assert simple["path"] == "simple"
+    assert simple["triage"]["reason"] == "arithmetic"
+    assert simple["final_answer"] == "S-output"
+    assert simple["agent_outputs"]["coordinator"] == ""
+
+    calls.clear()
+    lookup = asyncio.run(workflow.run("日本の首都はどこ？"))
+    assert calls == ["C", "R", "S"]
+    assert lookup["path"] == "lookup"
+    assert "【分析結果（Analyzer）】" not in prompts["S"][-1]
+    assert "R-output" in prompts["S"][-1]
+
+    calls.clear()
+    deep = asyncio.run(workflow.run("日本の首都はどこ？", path="deep"))
+    assert calls == ["C", "R", "A", "S"]
+    assert deep["triage"] == {"path": "deep", "reason": "requested", "features": {}}
+    assert "【分析結果（Analyzer）】" in prompts["S"][-1]
+
+
+def test_triage_is_disabled_by_default_and_rejects_unknown_path():
+    calls = []
+    workflow = _workflow_with_fake_agents(calls)
+
+    result = asyncio.run(workflow.run("2+2は？"))
+    assert calls == ["C", "R", "A", "S"]
+    assert result["path"] == "deep"
+
+    with pytest.raises(ValueError):
+        asyncio.run(workflow.run("Q", path="fast"))
+
+
+def test_initialize_agents_overlaps_warm_up_and_records_timings(monkeypatch):
+    wf = importlib.import_module("workflow")
+    monkeypatch.setattr(wf.settings, "LLM_BACKEND", "azure")
+    monkeypatch.setattr(wf.settings, "WARMUP_ENABLED", True)
+    monkeypatch.setattr(wf.settings, "AZURE_OPENAI_ENDPOINT", "https://example.openai.azure.com")
+    events = []
+
+    async def fake_warm_up(endpoint, api_key, timeout):
+        events.append("warm-up-start")
+        await asyncio.sleep(0.05)
+        events.append("warm-up-end")
+        return {"credential_seconds": 0.05, "connection_seconds": 0.05, "errors": []}
+
+    def factory(name):
+        async def create():
+            events.append(name)
+            return _text_agent(name, [])
+        return create
+
+    monkeypatch.setattr(wf, "warm_up_clients", fake_warm_up)
+    for phase, name in (("coordinator", "C"), ("researcher", "R"), ("analyzer", "A"), ("summarizer", "S")):
+        monkeypatch.setattr(wf, f"create_{phase}_agent", factory(name))
+
+    workflow = wf.MultiAgentWorkflow(use_cache=False, use_checkpoints=False)
+    result = asyncio.run(workflow.run("Q"))
+
+    # 事前準備を最初に開始し、待機中にエージェントを作成する
+    assert events == ["warm-up-start", "C", "R", "A", "S", "warm-up-end"]
+    timings = result["init_timings"]
+    assert set(timings) == {"coordinator", "researcher", "analyzer", "summarizer", "warm_up", "total"}
+    assert timings["warm_up"]["errors"] == []
+    assert timings["total"] >= 0.05
+    assert "init.warm_up" in {s["name"] for s in result["trace"]["spans"]}
+
+
+def test_rate_limiter_delays_calls_and_reports_backpressure():
+    from orchestration import RateLimiter
+
+    now = {"t": 0.0}
+
+    async def fake_sleep(seconds):
+        now["t"] += seconds
+        await asyncio.sleep(0)
+
+    limiter = RateLimiter(rpm=2, clock=lambda: now["t"], sleep=fake_sleep)
+    calls = []
+    events = []
+    workflow = _workflow_with_fake_agents(calls, rate_limiter=limiter)
+
+    result = asyncio.run(workflow.run("Q", tenant="team-a", on_backpressure=events.append))
+
+    # Coordinator・Analyzer・Summarizer は同じデプロイメント（RPM 2）を使うため Summarizer が待機
+    assert calls == ["C", "R", "A", "S"]
+    assert [e["phase"] for e in events] == ["summarizer"]
+    assert events[0]["tenant"] == "team-a" and events[0]["estimated_wait_seconds"] == 30
+    rate_limit = result["rate_limit"]
+    assert rate_limit["tenant"] == "team-a"
+    assert [w["phase"] for w in rate_limit["waits"]] == ["summarizer"]
+    assert rate_limit["total_wait_seconds"] == 30
+    assert "rate_limit" in {s["kind"] for s in result["trace"]["spans"]}
@@ -1,21 +1,61 @@
 """
 Multi-Agent Workflow - マルチエージェントワークフロー
 
-4つのエージェント（Coordinator、Researcher、Analyzer、Summarizer）を順次実行し、
+4つのエージェント（Coordinator、Researcher、Analyzer、Summarizer）をフェーズグラフとして実行し、
 複雑な推論タスクを協調的に処理します。
 """
 
 import asyncio
+import json
 import logging
-from typing import Dict, Any, List
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field, replace
+from typing import Dict, Any, List, Optional, Tuple, Callable, AsyncIterator, Awaitable, Iterator
 from datetime import datetime
+from pathlib import Path
 
 from agents import (
     create_coordinator_agent,
     create_researcher_agent,
     create_analyzer_agent,
-    create_summarizer_agent
+    create_summarizer_agent,
+    warm_up_clients
 )
+from orchestration import (
+    PhaseNode,
+    FanOutNode,
+    PhaseGraph,
+    GraphExecutor,
+    NodeTiming,
+    parse_research_items,
+    make_cache_key,
+    ResponseCache,
+    PromptCompactor,
+    CheckpointStore,
+    HistoryStore,
+    RetryPolicy,
+    RateLimiter,
+    RateLimitTicket,
+    estimate_tokens,
+    ModelRouter,
+    RoutingRule,
+    default_rules,
+    extract_features,
+    TriageDecision,
+    QueryTriage,
+    SpeculationReport,
+    reconcile_findings,
+    estimate_saving,
+    Tracer,
+    span,
+    current_span,
+    summarize_spans,
+    JsonlSpanExporter,
+    OtlpJsonFileExporter
+)
+from config.settings import settings
 
 # ロガー設定
 logging.basicConfig(
@@ -24,52 +64,720 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# ストリーミング通知コールバックの型: (フェーズ名, トークン差分)
+DeltaCallback = Callable[[str, str], None]
+
+# レート制限の待機を通知するコールバックの型: {phase, deployment, tenant, queue_position, estimated_wait_seconds}
+BackpressureCallback = Callable[[Dict[str, Any]], None]
+
+
+
+@dataclass
+class RunState:
+    """
+    run()呼び出し1回分の状態
+
+    同じワークフローインスタンスで複数のクエリを並行処理しても
+    実行履歴や通知先が混ざらないよう、リクエストごとに分離して保持します。
+    """
+
+    history: List[Dict[str, Any]] = field(default_factory=list)
+    on_delta: Optional[DeltaCallback] = None
+    # フェーズごとのトークン使用量 {phase: {"input_tokens": n, "output_tokens": n}}
+    usage: Dict[str, Dict[str, int]] = field(default_factory=dict)
+    # フェーズごとのプロンプト圧縮結果 {phase: CompactionStats.to_dict()}
+    compaction: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # フェーズごとのモデル選択結果（RoutingDecision.to_dict()）
+    routing: List[Dict[str, Any]] = field(default_factory=list)
+    # Researcher先行実行の計測値（開始・完了時刻、トークン数）と結果（SpeculationReport.to_dict()）
+    speculation: Dict[str, Any] = field(default_factory=dict)
+    # レート制限のテナントと、待機を通知するコールバック
+    tenant: str = "default"
+    on_backpressure: Optional[BackpressureCallback] = None
+    # レート制限で待機した呼び出し（RateLimitTicket.to_dict() + phase）
+    rate_limit: List[Dict[str, Any]] = field(default_factory=list)
+    # この実行での応答キャッシュのヒット・ミス数
+    cache_hits: int = 0
+    cache_misses: int = 0
+
+    def cache_summary(self, cache: ResponseCache) -> Dict[str, Any]:
+        """この実行のキャッシュヒット・ミス数と、プロセス全体の累計（cumulative）"""
+        return {
+            "hits": self.cache_hits,
+            "misses": self.cache_misses,
+            "cumulative": cache.stats(),
+        }
+
+    def rate_limit_summary(self) -> Dict[str, Any]:
+        """レート制限の待機の内訳と合計"""
+        return {
+            "tenant": self.tenant,
+            "waits": list(self.rate_limit),
+            "total_wait_seconds": sum(w["waited_seconds"] for w in self.rate_limit),
+        }
+
+    def routing_summary(self) -> Dict[str, Any]:
+        """モデル選択結果と削減時間の見積もり合計"""
+        savings = [d["estimated_saving_seconds"] for d in self.routing if d["estimated_saving_seconds"] is not None]
+        return {
+            "decisions": list(self.routing),
+            "escalations": sum(1 for d in self.routing if d["escalated"]),
+            "estimated_saving_seconds": sum(savings) if savings else None,
+        }
+
+    def add_usage(self, phase: str, usage_details: Any) -> None:
+        """エージェント応答のusage_detailsをフェーズの使用量に加算"""
+        if usage_details is None:
+            return
+        counts = self.usage.setdefault(phase, {"input_tokens": 0, "output_tokens": 0})
+        counts["input_tokens"] += getattr(usage_details, "input_token_count", None) or 0
+        counts["output_tokens"] += getattr(usage_details, "output_token_count", None) or 0
+
+    def usage_summary(self) -> Dict[str, Any]:
+        """トークン使用量の合計とフェーズ別内訳"""
+        input_tokens = sum(c["input_tokens"] for c in self.usage.values())
+        output_tokens = sum(c["output_tokens"] for c in self.usage.values())
+        return {
+            "input_tokens": input_tokens,
+            "output_tokens": output_tokens,
+            "total_tokens": input_tokens + output_tokens,
+            "by_phase": {phase: dict(counts) for phase, counts in self.usage.items()},
+        }
+
+
+# 実行中のrun()呼び出しの状態
+# （asyncioタスクはコンテキストを引き継ぐため、並行ノードからも参照できる）
+_run_state: ContextVar[Optional[RunState]] = ContextVar("run_state", default=None)
+
+
+@contextmanager
+def _deltas_suppressed() -> Iterator[None]:
+    """
+    この中で実行するエージェントの差分を通知しない
+
+    並行実行や破棄される可能性のある出力の差分が、通知先で混ざらないようにします。
+    呼び出し元は完了後に出力全体をまとめて通知します。
+    キャッシュのヒット・ミス数は元の実行状態に加算します。
+    """
+    state = _run_state.get()
+    if state is None or state.on_delta is None:
+        yield
+        return
+
+    buffered = replace(state, on_delta=None, cache_hits=0, cache_misses=0)
+    token = _run_state.set(buffered)
+    try:
+        yield
+    finally:
+        _run_state.reset(token)
+        state.cache_hits += buffered.cache_hits
+        state.cache_misses += buffered.cache_misses
+
+# キャッシュ対象のフェーズ
+CACHE_PHASES = ("coordinator", "researcher", "analyzer", "summarizer")
+
+# プロセス共有の応答キャッシュ（初回利用時に作成）
+_response_cache: Optional[ResponseCache] = None
+
+
+def get_response_cache() -> ResponseCache:
+    """
+    プロセス共有の応答キャッシュを取得
+
+    Settingsの RESPONSE_CACHE_* に従って初回呼び出し時に作成します。
+
+    Returns:
+        ResponseCache: 共有キャッシュ
+    """
+    global _response_cache
+    if _response_cache is None:
+        _response_cache = ResponseCache(
+            max_entries=settings.RESPONSE_CACHE_MAX_ENTRIES,
+            default_ttl=settings.RESPONSE_CACHE_TTL_SECONDS,
+            phase_ttls={phase: settings.get_cache_ttl(phase) for phase in CACHE_PHASES},
+            db_path=settings.RESPONSE_CACHE_DB or None
+        )
+    return _response_cache
+
+
+# プロセス共有のレート制限（初回利用時に作成）
+_rate_limiter: Optional[RateLimiter] = None
+
+
+def get_rate_limiter() -> RateLimiter:
+    """
+    プロセス共有のレート制限を取得
+
+    同じデプロイメントを使う全てのワークフローで枠を共有するため、プロセスで1つだけ作成します。
+    Settingsの RATE_LIMIT_* に従って初回呼び出し時に作成します。
+
+    Returns:
+        RateLimiter: 共有レート制限
+    """
+    global _rate_limiter
+    if _rate_limiter is None:
+        deployments = {settings.get_deployment_name(model) for model in ("gpt5", "gpt5-mini")}
+        _rate_limiter = RateLimiter(
+            rpm=settings.RATE_LIMIT_RPM,
+            tpm=settings.RATE_LIMIT_TPM,
+            tenant_rpm=settings.RATE_LIMIT_TENANT_RPM,
+            tenant_tpm=settings.RATE_LIMIT_TENANT_TPM,
+            deployment_limits={name: settings.get_rate_limits(name) for name in deployments}
+        )
+    return _rate_limiter
+
+
+def build_router() -> ModelRouter:
+    """
+    Settingsの ROUTING_* からモデルルーターを作成
+
+    ROUTING_RULES（JSON配列）が設定されていればそのルールを、
+    なければ既定のルール（短く数値を含まない質問は mini）を使います。
+
+    Returns:
+        ModelRouter: ルーター
+    """
+    if settings.ROUTING_RULES:
+        rules = [RoutingRule(**rule) for rule in json.loads(settings.ROUTING_RULES)]
+    else:
+        rules = default_rules(settings.ROUTING_SHORT_QUERY_CHARS, settings.ROUTING_SIMPLE_PLAN_ITEMS)
+    return ModelRouter(
+        enabled=settings.ROUTING_ENABLED,
+        rules=rules,
+        escalate=settings.ROUTING_ESCALATE,
+        min_output_chars=settings.ROUTING_MIN_OUTPUT_CHARS
+    )
+
+
+def export_trace(tracer: Tracer) -> None:
+    """
+    Settingsの TRACE_EXPORT_* に従ってスパンをファイルに出力
+
+    Args:
+        tracer: 出力するトレーサー
+    """
+    if not settings.TRACE_EXPORT_DIR or not tracer.spans:
+        return
+
+    export_dir = Path(settings.TRACE_EXPORT_DIR)
+    export_format = settings.TRACE_EXPORT_FORMAT.lower()
+    try:
+        if export_format in ("jsonl", "both"):
+            JsonlSpanExporter(export_dir / "spans.jsonl").export(tracer.spans)
+        if export_format in ("otlp", "both"):
+            OtlpJsonFileExporter(export_dir / "traces.otlp.jsonl").export(tracer.spans)
+    except OSError as e:
+        # トレースの出力失敗でワークフローの結果を失わないようにする
+        logger.warning(f"⚠️  トレースを出力できませんでした: {e}")
+
+
+# フェーズごとのエージェント作成関数（ルーティングで別モデルのエージェントを作る際に使用）
+PHASE_AGENT_FACTORIES: Dict[str, Callable[..., Awaitable[Any]]] = {
+    "coordinator": create_coordinator_agent,
+    "researcher": create_researcher_agent,
+    "analyzer": create_analyzer_agent,
+    "summarizer": create_summarizer_agent,
+}
+
 
 class MultiAgentWorkflow:
     """
     マルチエージェントワークフローの管理クラス
 
-    4つのエージェントを順次実行し、各エージェントの出力を
-    次のエージェントに引き継ぎます。
+    4つのエージェントをフェーズグラフに沿って実行し、各エージェントの出力を
+    依存先のエージェントに引き継ぎます。依存関係のないノードは並行に実行されます。
     """
 
-    def __init__(self):
-        """ワークフロー初期化"""
+    def __init__(
+        self,
+        research_fanout: Optional[bool] = None,
+        use_cache: Optional[bool] = None,
+        cache: Optional[ResponseCache] = None,
+        compactor: Optional[PromptCompactor] = None,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        use_checkpoints: Optional[bool] = None,
+        retry_policies: Optional[Dict[str, RetryPolicy]] = None,
+        router: Optional[ModelRouter] = None,
+        history_store: Optional[HistoryStore] = None,
+        speculative_research: Optional[bool] = None,
+        triage: Optional[QueryTriage] = None,
+        rate_limiter: Optional[RateLimiter] = None
+    ):
+        """
+        ワークフロー初期化
+
+        Args:
+            research_fanout: 調査項目ごとにResearcherを並行実行するか
+                             （省略時はSettings.RESEARCHER_FANOUTに従う）
+            use_cache: 応答キャッシュを使用するか（省略時はSettings.RESPONSE_CACHE_ENABLEDに従う）
+            cache: 使用する応答キャッシュ（省略時はプロセス共有キャッシュ）
+            compactor: 後段フェーズに渡す出力の圧縮器（省略時はSettings.PROMPT_*に従う）
+            checkpoint_store: フェーズ出力の保存先（省略時はSettings.CHECKPOINT_DIR）
+            use_checkpoints: フェーズ出力を保存するか（省略時はSettings.CHECKPOINT_ENABLEDに従う）
+            retry_policies: フェーズ名ごとのリトライポリシー（未指定のフェーズはSettingsから作成）
+            router: フェーズごとのモデル選択（省略時はSettings.ROUTING_*に従う）
+            history_store: 実行履歴の保存先（省略時はSettings.HISTORY_*に従う）
+            speculative_research: Coordinatorと並行して元の質問からResearcherを先行実行するか
+                                  （省略時はSettings.SPECULATIVE_RESEARCHに従う）
+            triage: 質問を simple / lookup / deep に分類するトリアージ（省略時はSettings.TRIAGE_*に従う）
+            rate_limiter: エージェント呼び出しのレート制限（省略時はSettings.RATE_LIMIT_ENABLEDが
+                          有効ならプロセス共有のレート制限）
+        """
+        self.research_fanout = settings.RESEARCHER_FANOUT if research_fanout is None else research_fanout
+        self.speculative_research = (
+            settings.SPECULATIVE_RESEARCH if speculative_research is None else speculative_research
+        )
+        self.use_cache = settings.RESPONSE_CACHE_ENABLED if use_cache is None else use_cache
+        self.cache = cache
+        self.compactor = compactor or PromptCompactor(
+            strategies=settings.get_compaction_strategies(),
+            extractive_max_chars=settings.PROMPT_EXTRACTIVE_MAX_CHARS,
+            phase_budgets={phase: settings.get_prompt_budget(phase) for phase in ("analyzer", "summarizer")}
+        )
+        self.use_checkpoints = settings.CHECKPOINT_ENABLED if use_checkpoints is None else use_checkpoints
+        self.checkpoint_store = checkpoint_store
+        if self.use_checkpoints and self.checkpoint_store is None:
+            self.checkpoint_store = CheckpointStore(settings.CHECKPOINT_DIR)
+        self.retry_policies: Dict[str, RetryPolicy] = dict(retry_policies or {})
+        self.router = router or build_router()
+        self.rate_limiter = rate_limiter
+        if self.rate_limiter is None and settings.RATE_LIMIT_ENABLED:
+            self.rate_limiter = get_rate_limiter()
+        self.triage = triage or QueryTriage(
+            enabled=settings.TRIAGE_ENABLED,
+            simple_max_chars=settings.TRIAGE_SIMPLE_MAX_CHARS,
+            lookup_max_chars=settings.TRIAGE_LOOKUP_MAX_CHARS
+        )
+        # ルーティングで既定と異なるモデルを選んだ場合のエージェント {(フェーズ, モデル): agent}
+        self.routed_agents: Dict[Tuple[str, str], Any] = {}
         self.coordinator = None
         self.researcher = None
         self.analyzer = None
         self.summarizer = None
-        self.execution_history: List[Dict[str, Any]] = []
+        # run()ごとの実行履歴（件数・バイト数の上限付き、長い文字列は参照で保持）
+        self.history = history_store if history_store is not None else HistoryStore(
+            max_runs=settings.HISTORY_MAX_RUNS,
+            max_bytes=settings.HISTORY_MAX_BYTES,
+            spill_path=settings.HISTORY_SPILL_PATH or None,
+            preview_chars=settings.HISTORY_PREVIEW_CHARS
+        )
+        self._init_lock: Optional[asyncio.Lock] = None
+        # エージェントごとの初期化時間と接続の事前準備の結果
+        self.init_timings: Dict[str, Any] = {}
+
+    @property
+    def execution_history(self) -> List[Dict[str, Any]]:
+        """直近の実行履歴（長い入出力はプレビューと参照）"""
+        latest = self.history.latest()
+        return latest.entries if latest is not None else []
+
+    def _record(self, entry: Dict[str, Any]) -> None:
+        """
+        実行履歴に記録
+
+        run()の実行中はそのリクエストの履歴に追加し、run()の終了時に履歴ストアへ保存します。
+        それ以外（フェーズを単独で呼び出した場合）は1件の履歴として直接保存します。
+        """
+        state = _run_state.get()
+        if state is not None:
+            state.history.append(entry)
+        else:
+            # 単独呼び出しの1件だけの履歴のため同期で追加する（上限を超えた場合のみ古い履歴を書き出す）
+            self.history.add([entry])
+
+    def _compact(self, phase: str, outputs: Dict[str, str]) -> Dict[str, str]:
+        """
+        後段フェーズに渡す前段の出力を圧縮し、削減量を記録
+
+        Args:
+            phase: 出力を受け取るフェーズ名
+            outputs: 出力元のフェーズ名をキー、出力を値とする辞書
+
+        Returns:
+            圧縮後の出力の辞書
+        """
+        if not self.compactor.enabled:
+            return outputs
+
+        compacted, stats = self.compactor.compact(phase, outputs)
+        state = _run_state.get()
+        if state is not None:
+            state.compaction[phase] = stats.to_dict()
+        return compacted
+
+    async def ensure_initialized(self):
+        """
+        エージェントが未初期化なら初期化する
+
+        並行に呼ばれても初期化は1回だけ実行されます。
+        """
+        if self.coordinator is not None:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self.coordinator is None:
+                await self.initialize_agents()
 
     async def initialize_agents(self):
         """
         全エージェントを初期化
 
-        並列で全エージェントを作成し、起動時間を短縮します。
+        エージェントの作成（同期的な構築処理）と並行して、認証情報の取得と
+        エンドポイントへのTLS接続を事前に行い（Settings.WARMUP_*）、
+        最初のクエリがこれらの待ち時間を負担しないようにします。
+        エージェントごとの初期化時間は self.init_timings に記録されます。
         """
         logger.info("エージェントを初期化中...")
+        start = time.perf_counter()
 
         try:
-            # 並列でエージェントを作成
-            coordinator_task = create_coordinator_agent()
-            researcher_task = create_researcher_agent()
-            analyzer_task = create_analyzer_agent()
-            summarizer_task = create_summarizer_agent()
+            async def traced_init(phase: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+                with span(f"init.{phase}", "init", phase=phase):
+                    phase_start = time.perf_counter()
+                    agent = await factory()
+                    self.init_timings[phase] = time.perf_counter() - phase_start
+                    return agent
+
+            async def warm_up() -> None:
+                with span("init.warm_up", "init", phase="warm_up"):
+                    self.init_timings["warm_up"] = await warm_up_clients(
+                        settings.AZURE_OPENAI_ENDPOINT,
+                        settings.AZURE_OPENAI_API_KEY or None,
+                        settings.WARMUP_TIMEOUT_SECONDS
+                    )
+
+            # 認証情報の取得・接続は待ち時間が主なので、最初に開始してエージェントの作成と重ねる
+            warm_up_tasks = []
+            if settings.WARMUP_ENABLED and settings.LLM_BACKEND != "fake" and settings.AZURE_OPENAI_ENDPOINT:
+                warm_up_tasks.append(warm_up())
 
-            # 全エージェントの作成を待機
-            self.coordinator, self.researcher, self.analyzer, self.summarizer = await asyncio.gather(
+            # 並列でエージェントを作成
+            coordinator_task = traced_init("coordinator", create_coordinator_agent)
+            researcher_task = traced_init("researcher", create_researcher_agent)
+            analyzer_task = traced_init("analyzer", create_analyzer_agent)
+            summarizer_task = traced_init("summarizer", create_summarizer_agent)
+
+            # 全エージェントの作成と事前準備を待機
+            results = await asyncio.gather(
+                *warm_up_tasks,
                 coordinator_task,
                 researcher_task,
                 analyzer_task,
                 summarizer_task
             )
+            self.coordinator, self.researcher, self.analyzer, self.summarizer = results[len(warm_up_tasks):]
 
-            logger.info("✅ 全エージェントの初期化が完了しました")
+            self.init_timings["total"] = time.perf_counter() - start
+            breakdown = ", ".join(
+                f"{phase} {seconds:.2f}秒" for phase, seconds in self.init_timings.items()
+                if phase in PHASE_AGENT_FACTORIES
+            )
+            logger.info(f"✅ 全エージェントの初期化が完了しました（{self.init_timings['total']:.2f}秒: {breakdown}）")
 
         except Exception as e:
             logger.error(f"❌ エージェント初期化エラー: {e}")
             raise
 
+    async def stream_agent(
+        self,
+        agent: Any,
+        prompt: str,
+        on_usage: Optional[Callable[[Any], None]] = None
+    ) -> AsyncIterator[str]:
+        """
+        エージェントの応答をトークン差分として逐次取得
+
+        Args:
+            agent: 実行するエージェント
+            prompt: 送信するプロンプト
+            on_usage: ストリーム中の使用量（UsageDetails）を受け取るコールバック
+
+        Yields:
+            応答テキストの差分
+        """
+        async for update in agent.run_stream(prompt):
+            if on_usage is not None:
+                for content in getattr(update, "contents", None) or []:
+                    if getattr(content, "type", None) == "usage":
+                        on_usage(content.details)
+            if update.text:
+                yield update.text
+
+    def _get_cache(self) -> Optional[ResponseCache]:
+        """使用する応答キャッシュを取得（無効な場合はNone）"""
+        if not self.use_cache:
+            return None
+        if self.cache is None:
+            self.cache = get_response_cache()
+        return self.cache
+
+    @staticmethod
+    def _cache_key(phase: str, agent: Any, prompt: str) -> str:
+        """エージェントの名前・デプロイメント・システムプロンプトとプロンプトからキーを生成"""
+        chat_client = getattr(agent, "chat_client", None)
+        chat_options = getattr(agent, "chat_options", None)
+        return make_cache_key(
+            getattr(agent, "name", None) or phase,
+            getattr(chat_client, "deployment_name", None) or "",
+            getattr(chat_options, "instructions", None) or "",
+            prompt
+        )
+
+    async def _run_agent(self, phase: str, agent: Any, prompt: str, model: Optional[str] = None) -> str:
+        """
+        エージェントを実行して応答テキストを返す
+
+        応答キャッシュが有効な場合は、ヒットすればエージェントを呼び出さずに
+        キャッシュ済みの応答を返します。
+
+        Args:
+            phase: フェーズ名（通知時の識別子）
+            agent: 実行するエージェント
+            prompt: 送信するプロンプト
+            model: エージェントのモデルタイプ（応答時間の記録用）
+
+        Returns:
+            応答テキスト全体
+        """
+        cache = self._get_cache()
+        if cache is None:
+            return await self._invoke_agent(phase, agent, prompt, model)
+
+        key = self._cache_key(phase, agent, prompt)
+        cached = cache.get(key, phase)
+        state = _run_state.get()
+        if cached is not None:
+            logger.info(f"💾 キャッシュヒット: {phase}")
+            current_span().set_attribute("cache_hit", True)
+            if state is not None:
+                state.cache_hits += 1
+                if state.on_delta is not None:
+                    state.on_delta(phase, cached)
+            return cached
+
+        if state is not None:
+            state.cache_misses += 1
+        output_text = await self._invoke_agent(phase, agent, prompt, model)
+        cache.set(key, output_text, phase)
+        return output_text
+
+    def _get_retry_policy(self, phase: str) -> RetryPolicy:
+        """
+        フェーズのリトライポリシーを取得（未作成ならSettingsから作成）
+
+        ポリシーはヘッジ判定用の応答時間を蓄積するため、フェーズごとに使い回します。
+        """
+        policy = self.retry_policies.get(phase)
+        if policy is None:
+            policy = RetryPolicy(
+                max_retries=settings.MAX_RETRIES,
+                timeout=settings.get_phase_timeout(phase),
+                base_delay=settings.RETRY_BASE_DELAY,
+                max_delay=settings.RETRY_MAX_DELAY,
+                hedge=settings.HEDGE_ENABLED,
+                hedge_percentile=settings.HEDGE_PERCENTILE,
+                hedge_min_samples=settings.HEDGE_MIN_SAMPLES,
+                hedge_after=settings.HEDGE_AFTER_SECONDS or None
+            )
+            self.retry_policies[phase] = policy
+        return policy
+
+    async def _acquire_rate_limit(self, phase: str, prompt: str, model: Optional[str]) -> Optional[RateLimitTicket]:
+        """
+        エージェント呼び出しの前にレート制限の枠を確保する
+
+        予約するトークン数はプロンプトの見積もりと出力の見込み（Settings.RATE_LIMIT_OUTPUT_TOKENS）の合計です。
+        待機する場合は run() の on_backpressure に順番と待機時間の見積もりを通知します。
+
+        Returns:
+            確保した枠（レート制限が無効な場合はNone）
+        """
+        if self.rate_limiter is None:
+            return None
+
+        state = _run_state.get()
+        tenant = state.tenant if state is not None else "default"
+        deployment = settings.get_deployment_name(model or self.router.default_model(phase))
+
+        def on_wait(info: Dict[str, Any]) -> None:
+            if state is not None and state.on_backpressure is not None:
+                state.on_backpressure({"phase": phase, **info})
+
+        with span(f"rate_limit.{phase}", "rate_limit", phase=phase, deployment=deployment, tenant=tenant) as wait_span:
+            ticket = await self.rate_limiter.acquire(
+                deployment,
+                tenant,
+                estimate_tokens(prompt) + settings.RATE_LIMIT_OUTPUT_TOKENS,
+                on_wait=on_wait
+            )
+            wait_span.set_attribute("waited_seconds", ticket.waited_seconds)
+
+        if ticket.waited_seconds > 0 and state is not None:
+            state.rate_limit.append({"phase": phase, **ticket.to_dict()})
+        return ticket
+
+    async def _invoke_agent(self, phase: str, agent: Any, prompt: str, model: Optional[str] = None) -> str:
+        """
+        エージェントを呼び出して応答テキストを返す
+
+        呼び出しはフェーズのリトライポリシー（タイムアウト・再試行・ヘッジ）に従い、
+        各試行の結果を実行履歴に記録します。
+        レート制限が有効な場合は呼び出しの前に枠を確保し、呼び出し後に実際の使用量を反映します。
+        ストリーミング通知先が設定されている場合はストリーミングで実行し、
+        差分を到着順に通知します（通知を始めた後は再試行しません）。
+        ENABLE_STREAMINGが無効な場合は通常実行した応答全体を1つの差分として通知します。
+
+        Args:
+            phase: フェーズ名（通知時の識別子）
+            agent: 実行するエージェント
+            prompt: 送信するプロンプト
+            model: エージェントのモデルタイプ（指定時は応答時間をルーターに記録）
+
+        Returns:
+            応答テキスト全体
+        """
+        state = _run_state.get()
+        on_delta = state.on_delta if state is not None else None
+        policy = self._get_retry_policy(phase)
+        attempts: List[Dict[str, Any]] = []
+        ticket = await self._acquire_rate_limit(phase, prompt, model)
+        used_tokens: Dict[str, int] = {}
+        start = time.perf_counter()
+
+        with span(f"agent.{phase}", "agent", phase=phase, model=model, prompt_chars=len(prompt)) as agent_span:
+            def record_usage(details: Any) -> None:
+                if details is None:
+                    return
+                if state is not None:
+                    state.add_usage(phase, details)
+                input_tokens = getattr(details, "input_token_count", None) or 0
+                output_tokens = getattr(details, "output_token_count", None) or 0
+                used_tokens["total"] = used_tokens.get("total", 0) + input_tokens + output_tokens
+                agent_span.add("input_tokens", input_tokens)
+                agent_span.add("output_tokens", output_tokens)
+
+            try:
+                if on_delta is None or not settings.ENABLE_STREAMING:
+                    # レスポンスからテキストを取得（agent-framework 1.0.0b251209対応）
+                    response = await policy.call(lambda: agent.run(prompt), attempts=attempts)
+                    record_usage(getattr(response, "usage_details", None))
+                    if on_delta is not None:
+                        on_delta(phase, response.text)
+                    output_text = response.text
+                else:
+                    emitted = {"any": False}
+
+                    async def stream_once() -> str:
+                        chunks: List[str] = []
+                        async for delta in self.stream_agent(agent, prompt, on_usage=record_usage):
+                            chunks.append(delta)
+                            emitted["any"] = True
+                            on_delta(phase, delta)
+                        return "".join(chunks)
+
+                    output_text = await policy.call(
+                        stream_once,
+                        attempts=attempts,
+                        hedge=False,
+                        can_retry=lambda: not emitted["any"]
+                    )
+
+                agent_span.set_attribute("completion_chars", len(output_text))
+                if model is not None:
+                    self.router.record_latency(phase, model, time.perf_counter() - start)
+                return output_text
+
+            finally:
+                # 予約したトークン数を実際の使用量で精算し、再試行・ヘッジで送った分も計上
+                if ticket is not None:
+                    self.rate_limiter.settle(ticket, used_tokens.get("total"), max(0, len(attempts) - 1))
+                agent_span.set_attribute("retries", max(0, len(attempts) - 1))
+                agent_span.set_attribute("hedged", any(a.get("hedged") for a in attempts))
+                self._record({
+                    "phase": phase,
+                    "timestamp": datetime.now().isoformat(),
+                    "attempts": attempts
+                })
+
+    async def _get_phase_agent(self, phase: str, model: str) -> Any:
+        """
+        フェーズとモデルに対応するエージェントを取得
+
+        既定モデルの場合は初期化済みのエージェントを、それ以外は初回利用時に作成して使い回します。
+        """
+        if model == self.router.default_model(phase):
+            return getattr(self, phase)
+
+        key = (phase, model)
+        if key not in self.routed_agents:
+            factory = PHASE_AGENT_FACTORIES[phase]
+            self.routed_agents[key] = await factory(model_type=model)
+        return self.routed_agents[key]
+
+    async def _run_phase(
+        self,
+        phase: str,
+        prompt: str,
+        original_query: str,
+        coordinator_output: Optional[str] = None
+    ) -> str:
+        """
+        モデルを選択してフェーズのエージェントを実行
+
+        既定より軽いモデルを選んだ場合は出力を品質チェックし、
+        不合格なら既定モデルで再実行します。その場合は途中の出力を通知しないよう、
+        選択したモデルの出力は品質チェックの後にまとめて通知します。
+
+        Args:
+            phase: フェーズ名
+            prompt: 送信するプロンプト
+            original_query: 元のユーザークエリ（特徴量の抽出に使用）
+            coordinator_output: Coordinatorの出力（特徴量の抽出に使用）
+
+        Returns:
+            応答テキスト全体
+        """
+        decision = self.router.route(phase, extract_features(original_query, coordinator_output))
+        default_model = self.router.default_model(phase)
+        state = _run_state.get()
+        start = time.perf_counter()
+
+        with span(f"phase.{phase}", "phase", phase=phase, model=decision.model, prompt_chars=len(prompt)) as phase_span:
+            try:
+                agent = await self._get_phase_agent(phase, decision.model)
+                may_escalate = self.router.escalate and decision.model != default_model
+                if not may_escalate or state is None or state.on_delta is None:
+                    output_text = await self._run_agent(phase, agent, prompt, decision.model)
+                else:
+                    # エスカレーションの可能性がある間は差分を通知しない
+                    with _deltas_suppressed():
+                        output_text = await self._run_agent(phase, agent, prompt, decision.model)
+
+                escalation_reason = self.router.should_escalate(decision, output_text)
+                if escalation_reason is not None:
+                    logger.warning(f"⤴️  {phase}: {decision.model} の出力を {default_model} で再実行（{escalation_reason}）")
+                    decision.escalated = True
+                    decision.escalation_reason = escalation_reason
+                    decision.escalation_model = default_model
+                    output_text = await self._run_agent(
+                        phase, await self._get_phase_agent(phase, default_model), prompt, default_model
+                    )
+                elif may_escalate and state is not None and state.on_delta is not None:
+                    state.on_delta(phase, output_text)
+
+                phase_span.set_attribute("completion_chars", len(output_text))
+                return output_text
+
+            finally:
+                phase_span.set_attribute("escalated", decision.escalated)
+                decision.duration_seconds = time.perf_counter() - start
+                decision.estimated_saving_seconds = self.router.estimate_saving(decision)
+                if state is not None:
+                    state.routing.append(decision.to_dict())
+                if decision.model != default_model:
+                    logger.info(f"🔀 {phase}: {decision.model} を使用（{decision.reason}）")
+
     async def run_coordinator(self, user_query: str) -> str:
         """
         Coordinatorエージェントを実行
@@ -86,13 +794,10 @@ class MultiAgentWorkflow:
 
         try:
             # Coordinatorに質問を送信
-            response = await self.coordinator.run(user_query)
-
-            # レスポンスからテキストを取得（agent-framework 1.0.0b251209対応）
-            output_text = response.text
+            output_text = await self._run_phase("coordinator", user_query, user_query)
 
             # 実行履歴に記録
-            self.execution_history.append({
+            self._record({
                 "agent": "Coordinator",
                 "timestamp": datetime.now().isoformat(),
                 "input": user_query,
@@ -135,13 +840,10 @@ Web検索ツールを活用し、最新の情報を含めてください。
 """
 
             # Researcherに送信
-            response = await self.researcher.run(researcher_prompt)
-
-            # レスポンスからテキストを取得
-            output_text = response.text
+            output_text = await self._run_phase("researcher", researcher_prompt, original_query, coordinator_output)
 
             # 実行履歴に記録
-            self.execution_history.append({
+            self._record({
                 "agent": "Researcher",
                 "timestamp": datetime.now().isoformat(),
                 "input": researcher_prompt,
@@ -155,6 +857,313 @@ Web検索ツールを活用し、最新の情報を含めてください。
             logger.error(f"❌ Researcherエラー: {e}")
             raise
 
+    async def run_researcher_item(self, item: str, coordinator_output: str, original_query: str) -> str:
+        """
+        1つの調査項目についてResearcherエージェントを実行（ファンアウト用）
+
+        他の項目と並行して実行されるため、差分は通知せず、完了時に出力全体を通知します。
+
+        Args:
+            item: 調査項目
+            coordinator_output: Coordinatorの出力（調査の文脈として参照）
+            original_query: 元のユーザークエリ
+
+        Returns:
+            Researcherの出力（当該項目について収集した情報）
+        """
+        logger.info(f"🔍 Researcher（項目別）: {item}")
+        state = _run_state.get()
+
+        try:
+            researcher_prompt = f"""
+【元の質問】
+{original_query}
+
+【担当する調査項目】
+{item}
+
+【参考: Coordinatorの調査計画全体】
+{coordinator_output}
+
+上記のうち「担当する調査項目」についてのみ、必要な情報を収集してください。
+他の項目は別のResearcherが並行して担当します。
+Web検索ツールを活用し、最新の情報を含めてください。
+"""
+
+            # 項目は並行して調査するため、差分が混ざらないよう完了した項目ごとに出力全体を通知する
+            with _deltas_suppressed():
+                output_text = await self._run_phase("researcher", researcher_prompt, original_query, coordinator_output)
+            if state is not None and state.on_delta is not None:
+                state.on_delta("researcher", output_text)
+
+            self._record({
+                "agent": "Researcher",
+                "item": item,
+                "timestamp": datetime.now().isoformat(),
+                "input": researcher_prompt,
+                "output": output_text
+            })
+
+            logger.info(f"✅ Researcher（項目別）完了: {item} ({len(output_text)}文字)")
+            return output_text
+
+        except Exception as e:
+            logger.error(f"❌ Researcherエラー（{item}）: {e}")
+            raise
+
+    async def run_speculative_researcher(self, original_query: str) -> str:
+        """
+        元の質問だけを使ってResearcherを先行実行（Coordinatorと並行）
+
+        Args:
+            original_query: 元のユーザークエリ
+
+        Returns:
+            先行調査の結果
+        """
+        logger.info("🔮 Researcher（先行）: 調査計画を待たずに元の質問から調査を開始")
+
+        state = _run_state.get()
+        speculation = state.speculation if state is not None else {}
+        researcher_prompt = f"""
+【元の質問】
+{original_query}
+
+調査計画はまだありません。元の質問に答えるために必要と思われる情報を、
+観点ごとに段落を分けて収集してください。
+Web検索ツールを活用し、最新の情報を含めてください。
+"""
+
+        try:
+            usage_before = dict(state.usage.get("researcher", {})) if state is not None else {}
+            speculation["start"] = time.perf_counter()
+            # 先行調査は照合で一部が破棄されるため差分を通知しない（照合後の結果だけを通知）
+            with _deltas_suppressed():
+                output_text = await self._run_phase("researcher", researcher_prompt, original_query)
+            speculation["end"] = time.perf_counter()
+            if state is not None:
+                usage_after = state.usage.get("researcher", {})
+                speculation["tokens"] = sum(
+                    usage_after.get(key, 0) - usage_before.get(key, 0) for key in ("input_tokens", "output_tokens")
+                )
+
+            self._record({
+                "agent": "Researcher",
+                "speculative": True,
+                "timestamp": datetime.now().isoformat(),
+                "input": researcher_prompt,
+                "output": output_text
+            })
+
+            logger.info(f"✅ Researcher（先行）完了: {len(output_text)}文字の情報を収集")
+            return output_text
+
+        except Exception as e:
+            logger.error(f"❌ Researcher（先行）エラー: {e}")
+            raise
+
+    async def run_researcher_followup(self, items: List[str], coordinator_output: str, original_query: str) -> str:
+        """
+        先行調査でカバーされなかった調査項目だけをResearcherで追加調査
+
+        Args:
+            items: 追加で調査する項目
+            coordinator_output: Coordinatorの出力（調査の文脈として参照）
+            original_query: 元のユーザークエリ
+
+        Returns:
+            Researcherの出力（追加で収集した情報）
+        """
+        logger.info(f"🔍 Researcher（追加調査）: {len(items)}項目")
+
+        try:
+            item_lines = "\n".join(f"- {item}" for item in items)
+            researcher_prompt = f"""
+【元の質問】
+{original_query}
+
+【追加で調査する項目】
+{item_lines}
+
+【参考: Coordinatorの調査計画全体】
+{coordinator_output}
+
+上記のうち「追加で調査する項目」についてのみ、必要な情報を収集してください。
+他の項目は調査済みです。
+Web検索ツールを活用し、最新の情報を含めてください。
+"""
+
+            output_text = await self._run_phase("researcher", researcher_prompt, original_query, coordinator_output)
+
+            self._record({
+                "agent": "Researcher",
+                "followup_items": items,
+                "timestamp": datetime.now().isoformat(),
+                "input": researcher_prompt,
+                "output": output_text
+            })
+
+            logger.info(f"✅ Researcher（追加調査）完了: {len(output_text)}文字")
+            return output_text
+
+        except Exception as e:
+            logger.error(f"❌ Researcher（追加調査）エラー: {e}")
+            raise
+
+    async def run_researcher_reconciled(
+        self,
+        speculative_output: str,
+        coordinator_output: str,
+        original_query: str
+    ) -> str:
+        """
+        先行調査の結果を調査計画と照合し、足りない項目だけを追加調査
+
+        計画の項目と重なる先行調査の段落は残し、カバーされていない項目は
+        ファンアウトが有効なら項目ごとに並行して、無効なら1回にまとめて調査します。
+        先行調査が失敗した場合や計画から項目を抽出できない場合は
+        通常のResearcherを実行します（先行調査は破棄）。
+        Researcherの差分として通知するのは、通常のResearcherの出力か照合後の統合テキストだけです。
+
+        Args:
+            speculative_output: 先行調査の結果
+            coordinator_output: Coordinatorの出力
+            original_query: 元のユーザークエリ
+
+        Returns:
+            Researcherの出力形式（【調査項目】【収集した情報】）に揃えた統合テキスト
+        """
+        state = _run_state.get()
+        speculation = state.speculation if state is not None else {}
+        report = SpeculationReport(
+            speculative_seconds=(
+                speculation["end"] - speculation["start"] if "start" in speculation and "end" in speculation else None
+            ),
+            speculative_tokens=speculation.get("tokens", 0),
+            error=speculation.get("error")
+        )
+
+        items = parse_research_items(coordinator_output)
+        followup_start = time.perf_counter()
+        if report.error is not None or not items:
+            if report.error is not None:
+                logger.info("先行調査が失敗したため、通常のResearcherを実行します")
+            else:
+                logger.info("調査項目を抽出できないため、先行調査を破棄して通常のResearcherを実行します")
+            report.fallback = True
+            report.discarded_chars = len(speculative_output)
+            report.wasted_tokens = report.speculative_tokens
+            output_text = await self.run_researcher(coordinator_output, original_query)
+        else:
+            reconciliation = reconcile_findings(items, speculative_output, settings.SPECULATIVE_COVERAGE_THRESHOLD)
+            report.covered_items = reconciliation.covered_items
+            report.followup_items = reconciliation.uncovered_items
+            report.kept_chars = reconciliation.kept_chars
+            report.discarded_chars = reconciliation.discarded_chars
+            report.wasted_tokens = round(report.speculative_tokens * reconciliation.discarded_ratio)
+            logger.info(
+                f"🔮 先行調査の照合: {len(reconciliation.covered_items)}/{len(items)}項目をカバー、"
+                f"{len(reconciliation.uncovered_items)}項目を追加調査"
+            )
+
+            results: List[Tuple[str, str]] = []
+            if reconciliation.kept_text:
+                results.append(("元の質問に基づく先行調査", reconciliation.kept_text))
+
+            uncovered = reconciliation.uncovered_items
+            with _deltas_suppressed():
+                if uncovered and self.research_fanout and len(uncovered) >= settings.RESEARCHER_FANOUT_MIN_ITEMS:
+                    semaphore = asyncio.Semaphore(settings.RESEARCHER_MAX_CONCURRENCY)
+
+                    async def research(item: str) -> Tuple[str, str]:
+                        async with semaphore:
+                            return item, await self.run_researcher_item(item, coordinator_output, original_query)
+
+                    results.extend(await asyncio.gather(*(research(item) for item in uncovered)))
+                elif uncovered:
+                    followup = await self.run_researcher_followup(uncovered, coordinator_output, original_query)
+                    results.append(("追加調査: " + "、".join(uncovered), followup))
+
+            output_text = self.merge_research_results(results)
+            # 統合した結果だけを通知する（先行調査・追加調査の途中の差分は通知しない）
+            if state is not None and state.on_delta is not None:
+                state.on_delta("researcher", output_text)
+
+        report.followup_seconds = time.perf_counter() - followup_start
+        if "coordinator_end" in speculation and report.speculative_seconds is not None:
+            report.estimated_saving_seconds = estimate_saving(
+                speculation["coordinator_end"], speculation["start"], speculation["end"], report.followup_seconds
+            )
+        speculation["report"] = report.to_dict()
+
+        if report.estimated_saving_seconds is not None:
+            logger.info(
+                f"🔮 先行実行の効果: 見積もり{report.estimated_saving_seconds:+.2f}秒、"
+                f"無駄になったトークン {report.wasted_tokens}"
+            )
+        return output_text
+
+    @staticmethod
+    def merge_research_results(results: List[Tuple[str, str]]) -> str:
+        """
+        項目別のResearcher出力を1つの構造化出力に統合
+
+        Args:
+            results: (調査項目, Researcherの出力) のリスト（計画の順序）
+
+        Returns:
+            Researcherの出力形式（【調査項目】【収集した情報】）に揃えた統合テキスト
+        """
+        lines = ["【調査項目】"]
+        lines.extend(f"- {item}" for item, _ in results)
+        lines.append("")
+        lines.append("【収集した情報】")
+
+        for i, (item, output) in enumerate(results, 1):
+            lines.append("")
+            lines.append(f"## [項目{i}] {item}")
+            lines.append(output.strip())
+
+        return "\n".join(lines)
+
+    def _build_researcher_node(self) -> FanOutNode:
+        """
+        Researcherのファンアウトノードを構築
+
+        Coordinatorの【必要な情報】を項目に分解し、項目ごとにResearcherを
+        Semaphoreで上限を設けて並行実行します。項目数が
+        RESEARCHER_FANOUT_MIN_ITEMS未満の場合は計画全体を1回で調査します。
+        """
+        def split(ctx: Dict[str, Any]) -> List[Optional[str]]:
+            items = parse_research_items(ctx["coordinator"])
+            if len(items) < settings.RESEARCHER_FANOUT_MIN_ITEMS:
+                logger.info(f"調査項目が{len(items)}件のため、ファンアウトせずに調査します")
+                return [None]
+            logger.info(
+                f"🔀 Researcherを{len(items)}項目にファンアウト"
+                f"（同時実行数: {settings.RESEARCHER_MAX_CONCURRENCY}）"
+            )
+            return items
+
+        async def worker(item: Optional[str], ctx: Dict[str, Any]) -> Tuple[Optional[str], str]:
+            if item is None:
+                return None, await self.run_researcher(ctx["coordinator"], ctx["query"])
+            return item, await self.run_researcher_item(item, ctx["coordinator"], ctx["query"])
+
+        def merge(results: List[Tuple[Optional[str], str]], ctx: Dict[str, Any]) -> str:
+            if len(results) == 1 and results[0][0] is None:
+                return results[0][1]
+            return self.merge_research_results(results)
+
+        return FanOutNode(
+            "researcher",
+            split=split,
+            worker=worker,
+            merge=merge,
+            depends_on=["coordinator"],
+            max_concurrency=settings.RESEARCHER_MAX_CONCURRENCY
+        )
+
     async def run_analyzer(self, researcher_output: str, coordinator_output: str, original_query: str) -> str:
         """
         Analyzerエージェントを実行
@@ -172,16 +1181,22 @@ Web検索ツールを活用し、最新の情報を含めてください。
         logger.info("=" * 80)
 
         try:
+            # 必要な部分だけに圧縮
+            compacted = self._compact("analyzer", {
+                "coordinator": coordinator_output,
+                "researcher": researcher_output
+            })
+
             # Analyzerへの指示を作成
             analyzer_prompt = f"""
 【元の質問】
 {original_query}
 
 【調査計画（Coordinator）】
-{coordinator_output}
+{compacted["coordinator"]}
 
 【収集された情報（Researcher）】
-{researcher_output}
+{compacted["researcher"]}
 
 上記の情報を分析し、深い洞察を導き出してください。
 パターン、傾向、因果関係を特定し、データに基づいた論理的な推論を行ってください。
@@ -189,13 +1204,10 @@ Web検索ツールを活用し、最新の情報を含めてください。
 """
 
             # Analyzerに送信
-            response = await self.analyzer.run(analyzer_prompt)
-
-            # レスポンスからテキストを取得
-            output_text = response.text
+            output_text = await self._run_phase("analyzer", analyzer_prompt, original_query, coordinator_output)
 
             # 実行履歴に記録
-            self.execution_history.append({
+            self._record({
                 "agent": "Analyzer",
                 "timestamp": datetime.now().isoformat(),
                 "input": analyzer_prompt,
@@ -211,7 +1223,7 @@ Web検索ツールを活用し、最新の情報を含めてください。
 
     async def run_summarizer(
         self,
-        analyzer_output: str,
+        analyzer_output: Optional[str],
         researcher_output: str,
         coordinator_output: str,
         original_query: str
@@ -220,7 +1232,7 @@ Web検索ツールを活用し、最新の情報を含めてください。
         Summarizerエージェントを実行
 
         Args:
-            analyzer_output: Analyzerの出力
+            analyzer_output: Analyzerの出力（lookupパスでAnalyzerを省略した場合はNone）
             researcher_output: Researcherの出力
             coordinator_output: Coordinatorの出力
             original_query: 元のユーザークエリ
@@ -233,33 +1245,44 @@ Web検索ツールを活用し、最新の情報を含めてください。
         logger.info("=" * 80)
 
         try:
+            # 必要な部分だけに圧縮
+            sources = {
+                "coordinator": coordinator_output,
+                "researcher": researcher_output
+            }
+            if analyzer_output is not None:
+                sources["analyzer"] = analyzer_output
+            compacted = self._compact("summarizer", sources)
+
+            # Analyzerを省略した場合は分析結果のセクションを含めない
+            analyzer_section = ""
+            if analyzer_output is not None:
+                analyzer_section = f"""
+【分析結果（Analyzer）】
+{compacted["analyzer"]}
+"""
+
             # Summarizerへの指示を作成
             summarizer_prompt = f"""
 【元の質問】
 {original_query}
 
 【調査計画（Coordinator）】
-{coordinator_output}
+{compacted["coordinator"]}
 
 【収集された情報（Researcher）】
-{researcher_output}
-
-【分析結果（Analyzer）】
-{analyzer_output}
-
+{compacted["researcher"]}
+{analyzer_section}
 上記の全ての情報を統合し、ユーザーの質問に対する最終的な回答を作成してください。
 わかりやすく構造化され、読みやすい形式で出力してください。
 整形ツールを積極的に活用して、Markdown形式で美しく整形してください。
 """
 
             # Summarizerに送信
-            response = await self.summarizer.run(summarizer_prompt)
-
-            # レスポンスからテキストを取得
-            output_text = response.text
+            output_text = await self._run_phase("summarizer", summarizer_prompt, original_query, coordinator_output)
 
             # 実行履歴に記録
-            self.execution_history.append({
+            self._record({
                 "agent": "Summarizer",
                 "timestamp": datetime.now().isoformat(),
                 "input": summarizer_prompt,
@@ -273,56 +1296,295 @@ Web検索ツールを活用し、最新の情報を含めてください。
             logger.error(f"❌ Summarizerエラー: {e}")
             raise
 
-    async def run(self, user_query: str) -> Dict[str, Any]:
+    async def run_direct_answer(self, original_query: str) -> str:
         """
-        完全なマルチエージェントワークフローを実行
+        調査・分析を行わずにSummarizerエージェントで直接回答する（simpleパス用）
+
+        Args:
+            original_query: 元のユーザークエリ
+
+        Returns:
+            Summarizerの出力（最終回答）
+        """
+        logger.info("=" * 80)
+        logger.info("⚡ Summarizer - 直接回答")
+        logger.info("=" * 80)
+
+        try:
+            direct_prompt = f"""
+【元の質問】
+{original_query}
+
+この質問は調査や分析を必要としない単純な質問のため、他のエージェントの出力はありません。
+質問に簡潔かつ正確に直接回答してください。見出しなどの定型の構成は不要です。
+"""
+
+            output_text = await self._run_phase("summarizer", direct_prompt, original_query)
+
+            # 実行履歴に記録
+            self._record({
+                "agent": "Summarizer",
+                "timestamp": datetime.now().isoformat(),
+                "input": direct_prompt,
+                "output": output_text
+            })
+
+            logger.info(f"✅ 直接回答完了: {len(output_text)}文字")
+            return output_text
+
+        except Exception as e:
+            logger.error(f"❌ Summarizerエラー: {e}")
+            raise
+
+    def build_graph(self, path: str = "deep") -> PhaseGraph:
+        """
+        標準の4フェーズグラフを構築
+
+        Coordinator → Researcher → Analyzer → Summarizer の依存関係を持つ
+        組み込みグラフです。各ノードの出力はノード名をキーにコンテキストへ格納されます。
+        research_fanoutが有効な場合、Researcherはファンアウトノードになります。
+        speculative_researchが有効な場合は、Coordinatorと並行して元の質問から先行調査を行い、
+        Researcherは計画との照合と不足分の追加調査を行うノードになります。
+
+        path にトリアージの結果を指定すると、より短いグラフを構築します。
+        simple はSummarizerの直接回答のみ、lookup はAnalyzerを省略した
+        Coordinator → Researcher → Summarizer です。
+
+        Args:
+            path: 実行パス（simple / lookup / deep）
+
+        Returns:
+            PhaseGraph: 実行パスに応じたフェーズグラフ
+
+        Raises:
+            ValueError: 未対応のパスを指定した場合
+        """
+        if path == "simple":
+            async def direct_answer(ctx: Dict[str, Any]) -> str:
+                return await self.run_direct_answer(ctx["query"])
+
+            return PhaseGraph([PhaseNode("summarizer", direct_answer)])
+        if path not in ("lookup", "deep"):
+            raise ValueError(f"未対応の実行パス: {path}")
+
+        async def coordinator(ctx: Dict[str, Any]) -> str:
+            output = await self.run_coordinator(ctx["query"])
+            state = _run_state.get()
+            if state is not None:
+                state.speculation["coordinator_end"] = time.perf_counter()
+            return output
+
+        async def researcher(ctx: Dict[str, Any]) -> str:
+            return await self.run_researcher(ctx["coordinator"], ctx["query"])
+
+        async def analyzer(ctx: Dict[str, Any]) -> str:
+            return await self.run_analyzer(ctx["researcher"], ctx["coordinator"], ctx["query"])
+
+        async def summarizer(ctx: Dict[str, Any]) -> str:
+            return await self.run_summarizer(
+                ctx["analyzer"],
+                ctx["researcher"],
+                ctx["coordinator"],
+                ctx["query"]
+            )
+
+        async def lookup_summarizer(ctx: Dict[str, Any]) -> str:
+            return await self.run_summarizer(None, ctx["researcher"], ctx["coordinator"], ctx["query"])
+
+        async def speculative_researcher(ctx: Dict[str, Any]) -> str:
+            # 先行調査は任意のため、失敗しても実行全体は止めずに通常の調査に切り替える
+            try:
+                return await self.run_speculative_researcher(ctx["query"])
+            except Exception as e:
+                logger.warning(f"⚠️  Researcher（先行）が失敗したため、調査計画に基づいて調査します: {e}")
+                state = _run_state.get()
+                if state is not None:
+                    state.speculation["error"] = f"{type(e).__name__}: {e}"
+                return ""
+
+        async def reconciled_researcher(ctx: Dict[str, Any]) -> str:
+            return await self.run_researcher_reconciled(ctx["speculative_researcher"], ctx["coordinator"], ctx["query"])
+
+        speculative_nodes = []
+        if self.speculative_research:
+            # 元の質問からの先行調査をCoordinatorと並行して実行し、計画が届いたら照合
+            speculative_nodes = [PhaseNode("speculative_researcher", speculative_researcher)]
+            researcher_node = PhaseNode(
+                "researcher", reconciled_researcher, depends_on=["coordinator", "speculative_researcher"]
+            )
+        elif self.research_fanout:
+            researcher_node = self._build_researcher_node()
+        else:
+            researcher_node = PhaseNode("researcher", researcher, depends_on=["coordinator"])
+
+        if path == "lookup":
+            return PhaseGraph([
+                PhaseNode("coordinator", coordinator),
+                *speculative_nodes,
+                researcher_node,
+                PhaseNode("summarizer", lookup_summarizer, depends_on=["researcher", "coordinator"]),
+            ])
+
+        return PhaseGraph([
+            PhaseNode("coordinator", coordinator),
+            *speculative_nodes,
+            researcher_node,
+            PhaseNode("analyzer", analyzer, depends_on=["researcher", "coordinator"]),
+            PhaseNode("summarizer", summarizer, depends_on=["analyzer", "researcher", "coordinator"]),
+        ])
+
+    def _record_node_timing(self, timing: NodeTiming) -> None:
+        """ノードの実行時間を実行履歴に記録"""
+        self._record(timing.to_dict())
+        logger.info(f"⏱️  ノード {timing.node}: {timing.duration_seconds:.2f}秒 ({timing.status})")
+
+    def _prepare_checkpoint(
+        self,
+        user_query: str,
+        resume: Optional[str]
+    ) -> Tuple[Optional[str], str, Dict[str, Any]]:
+        """
+        チェックポイントを作成、または再開する実行の保存済み出力を読み込む
 
         Args:
             user_query: ユーザーからの質問
+            resume: 再開する実行ID
+
+        Returns:
+            (実行ID, 質問, エグゼキューターの初期コンテキスト)
+        """
+        if resume is None:
+            if self.checkpoint_store is None:
+                return None, user_query, {"query": user_query}
+            run_id = self.checkpoint_store.create(user_query)
+            return run_id, user_query, {"query": user_query}
+
+        if self.checkpoint_store is None:
+            raise ValueError("チェックポイントが無効なため再開できません")
+
+        checkpoint = self.checkpoint_store.load(resume)
+        if user_query and user_query != checkpoint["query"]:
+            logger.warning("⚠️  再開時の質問がチェックポイントと異なるため、保存された質問を使用します")
+        query = checkpoint["query"]
+
+        self.checkpoint_store.mark(resume, "running")
+        outputs = checkpoint["outputs"]
+        logger.info(f"♻️  実行 {resume} を再開（完了済み: {', '.join(outputs) or 'なし'}）")
+        return resume, query, {"query": query, **outputs}
+
+    def _checkpoint_output(self, run_id: Optional[str]) -> Optional[Callable[[str, Any], Awaitable[None]]]:
+        """ノードの出力をチェックポイントに保存するコールバックを作成（書き込みはスレッドで実行）"""
+        if run_id is None:
+            return None
+
+        async def save(name: str, output: Any) -> None:
+            await asyncio.to_thread(self.checkpoint_store.save_output, run_id, name, output)
+
+        return save
+
+    async def run(
+        self,
+        user_query: str,
+        graph: Optional[PhaseGraph] = None,
+        on_delta: Optional[DeltaCallback] = None,
+        resume: Optional[str] = None,
+        path: Optional[str] = None,
+        tenant: str = "default",
+        on_backpressure: Optional[BackpressureCallback] = None
+    ) -> Dict[str, Any]:
+        """
+        完全なマルチエージェントワークフローを実行
+
+        Args:
+            user_query: ユーザーからの質問（再開時に空の場合はチェックポイントの質問を使用）
+            graph: 実行するフェーズグラフ（省略時はトリアージで選んだパスのグラフ）
+            on_delta: 各フェーズのトークン差分を受け取るコールバック（フェーズ名, 差分）
+            resume: 再開する実行ID（保存済みのフェーズを飛ばし、最初の未完了フェーズから実行）
+            path: トリアージを行わずに使う実行パス（simple / lookup / deep）
+            tenant: レート制限のテナント（テナントごとのクォータとテナント間の公平な順番に使用）
+            on_backpressure: レート制限で待機する呼び出しごとに、フェーズ・待ち順・待機時間の見積もりを
+                             受け取るコールバック
 
         Returns:
             実行結果を含む辞書:
                 - final_answer: 最終回答
                 - execution_time: 実行時間（秒）
-                - agent_outputs: 各エージェントの出力
+                - agent_outputs: 各エージェントの出力（省略したフェーズは空文字列）
+                - path: 実行パス（simple / lookup / deep、graph を指定した場合は custom）
+                - triage: トリアージの結果（パスと判定理由）
+                - execution_history: この実行の履歴（長い入出力はプレビューと参照。
+                  全文は self.history.get(trace_id) の参照から取得）
+                - usage: トークン使用量（合計とフェーズ別内訳）
+                - compaction: フェーズごとのプロンプト圧縮結果（バイト数）
+                - run_id: 実行ID（チェックポイント無効時はNone）
+                - resumed_phases: チェックポイントから復元したフェーズ
+                - routing: フェーズごとのモデル選択結果と削減時間の見積もり
+                - init_timings: エージェントごとの初期化時間と接続の事前準備の結果
+                - rate_limit: レート制限で待機した呼び出しと待機時間の合計（無効時はNone）
+                - speculation: Researcher先行実行の照合結果・短縮時間の見積もり・無駄になったトークン（無効時はNone）
+                - trace: この実行のスパン（trace_id, spans）
+                - profile: フェーズごとの所要時間・文字数・トークン数・再試行・キャッシュヒットの内訳
+
+        Raises:
+            ValueError: チェックポイントが無効な状態で resume を指定した場合、または未対応の path を指定した場合
+            KeyError: resume の実行IDのチェックポイントが存在しない場合
         """
+        if path is not None and path not in ("simple", "lookup", "deep"):
+            raise ValueError(f"未対応の実行パス: {path}")
+
         start_time = datetime.now()
+        run_id, user_query, context = await asyncio.to_thread(self._prepare_checkpoint, user_query, resume)
+        resumed_phases = [name for name in context if name != "query"]
 
         logger.info("\n" + "=" * 80)
         logger.info("🚀 マルチエージェントワークフロー開始")
         logger.info("=" * 80)
         logger.info(f"質問: {user_query}\n")
 
+        # 実行パスを決める（再開時も同じ質問から同じパスが選ばれる）
+        if graph is not None:
+            triage = TriageDecision("custom", "graph")
+        elif path is not None:
+            triage = TriageDecision(path, "requested")
+        else:
+            triage = self.triage.classify(user_query)
+        if triage.path != "deep":
+            logger.info(f"🧭 実行パス: {triage.path}（{triage.reason}）")
+
+        state = RunState(on_delta=on_delta, tenant=tenant, on_backpressure=on_backpressure)
+        tracer = Tracer()
+        token = _run_state.set(state)
         try:
-            # エージェント初期化（まだの場合）
-            if self.coordinator is None:
-                await self.initialize_agents()
-
-            # Phase 1: Coordinator
-            coordinator_output = await self.run_coordinator(user_query)
-
-            # Phase 2: Researcher
-            researcher_output = await self.run_researcher(coordinator_output, user_query)
-
-            # Phase 3: Analyzer
-            analyzer_output = await self.run_analyzer(
-                researcher_output,
-                coordinator_output,
-                user_query
-            )
-
-            # Phase 4: Summarizer
-            final_answer = await self.run_summarizer(
-                analyzer_output,
-                researcher_output,
-                coordinator_output,
-                user_query
-            )
+            with tracer.activate(), tracer.start_span(
+                "workflow.run", "workflow", query_chars=len(user_query), path=triage.path
+            ):
+                # エージェント初期化（まだの場合）
+                await self.ensure_initialized()
+
+                # フェーズグラフを実行（依存が解決したノードから並行実行）
+                executor = GraphExecutor(
+                    graph or self.build_graph(triage.path),
+                    on_node_complete=self._record_node_timing,
+                    on_node_output=self._checkpoint_output(run_id)
+                )
+                outputs = await executor.run(context)
+
+            # 完了した実行は再開することがないため、チェックポイントを残さない
+            if run_id is not None:
+                await asyncio.to_thread(self.checkpoint_store.delete, run_id)
+
+            coordinator_output = outputs.get("coordinator", "")
+            researcher_output = outputs.get("researcher", "")
+            analyzer_output = outputs.get("analyzer", "")
+            final_answer = outputs.get("summarizer", "")
 
             # 実行時間計算
             end_time = datetime.now()
             execution_time = (end_time - start_time).total_seconds()
 
+            # 履歴ストアに保存し、結果には軽量な表示（長い入出力はプレビューと参照）を返す
+            history = await self.history.add_async(state.history, user_query, "completed", tracer.trace_id)
+
             logger.info("\n" + "=" * 80)
             logger.info("🎉 ワークフロー完了!")
             logger.info(f"⏱️  実行時間: {execution_time:.2f}秒")
@@ -338,26 +1600,94 @@ Web検索ツールを活用し、最新の情報を含めてください。
                     "analyzer": analyzer_output,
                     "summarizer": final_answer
                 },
-                "execution_history": self.execution_history
+                "path": triage.path,
+                "triage": triage.to_dict(),
+                "execution_history": history.entries,
+                "node_timings": [timing.to_dict() for timing in executor.timings],
+                "cache_stats": state.cache_summary(self.cache) if self.use_cache and self.cache else None,
+                "usage": state.usage_summary(),
+                "compaction": state.compaction,
+                "run_id": run_id,
+                "resumed_phases": resumed_phases,
+                "routing": state.routing_summary(),
+                "init_timings": dict(self.init_timings),
+                "rate_limit": state.rate_limit_summary() if self.rate_limiter is not None else None,
+                "speculation": state.speculation.get("report"),
+                "trace": {
+                    "trace_id": tracer.trace_id,
+                    "spans": [s.to_dict() for s in tracer.spans]
+                },
+                "profile": summarize_spans(tracer.spans)
             }
 
         except Exception as e:
             logger.error(f"\n❌ ワークフローエラー: {e}")
+            await self.history.add_async(state.history, user_query, "failed", tracer.trace_id)
+            if run_id is not None:
+                await asyncio.to_thread(self.checkpoint_store.mark, run_id, "failed", str(e))
+                logger.error(f"💾 完了したフェーズは保存済みです（実行ID: {run_id} で再開できます）")
             raise
 
+        finally:
+            _run_state.reset(token)
+            export_trace(tracer)
+
+    async def run_stream(self, user_query: str) -> AsyncIterator[Tuple[str, str]]:
+        """
+        ワークフローを実行し、各フェーズのトークン差分を逐次返す
+
+        最終結果の辞書も必要な場合は run(user_query, on_delta=...) を使用してください。
+
+        Args:
+            user_query: ユーザーからの質問
 
-async def run_multi_agent_workflow(user_query: str) -> Dict[str, Any]:
+        Yields:
+            (フェーズ名, トークン差分) のタプル
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        task = asyncio.create_task(
+            self.run(user_query, on_delta=lambda phase, delta: queue.put_nowait((phase, delta)))
+        )
+
+        try:
+            while not task.done() or not queue.empty():
+                getter = asyncio.create_task(queue.get())
+                await asyncio.wait({getter, task}, return_when=asyncio.FIRST_COMPLETED)
+                if getter.done():
+                    yield getter.result()
+                else:
+                    getter.cancel()
+
+            # ワークフローの例外を呼び出し元へ伝播
+            await task
+
+        finally:
+            if not task.done():
+                task.cancel()
+
+
+async def run_multi_agent_workflow(
+    user_query: str,
+    research_fanout: Optional[bool] = None,
+    on_delta: Optional[DeltaCallback] = None,
+    use_cache: Optional[bool] = None,
+    resume: Optional[str] = None
+) -> Dict[str, Any]:
     """
     マルチエージェントワークフローを実行する便利関数
 
     Args:
         user_query: ユーザーからの質問
+        research_fanout: 調査項目ごとにResearcherを並行実行するか（省略時は設定に従う）
+        on_delta: 各フェーズのトークン差分を受け取るコールバック（フェーズ名, 差分）
+        use_cache: 応答キャッシュを使用するか（省略時は設定に従う）
+        resume: 再開する実行ID
 
     Returns:
         実行結果を含む辞書
     """
-    workflow = MultiAgentWorkflow()
-    return await workflow.run(user_query)
+    workflow = MultiAgentWorkflow(research_fanout=research_fanout, use_cache=use_cache)
+    return await workflow.run(user_query, on_delta=on_delta, resume=resume)
 
 
 # 使用例
@@ -10,6 +10,9 @@ from agent_framework import ChatAgent
 from agent_framework.azure import AzureOpenAIChatClient
 from azure.identity.aio import AzureCliCredential
 
+from config.settings import settings
+from .fake_client import get_fake_chat_client
+
 
 async def create_azure_agent(
     name: str,
@@ -30,7 +33,17 @@ async def create_azure_agent(
 
     Returns:
         ChatAgent: 設定済みエージェント
+
+    Note:
+        Settings.LLM_BACKEND が fake の場合はAzureに接続せず、フェイククライアントを使います。
     """
+    if settings.LLM_BACKEND == "fake":
+        return ChatAgent(
+            chat_client=get_fake_chat_client(deployment_name),
+            name=name,
+            instructions=instructions
+        )
+
     # 環境変数から取得
     endpoint = endpoint or os.getenv("AZURE_OPENAI_ENDPOINT")
     api_key = api_key or os.getenv("AZURE_OPENAI_API_KEY")
@@ -0,0 +1,248 @@
+"""
+オフライン用のフェイクチャットクライアント
+
+Azure OpenAI に接続せずに音声対話エージェントを動かすためのチャットクライアントです。
+固定の応答時間、秒間トークン数でのストリーミング、エラー（429・500）の注入、
+固定の応答を設定でき、VoiceAgentSession の再試行やストリーミング読み上げを
+ネットワークなしで確認できます。
+
+LLM_BACKEND=fake を設定すると create_azure_agent がこのクライアントを使います（音声認識・合成は対象外）。
+2つのプロジェクトはパッケージを共有しないため、01_multi-llm-reasoning の agents/fake_client.py から
+VoiceAgentSession が使う部分だけを残した縮小版です。split_tokens と _make_error は 01 と意図的に
+同じ実装にしているため、変更する場合は両方を更新してください（応答時間の分布・ルールによる応答・
+スクリプトファイルなどの負荷試験向けの機能は 01 にのみあります）。
+"""
+
+import asyncio
+import logging
+import random
+import re
+from typing import Any, AsyncIterable, Dict, List, MutableSequence, Optional, Sequence
+
+import httpx
+from agent_framework import (
+    BaseChatClient,
+    ChatMessage,
+    ChatOptions,
+    ChatResponse,
+    ChatResponseUpdate,
+    UsageContent,
+    UsageDetails,
+    use_function_invocation,
+)
+from agent_framework.exceptions import ServiceResponseException
+
+from config.settings import settings
+
+logger = logging.getLogger(__name__)
+
+# 注入できるエラーの種類
+FAILURE_KINDS = ("429", "500")
+
+# トークン分割（英数字は単語単位、それ以外は2文字ずつ）
+_TOKEN_PATTERN = re.compile(r"[A-Za-z0-9]+|\s+|[^\sA-Za-z0-9]{1,2}")
+
+# 例外に付けるダミーのリクエスト先
+_FAKE_URL = "https://fake-llm.invalid/chat/completions"
+
+
+def split_tokens(text: str) -> List[str]:
+    """
+    テキストを疑似トークンに分割する（01と同じ分割）
+
+    Args:
+        text: 分割するテキスト
+
+    Returns:
+        トークンのリスト（連結すると元のテキストになる）
+    """
+    return _TOKEN_PATTERN.findall(text)
+
+
+def _make_error(kind: str, retry_after: Optional[float] = None) -> Exception:
+    """注入するエラー（実際のクライアントと同じくopenaiの例外を原因に持つ、01と同じ実装）"""
+    # openaiの読み込みは重いため、エラーを注入する場合だけ読み込む
+    from openai import InternalServerError, RateLimitError
+
+    request = httpx.Request("POST", _FAKE_URL)
+    if kind == "429":
+        headers = {"retry-after": str(retry_after)} if retry_after is not None else {}
+        response = httpx.Response(429, headers=headers, request=request)
+        cause: Exception = RateLimitError("Rate limit exceeded (fake)", response=response, body=None)
+    elif kind == "500":
+        response = httpx.Response(500, request=request)
+        cause = InternalServerError("Internal server error (fake)", response=response, body=None)
+    else:
+        raise ValueError(f"未対応のエラー種別: {kind}")
+
+    error = ServiceResponseException(f"fake service failed to complete the prompt: {cause}", inner_exception=cause)
+    error.__cause__ = cause
+    return error
+
+
+@use_function_invocation
+class FakeChatClient(BaseChatClient):
+    """
+    Azure OpenAI の代わりに使うフェイクチャットクライアント
+
+    応答は最初のトークンまでの応答時間（latency 秒）のあと、
+    tokens_per_second の速さで1トークンずつ生成されます（0以下は待機なし）。
+    """
+
+    OTEL_PROVIDER_NAME = "fake"
+
+    def __init__(
+        self,
+        model_id: str = "fake",
+        latency: float = 0.0,
+        tokens_per_second: float = 0,
+        failure_rate: float = 0.0,
+        failure_kinds: Sequence[str] = ("429",),
+        retry_after: Optional[float] = None,
+        response: Optional[str] = None,
+        response_chars: int = 120,
+        seed: Optional[int] = None,
+        **kwargs: Any
+    ):
+        """
+        クライアント初期化
+
+        Args:
+            model_id: 応答に記録するモデル名（デプロイメント名）
+            latency: 最初のトークンまでの応答時間（秒）
+            tokens_per_second: 出力トークンの生成速度（0以下は待機なし）
+            failure_rate: エラーを発生させる確率（0〜1）
+            failure_kinds: 発生させるエラーの種類（429 / 500 から一様に選択）
+            retry_after: 429 のエラーに付けるRetry-After（秒）
+            response: 常に返す応答（省略時はユーザーの発話を含む既定の応答）
+            response_chars: 既定の応答の文字数
+            seed: 乱数のシード（指定するとエラーの発生が再現可能）
+        """
+        super().__init__(**kwargs)
+        unknown = [kind for kind in failure_kinds if kind not in FAILURE_KINDS]
+        if unknown:
+            raise ValueError(f"未対応のエラー種別: {', '.join(unknown)}")
+
+        self.model_id = model_id
+        self.latency = max(0.0, latency)
+        self.tokens_per_second = tokens_per_second
+        self.failure_rate = failure_rate
+        self.failure_kinds = list(failure_kinds)
+        self.retry_after = retry_after
+        self.response = response
+        self.response_chars = response_chars
+        self.rng = random.Random(seed)
+        # 呼び出し回数とエラーの発生回数
+        self.calls = 0
+        self.failures: Dict[str, int] = {}
+
+    def service_url(self) -> str:
+        """サービスのURL"""
+        return _FAKE_URL
+
+    def _default_response(self, messages: Sequence[ChatMessage]) -> str:
+        """固定の応答がない場合の決定的な応答"""
+        user_text = next((m.text for m in reversed(messages) if m.role.value == "user"), "")
+        head = re.sub(r"\s+", " ", user_text).strip()[:40]
+        text = f"（{self.model_id}）「{head}」への応答です。"
+        filler = "これはオフライン確認用のフェイク応答です。"
+        while len(text) < self.response_chars:
+            text += filler
+        return text[:max(self.response_chars, 1)]
+
+    async def _prepare(self, messages: Sequence[ChatMessage]) -> str:
+        """
+        応答を決めて最初のトークンまで待機する（エラーを注入する場合は発生させる）
+
+        Returns:
+            応答テキスト
+        """
+        self.calls += 1
+        if self.failure_kinds and self.rng.random() < self.failure_rate:
+            failure = self.rng.choice(self.failure_kinds)
+            self.failures[failure] = self.failures.get(failure, 0) + 1
+            raise _make_error(failure, self.retry_after)
+
+        await asyncio.sleep(self.latency)
+        return self.response if self.response is not None else self._default_response(messages)
+
+    def _usage(self, messages: Sequence[ChatMessage], output: str) -> UsageDetails:
+        """疑似トークン数による使用量"""
+        input_tokens = sum(len(split_tokens(m.text)) for m in messages)
+        output_tokens = len(split_tokens(output))
+        return UsageDetails(input_tokens, output_tokens, input_tokens + output_tokens)
+
+    async def _inner_get_response(
+        self,
+        *,
+        messages: MutableSequence[ChatMessage],
+        chat_options: ChatOptions,
+        **kwargs: Any
+    ) -> ChatResponse:
+        text = await self._prepare(messages)
+        if self.tokens_per_second > 0:
+            await asyncio.sleep(len(split_tokens(text)) / self.tokens_per_second)
+        return ChatResponse(
+            messages=ChatMessage(role="assistant", text=text),
+            model_id=self.model_id,
+            finish_reason="stop",
+            usage_details=self._usage(messages, text)
+        )
+
+    async def _inner_get_streaming_response(
+        self,
+        *,
+        messages: MutableSequence[ChatMessage],
+        chat_options: ChatOptions,
+        **kwargs: Any
+    ) -> AsyncIterable[ChatResponseUpdate]:
+        text = await self._prepare(messages)
+        delay = 1 / self.tokens_per_second if self.tokens_per_second > 0 else 0
+        for i, token in enumerate(split_tokens(text)):
+            if delay and i > 0:
+                await asyncio.sleep(delay)
+            yield ChatResponseUpdate(text=token, role="assistant", model_id=self.model_id)
+        yield ChatResponseUpdate(
+            contents=[UsageContent(details=self._usage(messages, text))],
+            role="assistant",
+            model_id=self.model_id,
+            finish_reason="stop"
+        )
+
+
+# デプロイメント名ごとの共有フェイククライアント
+_fake_clients: Dict[str, FakeChatClient] = {}
+
+
+def get_fake_chat_client(deployment_name: str) -> FakeChatClient:
+    """
+    Settingsの FAKE_LLM_* に従ったフェイククライアントを取得する（デプロイメント名ごとに共有）
+
+    Args:
+        deployment_name: デプロイメント名
+
+    Returns:
+        FakeChatClient: 共有フェイククライアント
+    """
+    client = _fake_clients.get(deployment_name)
+    if client is not None:
+        return client
+
+    client = FakeChatClient(
+        model_id=deployment_name,
+        latency=settings.FAKE_LLM_LATENCY_MEAN,
+        tokens_per_second=settings.FAKE_LLM_TOKENS_PER_SECOND,
+        failure_rate=settings.FAKE_LLM_FAILURE_RATE,
+        failure_kinds=[k.strip() for k in settings.FAKE_LLM_FAILURE_KINDS.split(",") if k.strip()],
+        retry_after=settings.FAKE_LLM_RETRY_AFTER or None,
+        response_chars=settings.FAKE_LLM_RESPONSE_CHARS,
+        seed=settings.FAKE_LLM_SEED
+    )
+    _fake_clients[deployment_name] = client
+    logger.debug(f"フェイククライアントを作成: {deployment_name}")
+    return client
+
+
+def reset_fake_clients() -> None:
+    """共有フェイククライアントを破棄（設定を変えて作り直す場合に使用）"""
+    _fake_clients.clear()
@@ -0,0 +1,185 @@
+"""
+エージェント呼び出しのリトライ・タイムアウト
+
+1回の呼び出しにタイムアウトを設け、一時的なエラー（タイムアウト、429、5xx、接続エラー）は
+ジッター付き指数バックオフで再試行します。429 の Retry-After が返された場合はその秒数を待機します。
+
+会話スレッドは呼び出しごとに状態が変わるため、同じリクエストを重複して送るヘッジは行いません。
+
+_error_chain・get_retry_after・is_retryable は 01_multi-llm-reasoning の orchestration/retry.py と
+同じ判定を意図的に複製しています（2つのプロジェクトはパッケージを共有しないため）。
+再試行の対象を変更する場合は両方を更新してください。
+"""
+
+import asyncio
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+T = TypeVar("T")
+
+# 再試行するHTTPステータスコード
+RETRYABLE_STATUS_CODES = {408, 409, 429, 500, 502, 503, 504}
+
+# 再試行する例外クラス名（openai の接続・タイムアウトエラー）
+RETRYABLE_ERROR_NAMES = {"APIConnectionError", "APITimeoutError"}
+
+
+def _error_chain(error: BaseException) -> List[BaseException]:
+    """例外と、その原因となった例外の連鎖（agent_frameworkは元の例外を__cause__に保持）"""
+    chain = []
+    while error is not None and error not in chain:
+        chain.append(error)
+        error = error.__cause__ or getattr(error, "inner_exception", None)
+    return chain
+
+
+def get_retry_after(error: BaseException) -> Optional[float]:
+    """
+    例外の連鎖からRetry-After（秒）を取得
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        待機秒数（ヘッダーがない場合はNone）
+    """
+    for item in _error_chain(error):
+        headers = getattr(getattr(item, "response", None), "headers", None)
+        if not headers:
+            continue
+        try:
+            if headers.get("retry-after-ms"):
+                return float(headers["retry-after-ms"]) / 1000
+            if headers.get("retry-after"):
+                return float(headers["retry-after"])
+        except (TypeError, ValueError):
+            continue
+    return None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """
+    再試行で回復する可能性のある一時的なエラーか
+
+    Args:
+        error: 発生した例外
+
+    Returns:
+        タイムアウト・429・5xx・接続エラーの場合True
+    """
+    if isinstance(error, asyncio.TimeoutError):
+        return True
+    for item in _error_chain(error):
+        if getattr(item, "status_code", None) in RETRYABLE_STATUS_CODES:
+            return True
+        if type(item).__name__ in RETRYABLE_ERROR_NAMES:
+            return True
+    return False
+
+
+def get_retry_delay(
+    error: BaseException,
+    retry: int,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0
+) -> float:
+    """
+    再試行までの待機秒数を決める
+
+    Args:
+        error: 発生した例外
+        retry: これまでの再試行回数
+        base_delay: バックオフの基準待機秒数（試行ごとに倍増）
+        max_delay: バックオフの最大待機秒数
+
+    Returns:
+        Retry-After（あればそれを優先）またはジッター付き指数バックオフの秒数
+    """
+    retry_after = get_retry_after(error)
+    return min(max_delay, retry_after if retry_after is not None
+               else random.uniform(0, base_delay * (2 ** retry)))
+
+
+def record_failure(
+    record: Dict[str, Any],
+    error: BaseException,
+    retry: int,
+    max_retries: int,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    can_retry: bool = True
+) -> Optional[float]:
+    """
+    失敗した試行を記録し、再試行するかを決める
+
+    Args:
+        record: 試行の結果（status, error, delay_seconds を追記）
+        error: 発生した例外
+        retry: これまでの再試行回数
+        max_retries: 最初の試行に加えて再試行する最大回数
+        base_delay: バックオフの基準待機秒数（試行ごとに倍増）
+        max_delay: バックオフの最大待機秒数
+        can_retry: 呼び出し側の事情で再試行できる状態か（ストリーミングで差分を渡した後はFalse）
+
+    Returns:
+        再試行までの待機秒数（再試行しない場合はNone）
+    """
+    record.update(
+        status="timeout" if isinstance(error, asyncio.TimeoutError) else "error",
+        error=str(error) or type(error).__name__
+    )
+    if not can_retry or retry >= max_retries or not is_retryable(error):
+        return None
+
+    delay = get_retry_delay(error, retry, base_delay, max_delay)
+    record["delay_seconds"] = delay
+    print(f"🔁 一時的なエラーのため{delay:.1f}秒後に再試行します（{retry + 1}/{max_retries}）")
+    return delay
+
+
+async def call_with_retry(
+    func: Callable[[], Awaitable[T]],
+    max_retries: int = 3,
+    timeout: Optional[float] = 60,
+    base_delay: float = 1.0,
+    max_delay: float = 30.0,
+    attempts: Optional[List[Dict[str, Any]]] = None,
+    sleep: Callable[[float], Awaitable[Any]] = asyncio.sleep
+) -> T:
+    """
+    タイムアウトと再試行付きで呼び出しを実行
+
+    Args:
+        func: 呼び出しを実行するコルーチン関数（試行ごとに呼ばれる）
+        max_retries: 最初の試行に加えて再試行する最大回数
+        timeout: 1試行あたりのタイムアウト（秒、0以下・Noneは無制限）
+        base_delay: バックオフの基準待機秒数（試行ごとに倍増）
+        max_delay: バックオフの最大待機秒数
+        attempts: 各試行の結果（attempt, status, error, delay_seconds）を追記するリスト
+        sleep: 待機関数（テスト用に差し替え可能）
+
+    Returns:
+        呼び出しの結果
+
+    Raises:
+        Exception: 再試行できないエラー、または再試行回数を使い切った場合の最後のエラー
+    """
+    attempts = attempts if attempts is not None else []
+    timeout = timeout if timeout and timeout > 0 else None
+    retry = 0
+
+    while True:
+        record: Dict[str, Any] = {"attempt": retry + 1}
+        attempts.append(record)
+        try:
+            result = await asyncio.wait_for(func(), timeout=timeout)
+        except Exception as e:
+            delay = record_failure(record, e, retry, max_retries, base_delay, max_delay)
+            if delay is None:
+                raise
+            await sleep(delay)
+            retry += 1
+            continue
+
+        record["status"] = "ok"
+        return result
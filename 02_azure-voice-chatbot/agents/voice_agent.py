@@ -4,9 +4,12 @@
 GPT-5を使用した音声対話専用エージェントを提供します。
 """
 
-from typing import Optional
+import asyncio
+from typing import AsyncIterator, Optional
 from agent_framework import ChatAgent
 from .base import create_azure_agent
+from .retry import call_with_retry, record_failure
+from config.settings import settings
 
 
 # システムプロンプト（音声対話用）
@@ -79,16 +82,27 @@ class VoiceAgentSession:
     会話履歴の管理と、エージェントとの対話インターフェースを提供します。
     """
 
-    def __init__(self, agent: ChatAgent):
+    def __init__(
+        self,
+        agent: ChatAgent,
+        max_retries: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
         """
         セッションの初期化
 
         Args:
             agent: 使用するChatAgentインスタンス
+            max_retries: 一時的なエラー時の再試行回数（省略時はSettings.MAX_RETRIES）
+            timeout: 1回の呼び出しのタイムアウト秒数（省略時はSettings.TIMEOUT_SECONDS）
         """
         self.agent = agent
         self.thread = agent.get_new_thread()  # マルチターン対話用のスレッドを作成
         self.conversation_history: list[dict] = []
+        self.max_retries = settings.MAX_RETRIES if max_retries is None else max_retries
+        self.timeout = settings.TIMEOUT_SECONDS if timeout is None else timeout
+        # 直近の呼び出しの試行結果（attempt, status, error, delay_seconds）
+        self.last_attempts: list[dict] = []
 
     async def send_message(self, user_input: str) -> str:
         """
@@ -108,7 +122,14 @@ class VoiceAgentSession:
 
         # エージェントに送信（Agent Framework 1.0.0b251209ではrun()を使用）
         # スレッドを渡すことでマルチターン対話の文脈を保持
-        response = await self.agent.run(user_input, thread=self.thread)
+        # タイムアウト・429・5xxは再試行する
+        self.last_attempts = []
+        response = await call_with_retry(
+            lambda: self.agent.run(user_input, thread=self.thread),
+            max_retries=self.max_retries,
+            timeout=self.timeout,
+            attempts=self.last_attempts
+        )
 
         # アシスタントの応答を履歴に追加
         assistant_message = response.text
@@ -119,6 +140,72 @@ class VoiceAgentSession:
 
         return assistant_message
 
+    async def stream_message(self, user_input: str) -> AsyncIterator[str]:
+        """
+        ユーザーメッセージを送信し、エージェントの応答を生成された順に受け取る
+
+        タイムアウトは差分ごとの待ち時間に適用します（最初のトークンまで、および応答の途中で止まった場合）。
+        一時的なエラーは最初のトークンが届く前であれば再試行し、
+        応答の途中で発生したエラーは（読み上げ済みの部分と重複するため）再試行せずに送出します。
+        途中で受信を打ち切った場合は、届いた部分までを応答として履歴に残します。
+        エージェントのストリームは終了・打ち切り・エラーのいずれの場合も閉じます（HTTP接続を解放）。
+
+        Args:
+            user_input: ユーザーからの入力テキスト
+
+        Yields:
+            エージェントの応答テキストの差分
+        """
+        self.conversation_history.append({
+            "role": "user",
+            "content": user_input
+        })
+
+        self.last_attempts = []
+        timeout = self.timeout if self.timeout and self.timeout > 0 else None
+        parts: list[str] = []
+        retry = 0
+
+        while True:
+            record: dict = {"attempt": retry + 1}
+            self.last_attempts.append(record)
+            stream = self.agent.run_stream(user_input, thread=self.thread).__aiter__()
+            try:
+                while True:
+                    try:
+                        update = await asyncio.wait_for(stream.__anext__(), timeout=timeout)
+                    except StopAsyncIteration:
+                        break
+                    if update.text:
+                        parts.append(update.text)
+                        yield update.text
+            except (GeneratorExit, asyncio.CancelledError):
+                # 割り込みなどで受信を打ち切った場合は、届いた部分を応答として履歴に残す
+                if parts:
+                    self.conversation_history.append({
+                        "role": "assistant",
+                        "content": "".join(parts)
+                    })
+                raise
+            except Exception as e:
+                delay = record_failure(record, e, retry, self.max_retries, can_retry=not parts)
+                if delay is None:
+                    raise
+                await _close_stream(stream)
+                await asyncio.sleep(delay)
+                retry += 1
+                continue
+            finally:
+                await _close_stream(stream)
+
+            record["status"] = "ok"
+            break
+
+        self.conversation_history.append({
+            "role": "assistant",
+            "content": "".join(parts)
+        })
+
     def get_conversation_history(self) -> list[dict]:
         """
         会話履歴を取得
@@ -143,6 +230,18 @@ class VoiceAgentSession:
         return sum(1 for msg in self.conversation_history if msg["role"] == "user")
 
 
+async def _close_stream(stream) -> None:
+    """エージェントのストリームを閉じる（既に終了している場合は何もしない）"""
+    aclose = getattr(stream, "aclose", None)
+    if aclose is None:
+        return
+    try:
+        await aclose()
+    except Exception:
+        # 失敗・キャンセル済みのストリームを閉じる際のエラーは元のエラーを優先して無視する
+        pass
+
+
 async def create_voice_session(
     agent_name: str = "VoiceAssistant",
     deployment_name: str = "gpt-5"
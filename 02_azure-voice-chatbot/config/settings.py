@@ -29,10 +29,22 @@ class Settings:
     # GPT-5 デプロイメント名
     AZURE_OPENAI_DEPLOYMENT_GPT5: str = os.getenv("AZURE_OPENAI_DEPLOYMENT_GPT5", "gpt-5")
 
+    # LLMバックエンド（azure: Azure OpenAI / fake: オフライン確認用のフェイククライアント）
+    LLM_BACKEND: str = os.getenv("LLM_BACKEND", "azure").lower()
+
+    # フェイククライアント設定（LLM_BACKEND=fake の場合に使用、01と共通の変数名のうち音声対話で使うもの）
+    FAKE_LLM_LATENCY_MEAN: float = float(os.getenv("FAKE_LLM_LATENCY_MEAN", "0.5"))  # 秒
+    FAKE_LLM_TOKENS_PER_SECOND: float = float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0"))  # 0の場合は待機なし
+    FAKE_LLM_FAILURE_RATE: float = float(os.getenv("FAKE_LLM_FAILURE_RATE", "0"))
+    FAKE_LLM_FAILURE_KINDS: str = os.getenv("FAKE_LLM_FAILURE_KINDS", "429")  # カンマ区切りで 429 / 500
+    FAKE_LLM_RETRY_AFTER: float = float(os.getenv("FAKE_LLM_RETRY_AFTER", "0"))  # 秒（0の場合はヘッダーなし）
+    FAKE_LLM_RESPONSE_CHARS: int = int(os.getenv("FAKE_LLM_RESPONSE_CHARS", "120"))
+    FAKE_LLM_SEED: int | None = int(os.getenv("FAKE_LLM_SEED")) if os.getenv("FAKE_LLM_SEED") else None
+
     # Agent 設定
     VOICE_AGENT_NAME: str = os.getenv("VOICE_AGENT_NAME", "VoiceAgent")
     MAX_RETRIES: int = int(os.getenv("MAX_RETRIES", "3"))
-    TIMEOUT_SECONDS: int = int(os.getenv("TIMEOUT_SECONDS", "60"))
+    TIMEOUT_SECONDS: int = int(os.getenv("TIMEOUT_SECONDS", "60"))  # ストリーミングでは差分ごとの待ち時間
 
     # GPT-5 特有の設定
     GPT5_MAX_TOKENS: int = int(os.getenv("GPT5_MAX_TOKENS", "4096"))
@@ -50,6 +62,19 @@ class Settings:
     SPEECH_RECOGNITION_TIMEOUT: int = int(os.getenv("SPEECH_RECOGNITION_TIMEOUT", "10"))  # 秒
     SPEECH_RECOGNITION_PHRASE_TIMEOUT: int = int(os.getenv("SPEECH_RECOGNITION_PHRASE_TIMEOUT", "5"))  # 秒
 
+    # 応答のストリーミング読み上げ（生成中の応答を文ごとに音声合成する）
+    VOICE_STREAMING_ENABLED: bool = os.getenv("VOICE_STREAMING_ENABLED", "true").lower() == "true"
+
+    # 定型文（あいさつ・音声コマンドの確認など）の合成音声キャッシュ（キャッシュした音声はローカルで再生）
+    AUDIO_CACHE_ENABLED: bool = os.getenv("AUDIO_CACHE_ENABLED", "true").lower() == "true"
+    AUDIO_CACHE_DIR: str = os.getenv("AUDIO_CACHE_DIR", ".audio_cache")  # 空の場合はメモリのみ
+    AUDIO_CACHE_MAX_ENTRIES: int = int(os.getenv("AUDIO_CACHE_MAX_ENTRIES", "64"))
+    AUDIO_CACHE_PREWARM: bool = os.getenv("AUDIO_CACHE_PREWARM", "true").lower() == "true"  # 起動時に定型文を合成
+
+    # 読み上げ中の割り込み（連続音声認識を続け、ユーザーが話し始めたら読み上げを中断する）
+    VOICE_BARGE_IN_ENABLED: bool = os.getenv("VOICE_BARGE_IN_ENABLED", "false").lower() == "true"
+    VOICE_BARGE_IN_MIN_CHARS: int = int(os.getenv("VOICE_BARGE_IN_MIN_CHARS", "2"))  # 雑音で中断しないための最小文字数
+
     # ========================================
     # 対話ループ安全設定（無限ループ防止）
     # ========================================
@@ -73,14 +98,14 @@ class Settings:
         Raises:
             ValueError: 必須設定が不足している場合
         """
-        # Azure OpenAI設定の検証
-        if not cls.AZURE_OPENAI_ENDPOINT:
+        # Azure OpenAI設定の検証（フェイククライアントは接続しない）
+        if cls.LLM_BACKEND != "fake" and not cls.AZURE_OPENAI_ENDPOINT:
             raise ValueError(
                 "AZURE_OPENAI_ENDPOINTが設定されていません。"
                 ".envファイルを確認してください。"
             )
 
-        if not cls.AZURE_OPENAI_API_KEY:
+        if cls.LLM_BACKEND != "fake" and not cls.AZURE_OPENAI_API_KEY:
             print(
                 "⚠️  AZURE_OPENAI_API_KEYが設定されていません。"
                 "Azure CLI認証を使用します。'az login'を実行してください。"
@@ -42,6 +42,9 @@ def check_environment():
         "AZURE_SPEECH_API_KEY": settings.AZURE_SPEECH_API_KEY,
         "AZURE_SPEECH_REGION": settings.AZURE_SPEECH_REGION,
     }
+    if settings.LLM_BACKEND == "fake":
+        # フェイクLLMバックエンドはAzure OpenAIに接続しない
+        del required_vars["AZURE_OPENAI_ENDPOINT"]
 
     missing_vars = []
     for var_name, var_value in required_vars.items():
@@ -59,6 +62,7 @@ def check_environment():
     # オプション環境変数
     print()
     print("【オプション設定】")
+    print(f"  LLMバックエンド: {settings.LLM_BACKEND}")
     print(f"  Azure OpenAI認証: {'APIキー' if settings.AZURE_OPENAI_API_KEY else 'Azure CLI'}")
     print(f"  デプロイメント名: {settings.AZURE_OPENAI_DEPLOYMENT_GPT5}")
     print(f"  音声言語: {settings.AZURE_SPEECH_LANGUAGE}")
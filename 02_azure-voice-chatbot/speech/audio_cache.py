@@ -0,0 +1,317 @@
+"""
+合成音声のキャッシュとローカル再生
+
+あいさつや音声コマンドの確認メッセージなど、繰り返し読み上げる定型文の合成音声を
+（テキストまたはSSML・音声名・話速・ピッチ・音量・出力形式）のハッシュをキーに保存します。
+メモリ上のLRUと、任意でエンコード済み音声ファイルを置くディスク層の2段構成です。
+キャッシュした音声はAzureを呼ばずにローカルのプレーヤーで再生します。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import wave
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# キャッシュする音声の出力形式（ローカルのプレーヤーで再生できるWAV）
+CACHE_OUTPUT_FORMAT = "Riff24Khz16BitMonoPcm"
+CACHE_FILE_SUFFIX = ".wav"
+
+# WAVを再生するコマンドの候補（先に見つかったものを使用）
+PLAYER_COMMANDS = (
+    ["afplay"],                                   # macOS
+    ["paplay"],                                   # PulseAudio
+    ["aplay", "-q"],                              # ALSA
+    ["ffplay", "-nodisp", "-autoexit", "-loglevel", "quiet"],
+)
+
+
+def make_audio_key(
+    content: str,
+    voice_name: str,
+    rate: float = 1.0,
+    pitch: str = "+0%",
+    volume: str = "+0%",
+    output_format: str = CACHE_OUTPUT_FORMAT,
+    is_ssml: bool = False
+) -> str:
+    """
+    合成音声のキャッシュキーを生成する
+
+    Args:
+        content: 読み上げるテキストまたはSSML
+        voice_name: 音声名
+        rate: 話速
+        pitch: ピッチ
+        volume: 音量
+        output_format: 出力形式
+        is_ssml: content がSSMLか
+
+    Returns:
+        SHA-256の16進文字列
+    """
+    payload = json.dumps(
+        ["ssml" if is_ssml else "text", content, voice_name, rate, pitch, volume, output_format],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AudioCache:
+    """
+    合成音声の2層キャッシュ（メモリLRU + 任意のディスク）
+
+    ディスク層は cache_dir に <キー>.wav として保存し、最初の保存時にディレクトリを作成します。
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 64,
+        cache_dir: Optional[Union[str, Path]] = None
+    ):
+        """
+        キャッシュ初期化
+
+        Args:
+            max_entries: メモリ層に保持する最大件数（超過分はLRUで破棄）
+            cache_dir: 音声ファイルを保存するディレクトリ（省略時はメモリ層のみ）
+        """
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "memory_hits": 0, "disk_hits": 0, "stores": 0, "evictions": 0}
+
+    def path_for(self, key: str) -> Optional[Path]:
+        """
+        ディスク層のファイルパスを取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            保存済みのファイルパス（ディスク層がない・未保存の場合はNone）
+        """
+        if self.cache_dir is None:
+            return None
+        path = self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}"
+        return path if path.exists() else None
+
+    def __contains__(self, key: str) -> bool:
+        """メモリ層またはディスク層に保存済みか（統計には含めない）"""
+        return key in self._memory or self.path_for(key) is not None
+
+    def get(self, key: str) -> Optional[bytes]:
+        """
+        キャッシュから音声を取得
+
+        Args:
+            key: キャッシュキー
+
+        Returns:
+            エンコード済みの音声（未登録の場合はNone）
+        """
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["memory_hits"] += 1
+                return data
+
+        path = self.path_for(key)
+        if path is not None:
+            try:
+                data = path.read_bytes()
+            except OSError as e:
+                logger.warning(f"⚠️  音声キャッシュを読み込めませんでした: {e}")
+                data = None
+            if data:
+                with self._lock:
+                    self._put_memory(key, data)
+                    self._stats["hits"] += 1
+                    self._stats["disk_hits"] += 1
+                return data
+
+        with self._lock:
+            self._stats["misses"] += 1
+        return None
+
+    def set(self, key: str, data: bytes) -> None:
+        """
+        音声をキャッシュに保存
+
+        Args:
+            key: キャッシュキー
+            data: エンコード済みの音声
+        """
+        with self._lock:
+            self._put_memory(key, data)
+            self._stats["stores"] += 1
+
+        if self.cache_dir is not None:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                # 書き込み途中のファイルを読まないよう、一時ファイルに書いてから置き換える
+                tmp_path = self.cache_dir / f"{key}.tmp"
+                tmp_path.write_bytes(data)
+                os.replace(tmp_path, self.cache_dir / f"{key}{CACHE_FILE_SUFFIX}")
+            except OSError as e:
+                logger.warning(f"⚠️  音声キャッシュを保存できませんでした: {e}")
+
+    def _put_memory(self, key: str, data: bytes) -> None:
+        """メモリ層に保存し、上限を超えた古いエントリを破棄"""
+        self._memory[key] = data
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+            self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, int]:
+        """
+        ヒット・ミスの統計を取得
+
+        Returns:
+            統計値の辞書（hits, misses, memory_hits, disk_hits, stores, evictions, size）
+        """
+        return {**self._stats, "size": len(self._memory)}
+
+    def clear(self) -> None:
+        """全エントリを削除（ディスク層のファイルも削除）"""
+        with self._lock:
+            self._memory.clear()
+        if self.cache_dir is not None and self.cache_dir.exists():
+            for path in self.cache_dir.glob(f"*{CACHE_FILE_SUFFIX}"):
+                path.unlink(missing_ok=True)
+
+
+@contextmanager
+def _playable_path(data: bytes, path: Optional[Path]) -> Iterator[Path]:
+    """再生するファイルのパス（保存済みファイルがなければ一時ファイルに書き出し、再生後に削除）"""
+    if path is not None:
+        yield path
+        return
+    with tempfile.NamedTemporaryFile(suffix=CACHE_FILE_SUFFIX, delete=False) as f:
+        f.write(data)
+        tmp_path = Path(f.name)
+    try:
+        yield tmp_path
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
+class LocalAudioPlayer:
+    """
+    WAV音声をローカルで再生するプレーヤー
+
+    Windowsでは winsound、それ以外では afplay / paplay / aplay / ffplay のうち
+    見つかったコマンドを使います。どれも使えない環境では available が False になります。
+    winsound はファイルを非同期で再生し、再生時間だけ待つことで stop による中断（割り込み）に対応します。
+    """
+
+    def __init__(self, command: Optional[List[str]] = None):
+        """
+        プレーヤー初期化
+
+        Args:
+            command: 再生コマンド（省略時は自動検出、ファイルパスを末尾に追加して実行）
+        """
+        self.command = command or self._find_command()
+        self._process: Optional[subprocess.Popen] = None
+        self._lock = threading.Lock()
+        # Windowsで stop が呼ばれた（再生時間の待機を打ち切る）
+        self._stopped = threading.Event()
+
+    @staticmethod
+    def _find_command() -> Optional[List[str]]:
+        """利用可能な再生コマンドを探す"""
+        if sys.platform == "win32":
+            return None
+        for command in PLAYER_COMMANDS:
+            if shutil.which(command[0]):
+                return list(command)
+        return None
+
+    @property
+    def available(self) -> bool:
+        """再生できる環境か"""
+        return sys.platform == "win32" or self.command is not None
+
+    def play(self, data: bytes, path: Optional[Path] = None) -> tuple[bool, str]:
+        """
+        音声を再生し、終わるまで待つ（ブロッキング）
+
+        Args:
+            data: WAV音声
+            path: 同じ内容の保存済みファイル（あれば一時ファイルを作らずに再生）
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        try:
+            if sys.platform == "win32":
+                return self._play_windows(data, path)
+
+            if self.command is None:
+                return False, "⚠️  音声を再生できるコマンドが見つかりません"
+
+            with _playable_path(data, path) as path:
+                try:
+                    with self._lock:
+                        self._process = subprocess.Popen(
+                            [*self.command, str(path)],
+                            stdout=subprocess.DEVNULL,
+                            stderr=subprocess.DEVNULL
+                        )
+                        process = self._process
+                    return_code = process.wait()
+                finally:
+                    with self._lock:
+                        self._process = None
+
+            if return_code != 0:
+                return False, f"⚠️  ローカル再生が中断されました（終了コード {return_code}）"
+            return True, "ローカル再生が完了しました"
+
+        except Exception as e:
+            return False, f"❌ ローカル再生エラー: {str(e)}"
+
+    def _play_windows(self, data: bytes, path: Optional[Path]) -> tuple[bool, str]:
+        """
+        winsound で非同期に再生し、再生時間だけ待つ（SND_MEMORY の同期再生は中断できないため）
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        import winsound
+
+        with _playable_path(data, path) as path:
+            with wave.open(str(path), "rb") as wav:
+                duration = wav.getnframes() / wav.getframerate()
+            self._stopped.clear()
+            winsound.PlaySound(str(path), winsound.SND_FILENAME | winsound.SND_ASYNC)
+            if self._stopped.wait(duration):
+                return False, "⚠️  ローカル再生が中断されました"
+        return True, "ローカル再生が完了しました"
+
+    def stop(self) -> None:
+        """再生中の音声を止める（他のスレッドから呼び出し可能）"""
+        if sys.platform == "win32":
+            import winsound
+            self._stopped.set()
+            winsound.PlaySound(None, 0)
+            return
+        with self._lock:
+            if self._process is not None and self._process.poll() is None:
+                self._process.terminate()
@@ -0,0 +1,169 @@
+"""
+読み上げ中の割り込み（バージイン）
+
+連続音声認識を読み上げ中も動かし続け、ユーザーが話し始めたら読み上げを即座に止めます。
+認識した発話は asyncio のキューに渡し、次のターンの入力として待たずに処理できるようにします。
+
+スピーカーの音声をマイクが拾うと自分の読み上げで中断してしまうため、
+ヘッドセットやエコーキャンセルのある環境での利用を想定しています。
+"""
+
+import asyncio
+from typing import Any, Optional, Tuple
+
+# 割り込み後に読み上げを抑止した場合のメッセージ
+CUT_OFF_MESSAGE = "割り込みにより読み上げを中断しました"
+
+
+class BargeInListener:
+    """
+    連続音声認識による発話の受け付けと読み上げの割り込み
+
+    Speech SDKのコールバック（別スレッド）で受け取った結果を、
+    イベントループのスレッドに渡して扱います。
+    """
+
+    def __init__(
+        self,
+        recognizer,
+        synthesizer,
+        loop: Optional[asyncio.AbstractEventLoop] = None,
+        min_chars: int = 2
+    ):
+        """
+        割り込み検出の初期化
+
+        Args:
+            recognizer: 音声認識器（recognize_continuous_start / recognize_continuous_stop を持つ）
+            synthesizer: 音声合成器（stop_speaking を持つ）
+            loop: 結果を渡すイベントループ（省略時は実行中のループ）
+            min_chars: 割り込みとみなす認識途中のテキストの最小文字数（雑音による中断を防ぐ）
+        """
+        self.recognizer = recognizer
+        self.synthesizer = synthesizer
+        self.loop = loop or asyncio.get_running_loop()
+        self.min_chars = min_chars
+
+        # 認識した発話
+        self.utterances: "asyncio.Queue[str]" = asyncio.Queue()
+        # 読み上げ中に発話を検出した
+        self.interrupted = asyncio.Event()
+        self.speaking = False
+        # 再生を止めた（SDKのスレッドで設定し、後続の文の読み上げを抑止する）
+        self.cut_off = False
+        self.interruptions = 0
+        self.active = False
+
+    def start(self) -> None:
+        """連続音声認識を開始"""
+        if self.active:
+            return
+        self.recognizer.recognize_continuous_start(self._on_recognized, on_speech_start=self._on_speech)
+        self.active = True
+
+    def stop(self) -> None:
+        """連続音声認識を停止"""
+        if not self.active:
+            return
+        self.recognizer.recognize_continuous_stop()
+        self.active = False
+
+    def begin_speaking(self) -> None:
+        """読み上げの開始を記録（以降の発話を割り込みとして扱う）"""
+        self.interrupted.clear()
+        self.cut_off = False
+        self.speaking = True
+
+    def end_speaking(self) -> None:
+        """読み上げの終了を記録"""
+        self.speaking = False
+
+    def guard(self, speak):
+        """
+        割り込み後は読み上げずに失敗を返すように読み上げ関数を包む
+
+        中断からキャンセルが届くまでの間に次の文の読み上げが始まらないようにします。
+
+        Args:
+            speak: 読み上げ関数（(成功フラグ, メッセージ)を返す、コルーチン関数も可）
+
+        Returns:
+            包んだ読み上げ関数（speak と同じくコルーチン関数かどうかを保つ）
+        """
+        if asyncio.iscoroutinefunction(speak):
+            async def guarded_async(text: str) -> "tuple[bool, str]":
+                if self.cut_off:
+                    return False, CUT_OFF_MESSAGE
+                return await speak(text)
+            return guarded_async
+
+        def guarded(text: str) -> "tuple[bool, str]":
+            if self.cut_off:
+                return False, CUT_OFF_MESSAGE
+            return speak(text)
+        return guarded
+
+    def _on_speech(self, text: str) -> None:
+        """認識途中のテキストを受け取る（Speech SDKのスレッド）"""
+        if not self.speaking or len(text.strip()) < self.min_chars:
+            return
+        self.speaking = False
+        self.cut_off = True
+        # 再生はSDKのスレッドからそのまま止め、待機中のターンにはループ経由で知らせる
+        self.synthesizer.stop_speaking()
+        self.loop.call_soon_threadsafe(self._mark_interrupted)
+
+    def _mark_interrupted(self) -> None:
+        self.interruptions += 1
+        self.interrupted.set()
+
+    def _on_recognized(self, text: str) -> None:
+        """認識結果を受け取る（Speech SDKのスレッド）"""
+        if text and text.strip():
+            self.loop.call_soon_threadsafe(self.utterances.put_nowait, text)
+
+    async def next_utterance(self, timeout: Optional[float] = None) -> Optional[str]:
+        """
+        次の発話を待つ
+
+        Args:
+            timeout: 最大待機秒数（Noneは無制限）
+
+        Returns:
+            認識した発話（タイムアウトした場合はNone）
+        """
+        try:
+            return await asyncio.wait_for(self.utterances.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def run_interruptible(self, reply) -> Tuple[bool, Any]:
+        """
+        読み上げを伴う応答を、発話による割り込みを受け付けながら実行する
+
+        発話を検出した場合は応答（生成中の後続の文を含む）をキャンセルします。
+
+        Args:
+            reply: 応答の生成と読み上げを行うコルーチン
+
+        Returns:
+            (最後まで実行したか, 応答の戻り値)のタプル（割り込みで中断した場合は (False, None)）
+
+        Raises:
+            Exception: 応答の実行中に発生したエラー
+        """
+        self.begin_speaking()
+        reply_task = asyncio.ensure_future(reply)
+        interrupt_task = asyncio.ensure_future(self.interrupted.wait())
+        try:
+            await asyncio.wait({reply_task, interrupt_task}, return_when=asyncio.FIRST_COMPLETED)
+            if reply_task.done():
+                return True, reply_task.result()
+            reply_task.cancel()
+            await asyncio.gather(reply_task, return_exceptions=True)
+            return False, None
+        finally:
+            self.end_speaking()
+            interrupt_task.cancel()
+            if not reply_task.done():
+                reply_task.cancel()
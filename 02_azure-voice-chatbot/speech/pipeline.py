@@ -0,0 +1,198 @@
+"""
+ストリーミング応答の読み上げパイプライン
+
+エージェントの応答をトークン単位で受け取り、文末（。！？）で区切って
+生成中の後続の文と並行して1文ずつ音声合成します。
+ユーザーが応答を聞き始めるまでの待ち時間は、応答全体ではなく最初の1文の生成時間になります。
+
+ステージごとの所要時間（音声認識・最初のトークン・最初の文・最初の読み上げ・生成・合成）を
+PipelineTimings に記録します。
+"""
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass, field
+from functools import partial
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+# 文末とみなす文字
+SENTENCE_ENDINGS = "。！？!?"
+
+# 文末の直後に続けて同じ文に含める文字（閉じ括弧など）
+TRAILING_CHARS = "」』）)"
+
+
+class SentenceSplitter:
+    """
+    ストリーミングで届くテキストを文単位に区切る
+
+    文末の文字（と直後の閉じ括弧・連続する文末の文字）までを1文とします。
+    「本当？！」のように文末の文字が続く場合に途中で区切らないよう、
+    受け取ったテキストの末尾が文末の文字のときは次のテキストが届くまで保留します。
+    """
+
+    def __init__(self):
+        """文区切りの初期化"""
+        self._buffer = ""
+
+    def feed(self, text: str) -> List[str]:
+        """
+        テキストを追加し、完成した文を取り出す
+
+        Args:
+            text: 新たに届いたテキスト
+
+        Returns:
+            完成した文のリスト（前後の空白は除去、空の文は含まない）
+        """
+        self._buffer += text
+        sentences: List[str] = []
+        start = 0
+        i = 0
+        while i < len(self._buffer):
+            char = self._buffer[i]
+            if char in SENTENCE_ENDINGS or char == "\n":
+                end = i + 1
+                while end < len(self._buffer) and self._buffer[end] in SENTENCE_ENDINGS + TRAILING_CHARS:
+                    end += 1
+                if end == len(self._buffer) and char != "\n":
+                    # 文末の文字や閉じ括弧がまだ続く可能性がある
+                    break
+                sentence = self._buffer[start:end].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = i = end
+                continue
+            i += 1
+        self._buffer = self._buffer[start:]
+        return sentences
+
+    def flush(self) -> Optional[str]:
+        """
+        残っているテキストを最後の文として取り出す
+
+        Returns:
+            残りの文（空の場合はNone）
+        """
+        rest = self._buffer.strip()
+        self._buffer = ""
+        return rest or None
+
+
+@dataclass
+class PipelineTimings:
+    """
+    1ターンのステージごとの所要時間（秒）
+
+    first_token_seconds・first_sentence_seconds・generation_seconds は応答の生成開始から、
+    first_audio_seconds は生成開始から最初の文の音声合成を始めるまでの時間
+    （ユーザーが応答を聞き始めるまでの待ち時間）です。
+    """
+
+    recognition_seconds: Optional[float] = None
+    first_token_seconds: Optional[float] = None
+    first_sentence_seconds: Optional[float] = None
+    first_audio_seconds: Optional[float] = None
+    generation_seconds: Optional[float] = None
+    synthesis_seconds: float = 0.0
+    total_seconds: Optional[float] = None
+    sentences: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """辞書形式に変換"""
+        return asdict(self)
+
+
+@dataclass
+class PipelineResult:
+    """パイプラインの実行結果"""
+
+    text: str = ""
+    sentences: List[str] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+    timings: PipelineTimings = field(default_factory=PipelineTimings)
+
+
+async def run_speech_pipeline(
+    deltas: AsyncIterator[str],
+    speak: Callable[[str], Any],
+    splitter: Optional[SentenceSplitter] = None,
+    clock: Callable[[], float] = time.perf_counter
+) -> PipelineResult:
+    """
+    ストリーミング応答を文ごとに読み上げる
+
+    応答の受信と音声合成を別のタスクで実行し、1文目を読み上げている間も後続のトークンを受信し続けます。
+    speak にはコルーチン関数（speak_async など）か、スレッドで実行するブロッキング関数を渡せます。
+    応答の受信中にエラーが発生した場合は、それまでに完成した文を読み上げてから例外を送出します。
+
+    Args:
+        deltas: 応答テキストの差分を返す非同期イテレーター
+        speak: 1文を読み上げる関数（(成功フラグ, メッセージ)を返す、コルーチン関数も可）
+        splitter: 文区切り（省略時は新規作成）
+        clock: 時刻の取得関数（テスト用に差し替え可能）
+
+    Returns:
+        PipelineResult: 応答全文、読み上げた文、合成エラー、ステージごとの所要時間
+
+    Raises:
+        Exception: 応答の受信中に発生したエラー
+    """
+    splitter = splitter or SentenceSplitter()
+    speak_async = speak if asyncio.iscoroutinefunction(speak) else partial(asyncio.to_thread, speak)
+    result = PipelineResult()
+    timings = result.timings
+    queue: "asyncio.Queue[Optional[str]]" = asyncio.Queue()
+    parts: List[str] = []
+    start = clock()
+
+    def enqueue(sentence: str) -> None:
+        if timings.first_sentence_seconds is None:
+            timings.first_sentence_seconds = clock() - start
+        result.sentences.append(sentence)
+        queue.put_nowait(sentence)
+
+    async def produce() -> None:
+        try:
+            async for delta in deltas:
+                if not delta:
+                    continue
+                if timings.first_token_seconds is None:
+                    timings.first_token_seconds = clock() - start
+                parts.append(delta)
+                for sentence in splitter.feed(delta):
+                    enqueue(sentence)
+            rest = splitter.flush()
+            if rest:
+                enqueue(rest)
+            timings.generation_seconds = clock() - start
+        finally:
+            queue.put_nowait(None)
+
+    async def consume() -> None:
+        while True:
+            sentence = await queue.get()
+            if sentence is None:
+                return
+            synthesis_start = clock()
+            if timings.first_audio_seconds is None:
+                timings.first_audio_seconds = synthesis_start - start
+            success, message = await speak_async(sentence)
+            timings.synthesis_seconds += clock() - synthesis_start
+            if not success:
+                result.errors.append(message)
+
+    producer = asyncio.create_task(produce())
+    try:
+        await consume()
+        await producer
+    finally:
+        if not producer.done():
+            producer.cancel()
+            # 応答ストリームの後始末（打ち切った部分の履歴記録・接続の解放）が終わってから戻る
+            await asyncio.gather(producer, return_exceptions=True)
+        result.text = "".join(parts)
+        timings.sentences = len(result.sentences)
+        timings.total_seconds = clock() - start
+
+    return result
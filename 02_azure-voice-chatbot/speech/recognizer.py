@@ -4,7 +4,10 @@ Speech-to-Text（音声認識）モジュール
 Azure Speech Serviceを使用して音声をテキストに変換します。
 """
 
+import asyncio
+import contextlib
 import azure.cognitiveservices.speech as speechsdk
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 from config.settings import settings
 
@@ -49,6 +52,11 @@ class SpeechRecognizer:
             audio_config=self.audio_config
         )
 
+        # SDKの結果待ち（ブロッキング）を実行する専用スレッド
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech-recognizer")
+        # 実行中の単発認識の結果待ち（キャンセル後も認識が終わるまで保持）
+        self._pending: Optional[asyncio.Future] = None
+
     def recognize_once(self) -> tuple[bool, str]:
         """
         1回の音声入力を認識
@@ -63,45 +71,106 @@ class SpeechRecognizer:
 
             # 音声認識を実行
             result = self.recognizer.recognize_once()
+            return self._handle_result(result)
 
-            # 結果の判定
-            if result.reason == speechsdk.ResultReason.RecognizedSpeech:
-                text = result.text
-                print(f"✅ 認識結果: {text}")
-                return True, text
+        except Exception as e:
+            error_msg = f"❌ 音声認識エラー: {str(e)}"
+            print(error_msg)
+            return False, error_msg
 
-            elif result.reason == speechsdk.ResultReason.NoMatch:
-                error_msg = "⚠️  音声が認識できませんでした（無音または雑音）"
-                print(error_msg)
-                return False, error_msg
+    async def recognize_once_async(self) -> tuple[bool, str]:
+        """
+        1回の音声入力を認識（イベントループを止めない非同期版）
 
-            elif result.reason == speechsdk.ResultReason.Canceled:
-                cancellation = result.cancellation_details
-                error_msg = f"❌ 音声認識がキャンセルされました: {cancellation.reason}"
+        SDKの非同期呼び出しで認識を開始し、結果待ちは専用スレッドで行います。
+        待機中にキャンセルされた場合、単発認識はSDKで中断できないため
+        認識は無音タイムアウトまで続き、その結果は破棄されます。
+        同じ認識器で認識が重ならないよう、次の認識は前回の認識が終わってから開始します。
 
-                if cancellation.reason == speechsdk.CancellationReason.Error:
-                    error_msg += f"\nエラー詳細: {cancellation.error_details}"
+        Returns:
+            (成功フラグ, 認識結果テキスト)のタプル
+            成功時: (True, "認識されたテキスト")
+            失敗時: (False, エラーメッセージ)
+        """
+        try:
+            print("🎤 音声入力を待機中... (話しかけてください)")
 
-                print(error_msg)
-                return False, error_msg
+            await self._wait_previous()
+            future = self.recognizer.recognize_once_async()
+            self._pending = asyncio.get_running_loop().run_in_executor(self._executor, future.get)
+            # キャンセルされても結果待ちは取り消さず、認識の終了を追跡する
+            result = await asyncio.shield(self._pending)
+            return self._handle_result(result)
 
-            else:
-                error_msg = f"⚠️  予期しない結果: {result.reason}"
-                print(error_msg)
-                return False, error_msg
+        except asyncio.CancelledError:
+            print("⏹  音声認識の待機を取り消しました")
+            if self._pending is not None:
+                # 破棄する結果のエラーを未処理として報告させない
+                self._pending.add_done_callback(lambda f: f.cancelled() or f.exception())
+            raise
 
         except Exception as e:
             error_msg = f"❌ 音声認識エラー: {str(e)}"
             print(error_msg)
             return False, error_msg
 
-    def recognize_continuous_start(self, callback_func):
+    async def _wait_previous(self) -> None:
+        """取り消した前回の単発認識が終わるまで待つ（結果は破棄）"""
+        pending = self._pending
+        if pending is None or pending.done():
+            return
+        print("⏳ 前回の音声認識の終了を待っています...")
+        with contextlib.suppress(Exception):
+            await asyncio.shield(pending)
+
+    def _handle_result(self, result) -> tuple[bool, str]:
+        """
+        認識結果を判定する
+
+        Args:
+            result: SDKの認識結果
+
+        Returns:
+            (成功フラグ, 認識結果テキストまたはエラーメッセージ)のタプル
+        """
+        if result.reason == speechsdk.ResultReason.RecognizedSpeech:
+            text = result.text
+            print(f"✅ 認識結果: {text}")
+            return True, text
+
+        elif result.reason == speechsdk.ResultReason.NoMatch:
+            error_msg = "⚠️  音声が認識できませんでした（無音または雑音）"
+            print(error_msg)
+            return False, error_msg
+
+        elif result.reason == speechsdk.ResultReason.Canceled:
+            cancellation = result.cancellation_details
+            error_msg = f"❌ 音声認識がキャンセルされました: {cancellation.reason}"
+
+            if cancellation.reason == speechsdk.CancellationReason.Error:
+                error_msg += f"\nエラー詳細: {cancellation.error_details}"
+
+            print(error_msg)
+            return False, error_msg
+
+        else:
+            error_msg = f"⚠️  予期しない結果: {result.reason}"
+            print(error_msg)
+            return False, error_msg
+
+    def recognize_continuous_start(self, callback_func, on_speech_start=None):
         """
         連続音声認識を開始（イベントドリブン）
 
         Args:
             callback_func: 認識結果を受け取るコールバック関数
                           引数: (text: str)
+            on_speech_start: 発話の途中経過（認識中のテキスト）を受け取るコールバック関数
+                             （読み上げ中の割り込み検出に使用、省略可）
+                             引数: (text: str)
+
+        Note:
+            コールバックはSpeech SDKのスレッドから呼ばれます。
         """
         def recognized_handler(evt):
             """認識成功時のハンドラ"""
@@ -111,13 +180,23 @@ class SpeechRecognizer:
         # イベントハンドラを登録
         self.recognizer.recognized.connect(recognized_handler)
 
+        if on_speech_start is not None:
+            def recognizing_handler(evt):
+                """認識中（発話の途中）のハンドラ"""
+                if evt.result.text:
+                    on_speech_start(evt.result.text)
+
+            self.recognizer.recognizing.connect(recognizing_handler)
+
         # 連続認識を開始
         print("🎤 連続音声認識を開始しました...")
         self.recognizer.start_continuous_recognition()
 
     def recognize_continuous_stop(self):
-        """連続音声認識を停止"""
+        """連続音声認識を停止（登録したハンドラも解除）"""
         self.recognizer.stop_continuous_recognition()
+        self.recognizer.recognized.disconnect_all()
+        self.recognizer.recognizing.disconnect_all()
         print("⏹  連続音声認識を停止しました")
 
     def test_microphone(self) -> bool:
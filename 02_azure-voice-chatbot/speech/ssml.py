@@ -0,0 +1,270 @@
+"""
+SSML（Speech Synthesis Markup Language）の組み立て
+
+<speak> と <voice>・<prosody> の開始・終了タグを（言語・音声名・話速・ピッチ・音量）ごとに
+一度だけ生成してキャッシュし、読み上げるテキストは1回の置換でXMLエスケープして差し込みます。
+応答に < や & が含まれていても合成が失敗しません。
+
+複数の <voice> 区間や <break> を含む文書を SsmlBuilder で、
+文ごとのチャンクを1つの文書または文ごとの文書として組み立てられます。
+"""
+
+from functools import lru_cache
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+SSML_NAMESPACE = "http://www.w3.org/2001/10/synthesis"
+
+# XMLで特別な意味を持つ文字の置換表（str.translate で1回の走査で置換）
+_ESCAPE_TABLE = str.maketrans({
+    "&": "&amp;",
+    "<": "&lt;",
+    ">": "&gt;",
+    '"': "&quot;",
+    "'": "&apos;",
+})
+
+
+def escape_text(text: str) -> str:
+    """
+    テキストをSSMLに埋め込めるようにXMLエスケープする
+
+    Args:
+        text: 読み上げるテキスト
+
+    Returns:
+        エスケープしたテキスト
+    """
+    return text.translate(_ESCAPE_TABLE)
+
+
+def rate_to_percent(rate: float) -> str:
+    """
+    話速（倍率）をprosodyのパーセント表記に変換する
+
+    Args:
+        rate: 話速（1.0が標準）
+
+    Returns:
+        "+20%" のような文字列
+    """
+    return f"{int(round((rate - 1.0) * 100)):+d}%"
+
+
+@lru_cache(maxsize=16)
+def speak_envelope(language: str) -> Tuple[str, str]:
+    """
+    <speak> 要素の開始・終了タグ（言語ごとにキャッシュ）
+
+    Args:
+        language: 言語（例: ja-JP）
+
+    Returns:
+        (開始タグ, 終了タグ)のタプル
+    """
+    return (
+        f'<speak version="1.0" xmlns="{SSML_NAMESPACE}" xml:lang="{escape_text(language)}">',
+        "</speak>"
+    )
+
+
+@lru_cache(maxsize=128)
+def voice_envelope(voice_name: str, rate: float = 1.0, pitch: str = "+0%", volume: str = "+0%") -> Tuple[str, str]:
+    """
+    <voice> と <prosody> の開始・終了タグ（音声名・話速・ピッチ・音量ごとにキャッシュ）
+
+    話速・ピッチ・音量がすべて標準の場合は <prosody> を省略します。
+
+    Args:
+        voice_name: 音声名
+        rate: 話速
+        pitch: ピッチ
+        volume: 音量
+
+    Returns:
+        (開始タグ, 終了タグ)のタプル
+    """
+    voice_open = f'<voice name="{escape_text(voice_name)}">'
+    if rate == 1.0 and pitch in ("+0%", "0%") and volume in ("+0%", "0%"):
+        return voice_open, "</voice>"
+    prosody_open = (
+        f'<prosody rate="{rate_to_percent(rate)}" pitch="{escape_text(pitch)}" volume="{escape_text(volume)}">'
+    )
+    return voice_open + prosody_open, "</prosody></voice>"
+
+
+def build_ssml(
+    text: str,
+    language: str,
+    voice_name: str,
+    rate: float = 1.0,
+    pitch: str = "+0%",
+    volume: str = "+0%"
+) -> str:
+    """
+    1つの音声で読み上げるSSMLを組み立てる
+
+    Args:
+        text: 読み上げるテキスト（エスケープ前）
+        language: 言語
+        voice_name: 音声名
+        rate: 話速
+        pitch: ピッチ
+        volume: 音量
+
+    Returns:
+        SSML文字列
+    """
+    speak_open, speak_close = speak_envelope(language)
+    voice_open, voice_close = voice_envelope(voice_name, rate, pitch, volume)
+    return f"{speak_open}{voice_open}{escape_text(text)}{voice_close}{speak_close}"
+
+
+def iter_ssml_chunks(
+    chunks: Iterable[str],
+    language: str,
+    voice_name: str,
+    rate: float = 1.0,
+    pitch: str = "+0%",
+    volume: str = "+0%"
+) -> Iterator[str]:
+    """
+    文ごとのチャンクをそれぞれSSML文書にする（パイプラインで文ごとに合成する場合）
+
+    開始・終了タグはキャッシュを共有するため、チャンクごとに組み立て直すのはテキスト部分だけです。
+
+    Args:
+        chunks: 文ごとのテキスト（ジェネレーターも可）
+        language: 言語
+        voice_name: 音声名
+        rate: 話速
+        pitch: ピッチ
+        volume: 音量
+
+    Yields:
+        チャンクごとのSSML文字列（空のチャンクは除く）
+    """
+    for chunk in chunks:
+        if chunk and chunk.strip():
+            yield build_ssml(chunk, language, voice_name, rate, pitch, volume)
+
+
+class SsmlBuilder:
+    """
+    複数の <voice> 区間と <break> を含むSSML文書の組み立て
+
+    同じ音声・話速・ピッチ・音量のテキストは1つの <voice> 区間にまとめます。
+
+    使用例:
+        builder = SsmlBuilder("ja-JP", "ja-JP-NanamiNeural")
+        builder.add_text("こんにちは。").add_break(300).add_text("お元気ですか？", voice_name="ja-JP-KeitaNeural")
+        ssml = builder.build()
+    """
+
+    def __init__(
+        self,
+        language: str,
+        voice_name: str,
+        rate: float = 1.0,
+        pitch: str = "+0%",
+        volume: str = "+0%"
+    ):
+        """
+        組み立ての初期化
+
+        Args:
+            language: 言語
+            voice_name: 既定の音声名
+            rate: 既定の話速
+            pitch: 既定のピッチ
+            volume: 既定の音量
+        """
+        self.language = language
+        self.defaults = (voice_name, rate, pitch, volume)
+        # (<voice>の設定, エスケープ済みの本文の断片)
+        self._segments: List[Tuple[Tuple[str, float, str, str], List[str]]] = []
+
+    def add_text(
+        self,
+        text: str,
+        voice_name: Optional[str] = None,
+        rate: Optional[float] = None,
+        pitch: Optional[str] = None,
+        volume: Optional[str] = None
+    ) -> "SsmlBuilder":
+        """
+        テキストを追加する
+
+        Args:
+            text: 読み上げるテキスト（エスケープ前）
+            voice_name: 音声名（省略時は既定値）
+            rate: 話速（省略時は既定値）
+            pitch: ピッチ（省略時は既定値）
+            volume: 音量（省略時は既定値）
+
+        Returns:
+            自身（メソッドチェーン用）
+        """
+        default_voice, default_rate, default_pitch, default_volume = self.defaults
+        key = (
+            voice_name or default_voice,
+            default_rate if rate is None else rate,
+            pitch or default_pitch,
+            volume or default_volume
+        )
+        if not self._segments or self._segments[-1][0] != key:
+            self._segments.append((key, []))
+        self._segments[-1][1].append(escape_text(text))
+        return self
+
+    def add_sentences(self, sentences: Iterable[str], **voice_options) -> "SsmlBuilder":
+        """
+        文ごとのチャンクをまとめて追加する（長い応答を1回のリクエストで合成する場合）
+
+        Args:
+            sentences: 文ごとのテキスト（ジェネレーターも可）
+            **voice_options: add_text に渡す音声の指定
+
+        Returns:
+            自身（メソッドチェーン用）
+        """
+        for sentence in sentences:
+            if sentence and sentence.strip():
+                self.add_text(sentence, **voice_options)
+        return self
+
+    @property
+    def has_content(self) -> bool:
+        """テキストまたは間を1つ以上追加したか"""
+        return bool(self._segments)
+
+    def add_break(self, milliseconds: int) -> "SsmlBuilder":
+        """
+        無音の間を追加する（直前の <voice> 区間の中に入れる）
+
+        Args:
+            milliseconds: 間の長さ（ミリ秒）
+
+        Returns:
+            自身（メソッドチェーン用）
+        """
+        if not self._segments:
+            self._segments.append((self.defaults, []))
+        self._segments[-1][1].append(f'<break time="{int(milliseconds)}ms"/>')
+        return self
+
+    def build(self) -> str:
+        """
+        SSML文書を組み立てる
+
+        Returns:
+            SSML文字列
+        """
+        speak_open, speak_close = speak_envelope(self.language)
+        parts = [speak_open]
+        for key, body in self._segments:
+            voice_open, voice_close = voice_envelope(*key)
+            parts.append(voice_open)
+            parts.extend(body)
+            parts.append(voice_close)
+        parts.append(speak_close)
+        return "".join(parts)
@@ -4,9 +4,14 @@ Text-to-Speech（音声合成）モジュール
 Azure Speech Serviceを使用してテキストを音声に変換します。
 """
 
+import asyncio
+import threading
 import azure.cognitiveservices.speech as speechsdk
-from typing import Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
 from config.settings import settings
+from speech.audio_cache import AudioCache, LocalAudioPlayer, CACHE_OUTPUT_FORMAT, make_audio_key
+from speech.ssml import SsmlBuilder, build_ssml
 
 
 class SpeechSynthesizer:
@@ -18,6 +23,8 @@ class SpeechSynthesizer:
         region: Optional[str] = None,
         voice_name: Optional[str] = None,
         language: Optional[str] = None,
+        audio_cache: Optional[AudioCache] = None,
+        player: Optional[LocalAudioPlayer] = None,
     ):
         """
         音声合成の初期化
@@ -27,6 +34,8 @@ class SpeechSynthesizer:
             region: Azureリージョン（省略時は設定から取得）
             voice_name: 音声名（省略時は設定から取得）
             language: 言語（省略時は設定から取得）
+            audio_cache: 定型文の合成音声キャッシュ（省略時はキャッシュしない）
+            player: キャッシュした音声のプレーヤー（省略時は自動検出）
         """
         self.api_key = api_key or settings.AZURE_SPEECH_API_KEY
         self.region = region or settings.AZURE_SPEECH_REGION
@@ -49,6 +58,16 @@ class SpeechSynthesizer:
             speech_config=self.speech_config
         )
 
+        # SDKの結果待ち（ブロッキング）を実行する専用スレッド
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="speech-synthesizer")
+
+        # 定型文の合成音声キャッシュとローカル再生
+        self.audio_cache = audio_cache
+        self.player = player or (LocalAudioPlayer() if audio_cache is not None else None)
+        # 同じ定型文を同時に合成しないためのキーごとのロック（事前合成と読み上げの重複防止）
+        self._phrase_locks: Dict[str, threading.Lock] = {}
+        self._phrase_locks_guard = threading.Lock()
+
     def speak(self, text: str) -> tuple[bool, str]:
         """
         テキストを音声で読み上げる
@@ -69,26 +88,7 @@ class SpeechSynthesizer:
 
             # 音声合成を実行
             result = self.synthesizer.speak_text_async(text).get()
-
-            # 結果の判定
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                print("✅ 音声合成が完了しました")
-                return True, "音声合成が完了しました"
-
-            elif result.reason == speechsdk.ResultReason.Canceled:
-                cancellation = result.cancellation_details
-                error_msg = f"❌ 音声合成がキャンセルされました: {cancellation.reason}"
-
-                if cancellation.reason == speechsdk.CancellationReason.Error:
-                    error_msg += f"\nエラー詳細: {cancellation.error_details}"
-
-                print(error_msg)
-                return False, error_msg
-
-            else:
-                error_msg = f"⚠️  予期しない結果: {result.reason}"
-                print(error_msg)
-                return False, error_msg
+            return self._handle_result(result, "音声合成")
 
         except Exception as e:
             error_msg = f"❌ 音声合成エラー: {str(e)}"
@@ -110,32 +110,299 @@ class SpeechSynthesizer:
 
             # SSML音声合成を実行
             result = self.synthesizer.speak_ssml_async(ssml).get()
+            return self._handle_result(result, "SSML音声合成")
 
-            # 結果の判定
-            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
-                print("✅ SSML音声合成が完了しました")
-                return True, "SSML音声合成が完了しました"
+        except Exception as e:
+            error_msg = f"❌ SSML音声合成エラー: {str(e)}"
+            print(error_msg)
+            return False, error_msg
 
-            elif result.reason == speechsdk.ResultReason.Canceled:
-                cancellation = result.cancellation_details
-                error_msg = f"❌ SSML音声合成がキャンセルされました: {cancellation.reason}"
+    async def speak_async(self, text: str) -> tuple[bool, str]:
+        """
+        テキストを音声で読み上げる（イベントループを止めない非同期版）
 
-                if cancellation.reason == speechsdk.CancellationReason.Error:
-                    error_msg += f"\nエラー詳細: {cancellation.error_details}"
+        SDKの非同期呼び出しで合成を開始し、完了待ちは専用スレッドで行います。
+        待機中にキャンセルされた場合は再生を中断します。
 
-                print(error_msg)
-                return False, error_msg
+        Args:
+            text: 読み上げるテキスト
 
-            else:
-                error_msg = f"⚠️  予期しない結果: {result.reason}"
-                print(error_msg)
-                return False, error_msg
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        if not text or not text.strip():
+            return False, "⚠️  読み上げるテキストが空です"
+
+        print(f"🔊 音声合成中: {text[:50]}...")
+        return await self._await_synthesis(self.synthesizer.speak_text_async, text, "音声合成")
+
+    async def speak_ssml_async(self, ssml: str) -> tuple[bool, str]:
+        """
+        SSMLを使用して音声合成（イベントループを止めない非同期版）
+
+        Args:
+            ssml: SSML形式のテキスト
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        print("🔊 SSML音声合成中...")
+        return await self._await_synthesis(self.synthesizer.speak_ssml_async, ssml, "SSML音声合成")
+
+    async def speak_with_options_async(
+        self,
+        text: str,
+        rate: float = 1.0,
+        pitch: str = "+0%",
+        volume: str = "+0%"
+    ) -> tuple[bool, str]:
+        """
+        音声オプションを指定して読み上げ（イベントループを止めない非同期版）
+
+        Args:
+            text: 読み上げるテキスト
+            rate: 話速（0.5 ~ 2.0、1.0が標準）
+            pitch: ピッチ（-50% ~ +50%、+0%が標準）
+            volume: 音量（-50% ~ +50%、+0%が標準）
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        return await self.speak_ssml_async(self._generate_ssml(text, rate, pitch, volume))
+
+    async def speak_sentences_async(
+        self,
+        sentences: Iterable[str],
+        rate: float = 1.0,
+        pause_ms: int = 0
+    ) -> tuple[bool, str]:
+        """
+        複数の文を1つのSSMLにまとめて1回のリクエストで読み上げる（長い応答向け）
+
+        Args:
+            sentences: 文ごとのテキスト（ジェネレーターも可）
+            rate: 話速（1.0が標準）
+            pause_ms: 文と文の間に入れる無音の長さ（ミリ秒、0の場合は入れない）
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        builder = SsmlBuilder(self.language, self.voice_name, rate=rate)
+        for sentence in sentences:
+            if not sentence or not sentence.strip():
+                continue
+            if pause_ms > 0 and builder.has_content:
+                builder.add_break(pause_ms)
+            builder.add_text(sentence)
+        if not builder.has_content:
+            return False, "⚠️  読み上げるテキストが空です"
+        return await self.speak_ssml_async(builder.build())
+
+    async def _await_synthesis(self, start, content: str, label: str) -> tuple[bool, str]:
+        """
+        合成を開始し、完了を専用スレッドで待つ（キャンセル時は再生を中断）
+
+        Args:
+            start: 合成を開始するSDKの非同期メソッド（ResultFutureを返す）
+            content: 読み上げるテキストまたはSSML
+            label: メッセージに使う処理名
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        try:
+            future = start(content)
+            result = await asyncio.get_running_loop().run_in_executor(self._executor, future.get)
+            return self._handle_result(result, label)
+
+        except asyncio.CancelledError:
+            # 完了を待たずに停止を要求（専用スレッドは合成の完了待ちで埋まっている）
+            self.synthesizer.stop_speaking_async()
+            print("⏹  読み上げを中断しました")
+            raise
 
         except Exception as e:
-            error_msg = f"❌ SSML音声合成エラー: {str(e)}"
+            error_msg = f"❌ {label}エラー: {str(e)}"
+            print(error_msg)
+            return False, error_msg
+
+    def _handle_result(self, result, label: str) -> tuple[bool, str]:
+        """
+        合成結果を判定する
+
+        Args:
+            result: SDKの合成結果
+            label: メッセージに使う処理名（音声合成 / SSML音声合成）
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted:
+            print(f"✅ {label}が完了しました")
+            return True, f"{label}が完了しました"
+
+        elif result.reason == speechsdk.ResultReason.Canceled:
+            cancellation = result.cancellation_details
+            error_msg = f"❌ {label}がキャンセルされました: {cancellation.reason}"
+
+            if cancellation.reason == speechsdk.CancellationReason.Error:
+                error_msg += f"\nエラー詳細: {cancellation.error_details}"
+
             print(error_msg)
             return False, error_msg
 
+        else:
+            error_msg = f"⚠️  予期しない結果: {result.reason}"
+            print(error_msg)
+            return False, error_msg
+
+    def render_audio(self, text: str, rate: float = 1.0) -> Optional[bytes]:
+        """
+        テキストを再生せずに音声データに合成する（キャッシュ用、ブロッキング）
+
+        Args:
+            text: 読み上げるテキスト
+            rate: 話速（1.0以外はSSMLで指定）
+
+        Returns:
+            WAV形式の音声（失敗時はNone）
+        """
+        try:
+            config = speechsdk.SpeechConfig(subscription=self.api_key, region=self.region)
+            config.speech_synthesis_voice_name = self.voice_name
+            config.speech_synthesis_language = self.language
+            config.set_speech_synthesis_output_format(
+                getattr(speechsdk.SpeechSynthesisOutputFormat, CACHE_OUTPUT_FORMAT)
+            )
+            # audio_config=None でスピーカーに出力せず音声データだけを受け取る
+            renderer = speechsdk.SpeechSynthesizer(speech_config=config, audio_config=None)
+
+            if rate != 1.0:
+                result = renderer.speak_ssml_async(self._generate_ssml(text, rate)).get()
+            else:
+                result = renderer.speak_text_async(text).get()
+
+            if result.reason == speechsdk.ResultReason.SynthesizingAudioCompleted and result.audio_data:
+                return bytes(result.audio_data)
+            print(f"⚠️  音声キャッシュ用の合成に失敗しました: {result.reason}")
+            return None
+
+        except Exception as e:
+            print(f"❌ 音声キャッシュ用の合成エラー: {str(e)}")
+            return None
+
+    def _phrase_key(self, text: str, rate: float) -> str:
+        """定型文のキャッシュキー（現在の音声名を含む）"""
+        return make_audio_key(text, self.voice_name, rate=rate)
+
+    def _load_phrase(self, text: str, rate: float) -> Optional[Tuple[str, bytes]]:
+        """
+        定型文の音声をキャッシュから取得し、なければ合成して保存する（ブロッキング）
+
+        同じ定型文を別のスレッドが合成中の場合は、その完了を待ってキャッシュから取得します。
+
+        Returns:
+            (キャッシュキー, 音声)のタプル（合成に失敗した場合はNone）
+        """
+        key = self._phrase_key(text, rate)
+        with self._phrase_locks_guard:
+            lock = self._phrase_locks.setdefault(key, threading.Lock())
+
+        with lock:
+            data = self.audio_cache.get(key)
+            if data is None:
+                data = self.render_audio(text, rate)
+                if data is None:
+                    return None
+                self.audio_cache.set(key, data)
+        return key, data
+
+    @property
+    def phrase_cache_enabled(self) -> bool:
+        """定型文をキャッシュからローカル再生できるか"""
+        return self.audio_cache is not None and self.player is not None and self.player.available
+
+    async def speak_phrase_async(self, text: str, rate: float = 1.0) -> tuple[bool, str]:
+        """
+        定型文を読み上げる（キャッシュした音声はAzureを呼ばずにローカル再生）
+
+        キャッシュにない場合は1回だけ合成して保存してから再生します。
+        キャッシュやプレーヤーが使えない場合は通常の読み上げに切り替えます。
+        待機中にキャンセルされた場合は再生を中断します。
+
+        Args:
+            text: 読み上げるテキスト
+            rate: 話速（0.5 ~ 2.0、1.0が標準）
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        if not text or not text.strip():
+            return False, "⚠️  読み上げるテキストが空です"
+
+        if self.phrase_cache_enabled:
+            loaded = await asyncio.to_thread(self._load_phrase, text, rate)
+            if loaded is not None:
+                key, data = loaded
+                print(f"🔊 キャッシュから再生中: {text[:50]}...")
+                try:
+                    return await asyncio.get_running_loop().run_in_executor(
+                        self._executor, self.player.play, data, self.audio_cache.path_for(key)
+                    )
+                except asyncio.CancelledError:
+                    self.player.stop()
+                    print("⏹  読み上げを中断しました")
+                    raise
+
+        if rate != 1.0:
+            return await self.speak_with_options_async(text, rate=rate)
+        return await self.speak_async(text)
+
+    async def prewarm_async(self, phrases: Iterable[Tuple[str, float]]) -> int:
+        """
+        定型文の音声をあらかじめ合成してキャッシュする
+
+        Args:
+            phrases: (テキスト, 話速)のリスト
+
+        Returns:
+            新たに合成した件数（キャッシュ済みの定型文は合成しない）
+        """
+        if not self.phrase_cache_enabled:
+            return 0
+
+        def prewarm() -> int:
+            rendered = 0
+            for text, rate in phrases:
+                key = self._phrase_key(text, rate)
+                if key in self.audio_cache:
+                    continue
+                if self._load_phrase(text, rate) is not None:
+                    rendered += 1
+            return rendered
+
+        return await asyncio.to_thread(prewarm)
+
+    def stop_speaking(self) -> bool:
+        """
+        再生中の読み上げを中断する（割り込み用、他のスレッドから呼び出し可能）
+
+        中断された speak / speak_ssml はキャンセルとして (False, メッセージ) を返します。
+        キャッシュからローカル再生中の定型文も止めます。
+
+        Returns:
+            中断の要求に成功した場合True
+        """
+        try:
+            if self.player is not None:
+                self.player.stop()
+            self.synthesizer.stop_speaking_async().get()
+            print("⏹  読み上げを中断しました")
+            return True
+        except Exception as e:
+            print(f"❌ 読み上げの中断エラー: {str(e)}")
+            return False
+
     def set_voice(self, voice_name: str):
         """
         音声を変更
@@ -193,6 +460,8 @@ class SpeechSynthesizer:
         """
         SSML（Speech Synthesis Markup Language）を生成
 
+        開始・終了タグは（言語・音声名・話速・ピッチ・音量）ごとにキャッシュしたものを使います。
+
         Args:
             text: 読み上げるテキスト
             rate: 話速
@@ -200,22 +469,9 @@ class SpeechSynthesizer:
             volume: 音量
 
         Returns:
-            SSML文字列
-        """
-        # 話速をパーセント表記に変換
-        rate_percent = f"{int((rate - 1.0) * 100):+d}%"
-
-        ssml = f"""
-<speak version="1.0" xmlns="http://www.w3.org/2001/10/synthesis" xml:lang="{self.language}">
-    <voice name="{self.voice_name}">
-        <prosody rate="{rate_percent}" pitch="{pitch}" volume="{volume}">
-            {text}
-        </prosody>
-    </voice>
-</speak>
-        """.strip()
-
-        return ssml
+            SSML文字列（テキストはXMLエスケープ済み）
+        """
+        return build_ssml(text, self.language, self.voice_name, rate, pitch, volume)
 
     def test_speaker(self) -> bool:
         """
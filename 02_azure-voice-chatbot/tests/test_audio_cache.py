@@ -0,0 +1,195 @@
+"""
+合成音声キャッシュ (speech/audio_cache.py) のユニットテスト
+
+キャッシュした定型文がAzureを呼ばずにローカル再生されることをテストします。
+Azure Speech SDKの呼び出しとプレーヤーはモックで代替します。
+"""
+
+import sys
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+import pytest
+
+# プロジェクトディレクトリをパスに追加
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from speech.audio_cache import AudioCache, make_audio_key
+from speech.synthesizer import SpeechSynthesizer
+
+
+class FakePlayer:
+    """再生した音声を記録するプレーヤー"""
+
+    available = True
+
+    def __init__(self):
+        self.played = []
+
+    def play(self, data, path=None):
+        self.played.append(data)
+        return True, "ローカル再生が完了しました"
+
+    def stop(self):
+        pass
+
+
+@pytest.fixture
+def mock_speech_sdk():
+    """Azure Speech SDKのモック（合成すると音声データを返す）"""
+    with patch('speech.synthesizer.speechsdk') as mock_sdk:
+        mock_sdk.ResultReason.SynthesizingAudioCompleted = 0
+        mock_sdk.ResultReason.Canceled = 1
+
+        result = Mock(reason=0, audio_data=b"RIFF-audio")
+        future = MagicMock()
+        future.get.return_value = result
+        sdk_synthesizer = mock_sdk.SpeechSynthesizer.return_value
+        sdk_synthesizer.speak_text_async.return_value = future
+        sdk_synthesizer.speak_ssml_async.return_value = future
+        yield mock_sdk
+
+
+def test_audio_key_depends_on_voice_and_options():
+    """音声名・話速・出力形式が異なれば別のキーになるテスト"""
+    base = make_audio_key("こんにちは", "ja-JP-NanamiNeural")
+
+    assert base == make_audio_key("こんにちは", "ja-JP-NanamiNeural")
+    assert base != make_audio_key("こんにちは", "ja-JP-KeitaNeural")
+    assert base != make_audio_key("こんにちは", "ja-JP-NanamiNeural", rate=1.25)
+    assert base != make_audio_key("こんにちは", "ja-JP-NanamiNeural", output_format="Audio16Khz32KBitRateMonoMp3")
+    assert base != make_audio_key("こんにちは", "ja-JP-NanamiNeural", is_ssml=True)
+
+
+def test_audio_cache_lru_and_disk(tmp_path):
+    """メモリ層のLRU破棄とディスク層からの読み込みのテスト"""
+    cache = AudioCache(max_entries=1, cache_dir=tmp_path / "audio")
+
+    cache.set("a", b"audio-a")
+    cache.set("b", b"audio-b")
+
+    assert cache.stats()["evictions"] == 1
+    assert "a" in cache
+    assert cache.get("a") == b"audio-a"
+    assert cache.stats()["disk_hits"] == 1
+
+    # 別プロセス（再起動後）でもディスク層から取得できる
+    assert AudioCache(cache_dir=tmp_path / "audio").get("b") == b"audio-b"
+    assert cache.get("missing") is None
+
+
+@pytest.mark.asyncio
+async def test_speak_phrase_plays_cached_audio_without_azure(mock_speech_sdk, tmp_path):
+    """2回目以降の定型文はAzureを呼ばずにローカル再生するテスト"""
+    player = FakePlayer()
+    synthesizer = SpeechSynthesizer(
+        api_key="key", region="japaneast", voice_name="ja-JP-NanamiNeural", language="ja-JP",
+        audio_cache=AudioCache(cache_dir=tmp_path), player=player
+    )
+    sdk_synthesizer = mock_speech_sdk.SpeechSynthesizer.return_value
+
+    assert await synthesizer.speak_phrase_async("さようなら。") == (True, "ローカル再生が完了しました")
+    assert await synthesizer.speak_phrase_async("さようなら。") == (True, "ローカル再生が完了しました")
+
+    assert sdk_synthesizer.speak_text_async.call_count == 1
+    assert player.played == [b"RIFF-audio", b"RIFF-audio"]
+
+    # 話速が異なる場合は別に合成する（SSMLで話速を指定）
+    await synthesizer.speak_phrase_async("さようなら。", rate=1.25)
+    assert sdk_synthesizer.speak_ssml_async.call_count == 1
+
+
+@pytest.mark.asyncio
+async def test_prewarm_renders_only_missing_phrases(mock_speech_sdk, tmp_path):
+    """起動時の事前合成はキャッシュにない定型文だけを合成するテスト"""
+    cache = AudioCache(cache_dir=tmp_path)
+    synthesizer = SpeechSynthesizer(
+        api_key="key", region="japaneast", voice_name="ja-JP-NanamiNeural", language="ja-JP",
+        audio_cache=cache, player=FakePlayer()
+    )
+    phrases = [("こんにちは。", 1.0), ("さようなら。", 1.0)]
+
+    assert await synthesizer.prewarm_async(phrases) == 2
+    assert await synthesizer.prewarm_async(phrases) == 0
+    assert cache.stats()["stores"] == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_prewarm_and_speak_render_phrase_once(mock_speech_sdk, tmp_path):
+    """事前合成と読み上げが同じ定型文を同時に求めても合成は1回のテスト"""
+    import asyncio
+    import time
+
+    sdk_synthesizer = mock_speech_sdk.SpeechSynthesizer.return_value
+    future = sdk_synthesizer.speak_text_async.return_value
+    result = future.get.return_value
+
+    def slow_get():
+        time.sleep(0.05)
+        return result
+
+    future.get.side_effect = slow_get
+    player = FakePlayer()
+    synthesizer = SpeechSynthesizer(
+        api_key="key", region="japaneast", voice_name="ja-JP-NanamiNeural", language="ja-JP",
+        audio_cache=AudioCache(cache_dir=tmp_path), player=player
+    )
+
+    _, spoken = await asyncio.gather(
+        synthesizer.prewarm_async([("こんにちは。", 1.0)]),
+        synthesizer.speak_phrase_async("こんにちは。")
+    )
+
+    assert spoken == (True, "ローカル再生が完了しました")
+    assert sdk_synthesizer.speak_text_async.call_count == 1
+    assert player.played == [b"RIFF-audio"]
+
+
+@pytest.mark.asyncio
+async def test_speak_phrase_falls_back_without_player(mock_speech_sdk, tmp_path):
+    """再生できるプレーヤーがない場合は通常の読み上げに切り替えるテスト"""
+    player = FakePlayer()
+    player.available = False
+    cache = AudioCache(cache_dir=tmp_path)
+    synthesizer = SpeechSynthesizer(
+        api_key="key", region="japaneast", voice_name="ja-JP-NanamiNeural", language="ja-JP",
+        audio_cache=cache, player=player
+    )
+
+    success, _ = await synthesizer.speak_phrase_async("こんにちは。")
+
+    assert success is True
+    assert player.played == []
+    assert cache.stats()["stores"] == 0
+
+
+def test_windows_playback_can_be_stopped(monkeypatch, tmp_path):
+    """Windowsでは非同期再生にして、再生中に stop で中断できるテスト"""
+    import io
+    import threading
+    import types
+    import wave
+    from speech import audio_cache
+
+    buffer = io.BytesIO()
+    with wave.open(buffer, "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(8000)
+        wav.writeframes(b"\0\0" * 8000 * 5)  # 5秒
+
+    calls = []
+    winsound = types.SimpleNamespace(SND_FILENAME=0x20000, SND_ASYNC=0x1, PlaySound=lambda *args: calls.append(args))
+    monkeypatch.setitem(sys.modules, "winsound", winsound)
+    monkeypatch.setattr(audio_cache.sys, "platform", "win32")
+
+    player = audio_cache.LocalAudioPlayer()
+    timer = threading.Timer(0.05, player.stop)
+    timer.start()
+    success, message = player.play(buffer.getvalue())
+    timer.join()
+
+    assert success is False and "中断" in message
+    assert calls[0][1] == winsound.SND_FILENAME | winsound.SND_ASYNC
+    assert calls[-1] == (None, 0)
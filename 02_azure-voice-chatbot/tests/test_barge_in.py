@@ -0,0 +1,100 @@
+"""
+読み上げ中の割り込み (speech/barge_in.py) のユニットテスト
+
+Speech SDKのコールバックは別スレッドから呼び出して再現します。
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+from unittest.mock import Mock
+import pytest
+
+# プロジェクトディレクトリをパスに追加
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from speech.barge_in import BargeInListener
+
+
+class FakeRecognizer:
+    """連続音声認識のコールバックを保持するだけの認識器"""
+
+    def __init__(self):
+        self.on_recognized = None
+        self.on_speech_start = None
+        self.stopped = False
+
+    def recognize_continuous_start(self, callback_func, on_speech_start=None):
+        self.on_recognized = callback_func
+        self.on_speech_start = on_speech_start
+
+    def recognize_continuous_stop(self):
+        self.stopped = True
+
+    def say(self, text: str) -> None:
+        """SDKのスレッドから認識途中・認識結果のイベントを送る"""
+        def run():
+            self.on_speech_start(text[:1])
+            self.on_speech_start(text)
+            self.on_recognized(text)
+        thread = threading.Thread(target=run)
+        thread.start()
+        thread.join()
+
+
+@pytest.mark.asyncio
+async def test_speech_during_playback_interrupts_reply():
+    """読み上げ中に話し始めると再生を止め、応答をキャンセルして次の発話を受け取るテスト"""
+    recognizer = FakeRecognizer()
+    synthesizer = Mock()
+    listener = BargeInListener(recognizer, synthesizer)
+    listener.start()
+    cancelled = asyncio.Event()
+
+    async def reply():
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def user_speaks():
+        await asyncio.sleep(0.01)
+        recognizer.say("ちょっと待って")
+
+    speaker = asyncio.create_task(user_speaks())
+    completed, value = await listener.run_interruptible(reply())
+    await speaker
+
+    assert (completed, value) == (False, None)
+    assert cancelled.is_set()
+    synthesizer.stop_speaking.assert_called_once()
+    assert listener.interruptions == 1
+    assert listener.guard(Mock())("次の文") == (False, "割り込みにより読み上げを中断しました")
+    assert await listener.next_utterance(timeout=1) == "ちょっと待って"
+
+    listener.stop()
+    assert recognizer.stopped
+
+
+@pytest.mark.asyncio
+async def test_speech_outside_playback_does_not_interrupt():
+    """読み上げていない間の発話や短い雑音では中断しないテスト"""
+    recognizer = FakeRecognizer()
+    synthesizer = Mock()
+    listener = BargeInListener(recognizer, synthesizer, min_chars=2)
+    listener.start()
+
+    recognizer.say("こんにちは")
+    assert await listener.next_utterance(timeout=1) == "こんにちは"
+
+    async def reply():
+        recognizer.on_speech_start("あ")  # 最小文字数未満は雑音とみなす
+        return "応答"
+
+    assert await listener.run_interruptible(reply()) == (True, "応答")
+    synthesizer.stop_speaking.assert_not_called()
+    assert await listener.next_utterance(timeout=0.01) is None
@@ -0,0 +1,126 @@
+"""
+フェイクチャットクライアント (agents/fake_client.py) のユニットテスト
+
+LLM_BACKEND=fake の場合に、VoiceAgentSession がAzureに接続せずに
+変更なしで動作することを確認します。
+"""
+
+import sys
+from pathlib import Path
+import pytest
+
+# プロジェクトディレクトリをパスに追加
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from agents import fake_client
+from agents.base import create_azure_agent
+from agents.fake_client import FakeChatClient
+from agents.voice_agent import VoiceAgentSession
+from config.settings import settings
+
+
+@pytest.fixture
+def fake_backend(monkeypatch):
+    """LLM_BACKEND=fake（待機なし）に切り替え"""
+    monkeypatch.setattr(settings, "LLM_BACKEND", "fake")
+    monkeypatch.setattr(settings, "FAKE_LLM_LATENCY_MEAN", 0.0)
+    fake_client.reset_fake_clients()
+    yield
+    fake_client.reset_fake_clients()
+
+
+@pytest.mark.asyncio
+async def test_create_azure_agent_uses_fake_client_without_endpoint(fake_backend, monkeypatch):
+    """フェイクバックエンドではエンドポイントなしでエージェントを作成できるテスト"""
+    monkeypatch.delenv("AZURE_OPENAI_ENDPOINT", raising=False)
+
+    agent = await create_azure_agent(name="Voice", instructions="指示", deployment_name="gpt-5")
+    session = VoiceAgentSession(agent, max_retries=0, timeout=5)
+
+    first = await session.send_message("こんにちは")
+    second = await session.send_message("元気ですか")
+
+    assert "gpt-5" in first and "こんにちは" in first
+    assert "元気ですか" in second
+    assert len(session.get_conversation_history()) == 4
+    assert isinstance(agent.chat_client, FakeChatClient)
+
+
+@pytest.mark.asyncio
+async def test_session_retries_injected_rate_limit():
+    """注入した429エラーがRetry-Afterに従って再試行されるテスト"""
+    from agent_framework import ChatAgent
+
+    client = FakeChatClient(failure_rate=1.0, failure_kinds=["429"], retry_after=0.01)
+    session = VoiceAgentSession(ChatAgent(chat_client=client, instructions="指示"), max_retries=1, timeout=5)
+
+    with pytest.raises(Exception):
+        await session.send_message("やあ")
+
+    assert [a["status"] for a in session.last_attempts] == ["error", "error"]
+    assert session.last_attempts[0]["delay_seconds"] == 0.01
+    assert client.failures == {"429": 2}
+
+
+@pytest.mark.asyncio
+async def test_fixed_response_is_returned():
+    """固定の応答を返すテスト"""
+    from agent_framework import ChatAgent
+
+    client = FakeChatClient(response="晴れです。")
+    session = VoiceAgentSession(ChatAgent(chat_client=client, instructions="指示"), max_retries=0, timeout=5)
+
+    assert await session.send_message("今日の天気は？") == "晴れです。"
+
+
+@pytest.mark.asyncio
+async def test_stream_message_yields_deltas_and_records_history():
+    """ストリーミング応答が差分で届き、全文が履歴に残るテスト"""
+    from agent_framework import ChatAgent
+
+    client = FakeChatClient(response="晴れです。午後は曇ります。")
+    session = VoiceAgentSession(ChatAgent(chat_client=client, instructions="指示"), max_retries=0, timeout=5)
+
+    deltas = [delta async for delta in session.stream_message("今日の天気は？")]
+
+    assert len(deltas) > 1
+    assert "".join(deltas) == "晴れです。午後は曇ります。"
+    assert session.get_conversation_history()[-1] == {"role": "assistant", "content": "晴れです。午後は曇ります。"}
+    assert [a["status"] for a in session.last_attempts] == ["ok"]
+
+
+@pytest.mark.asyncio
+async def test_stream_message_retries_before_first_token():
+    """最初のトークンが届く前のエラーは再試行するテスト"""
+    from agent_framework import ChatAgent
+
+    client = FakeChatClient(failure_rate=1.0, failure_kinds=["429"], retry_after=0.01)
+    session = VoiceAgentSession(ChatAgent(chat_client=client, instructions="指示"), max_retries=1, timeout=5)
+
+    with pytest.raises(Exception):
+        async for _ in session.stream_message("やあ"):
+            pass
+
+    assert [a["status"] for a in session.last_attempts] == ["error", "error"]
+    assert session.last_attempts[0]["delay_seconds"] == 0.01
+
+
+def test_failure_kinds_are_limited_to_http_errors():
+    """注入できるエラーは429と500のみのテスト"""
+    with pytest.raises(ValueError):
+        FakeChatClient(failure_kinds=["timeout"])
+
+
+def test_fake_client_follows_settings(fake_backend, monkeypatch):
+    """FAKE_LLM_* の設定からクライアントを作成し、デプロイメントごとに共有するテスト"""
+    monkeypatch.setattr(settings, "FAKE_LLM_FAILURE_KINDS", "429, 500")
+    monkeypatch.setattr(settings, "FAKE_LLM_RETRY_AFTER", 2.0)
+
+    client = fake_client.get_fake_chat_client("gpt-5")
+
+    assert client is fake_client.get_fake_chat_client("gpt-5")
+    assert client.failure_kinds == ["429", "500"]
+    assert client.retry_after == 2.0
+    assert client.latency == 0.0
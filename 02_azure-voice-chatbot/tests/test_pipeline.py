@@ -0,0 +1,116 @@
+"""
+ストリーミング読み上げパイプライン (speech/pipeline.py) のユニットテスト
+
+文区切りと、応答の生成と音声合成が並行して進むことをテストします。
+"""
+
+import asyncio
+import sys
+import threading
+from pathlib import Path
+import pytest
+
+# プロジェクトディレクトリをパスに追加
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from speech.pipeline import SentenceSplitter, run_speech_pipeline
+
+
+def test_sentence_splitter_splits_at_japanese_endings():
+    """文末（。！？）で区切るテスト"""
+    splitter = SentenceSplitter()
+
+    assert splitter.feed("こんにちは。今日は") == ["こんにちは。"]
+    assert splitter.feed("晴れです！明日は？ 雨") == ["今日は晴れです！", "明日は？"]
+    assert splitter.flush() == "雨"
+    assert splitter.flush() is None
+
+
+def test_sentence_splitter_keeps_trailing_marks_together():
+    """連続する文末の文字と閉じ括弧を同じ文に含めるテスト"""
+    splitter = SentenceSplitter()
+
+    # 末尾の文末の文字は次のテキストが届くまで保留
+    assert splitter.feed("本当？") == []
+    assert splitter.feed("！」と彼は言った。") == ["本当？！」"]
+    assert splitter.flush() == "と彼は言った。"
+
+
+@pytest.mark.asyncio
+async def test_pipeline_speaks_first_sentence_while_generating():
+    """1文目の音声合成が応答の生成中に始まるテスト"""
+    first_spoken = threading.Event()
+    spoken = []
+
+    def speak(sentence):
+        spoken.append(sentence)
+        first_spoken.set()
+        return True, "完了"
+
+    async def deltas():
+        yield "最初の文です。"
+        yield "次の"
+        # 1文目の読み上げが始まるまで生成を止める（並行していなければタイムアウト）
+        started = await asyncio.to_thread(first_spoken.wait, 2)
+        assert started
+        yield "文です。最後"
+
+    result = await run_speech_pipeline(deltas(), speak)
+
+    assert spoken == ["最初の文です。", "次の文です。", "最後"]
+    assert result.text == "最初の文です。次の文です。最後"
+    assert result.errors == []
+    timings = result.timings
+    assert timings.sentences == 3
+    assert timings.first_audio_seconds <= timings.generation_seconds
+    assert timings.first_token_seconds <= timings.first_sentence_seconds
+
+
+@pytest.mark.asyncio
+async def test_pipeline_speaks_completed_sentences_before_raising():
+    """生成中のエラーでも完成済みの文を読み上げてから例外を送出するテスト"""
+    spoken = []
+
+    def speak(sentence):
+        spoken.append(sentence)
+        return (False, "合成失敗") if len(spoken) == 1 else (True, "完了")
+
+    async def deltas():
+        yield "一文目。二文"
+        raise RuntimeError("接続が切れました")
+
+    with pytest.raises(RuntimeError):
+        await run_speech_pipeline(deltas(), speak)
+
+    assert spoken == ["一文目。"]
+
+
+@pytest.mark.asyncio
+async def test_pipeline_finishes_stream_cleanup_before_returning_on_cancel():
+    """キャンセルされた場合も応答ストリームの後始末が終わってから戻るテスト"""
+    cleaned_up = []
+    speaking = asyncio.Event()
+
+    async def speak(sentence):
+        speaking.set()
+        await asyncio.sleep(10)
+        return True, "完了"
+
+    async def deltas():
+        try:
+            yield "一文目。二文"
+            await asyncio.sleep(10)
+            yield "目。"
+        finally:
+            await asyncio.sleep(0)
+            cleaned_up.append(True)
+
+    task = asyncio.create_task(run_speech_pipeline(deltas(), speak))
+    await speaking.wait()
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    assert cleaned_up == [True]
@@ -162,3 +162,79 @@ def test_recognize_once_exception_handling(mock_speech_sdk, mock_settings):
     # 結果確認
     assert success is False
     assert "エラー" in message or "Network error" in message
+
+
+def test_recognize_continuous_reports_partial_speech(mock_speech_sdk, mock_settings):
+    """連続音声認識で認識途中のテキストと認識結果を通知し、停止時にハンドラを解除するテスト"""
+    recognizer = SpeechRecognizer()
+    sdk_recognizer = mock_speech_sdk['recognizer']
+    recognized, partial = [], []
+
+    recognizer.recognize_continuous_start(recognized.append, on_speech_start=partial.append)
+    recognizing_handler = sdk_recognizer.recognizing.connect.call_args.args[0]
+    recognized_handler = sdk_recognizer.recognized.connect.call_args.args[0]
+
+    recognizing_handler(Mock(result=Mock(text="こんに")))
+    recognized_handler(Mock(result=Mock(reason=0, text="こんにちは")))
+
+    assert partial == ["こんに"]
+    assert recognized == ["こんにちは"]
+    sdk_recognizer.start_continuous_recognition.assert_called_once()
+
+    recognizer.recognize_continuous_stop()
+    sdk_recognizer.recognized.disconnect_all.assert_called_once()
+    sdk_recognizer.recognizing.disconnect_all.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_recognize_once_async(mock_speech_sdk, mock_settings):
+    """SDKの非同期呼び出しで認識し、結果を判定するテスト"""
+    mock_result = Mock()
+    mock_result.reason = mock_speech_sdk['sdk'].ResultReason.RecognizedSpeech
+    mock_result.text = "こんにちは"
+    mock_future = MagicMock()
+    mock_future.get.return_value = mock_result
+    mock_speech_sdk['recognizer'].recognize_once_async.return_value = mock_future
+
+    recognizer = SpeechRecognizer()
+    success, text = await recognizer.recognize_once_async()
+
+    assert (success, text) == (True, "こんにちは")
+    mock_speech_sdk['recognizer'].recognize_once.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_recognize_once_async_waits_for_cancelled_recognition(mock_speech_sdk, mock_settings):
+    """取り消した単発認識が終わるまで次の認識を開始しないテスト"""
+    import asyncio
+    import threading
+
+    released = threading.Event()
+    mock_result = Mock()
+    mock_result.reason = mock_speech_sdk['sdk'].ResultReason.RecognizedSpeech
+    mock_result.text = "こんにちは"
+
+    def blocking_get():
+        released.wait(5)
+        return mock_result
+
+    mock_future = MagicMock()
+    mock_future.get.side_effect = blocking_get
+    sdk_recognizer = mock_speech_sdk['recognizer']
+    sdk_recognizer.recognize_once_async.return_value = mock_future
+
+    recognizer = SpeechRecognizer()
+    first = asyncio.create_task(recognizer.recognize_once_async())
+    await asyncio.sleep(0.05)
+    first.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await first
+
+    second = asyncio.create_task(recognizer.recognize_once_async())
+    await asyncio.sleep(0.05)
+    # 前回の認識が続いている間は新しい認識を開始しない
+    assert sdk_recognizer.recognize_once_async.call_count == 1
+
+    released.set()
+    assert await asyncio.wait_for(second, 5) == (True, "こんにちは")
+    assert sdk_recognizer.recognize_once_async.call_count == 2
@@ -0,0 +1,132 @@
+"""
+SSMLの組み立て (speech/ssml.py) のユニットテスト
+
+テキストのXMLエスケープ、開始・終了タグのキャッシュ、複数の音声区間と間、
+文ごとのチャンクからの組み立てをテストします。
+"""
+
+import sys
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from unittest.mock import MagicMock, Mock, patch
+import pytest
+
+# プロジェクトディレクトリをパスに追加
+PROJECT_DIR = Path(__file__).resolve().parents[1]
+if str(PROJECT_DIR) not in sys.path:
+    sys.path.insert(0, str(PROJECT_DIR))
+
+from speech.ssml import (
+    SsmlBuilder, build_ssml, escape_text, iter_ssml_chunks, rate_to_percent, voice_envelope
+)
+from speech.synthesizer import SpeechSynthesizer
+
+NS = "{http://www.w3.org/2001/10/synthesis}"
+
+
+def test_escape_text():
+    """XMLで特別な意味を持つ文字のエスケープのテスト"""
+    assert escape_text('a < b & "c" > \'d\'') == "a &lt; b &amp; &quot;c&quot; &gt; &apos;d&apos;"
+    assert escape_text("こんにちは。") == "こんにちは。"
+
+
+def test_rate_to_percent():
+    """話速のパーセント表記のテスト"""
+    assert rate_to_percent(1.0) == "+0%"
+    assert rate_to_percent(1.2) == "+20%"
+    assert rate_to_percent(0.9) == "-10%"
+
+
+def test_build_ssml_is_valid_xml_with_special_characters():
+    """記号を含むテキストでも正しいXMLになるテスト"""
+    ssml = build_ssml("1 < 2 & 3 > 2", "ja-JP", "ja-JP-NanamiNeural", rate=1.25)
+
+    root = ET.fromstring(ssml)
+    voice = root.find(f"{NS}voice")
+    prosody = voice.find(f"{NS}prosody")
+
+    assert root.get("{http://www.w3.org/XML/1998/namespace}lang") == "ja-JP"
+    assert voice.get("name") == "ja-JP-NanamiNeural"
+    assert prosody.get("rate") == "+25%"
+    assert prosody.text == "1 < 2 & 3 > 2"
+
+
+def test_default_prosody_is_omitted():
+    """話速・ピッチ・音量が標準の場合は prosody を省略するテスト"""
+    ssml = build_ssml("こんにちは", "ja-JP", "ja-JP-NanamiNeural")
+
+    assert "<prosody" not in ssml
+    assert ET.fromstring(ssml).find(f"{NS}voice").text == "こんにちは"
+
+
+def test_envelope_is_cached():
+    """同じ音声設定の開始・終了タグを再利用するテスト"""
+    voice_envelope.cache_clear()
+
+    build_ssml("一文目。", "ja-JP", "ja-JP-NanamiNeural", rate=1.1)
+    build_ssml("二文目。", "ja-JP", "ja-JP-NanamiNeural", rate=1.1)
+
+    info = voice_envelope.cache_info()
+    assert info.misses == 1
+    assert info.hits == 1
+
+
+def test_builder_multiple_voices_and_breaks():
+    """複数の音声区間と間を含む文書のテスト"""
+    ssml = (
+        SsmlBuilder("ja-JP", "ja-JP-NanamiNeural")
+        .add_text("こんにちは。")
+        .add_text("元気です。")
+        .add_break(300)
+        .add_text("私はケイタです。", voice_name="ja-JP-KeitaNeural")
+        .build()
+    )
+
+    voices = ET.fromstring(ssml).findall(f"{NS}voice")
+
+    # 同じ音声のテキストは1つの区間にまとめる
+    assert [v.get("name") for v in voices] == ["ja-JP-NanamiNeural", "ja-JP-KeitaNeural"]
+    assert voices[0].text == "こんにちは。元気です。"
+    assert voices[0].find(f"{NS}break").get("time") == "300ms"
+    assert voices[1].text == "私はケイタです。"
+
+
+def test_chunks_from_generator():
+    """文ごとのチャンク（ジェネレーター）から組み立てるテスト"""
+    def sentences():
+        yield "一文目。"
+        yield "  "
+        yield "A & B。"
+
+    documents = list(iter_ssml_chunks(sentences(), "ja-JP", "ja-JP-NanamiNeural"))
+    assert len(documents) == 2
+    assert ET.fromstring(documents[1]).find(f"{NS}voice").text == "A & B。"
+
+    ssml = SsmlBuilder("ja-JP", "ja-JP-NanamiNeural").add_sentences(sentences()).build()
+    assert ET.fromstring(ssml).find(f"{NS}voice").text == "一文目。A & B。"
+
+
+@pytest.mark.asyncio
+async def test_speak_sentences_async_uses_single_request():
+    """複数の文を1回の合成リクエストで読み上げるテスト"""
+    with patch('speech.synthesizer.speechsdk') as mock_sdk:
+        mock_sdk.ResultReason.SynthesizingAudioCompleted = 0
+        mock_sdk.ResultReason.Canceled = 1
+        future = MagicMock()
+        future.get.return_value = Mock(reason=0)
+        sdk_synthesizer = mock_sdk.SpeechSynthesizer.return_value
+        sdk_synthesizer.speak_ssml_async.return_value = future
+
+        synthesizer = SpeechSynthesizer(
+            api_key="key", region="japaneast", voice_name="ja-JP-NanamiNeural", language="ja-JP"
+        )
+        success, _ = await synthesizer.speak_sentences_async(["一文目。", "二文目。"], pause_ms=200)
+
+        assert success is True
+        sdk_synthesizer.speak_ssml_async.assert_called_once()
+        ssml = sdk_synthesizer.speak_ssml_async.call_args[0][0]
+        voice = ET.fromstring(ssml).find(f"{NS}voice")
+        assert voice.text == "一文目。"
+        assert voice.find(f"{NS}break").tail == "二文目。"
+
+        assert (await synthesizer.speak_sentences_async([" "]))[0] is False
@@ -194,3 +194,60 @@ def test_speak_exception_handling(mock_speech_sdk, mock_settings):
     # 結果確認
     assert success is False
     assert "エラー" in message or "Network error" in message
+
+
+def test_stop_speaking(mock_speech_sdk, mock_settings):
+    """再生中の読み上げを中断するテスト"""
+    synthesizer = SpeechSynthesizer()
+
+    assert synthesizer.stop_speaking() is True
+    mock_speech_sdk['synthesizer'].stop_speaking_async.assert_called_once()
+
+    mock_speech_sdk['synthesizer'].stop_speaking_async.side_effect = Exception("停止失敗")
+    assert synthesizer.stop_speaking() is False
+
+
+@pytest.mark.asyncio
+async def test_speak_async_does_not_block_event_loop(mock_speech_sdk, mock_settings):
+    """合成の完了を待つ間もイベントループが他の処理を進められるテスト"""
+    import asyncio
+    import threading
+
+    finished = threading.Event()
+    mock_result = Mock()
+    mock_result.reason = mock_speech_sdk['sdk'].ResultReason.SynthesizingAudioCompleted
+    mock_async = MagicMock()
+    mock_async.get.side_effect = lambda: finished.wait(2) and mock_result
+    mock_speech_sdk['synthesizer'].speak_text_async.return_value = mock_async
+
+    synthesizer = SpeechSynthesizer()
+    speaking = asyncio.create_task(synthesizer.speak_async("こんにちは"))
+
+    # 再生中に別の処理を実行できる
+    await asyncio.sleep(0.01)
+    assert not speaking.done()
+    finished.set()
+
+    assert await speaking == (True, "音声合成が完了しました")
+
+
+@pytest.mark.asyncio
+async def test_speak_async_cancel_stops_playback(mock_speech_sdk, mock_settings):
+    """待機中のキャンセルで再生を中断するテスト"""
+    import asyncio
+    import threading
+
+    finished = threading.Event()
+    mock_async = MagicMock()
+    mock_async.get.side_effect = lambda: finished.wait(2)
+    mock_speech_sdk['synthesizer'].speak_text_async.return_value = mock_async
+    mock_speech_sdk['synthesizer'].stop_speaking_async.side_effect = lambda: finished.set()
+
+    synthesizer = SpeechSynthesizer()
+    speaking = asyncio.create_task(synthesizer.speak_async("長い応答です"))
+    await asyncio.sleep(0.01)
+    speaking.cancel()
+
+    with pytest.raises(asyncio.CancelledError):
+        await speaking
+    mock_speech_sdk['synthesizer'].stop_speaking_async.assert_called_once()
@@ -213,3 +213,88 @@ async def test_send_message_with_empty_string(mock_agent):
     assert response == ""
     assert len(session.conversation_history) == 2
     assert session.conversation_history[0]["content"] == ""
+
+
+@pytest.mark.asyncio
+async def test_send_message_retries_rate_limited_call(mock_agent):
+    """429エラー時にRetry-Afterに従って再試行するテスト"""
+
+    class RateLimitError(Exception):
+        status_code = 429
+
+        def __init__(self):
+            super().__init__("rate limited")
+            self.response = Mock(headers={"retry-after": "0"})
+
+    mock_response = Mock()
+    mock_response.text = "こんにちは"
+    mock_agent.run = AsyncMock(side_effect=[RateLimitError(), mock_response])
+
+    session = VoiceAgentSession(mock_agent, max_retries=2, timeout=5)
+    response = await session.send_message("やあ")
+
+    assert response == "こんにちは"
+    assert mock_agent.run.await_count == 2
+    assert [a["status"] for a in session.last_attempts] == ["error", "ok"]
+    assert session.last_attempts[0]["delay_seconds"] == 0
+
+
+@pytest.mark.asyncio
+async def test_send_message_does_not_retry_client_errors(mock_agent):
+    """400系エラーは再試行しないテスト"""
+
+    class BadRequestError(Exception):
+        status_code = 400
+
+    mock_agent.run = AsyncMock(side_effect=BadRequestError("bad"))
+    session = VoiceAgentSession(mock_agent, max_retries=3, timeout=5)
+
+    with pytest.raises(BadRequestError):
+        await session.send_message("やあ")
+    assert mock_agent.run.await_count == 1
+
+
+@pytest.mark.asyncio
+async def test_stream_message_closes_agent_stream_when_abandoned(mock_agent):
+    """受信を途中で打ち切った場合にエージェントのストリームを閉じるテスト"""
+    closed = []
+
+    async def run_stream(text, thread=None):
+        try:
+            for token in ["こんにちは。", "元気ですか。"]:
+                yield Mock(text=token)
+        finally:
+            closed.append(True)
+
+    mock_agent.run_stream = run_stream
+    session = VoiceAgentSession(mock_agent, max_retries=0, timeout=5)
+
+    replies = session.stream_message("やあ")
+    assert await replies.__anext__() == "こんにちは。"
+    await replies.aclose()
+
+    assert closed == [True]
+    assert session.conversation_history[-1] == {"role": "assistant", "content": "こんにちは。"}
+
+
+@pytest.mark.asyncio
+async def test_stream_message_times_out_when_reply_stalls(mock_agent):
+    """応答の途中で差分が止まった場合もタイムアウトするテスト"""
+    import asyncio
+
+    async def run_stream(text, thread=None):
+        yield Mock(text="こんにちは。")
+        await asyncio.sleep(10)
+        yield Mock(text="届かない差分")
+
+    mock_agent.run_stream = run_stream
+    session = VoiceAgentSession(mock_agent, max_retries=2, timeout=0.05)
+
+    received = []
+    with pytest.raises(asyncio.TimeoutError):
+        async for delta in session.stream_message("やあ"):
+            received.append(delta)
+
+    assert received == ["こんにちは。"]
+    # 差分を渡した後は再試行しない
+    assert session.last_attempts == [{"attempt": 1, "status": "timeout", "error": "TimeoutError"}]
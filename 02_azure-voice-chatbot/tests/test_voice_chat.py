@@ -33,6 +33,7 @@ def mock_recognizer():
     """SpeechRecognizerのモック"""
     recognizer = Mock()
     recognizer.recognize_once = Mock(return_value=(True, "テスト入力"))
+    recognizer.recognize_once_async = AsyncMock(return_value=(True, "テスト入力"))
     return recognizer
 
 
@@ -42,6 +43,8 @@ def mock_synthesizer():
     synthesizer = Mock()
     synthesizer.speak = Mock(return_value=(True, "完了"))
     synthesizer.speak_with_options = Mock(return_value=(True, "完了"))
+    synthesizer.speak_async = AsyncMock(return_value=(True, "完了"))
+    synthesizer.speak_with_options_async = AsyncMock(return_value=(True, "完了"))
     synthesizer.set_voice = Mock()
     return synthesizer
 
@@ -375,3 +378,88 @@ def test_print_session_statistics(mock_session, mock_recognizer, mock_synthesize
     assert "セッション統計" in captured.out
     assert "総ターン数: 5" in captured.out
     assert "セッション時間:" in captured.out
+
+
+@pytest.mark.asyncio
+async def test_respond_streaming_speaks_each_sentence(mock_session, mock_recognizer, mock_synthesizer, mock_settings):
+    """ストリーミング応答を文ごとに読み上げ、所要時間を記録するテスト"""
+    async def stream_message(text):
+        for delta in ["こんにちは。", "今日は", "いい天気ですね。"]:
+            yield delta
+
+    mock_session.stream_message = stream_message
+    chat = VoiceChat(mock_session, mock_recognizer, mock_synthesizer)
+
+    response = await chat._respond_streaming("やあ", recognition_seconds=0.5)
+
+    assert response == "こんにちは。今日はいい天気ですね。"
+    assert [c.args[0] for c in mock_synthesizer.speak_async.call_args_list] == ["こんにちは。", "今日はいい天気ですね。"]
+    assert chat.last_pipeline.timings.recognition_seconds == 0.5
+    assert chat.last_pipeline.timings.sentences == 2
+
+
+def test_only_fixed_command_confirmations_use_phrase_cache(mock_session, mock_recognizer, mock_synthesizer, mock_settings):
+    """定型文になる音声コマンドの確認だけをキャッシュして読み上げるテスト"""
+    chat = VoiceChat(session=mock_session, recognizer=mock_recognizer, synthesizer=mock_synthesizer)
+
+    for command_type in ("speed_up", "speed_down", "reset_voice"):
+        assert chat._command_speaker(command_type) == chat._speak_phrase
+    # 音声プロファイルの説明や要約を含む確認、通常の応答はキャッシュしない
+    for command_type in ("voice_change", "summary", None):
+        assert chat._command_speaker(command_type) == chat._speak
+
+
+@pytest.mark.asyncio
+async def test_barge_in_cancels_reply_during_generation(mock_session, mock_recognizer, mock_synthesizer, mock_settings):
+    """応答の生成中に発話を検出した場合、生成を取り消して読み上げないテスト"""
+    import asyncio
+    from speech.barge_in import BargeInListener
+
+    generating = asyncio.Event()
+    cancelled = []
+
+    async def send_message(text):
+        generating.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(text)
+            raise
+        return "届かない応答"
+
+    mock_session.send_message = send_message
+    chat = VoiceChat(mock_session, mock_recognizer, mock_synthesizer)
+    chat.barge_in = BargeInListener(mock_recognizer, mock_synthesizer)
+
+    async def interrupt():
+        await generating.wait()
+        chat.barge_in._mark_interrupted()
+
+    interrupter = asyncio.create_task(interrupt())
+    completed, _ = await chat._run_interruptible(chat._respond("やあ"))
+    await interrupter
+
+    assert completed is False
+    assert cancelled == ["やあ"]
+    mock_synthesizer.speak_async.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_barge_in_listener_stops_when_loop_is_cancelled(mock_session, mock_recognizer, mock_synthesizer, mock_settings):
+    """対話ループがキャンセルされても連続音声認識を止めるテスト"""
+    import asyncio
+
+    mock_settings.AUDIO_CACHE_PREWARM = False
+    mock_settings.VOICE_BARGE_IN_ENABLED = True
+    mock_settings.VOICE_BARGE_IN_MIN_CHARS = 2
+    mock_synthesizer.speak_phrase_async = AsyncMock(return_value=(True, "完了"))
+    listener = Mock()
+    listener.next_utterance = AsyncMock(side_effect=asyncio.CancelledError)
+
+    with patch('voice_chat.BargeInListener', return_value=listener):
+        chat = VoiceChat(mock_session, mock_recognizer, mock_synthesizer)
+        with pytest.raises(asyncio.CancelledError):
+            await chat.start_conversation()
+
+    listener.start.assert_called_once()
+    listener.stop.assert_called_once()
@@ -11,10 +11,14 @@ Phase 3拡張:
 - 音声コマンド処理
 """
 
+import asyncio
 import time
-from typing import Optional
+from typing import Any, Awaitable, List, Optional, Tuple
 from speech.recognizer import SpeechRecognizer
 from speech.synthesizer import SpeechSynthesizer
+from speech.pipeline import PipelineResult, run_speech_pipeline
+from speech.barge_in import BargeInListener
+from speech.audio_cache import AudioCache
 from agents.voice_agent import VoiceAgentSession
 from config.settings import settings
 from tools.context_manager import ContextManager
@@ -26,6 +30,50 @@ from config.voice_profiles import (
     CUSTOM_PROFILES
 )
 
+# 定型文（合成音声をキャッシュしてローカル再生）
+WELCOME_MESSAGE = "こんにちは。音声アシスタントです。何かお手伝いできることはありますか？"
+FAREWELL_MESSAGE = "ご利用ありがとうございました。さようなら。"
+RESET_VOICE_MESSAGE = "音声設定をデフォルトにリセットしました。"
+
+# 確認メッセージが定型文になる音声コマンド（要約や音声プロファイルの説明を含む確認はキャッシュしない）
+PHRASE_COMMANDS = ("speed_up", "speed_down", "reset_voice")
+
+# 話速の変更範囲と刻み
+MIN_SPEAKING_RATE = 0.5
+MAX_SPEAKING_RATE = 1.5
+SPEAKING_RATE_STEP = 0.25
+
+
+def speaking_rate_message(faster: bool, rate: float) -> str:
+    """
+    話速変更の確認メッセージ
+
+    Args:
+        faster: 速くした場合True
+        rate: 変更後の話速
+
+    Returns:
+        確認メッセージ
+    """
+    if faster:
+        return f"話速を速くしました。現在は{rate}倍速です。"
+    return f"話速を遅くしました。現在は{rate}倍速です。"
+
+
+def create_audio_cache() -> Optional[AudioCache]:
+    """
+    設定に従って定型文の合成音声キャッシュを作成
+
+    Returns:
+        AudioCache（AUDIO_CACHE_ENABLED=false の場合はNone）
+    """
+    if not settings.AUDIO_CACHE_ENABLED:
+        return None
+    return AudioCache(
+        max_entries=settings.AUDIO_CACHE_MAX_ENTRIES,
+        cache_dir=settings.AUDIO_CACHE_DIR or None
+    )
+
 
 class VoiceChat:
     """
@@ -51,7 +99,7 @@ class VoiceChat:
         """
         self.session = session
         self.recognizer = recognizer or SpeechRecognizer()
-        self.synthesizer = synthesizer or SpeechSynthesizer()
+        self.synthesizer = synthesizer or SpeechSynthesizer(audio_cache=create_audio_cache())
 
         # 安全カウンター
         self.turn_count = 0
@@ -66,6 +114,15 @@ class VoiceChat:
         self.current_voice_profile = "default"
         self.current_speaking_rate = 1.0
 
+        # 直近のストリーミング読み上げの結果（ステージごとの所要時間を含む）
+        self.last_pipeline: Optional[PipelineResult] = None
+
+        # 読み上げ中の割り込み（VOICE_BARGE_IN_ENABLED の場合に対話開始時に作成）
+        self.barge_in: Optional[BargeInListener] = None
+
+        # 定型文の合成音声の事前準備（対話開始時に作成）
+        self._prewarm_task: Optional[asyncio.Task] = None
+
     def _check_safety_limits(self) -> tuple[bool, Optional[str]]:
         """
         安全制限のチェック
@@ -215,13 +272,11 @@ class VoiceChat:
             応答メッセージ
         """
         if faster:
-            self.current_speaking_rate = min(1.5, self.current_speaking_rate + 0.25)
-            message = f"話速を速くしました。現在は{self.current_speaking_rate}倍速です。"
+            self.current_speaking_rate = min(MAX_SPEAKING_RATE, self.current_speaking_rate + SPEAKING_RATE_STEP)
         else:
-            self.current_speaking_rate = max(0.5, self.current_speaking_rate - 0.25)
-            message = f"話速を遅くしました。現在は{self.current_speaking_rate}倍速です。"
+            self.current_speaking_rate = max(MIN_SPEAKING_RATE, self.current_speaking_rate - SPEAKING_RATE_STEP)
 
-        return message
+        return speaking_rate_message(faster, self.current_speaking_rate)
 
     def _reset_voice_settings(self) -> str:
         """
@@ -237,7 +292,153 @@ class VoiceChat:
         if profile:
             self.synthesizer.set_voice(profile.voice_name)
 
-        return "音声設定をデフォルトにリセットしました。"
+        return RESET_VOICE_MESSAGE
+
+    async def _speak(self, text: str) -> tuple[bool, str]:
+        """
+        現在の話速でテキストを読み上げる（イベントループを止めない）
+
+        Args:
+            text: 読み上げるテキスト
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        if self.current_speaking_rate != 1.0:
+            # 話速が変更されている場合はspeak_with_optionsを使用
+            return await self.synthesizer.speak_with_options_async(text, rate=self.current_speaking_rate)
+        # デフォルトの話速の場合は通常のspeakを使用
+        return await self.synthesizer.speak_async(text)
+
+    async def _speak_phrase(self, text: str) -> tuple[bool, str]:
+        """
+        定型文を現在の話速で読み上げる（キャッシュした合成音声をローカル再生）
+
+        Args:
+            text: 読み上げる定型文
+
+        Returns:
+            (成功フラグ, メッセージ)のタプル
+        """
+        return await self.synthesizer.speak_phrase_async(text, rate=self.current_speaking_rate)
+
+    def _command_speaker(self, command_type: Optional[str]):
+        """
+        音声コマンドの確認メッセージを読み上げる関数を選ぶ
+
+        Args:
+            command_type: コマンドタイプ（音声コマンドでない場合はNone）
+
+        Returns:
+            定型文の確認は _speak_phrase、それ以外は _speak
+        """
+        return self._speak_phrase if command_type in PHRASE_COMMANDS else self._speak
+
+    def _common_phrases(self) -> List[Tuple[str, float]]:
+        """
+        起動時に合成しておく定型文と話速
+
+        Returns:
+            (テキスト, 話速)のリスト（開始・終了・音声設定のリセット・話速変更の確認）
+        """
+        phrases = [(WELCOME_MESSAGE, 1.0), (FAREWELL_MESSAGE, 1.0), (RESET_VOICE_MESSAGE, 1.0)]
+        steps = int((MAX_SPEAKING_RATE - MIN_SPEAKING_RATE) / SPEAKING_RATE_STEP)
+        for i in range(1, steps + 1):
+            faster_rate = MIN_SPEAKING_RATE + SPEAKING_RATE_STEP * i
+            slower_rate = MAX_SPEAKING_RATE - SPEAKING_RATE_STEP * i
+            phrases.append((speaking_rate_message(True, faster_rate), faster_rate))
+            phrases.append((speaking_rate_message(False, slower_rate), slower_rate))
+        return phrases
+
+    async def _respond_streaming(self, user_text: str, recognition_seconds: Optional[float] = None) -> str:
+        """
+        応答を生成しながら文ごとに読み上げる
+
+        Args:
+            user_text: 認識したユーザーの発話
+            recognition_seconds: 音声認識の所要時間（記録用）
+
+        Returns:
+            応答全文
+        """
+        print("🤔 応答を生成中（文ごとに読み上げます）...")
+        speak = self.barge_in.guard(self._speak) if self.barge_in is not None else self._speak
+        result = await run_speech_pipeline(self.session.stream_message(user_text), speak)
+        result.timings.recognition_seconds = recognition_seconds
+        self.last_pipeline = result
+
+        print(f"🤖 アシスタント: {result.text}")
+        timings = result.timings
+        if timings.first_audio_seconds is not None:
+            print(
+                f"⏱  最初の読み上げまで{timings.first_audio_seconds:.2f}秒"
+                f"（生成 {timings.generation_seconds:.2f}秒 / 合成 {timings.synthesis_seconds:.2f}秒 / {timings.sentences}文）"
+            )
+        for error in result.errors:
+            print(f"⚠️  音声合成エラー: {error}")
+        return result.text
+
+    async def _respond(self, user_text: str, command_type: Optional[str] = None) -> tuple[bool, str]:
+        """
+        応答全体を生成してから読み上げる
+
+        生成と読み上げをまとめて _run_interruptible に渡し、生成中の発話でも応答を中断できるようにします。
+
+        Args:
+            user_text: 認識したユーザーの発話
+            command_type: 音声コマンドのタイプ（音声コマンドでない場合はNone）
+
+        Returns:
+            読み上げの(成功フラグ, メッセージ)のタプル
+        """
+        if command_type is not None:
+            print(f"🎛️  音声コマンドを検出: {command_type}")
+            assistant_response = await self._handle_voice_command(command_type)
+        else:
+            print("🤔 応答を生成中...")
+            assistant_response = await self.session.send_message(user_text)
+        print(f"🤖 アシスタント: {assistant_response}")
+
+        # 話速を適用、定型文になる音声コマンドの確認はキャッシュ
+        speak = self._command_speaker(command_type)
+        if self.barge_in is not None:
+            speak = self.barge_in.guard(speak)
+        return await speak(assistant_response)
+
+    async def _recognize(self) -> tuple[bool, str]:
+        """
+        ユーザーの発話を1回認識する
+
+        割り込みが有効な場合は連続音声認識で受け付けた発話（読み上げ中に話し始めたものを含む）を待ちます。
+
+        Returns:
+            (成功フラグ, 認識結果テキストまたはエラーメッセージ)のタプル
+        """
+        if self.barge_in is None:
+            return await self.recognizer.recognize_once_async()
+
+        user_text = await self.barge_in.next_utterance(timeout=settings.SPEECH_RECOGNITION_TIMEOUT)
+        if user_text is None:
+            return False, "⚠️  音声が認識できませんでした（無音または雑音）"
+        return True, user_text
+
+    async def _run_interruptible(self, reply: Awaitable[Any]) -> tuple[bool, Any]:
+        """
+        読み上げを伴う応答を実行する（割り込みが有効な場合は発話で中断）
+
+        Args:
+            reply: 応答の生成と読み上げを行うコルーチン
+
+        Returns:
+            (最後まで実行したか, 応答の戻り値)のタプル
+        """
+        if self.barge_in is None:
+            return True, await reply
+
+        completed, value = await self.barge_in.run_interruptible(reply)
+        if not completed:
+            print("✋ 発話を検出したため応答を中断しました")
+        return completed, value
 
     async def start_conversation(self):
         """
@@ -259,114 +460,123 @@ class VoiceChat:
         print()
 
         # 開始メッセージ
-        welcome_message = "こんにちは。音声アシスタントです。何かお手伝いできることはありますか？"
-        print(f"🤖 アシスタント: {welcome_message}")
-        success, _ = self.synthesizer.speak(welcome_message)
+        # 定型文の合成音声を開始メッセージの読み上げと並行して用意
+        if settings.AUDIO_CACHE_PREWARM:
+            self._prewarm_task = asyncio.create_task(self.synthesizer.prewarm_async(self._common_phrases()))
+
+        print(f"🤖 アシスタント: {WELCOME_MESSAGE}")
+        success, _ = await self.synthesizer.speak_phrase_async(WELCOME_MESSAGE)
 
         if not success:
             print("⚠️  音声合成に失敗しました。テキストのみで継続します。")
 
+        # 読み上げ中も連続音声認識を続けて割り込みを受け付ける
+        if settings.VOICE_BARGE_IN_ENABLED:
+            self.barge_in = BargeInListener(
+                self.recognizer,
+                self.synthesizer,
+                min_chars=settings.VOICE_BARGE_IN_MIN_CHARS
+            )
+            self.barge_in.start()
+            print("✋ 読み上げ中の割り込みが有効です（ヘッドセットの使用を推奨）")
+
         # セッション開始時刻を記録
         self.session_start_time = time.time()
 
         # 対話ループ
-        while True:
-            # 安全制限チェック
-            can_continue, stop_reason = self._check_safety_limits()
-            if not can_continue:
-                print(f"\n⏹  対話を終了します: {stop_reason}")
-                break
-
-            print()
-            print(f"--- ターン {self.turn_count + 1}/{settings.MAX_CONVERSATION_TURNS} ---")
-
-            try:
-                # 1. 音声認識（Phase 3: 再試行機能追加）
-                user_text = None
-                max_retries = 3  # 最大再試行回数
-                recognition_success = False
-
-                for retry in range(max_retries):
-                    if retry > 0:
-                        print(f"🔄 再試行中... ({retry}/{max_retries - 1})")
-
-                    print("🎤 音声入力を待機中...")
-                    success, user_text = self.recognizer.recognize_once()
-
-                    if success:
-                        # エラーカウンターリセット
-                        self.consecutive_errors = 0
-                        recognition_success = True
-                        break
-                    else:
-                        print(f"❌ 音声認識エラー: {user_text}")
-
-                        if retry < max_retries - 1:
-                            print("💬 もう一度話しかけてください...")
-
-                # 全ての再試行が失敗した場合
-                if not recognition_success:
-                    print("⚠️  音声認識に失敗しました。次のターンに進みます。")
-                    self.consecutive_errors += 1
-                    continue
-
-                print(f"📝 認識結果: {user_text}")
-
-                # 終了コマンドチェック
-                if self._is_exit_command(user_text):
-                    print("\n👋 終了コマンドを検出しました")
-                    farewell_message = "ご利用ありがとうございました。さようなら。"
-                    print(f"🤖 アシスタント: {farewell_message}")
-                    self.synthesizer.speak(farewell_message)
+        try:
+            while True:
+                # 安全制限チェック
+                can_continue, stop_reason = self._check_safety_limits()
+                if not can_continue:
+                    print(f"\n⏹  対話を終了します: {stop_reason}")
                     break
 
-                # Phase 3: 音声コマンドチェック
-                is_command, command_type = self._is_voice_command(user_text)
-                if is_command:
-                    print(f"🎛️  音声コマンドを検出: {command_type}")
-                    assistant_response = await self._handle_voice_command(command_type)
-                    print(f"🤖 アシスタント: {assistant_response}")
-                else:
-                    # 2. エージェント処理
-                    print("🤔 応答を生成中...")
-                    assistant_response = await self.session.send_message(user_text)
-                    print(f"🤖 アシスタント: {assistant_response}")
-
-                # 3. 音声合成（話速を適用）
-                if self.current_speaking_rate != 1.0:
-                    # 話速が変更されている場合はspeak_with_optionsを使用
-                    success, result = self.synthesizer.speak_with_options(
-                        assistant_response,
-                        rate=self.current_speaking_rate
-                    )
-                else:
-                    # デフォルトの話速の場合は通常のspeakを使用
-                    success, result = self.synthesizer.speak(assistant_response)
-
-                if not success:
-                    print(f"⚠️  音声合成エラー: {result}")
-                    print("テキストのみで継続します")
-
-                # ターン数をインクリメント
-                self.turn_count += 1
+                print()
+                print(f"--- ターン {self.turn_count + 1}/{settings.MAX_CONVERSATION_TURNS} ---")
+
+                try:
+                    # 1. 音声認識（Phase 3: 再試行機能追加）
+                    user_text = None
+                    max_retries = 3  # 最大再試行回数
+                    recognition_success = False
+
+                    recognition_start = time.perf_counter()
+
+                    for retry in range(max_retries):
+                        if retry > 0:
+                            print(f"🔄 再試行中... ({retry}/{max_retries - 1})")
+
+                        print("🎤 音声入力を待機中...")
+                        success, user_text = await self._recognize()
+
+                        if success:
+                            # エラーカウンターリセット
+                            self.consecutive_errors = 0
+                            recognition_success = True
+                            break
+                        else:
+                            print(f"❌ 音声認識エラー: {user_text}")
+
+                            if retry < max_retries - 1:
+                                print("💬 もう一度話しかけてください...")
+
+                    # 全ての再試行が失敗した場合
+                    if not recognition_success:
+                        print("⚠️  音声認識に失敗しました。次のターンに進みます。")
+                        self.consecutive_errors += 1
+                        continue
+
+                    recognition_seconds = time.perf_counter() - recognition_start
+                    print(f"📝 認識結果: {user_text}")
+
+                    # 終了コマンドチェック
+                    if self._is_exit_command(user_text):
+                        print("\n👋 終了コマンドを検出しました")
+                        print(f"🤖 アシスタント: {FAREWELL_MESSAGE}")
+                        await self.synthesizer.speak_phrase_async(FAREWELL_MESSAGE)
+                        break
 
-                # Phase 3: コンテキストを自動抽出
-                self.context_manager.extract_from_conversation(
-                    self.session.get_conversation_history()
-                )
+                    # Phase 3: 音声コマンドチェック
+                    is_command, command_type = self._is_voice_command(user_text)
+                    if not is_command and settings.VOICE_STREAMING_ENABLED:
+                        # 2-3. エージェント処理と音声合成を文単位で並行実行
+                        await self._run_interruptible(self._respond_streaming(user_text, recognition_seconds))
+                    else:
+                        # 2-3. エージェント処理（または音声コマンド）のあと応答全体を読み上げ
+                        completed, speech = await self._run_interruptible(
+                            self._respond(user_text, command_type if is_command else None)
+                        )
+                        success, result = speech if completed else (True, "")
+
+                        if not success:
+                            print(f"⚠️  音声合成エラー: {result}")
+                            print("テキストのみで継続します")
+
+                    # ターン数をインクリメント
+                    self.turn_count += 1
+
+                    # Phase 3: コンテキストを自動抽出
+                    self.context_manager.extract_from_conversation(
+                        self.session.get_conversation_history()
+                    )
 
-            except KeyboardInterrupt:
-                print("\n\n⏹  ユーザーによって中断されました")
-                break
+                except KeyboardInterrupt:
+                    print("\n\n⏹  ユーザーによって中断されました")
+                    break
 
-            except Exception as e:
-                print(f"\n❌ 予期しないエラー: {str(e)}")
-                self.consecutive_errors += 1
+                except Exception as e:
+                    print(f"\n❌ 予期しないエラー: {str(e)}")
+                    self.consecutive_errors += 1
 
-                # エラーが多すぎる場合は終了
-                if self.consecutive_errors >= settings.MAX_CONSECUTIVE_ERRORS:
-                    print(f"⚠️  連続エラーが{settings.MAX_CONSECUTIVE_ERRORS}回発生したため終了します")
-                    break
+                    # エラーが多すぎる場合は終了
+                    if self.consecutive_errors >= settings.MAX_CONSECUTIVE_ERRORS:
+                        print(f"⚠️  連続エラーが{settings.MAX_CONSECUTIVE_ERRORS}回発生したため終了します")
+                        break
+        finally:
+            # ループを抜けた理由（キャンセル・予期しない例外を含む）によらず連続音声認識を止める
+            if self.barge_in is not None:
+                self.barge_in.stop()
 
         # 終了時の統計情報
         self._print_session_statistics()
@@ -386,6 +596,8 @@ class VoiceChat:
             print(f"  セッション時間: {minutes}分{seconds}秒")
 
         print(f"  会話履歴: {len(self.session.get_conversation_history())}メッセージ")
+        if self.barge_in is not None:
+            print(f"  割り込み: {self.barge_in.interruptions}回")
         print("=" * 60)
         print()
 